@@ -3,10 +3,14 @@ Module contains abstract classes (abstract) that should be implemented and used
 application usage.
 """
 import abc
+from typing import Callable
 
 import battleapi.api.dto as api_dto
+import battleapi.logic.events as events
 import battleapi.logic.models as models
 
+SessionUpdate = Callable[[api_dto.SessionStateDto], api_dto.SessionStateDto]
+
 
 class IdGenerator(abc.ABC):
     """Interface for the ID generation classes.
@@ -32,12 +36,27 @@ class DbClient(abc.ABC):
     """
 
     @abc.abstractmethod
-    def save(self, session_id: str, session: api_dto.SessionStateDto) -> bool:
+    def save(
+        self,
+        session_id: str,
+        session: api_dto.SessionStateDto,
+        expected_version: int | None = None,
+    ) -> bool:
         """Save SessionStateDto object to the DB with passed session_id.
 
+        Saved session gets the next version: expected_version + 1, or
+        session.version + 1 if expected_version is not passed.
+
         Args:
             session_id (str): unique identifier of the session. Primary Key.
             session (dto.SessionState): Game Session Object.
+            expected_version (int | None, optional): if passed, session is saved only
+                if the stored version is equal to it (compare-and-swap, 0 - session is
+                not stored). Defaults to None (session is overwritten).
+
+        Raises:
+            SessionVersionConflictException: raised if the stored version is not the
+                expected one.
 
         Returns:
             bool: success of the operation. True - OK, False - Failure.
@@ -66,6 +85,142 @@ class DbClient(abc.ABC):
                 or session was already deleted or even never exist in the DB
         """
 
+    @abc.abstractmethod
+    def update(
+        self, session_id: str, update_fn: SessionUpdate
+    ) -> api_dto.SessionStateDto:
+        """Atomically load, change and save SessionStateDto object.
+
+        Other changes of the same session are not applied between load and save.
+        Saved session gets version of the loaded session + 1.
+
+        Args:
+            session_id (str): unique identifier of the session. Primary Key.
+            update_fn (SessionUpdate): function that receives stored session and
+                returns session to be saved. Nothing is saved if it raises.
+
+        Raises:
+            KeyError: raised if the session is not found.
+            SessionVersionConflictException: raised if the session was changed by
+                another process after load (nothing is saved, update can be retried).
+
+        Returns:
+            api_dto.SessionStateDto: saved Game Session Object.
+        """
+
+
+class EventStore(abc.ABC):
+    """Interface for the storage of the session events and snapshots.
+
+    Version of the session is the number of the stored events. Snapshot is the state
+    of the session after the first snapshot.version events.
+
+    Args:
+        abc (_type_): Inherits abstract metaclass.
+    """
+
+    @abc.abstractmethod
+    def append(
+        self,
+        session_id: str,
+        new_events: list[events.GameEvent],
+        expected_version: int | None = None,
+    ) -> int:
+        """Add events to the end of the session log (log is created if needed).
+
+        Args:
+            session_id (str): unique identifier of the session. Primary Key.
+            new_events (list[events.GameEvent]): events to be added.
+            expected_version (int | None, optional): if passed, events are added only
+                if the current version is equal to it. Defaults to None (no check).
+
+        Raises:
+            SessionVersionConflictException: raised if the current version is not the
+                expected one.
+
+        Returns:
+            int: new version of the session.
+        """
+
+    @abc.abstractmethod
+    def load_events(
+        self, session_id: str, start: int = 0, end: int | None = None
+    ) -> list[events.GameEvent]:
+        """Load events of the session.
+
+        Args:
+            session_id (str): unique identifier of the session. Primary Key.
+            start (int, optional): version to start from. Defaults to 0.
+            end (int | None, optional): version to stop at (exclusive). Defaults to
+                None (till the end of the log).
+
+        Raises:
+            KeyError: raised if the session is not found.
+
+        Returns:
+            list[events.GameEvent]: events in the order of the changes.
+        """
+
+    @abc.abstractmethod
+    def save_snapshot(self, session_id: str, session: api_dto.SessionStateDto) -> None:
+        """Save state of the session after session.version events.
+
+        Args:
+            session_id (str): unique identifier of the session. Primary Key.
+            session (api_dto.SessionStateDto): state of the session.
+
+        Raises:
+            KeyError: raised if the session is not found.
+        """
+
+    @abc.abstractmethod
+    def prune_snapshots(self, session_id: str, version: int) -> int:
+        """Remove snapshots older than version except the first one of the session.
+
+        First snapshot is the base of the replay of the full log, so any version of
+        the session can still be restored.
+
+        Args:
+            session_id (str): unique identifier of the session. Primary Key.
+            version (int): snapshots with the lower versions are removed.
+
+        Raises:
+            KeyError: raised if the session is not found.
+
+        Returns:
+            int: number of the removed snapshots.
+        """
+
+    @abc.abstractmethod
+    def load_snapshot(
+        self, session_id: str, max_version: int | None = None
+    ) -> api_dto.SessionStateDto:
+        """Load latest snapshot of the session.
+
+        Args:
+            session_id (str): unique identifier of the session. Primary Key.
+            max_version (int | None, optional): max version of the snapshot.
+                Defaults to None (latest snapshot).
+
+        Raises:
+            KeyError: raised if the session or the snapshot is not found.
+
+        Returns:
+            api_dto.SessionStateDto: state of the session, the returned object is not
+                shared with the store.
+        """
+
+    @abc.abstractmethod
+    def remove(self, session_id: str) -> bool:
+        """Remove events and snapshots of the session.
+
+        Args:
+            session_id (str): unique identifier of the session. Primary Key.
+
+        Returns:
+            bool: True if the session was removed, False if it doesn't exist.
+        """
+
 
 class GamePersistence(abc.ABC):
     """Interface for the Persistence API required for game controller.
@@ -78,13 +233,22 @@ class GamePersistence(abc.ABC):
 
     @abc.abstractmethod
     def save_session(
-        self, session_id: str, session_state: api_dto.SessionStateDto
+        self,
+        session_id: str,
+        session_state: api_dto.SessionStateDto,
+        expected_version: int | None = None,
     ) -> bool:
         """Save game session via db_client object.
 
         Args:
             session_id (str): identifier of the session to be saved. Primary Key.
             session_state (dto.SessionState): current game session state.
+            expected_version (int | None, optional): stored version required for the
+                save (see DbClient.save). Defaults to None (no check).
+
+        Raises:
+            SessionVersionConflictException: raised if the stored version is not the
+                expected one.
 
         Returns:
             bool: result of the save method.
@@ -112,6 +276,26 @@ class GamePersistence(abc.ABC):
             bool: result of deletion. False if error or absence of the session.
         """
 
+    @abc.abstractmethod
+    def update_session(
+        self, session_id: str, update_fn: SessionUpdate
+    ) -> api_dto.SessionStateDto | None:
+        """Atomically change game session via db_client object.
+
+        Args:
+            session_id (str): identifier of the session to be changed. Primary Key.
+            update_fn (SessionUpdate): function that receives stored session and
+                returns session to be saved. Its exceptions are passed to the caller.
+
+        Raises:
+            SessionVersionConflictException: raised if the session was changed
+                concurrently and the change was not saved.
+
+        Returns:
+            api_dto.SessionStateDto | None: saved session or None if the session is
+                not found or error happened in the DB.
+        """
+
 
 class GameController(abc.ABC):
     """Interface for the game controller which responsible to manage all the actions
@@ -124,6 +308,18 @@ class GameController(abc.ABC):
     persistence: GamePersistence
     id_generator: IdGenerator
 
+    @abc.abstractmethod
+    def begin_scope(self) -> None:
+        """Open scope (unit of work) for the current thread.
+
+        Game sessions loaded in the scope are reused by the reads. Changes are saved
+        at once and atomically, they are not deferred to the end_scope.
+        """
+
+    @abc.abstractmethod
+    def end_scope(self) -> None:
+        """Close scope opened by begin_scope and drop its cached game sessions."""
+
     @abc.abstractmethod
     def init_game_session(self) -> str:
         """Init new game session.
@@ -151,6 +347,17 @@ class GameController(abc.ABC):
             api_dto.PlayerDto: player information object of the created player.
         """
 
+    @abc.abstractmethod
+    def create_bot_in_session(self, session_id: str) -> api_dto.PlayerDto:
+        """Add bot (computer) opponent to the session of the single-player game.
+
+        Args:
+            session_id (str): session id of the created session.
+
+        Returns:
+            api_dto.PlayerDto: player information object of the bot.
+        """
+
     @abc.abstractmethod
     def get_opponent_prepare_status(
         self, session_id: str, current_player_id: str
@@ -259,6 +466,22 @@ class GameController(abc.ABC):
             list[list]: field representation.
         """
 
+    @abc.abstractmethod
+    def get_field_rows(
+        self, session_id: str, player_id: str, is_for_opponent: bool = False
+    ) -> list[str]:
+        """Return compact row encoded field representation for player.
+
+        Args:
+            session_id (str): id of the current game session.
+            player_id (str): player id whose field should be returned.
+            is_for_opponent (bool, optional): Flag to let game know if the ships should
+                be showed or not. True means ships should be hidden. Defaults to False.
+
+        Returns:
+            list[str]: one string per row of the field.
+        """
+
     @abc.abstractmethod
     def get_winner(self, session_id: str) -> api_dto.PlayerDto:
         """Return winner of the game.
@@ -270,6 +493,48 @@ class GameController(abc.ABC):
             api_dto.PlayerDto: player information.
         """
 
+    @abc.abstractmethod
+    def get_gameplay_snapshot(
+        self, session_id: str, player_id: str
+    ) -> api_dto.GameplaySnapshotDto:
+        """Return everything required to show gameplay page by one session load.
+
+        Args:
+            session_id (str): id of the current game session.
+            player_id (str): id of the player who requested information.
+
+        Returns:
+            api_dto.GameplaySnapshotDto: players, fields and counters of the game.
+        """
+
+    @abc.abstractmethod
+    def get_prepare_snapshot(
+        self, session_id: str, player_id: str
+    ) -> api_dto.PrepareSnapshotDto:
+        """Return everything required to show preparation page by one session load.
+
+        Args:
+            session_id (str): id of the current game session.
+            player_id (str): id of the player who requested information.
+
+        Returns:
+            api_dto.PrepareSnapshotDto: players, available ships and field.
+        """
+
+    @abc.abstractmethod
+    def get_wait_snapshot(
+        self, session_id: str, player_id: str
+    ) -> api_dto.WaitSnapshotDto:
+        """Return everything required to show wait page by one session load.
+
+        Args:
+            session_id (str): id of the current game session.
+            player_id (str): id of the player who requested information.
+
+        Returns:
+            api_dto.WaitSnapshotDto: player and opponent.
+        """
+
     @abc.abstractmethod
     def add_ship_to_field(
         self,
@@ -287,6 +552,13 @@ class GameController(abc.ABC):
             ship_id (str): ship type.
             coordinate (models.Coordinate): coordinate of the cell.
             ship_direction (str): direction of the ship.
+
+        Raises:
+            IncorrectStringException: raised if the direction is not a name of
+                models.Direction.
+            ShipNotFoundException: raised if the player has no ship with the id.
+            ShipAlreadyOnTheBoardException: raised if the ship is already on the
+                board.
         """
 
     @abc.abstractmethod
@@ -301,6 +573,18 @@ class GameController(abc.ABC):
             coordinate (models.Coordinate): coordinate of the cell.
         """
 
+    @abc.abstractmethod
+    def randomize_fleet(self, session_id: str, player_id: str) -> None:
+        """Put all ships of the player on the random positions in preparation stage.
+
+        Args:
+            session_id (str): current game session id.
+            player_id (str): player id whose ships are placed.
+
+        Raises:
+            PlayerIsReadyException: raised if the player is already ready.
+        """
+
     @abc.abstractmethod
     def start_game(self, session_id: str, player_id: str) -> None:
         """Start game.
@@ -315,7 +599,11 @@ class GameController(abc.ABC):
 
     @abc.abstractmethod
     def make_shot(
-        self, session_id: str, player_id: str, coordinate: models.Coordinate
+        self,
+        session_id: str,
+        player_id: str,
+        coordinate: models.Coordinate,
+        check_turn: bool = False,
     ) -> api_dto.ShotResultDto:
         """Make a shot by the opponent field.
 
@@ -323,6 +611,13 @@ class GameController(abc.ABC):
             session_id (str): current game session id.
             player_id (str): player who makes a shot.
             coordinate (models.Coordinate): coordinate of the cell in opponent field.
+            check_turn (bool, optional): True if the shot is rejected when it is not
+                the turn of the player, the turn is checked in the same atomic change
+                as the shot. Defaults to False.
+
+        Raises:
+            NotPlayerTurnException: raised if check_turn is True and the game is not
+                on the gameplay stage or it is the turn of the opponent.
 
         Returns:
             api_dto.ShotResultDto: Result of the made shot.
@@ -0,0 +1,133 @@
+"""Bot (computer) players of the single-player games.
+
+Bot player is the usual player of the game session whose id starts with
+BOT_PLAYER_ID_PREFIX, so the session state doesn't need any new fields and is
+persisted as before. Controller makes the shots of the bot right after the change
+that gives the turn to it.
+
+State of the bot (heatmap.HeatmapBot by default, montecarlo.MonteCarloBot for the
+stronger and slower one, see BotRegistry bot_factory) is only the cache of the observed opponent
+board: bots are kept in the LRU bounded registry of the process and the evicted (or
+never seen, for example after restart) bot is created again and observes the whole
+board by the first move.
+"""
+import collections
+import contextlib
+import threading
+from typing import Callable, Iterator
+
+import battleapi.logic.configs as configs
+import battleapi.logic.heatmap as heatmap
+import battleapi.logic.montecarlo as montecarlo
+import battleapi.utils.logs as logs
+
+log: logs.StructuredLogger = logs.get_logger(__name__)
+
+BotKey = tuple[str, str]
+Bot = heatmap.HeatmapBot | montecarlo.MonteCarloBot
+BotFactory = Callable[[configs.GameConfiguration | None], Bot]
+
+BOT_PLAYER_ID_PREFIX: str = "bot-"
+BOT_PLAYER_NAME: str = "Computer"
+DEFAULT_MAX_BOTS: int = 1024
+
+
+def is_bot_player(player_id: str) -> bool:
+    """Check if the player is the bot.
+
+    Args:
+        player_id (str): player id.
+
+    Returns:
+        bool: True if the player is the bot.
+    """
+    return player_id.startswith(BOT_PLAYER_ID_PREFIX)
+
+
+class BotRegistry:
+    """LRU bounded registry of the bots of the running games (thread safe).
+
+    Every bot has its own lock, so bots of the different games make moves
+    concurrently and the moves of the same bot are serialized.
+    """
+
+    max_size: int
+    _bot_factory: BotFactory
+    _bots: collections.OrderedDict[BotKey, tuple[Bot, threading.Lock]]
+    _lock: threading.Lock
+
+    def __init__(
+        self, max_size: int = DEFAULT_MAX_BOTS, bot_factory: BotFactory | None = None
+    ) -> None:
+        """Initialization of the registry.
+
+        Args:
+            max_size (int, optional): max number of the kept bots.
+                Defaults to DEFAULT_MAX_BOTS.
+            bot_factory (BotFactory | None, optional): creates bot by the game
+                configuration. Defaults to None (heatmap.HeatmapBot).
+
+        Raises:
+            ValueError: raised if max_size is less than 1.
+        """
+        if max_size < 1:
+            raise ValueError(f"Max size should be positive, got: {max_size}")
+        self.max_size = max_size
+        self._bot_factory = heatmap.HeatmapBot if bot_factory is None else bot_factory
+        self._bots = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return number of the kept bots.
+
+        Returns:
+            int: number of the bots.
+        """
+        with self._lock:
+            return len(self._bots)
+
+    @contextlib.contextmanager
+    def acquire(
+        self,
+        session_id: str,
+        player_id: str,
+        game_config: configs.GameConfiguration | None = None,
+    ) -> Iterator[Bot]:
+        """Lock the bot of the game session, bot is created if it is not kept.
+
+        Args:
+            session_id (str): game session id.
+            player_id (str): player id of the bot.
+            game_config (configs.GameConfiguration | None, optional): configuration
+                of the game (fleet of the opponent). Defaults to None (classic).
+
+        Yields:
+            Iterator[Bot]: bot locked for the current thread.
+        """
+        key: BotKey = (session_id, player_id)
+        with self._lock:
+            entry = self._bots.get(key)
+            if entry is None:
+                entry = (self._bot_factory(game_config), threading.Lock())
+                self._bots[key] = entry
+                while len(self._bots) > self.max_size:
+                    evicted, _ = self._bots.popitem(last=False)
+                    log.debug("Bot is evicted: %s", evicted)
+            else:
+                self._bots.move_to_end(key)
+        bot, lock = entry
+        with lock:
+            yield bot
+
+    def remove(self, session_id: str, player_id: str) -> bool:
+        """Remove bot of the finished game.
+
+        Args:
+            session_id (str): game session id.
+            player_id (str): player id of the bot.
+
+        Returns:
+            bool: True if the bot was kept.
+        """
+        with self._lock:
+            return self._bots.pop((session_id, player_id), None) is not None
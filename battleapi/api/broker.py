@@ -0,0 +1,288 @@
+"""In-process publish/subscribe broker of the game session notifications.
+
+Controller publishes small notifications about the changes of the session (player
+joined, player is ready, cell changed, turn changed, game over) and every subscriber
+of the session receives them in its own bounded queue. Slow subscriber doesn't block
+publisher: when its queue is full, pending notifications are dropped and the
+subscriber receives EVENT_RESYNC to reload the whole state.
+
+Subscriptions are consumed by the blocking code (Subscription) or by the coroutines
+of the event loop (AsyncSubscription); publisher can be any thread in both cases.
+"""
+import asyncio
+import dataclasses
+import queue
+import threading
+from typing import Any
+
+import battleapi.utils.logs as logs
+
+log: logs.StructuredLogger = logs.get_logger(__name__)
+
+EVENT_PLAYER_JOINED: str = "player_joined"
+EVENT_PLAYER_READY: str = "player_ready"
+EVENT_CELL: str = "cell"
+EVENT_TURN: str = "turn"
+EVENT_GAME_OVER: str = "game_over"
+EVENT_RESYNC: str = "resync"
+
+DEFAULT_QUEUE_SIZE: int = 256
+
+
+@dataclasses.dataclass(frozen=True)
+class Notification:
+    """Notification about the change of the game session.
+
+    kind - type of the change (one of EVENT_* constants).
+    data - details of the change (JSON serializable).
+    """
+
+    kind: str
+    data: dict[str, Any] = dataclasses.field(default_factory=dict)
+
+
+class Subscription:
+    """Queue of the notifications of one subscriber of the session."""
+
+    session_id: str
+    _queue: queue.Queue
+    _is_overflowed: bool
+
+    def __init__(self, session_id: str, queue_size: int = DEFAULT_QUEUE_SIZE) -> None:
+        """Initialization of the subscription.
+
+        Args:
+            session_id (str): game session id.
+            queue_size (int, optional): max number of the not received
+                notifications. Defaults to DEFAULT_QUEUE_SIZE.
+        """
+        self.session_id = session_id
+        self._queue = queue.Queue(queue_size)
+        self._is_overflowed = False
+
+    def put(self, notification: Notification) -> bool:
+        """Add notification to the queue without waiting.
+
+        Args:
+            notification (Notification): notification.
+
+        Returns:
+            bool: False if the queue is full and notification is dropped.
+        """
+        try:
+            self._queue.put_nowait(notification)
+        except queue.Full:
+            self._is_overflowed = True
+            return False
+        return True
+
+    def get(self, timeout: float | None = None) -> Notification | None:
+        """Wait for the next notification.
+
+        Args:
+            timeout (float | None, optional): max seconds to wait. Defaults to None
+                (wait forever).
+
+        Returns:
+            Notification | None: notification or None if nothing was published in
+                the timeout.
+        """
+        if self._is_overflowed:
+            self._is_overflowed = False
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            return Notification(EVENT_RESYNC)
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class AsyncSubscription:
+    """Queue of the notifications of one subscriber of the session for asyncio code.
+
+    Notifications are passed to the event loop of the subscriber, so it doesn't need
+    a thread to wait for them.
+    """
+
+    session_id: str
+    _loop: asyncio.AbstractEventLoop
+    _queue: asyncio.Queue
+    _is_overflowed: bool
+
+    def __init__(
+        self,
+        session_id: str,
+        loop: asyncio.AbstractEventLoop,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        """Initialization of the subscription.
+
+        Args:
+            session_id (str): game session id.
+            loop (asyncio.AbstractEventLoop): event loop of the subscriber.
+            queue_size (int, optional): max number of the not received
+                notifications. Defaults to DEFAULT_QUEUE_SIZE.
+        """
+        self.session_id = session_id
+        self._loop = loop
+        self._queue = asyncio.Queue(queue_size)
+        self._is_overflowed = False
+
+    def put(self, notification: Notification) -> bool:
+        """Pass notification to the event loop without waiting (thread safe).
+
+        Args:
+            notification (Notification): notification.
+
+        Returns:
+            bool: False if the event loop is closed and notification is dropped.
+        """
+        try:
+            self._loop.call_soon_threadsafe(self._put_nowait, notification)
+        except RuntimeError:
+            return False
+        return True
+
+    def _put_nowait(self, notification: Notification) -> None:
+        """Add notification to the queue, called in the event loop.
+
+        Args:
+            notification (Notification): notification.
+        """
+        try:
+            self._queue.put_nowait(notification)
+        except asyncio.QueueFull:
+            self._is_overflowed = True
+
+    async def get(self, timeout: float | None = None) -> Notification | None:
+        """Wait for the next notification.
+
+        Args:
+            timeout (float | None, optional): max seconds to wait. Defaults to None
+                (wait forever).
+
+        Returns:
+            Notification | None: notification or None if nothing was published in
+                the timeout.
+        """
+        if self._is_overflowed:
+            self._is_overflowed = False
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            return Notification(EVENT_RESYNC)
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class Broker:
+    """Thread safe in-process broker of the notifications grouped by session."""
+
+    queue_size: int
+    _subscriptions: dict[str, set[Subscription | AsyncSubscription]]
+    _lock: threading.Lock
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE) -> None:
+        """Initialization of the broker.
+
+        Args:
+            queue_size (int, optional): size of the queue of every subscription.
+                Defaults to DEFAULT_QUEUE_SIZE.
+        """
+        self.queue_size = queue_size
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, session_id: str) -> Subscription:
+        """Create subscription to the notifications of the session.
+
+        Args:
+            session_id (str): game session id.
+
+        Returns:
+            Subscription: subscription, should be passed to unsubscribe at the end.
+        """
+        subscription = Subscription(session_id, self.queue_size)
+        self._add(subscription)
+        return subscription
+
+    def subscribe_async(self, session_id: str) -> AsyncSubscription:
+        """Create subscription to the notifications of the session for the running
+        event loop.
+
+        Args:
+            session_id (str): game session id.
+
+        Returns:
+            AsyncSubscription: subscription, should be passed to unsubscribe at the
+                end.
+        """
+        subscription = AsyncSubscription(
+            session_id, asyncio.get_running_loop(), self.queue_size
+        )
+        self._add(subscription)
+        return subscription
+
+    def _add(self, subscription: Subscription | AsyncSubscription) -> None:
+        """Start delivery of the notifications to the subscription.
+
+        Args:
+            subscription (Subscription | AsyncSubscription): new subscription.
+        """
+        with self._lock:
+            self._subscriptions.setdefault(subscription.session_id, set()).add(
+                subscription
+            )
+        log.debug("Subscribed to: %s", subscription.session_id)
+
+    def unsubscribe(self, subscription: Subscription | AsyncSubscription) -> None:
+        """Stop delivery of the notifications to the subscription.
+
+        Args:
+            subscription (Subscription | AsyncSubscription): subscription created by
+                subscribe or subscribe_async.
+        """
+        with self._lock:
+            subscriptions: set[
+                Subscription | AsyncSubscription
+            ] | None = self._subscriptions.get(subscription.session_id)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.session_id]
+        log.debug("Unsubscribed from: %s", subscription.session_id)
+
+    def publish(self, session_id: str, notification: Notification) -> int:
+        """Deliver notification to all the subscribers of the session.
+
+        Args:
+            session_id (str): game session id.
+            notification (Notification): notification.
+
+        Returns:
+            int: number of the subscribers received the notification.
+        """
+        with self._lock:
+            subscriptions: list[Subscription | AsyncSubscription] = list(
+                self._subscriptions.get(session_id, ())
+            )
+        delivered: int = sum(
+            subscription.put(notification) for subscription in subscriptions
+        )
+        log.debug("Published to %s: %s, %d", session_id, notification, delivered)
+        return delivered
+
+    def count_subscribers(self, session_id: str) -> int:
+        """Return number of the subscribers of the session.
+
+        Args:
+            session_id (str): game session id.
+
+        Returns:
+            int: number of the subscribers.
+        """
+        with self._lock:
+            return len(self._subscriptions.get(session_id, ()))
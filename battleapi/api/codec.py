@@ -0,0 +1,436 @@
+"""Compact binary codec of the game session state.
+
+Layout of the encoded session (version 1), all integers are unsigned, varint is
+LEB128:
+
+    magic (2 bytes) | version (1 byte)
+    strings: varint count, then for every string: tag (1 byte) and payload
+        (TAG_UUID - 16 bytes of uuid, TAG_TEXT - varint length + utf-8 bytes)
+    session_id: varint string index | active_player_id: varint string index
+    config: game type (1 byte) | varint count of overrides, then for every override:
+        ship type, ship size, ship amount (1 byte each, size 0 - type is removed)
+    players: varint count, then for every player:
+        player_id: varint string index | player_name: varint length + utf-8 bytes
+        flags (1 byte) | shots: bit per cell (BOARD_BYTES bytes)
+        ships: varint count, then for every ship: ship_id varint string index,
+            size (1 byte), flags (1 byte), origin cell index (1 byte, placed only)
+
+Identifiers (session, players, ships) are interned in the string table and uuid
+strings take 16 bytes. Board cells are not stored: ship cells are restored from the
+placed ships and shots are stored as a bitmask.
+
+Raises:
+    CodecException: raised if the data can't be decoded.
+"""
+import uuid
+
+import battleapi.api.dto as dto
+import battleapi.logic.bitboard as bitboard
+import battleapi.logic.board as board
+import battleapi.logic.configs as config
+import battleapi.logic.models as models
+import battleapi.logic.player as pl
+import battleapi.logic.utils as utils
+import battleapi.utils.logs as logs
+
+log: logs.StructuredLogger = logs.get_logger(__name__)
+
+MAGIC: bytes = b"BS"
+VERSION: int = 1
+
+TAG_UUID: int = 0
+TAG_TEXT: int = 1
+
+PLAYER_READY: int = 1
+PLAYER_BITBOARD: int = 2
+
+SHIP_VERTICAL: int = 1
+SHIP_PLACED: int = 2
+
+BOARD_CELLS: int = utils.SIZE_VERTICAL * utils.SIZE_HORIZONTAL
+BOARD_BYTES: int = (BOARD_CELLS + 7) // 8
+
+BASE_CONFIGS: dict[config.GameType, type[config.GameConfiguration]] = {
+    config.GameType.CLASSIC: config.ClassicGameConfiguration,
+    config.GameType.CUSTOM: config.CustomGameConfiguration,
+}
+
+
+class CodecException(Exception):
+    """Exception is raised when encoded session can't be decoded."""
+
+    def __init__(self, message: str) -> None:
+        Exception.__init__(self, message)
+
+
+class _Writer:
+    """Buffer with the interned strings table."""
+
+    def __init__(self) -> None:
+        """Initialization of the empty buffer."""
+        self.body: bytearray = bytearray()
+        self.strings: dict[str, int] = {}
+
+    def varint(self, value: int) -> None:
+        """Write non negative integer as LEB128 varint."""
+        while value > 0x7F:
+            self.body.append(value & 0x7F | 0x80)
+            value >>= 7
+        self.body.append(value)
+
+    def byte(self, value: int) -> None:
+        """Write one byte."""
+        self.body.append(value)
+
+    def text(self, value: str) -> None:
+        """Write length prefixed utf-8 string."""
+        raw: bytes = value.encode("utf-8")
+        self.varint(len(raw))
+        self.body += raw
+
+    def ref(self, value: str) -> None:
+        """Write index of the string in the strings table (adds it if needed)."""
+        index: int | None = self.strings.get(value)
+        if index is None:
+            index = len(self.strings)
+            self.strings[value] = index
+        self.varint(index)
+
+    def to_bytes(self) -> bytes:
+        """Return header, strings table and body."""
+        table: _Writer = _Writer()
+        table.varint(len(self.strings))
+        for value in self.strings:
+            packed: bytes | None = _pack_uuid(value)
+            if packed is None:
+                table.byte(TAG_TEXT)
+                table.text(value)
+            else:
+                table.byte(TAG_UUID)
+                table.body += packed
+        return MAGIC + bytes([VERSION]) + bytes(table.body) + bytes(self.body)
+
+
+class _Reader:
+    """Cursor over the encoded data."""
+
+    def __init__(self, data: bytes) -> None:
+        """Initialization of the cursor at the start of data."""
+        self.data: bytes = data
+        self.pos: int = 0
+        self.strings: list[str] = []
+
+    def take(self, size: int) -> bytes:
+        """Read size bytes."""
+        end: int = self.pos + size
+        if end > len(self.data):
+            raise CodecException("Unexpected end of data")
+        chunk: bytes = self.data[self.pos : end]
+        self.pos = end
+        return chunk
+
+    def byte(self) -> int:
+        """Read one byte."""
+        return self.take(1)[0]
+
+    def varint(self) -> int:
+        """Read LEB128 varint."""
+        value: int = 0
+        shift: int = 0
+        while True:
+            current: int = self.byte()
+            value |= (current & 0x7F) << shift
+            if not current & 0x80:
+                return value
+            shift += 7
+
+    def text(self) -> str:
+        """Read length prefixed utf-8 string."""
+        return self.take(self.varint()).decode("utf-8")
+
+    def ref(self) -> str:
+        """Read string by its index in the strings table."""
+        index: int = self.varint()
+        if index >= len(self.strings):
+            raise CodecException(f"Unknown string index: {index}")
+        return self.strings[index]
+
+
+def _pack_uuid(value: str) -> bytes | None:
+    """Return 16 bytes of the uuid if value is canonical uuid string.
+
+    Args:
+        value (str): string to pack.
+
+    Returns:
+        bytes | None: packed uuid or None if value isn't canonical uuid string.
+    """
+    if len(value) != 36:
+        return None
+    try:
+        parsed: uuid.UUID = uuid.UUID(value)
+    except ValueError:
+        return None
+    return parsed.bytes if str(parsed) == value else None
+
+
+def _write_config(writer: _Writer, game_config: config.GameConfiguration) -> None:
+    """Write game type and differences of the configuration from the type.
+
+    Args:
+        writer (_Writer): output.
+        game_config (config.GameConfiguration): configuration.
+    """
+    game_type: config.GameType = (
+        config.GameType.CUSTOM
+        if isinstance(game_config, config.CustomGameConfiguration)
+        else config.GameType.CLASSIC
+    )
+    base: config.GameConfiguration = BASE_CONFIGS[game_type]()
+    sizes: dict[models.ShipType, int] = game_config.get_size_mapping()
+    amounts: dict[models.ShipType, int] = game_config.get_amount_mapping()
+    base_sizes: dict[models.ShipType, int] = base.get_size_mapping()
+    base_amounts: dict[models.ShipType, int] = base.get_amount_mapping()
+    overrides: list[tuple[int, int, int]] = []
+    for ship_type in models.ShipType:
+        current: tuple[int, int] = (sizes.get(ship_type, 0), amounts.get(ship_type, 0))
+        if current != (base_sizes.get(ship_type, 0), base_amounts.get(ship_type, 0)):
+            overrides.append((ship_type.value, current[0], current[1]))
+    writer.byte(game_type.value)
+    writer.varint(len(overrides))
+    for override in overrides:
+        writer.body += bytes(override)
+
+
+def _read_config(reader: _Reader) -> config.GameConfiguration:
+    """Read game configuration.
+
+    Args:
+        reader (_Reader): input.
+
+    Returns:
+        config.GameConfiguration: configuration, instance of the game type class if
+            there are no overrides.
+    """
+    base: config.GameConfiguration = BASE_CONFIGS[config.GameType(reader.byte())]()
+    count: int = reader.varint()
+    if count == 0:
+        return base
+    sizes: dict[models.ShipType, int] = base.get_size_mapping()
+    amounts: dict[models.ShipType, int] = base.get_amount_mapping()
+    for _ in range(count):
+        ship_type: models.ShipType = models.ShipType(reader.byte())
+        size: int = reader.byte()
+        amount: int = reader.byte()
+        if size == 0:
+            sizes.pop(ship_type, None)
+            amounts.pop(ship_type, None)
+        else:
+            sizes[ship_type] = size
+            amounts[ship_type] = amount
+    return config.MappingGameConfiguration(sizes, amounts)
+
+
+def _write_player(writer: _Writer, player: pl.Player) -> None:
+    """Write player with ships and shots of the board.
+
+    Args:
+        writer (_Writer): output.
+        player (pl.Player): player.
+    """
+    view: pl.GameBoardView = player.board.get_view()
+    shots: int = 0
+    origins: dict[models.ShipId, int] = {}
+    vertical: set[models.ShipId] = set()
+    for index in range(BOARD_CELLS):
+        row, col = divmod(index, utils.SIZE_HORIZONTAL)
+        if view.has_shot(row, col):
+            shots |= 1 << index
+        ship_id: models.ShipId | None = view.ship_id(row, col)
+        if ship_id is None:
+            continue
+        if ship_id not in origins:
+            origins[ship_id] = index
+        elif index - origins[ship_id] >= utils.SIZE_HORIZONTAL:
+            vertical.add(ship_id)
+    flags: int = PLAYER_READY if player.is_ready else 0
+    if isinstance(player.board, bitboard.BitBoard):
+        flags |= PLAYER_BITBOARD
+    writer.ref(player.player_id)
+    writer.text(player.player_name)
+    writer.byte(flags)
+    writer.body += shots.to_bytes(BOARD_BYTES, "little")
+    writer.varint(len(player.all_ships))
+    for ship_id, ship in player.all_ships.items():
+        origin: int | None = origins.get(ship_id)
+        is_placed: bool = (
+            origin is not None and ship_id not in player.ships_not_on_board
+        )
+        is_vertical: bool = (
+            ship_id in vertical
+            if is_placed and ship.ship_size > 1
+            else ship.direction == models.Direction.VERTICAL
+        )
+        ship_flags: int = (SHIP_VERTICAL if is_vertical else 0) | (
+            SHIP_PLACED if is_placed else 0
+        )
+        writer.ref(ship_id)
+        writer.byte(ship.ship_size)
+        writer.byte(ship_flags)
+        if is_placed:
+            writer.byte(origin)
+
+
+def _read_player(reader: _Reader) -> pl.Player:
+    """Read player and restore the board.
+
+    Args:
+        reader (_Reader): input.
+
+    Returns:
+        pl.Player: player.
+    """
+    player_id: str = reader.ref()
+    player_name: str = reader.text()
+    flags: int = reader.byte()
+    shots: int = int.from_bytes(reader.take(BOARD_BYTES), "little")
+    cells: models.Board = []
+    for row in range(utils.SIZE_VERTICAL):
+        line: list[models.Cell] = []
+        for col in range(utils.SIZE_HORIZONTAL):
+            index: int = row * utils.SIZE_HORIZONTAL + col
+            line.append(models.Cell(has_shot=bool(shots >> index & 1)))
+        cells.append(line)
+    all_ships: dict[models.ShipId, models.Ship] = {}
+    ships_not_on_board: dict[models.ShipId, models.Ship] = {}
+    for _ in range(reader.varint()):
+        ship_id: str = reader.ref()
+        ship_size: int = reader.byte()
+        ship_flags: int = reader.byte()
+        direction: models.Direction = (
+            models.Direction.VERTICAL
+            if ship_flags & SHIP_VERTICAL
+            else models.Direction.HORIZONTAL
+        )
+        ship: models.Ship = models.Ship(ship_id, ship_size, direction)
+        all_ships[ship_id] = ship
+        if not ship_flags & SHIP_PLACED:
+            ships_not_on_board[ship_id] = ship
+            continue
+        origin: models.Coordinate = utils.index_to_coordinate(reader.byte())
+        footprint, _ = utils.get_ship_footprint(origin, ship_size, direction)
+        for row, col in footprint:
+            cells[row][col].has_ship = True
+            cells[row][col].ship_id = ship_id
+    game_board: pl.GameBoard = (
+        bitboard.BitBoard(cells) if flags & PLAYER_BITBOARD else board.Board(cells)
+    )
+    return pl.Player(
+        player_id=player_id,
+        player_name=player_name,
+        board=game_board,
+        ships_not_on_board=ships_not_on_board,
+        all_ships=all_ships,
+        is_ready=bool(flags & PLAYER_READY),
+    )
+
+
+def encode(session: dto.SessionStateDto) -> bytes:
+    """Encode session state into compact binary form.
+
+    Args:
+        session (dto.SessionStateDto): session state.
+
+    Returns:
+        bytes: encoded session.
+    """
+    writer: _Writer = _Writer()
+    writer.ref(session.session_id)
+    writer.ref(session.active_player_id)
+    _write_config(writer, session.game_config)
+    writer.varint(len(session.players))
+    for player in session.players.values():
+        _write_player(writer, player)
+    return writer.to_bytes()
+
+
+def _estimate_string_size(value: str) -> int:
+    """Return size of the string in the strings table without uuid parsing.
+
+    Args:
+        value (str): string.
+
+    Returns:
+        int: number of bytes (uuid is assumed by the length of the string).
+    """
+    if len(value) == 36:
+        return 17
+    return 2 + len(value)
+
+
+def estimate_size(session: dto.SessionStateDto) -> int:
+    """Return size of the encoded session calculated by the layout without encoding.
+
+    Size is exact for the uuid ids, ascii texts shorter than 128 bytes and the
+    configurations without overrides, otherwise it is close to the encoded one. It
+    is used where the size is tracked on every save (see
+    battleapi.db.expiring_db_client).
+
+    Args:
+        session (dto.SessionStateDto): session state.
+
+    Returns:
+        int: estimated number of bytes.
+    """
+    strings: set[str] = {session.session_id, session.active_player_id}
+    # version, strings count, session and active player refs, config, players count
+    size: int = len(MAGIC) + 7
+    for player in session.players.values():
+        strings.add(player.player_id)
+        strings.update(player.all_ships)
+        placed: int = len(player.all_ships) - len(player.ships_not_on_board)
+        size += 4 + len(player.player_name) + BOARD_BYTES
+        size += 3 * len(player.all_ships) + placed
+    return size + sum(map(_estimate_string_size, strings))
+
+
+def decode(data: bytes) -> dto.SessionStateDto:
+    """Decode session state encoded by encode.
+
+    Args:
+        data (bytes): encoded session.
+
+    Raises:
+        CodecException: raised if the data has wrong format or version.
+
+    Returns:
+        dto.SessionStateDto: session state.
+    """
+    reader: _Reader = _Reader(data)
+    if reader.take(len(MAGIC)) != MAGIC:
+        raise CodecException("Data is not encoded session")
+    version: int = reader.byte()
+    if version != VERSION:
+        raise CodecException(f"Unsupported version: {version}")
+    try:
+        for _ in range(reader.varint()):
+            if reader.byte() == TAG_UUID:
+                reader.strings.append(str(uuid.UUID(bytes=reader.take(16))))
+            else:
+                reader.strings.append(reader.text())
+        session_id: str = reader.ref()
+        active_player_id: str = reader.ref()
+        game_config: config.GameConfiguration = _read_config(reader)
+        players: dict[str, pl.Player] = {}
+        for _ in range(reader.varint()):
+            player: pl.Player = _read_player(reader)
+            players[player.player_id] = player
+    except (ValueError, IndexError) as err:
+        raise CodecException(f"Data is corrupted: {err}") from err
+    log.debug("Decoded session: %s, size: %d", session_id, len(data))
+    return dto.SessionStateDto(
+        session_id=session_id,
+        game_config=game_config,
+        players=players,
+        active_player_id=active_player_id,
+    )
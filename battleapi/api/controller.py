@@ -1,15 +1,165 @@
 """Implementation of the Game Controller functionality."""
-import logging
+import contextlib
+import dataclasses
+import functools
+import threading
+from typing import Any, Callable, Iterator, TypeVar
 
 import battleapi.abstract as abstract
+import battleapi.api.bots as bots
+import battleapi.api.broker as broker
 import battleapi.api.dto as dto
+import battleapi.api.session_cache as session_cache
 import battleapi.logic.configs as config
 import battleapi.logic.exceptions as ex
 import battleapi.logic.game as game
 import battleapi.logic.models as models
 import battleapi.logic.player as pl
+import battleapi.utils.logs as logs
+import battleapi.utils.metrics as metrics
 
-log: logging.Logger = logging.getLogger(__name__)
+log: logs.StructuredLogger = logs.get_logger(__name__)
+
+Result = TypeVar("Result")
+CellChange = tuple[str, int, int, str]
+
+DEFAULT_MAX_RETRIES: int = 5
+
+
+@dataclasses.dataclass
+class ContentionStats:
+    """Counters of the concurrent changes of the game sessions.
+
+    updates - Number of the saved changes.
+    conflicts - Number of the changes rejected because of the version conflict.
+    failures - Number of the changes that failed after all the retries.
+    """
+
+    updates: int = 0
+    conflicts: int = 0
+    failures: int = 0
+    _lock: threading.Lock = dataclasses.field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def record(self, conflicts: int, is_saved: bool) -> None:
+        """Add result of one change.
+
+        Args:
+            conflicts (int): number of the conflicts happened during the change.
+            is_saved (bool): True if the change was saved.
+        """
+        with self._lock:
+            self.conflicts += conflicts
+            if is_saved:
+                self.updates += 1
+            else:
+                self.failures += 1
+
+
+class ControllerMetrics:
+    """Metrics of the game sessions reported by the controller.
+
+    Children of the labeled metrics are kept, so the reports are cheap in the shot
+    path. Number of the active sessions is reported by the store (see
+    battleapi.db.in_memory_db_client), so expired and removed sessions are not
+    counted.
+    """
+
+    sessions_created: metrics.CounterChild
+    players_joined: metrics.CounterChild
+    bots_joined: metrics.CounterChild
+    shots: metrics.CounterChild
+    hits: metrics.CounterChild
+    games_finished: metrics.CounterChild
+    errors: metrics.Counter
+
+    def __init__(self, registry: metrics.Registry) -> None:
+        """Register the metrics.
+
+        Args:
+            registry (metrics.Registry): registry of the metrics.
+        """
+        self.sessions_created = registry.counter(
+            "battleship_sessions_created_total", "Created game sessions."
+        ).labels()
+        joined: metrics.Counter = registry.counter(
+            "battleship_players_joined_total",
+            "Players joined the game sessions by kind (player or bot).",
+            ("kind",),
+        )
+        self.players_joined = joined.labels("player")
+        self.bots_joined = joined.labels("bot")
+        self.shots = registry.counter(
+            "battleship_shots_total", "Shots fired by players and bots."
+        ).labels()
+        self.hits = registry.counter(
+            "battleship_hits_total", "Shots that hit a ship."
+        ).labels()
+        registry.gauge(
+            "battleship_hit_ratio", "Share of the shots that hit a ship."
+        ).set_function(self.get_hit_ratio)
+        self.games_finished = registry.counter(
+            "battleship_games_finished_total", "Finished games."
+        ).labels()
+        self.errors = registry.counter(
+            "battleship_errors_total",
+            "Game logic exceptions raised by the controller by type.",
+            ("type",),
+        )
+
+    def get_hit_ratio(self) -> float:
+        """Return share of the shots that hit a ship.
+
+        Returns:
+            float: ratio, 0 if there are no shots.
+        """
+        shots: float = self.shots.get()
+        return self.hits.get() / shots if shots else 0.0
+
+    def report_shots(self, shots: list[bool], is_finished: bool) -> None:
+        """Report shots of the saved change.
+
+        Args:
+            shots (list[bool]): hit flags of the shots.
+            is_finished (bool): True if the change finished the game.
+        """
+        if shots:
+            self.shots.inc(len(shots))
+            self.hits.inc(sum(shots))
+        if is_finished:
+            self.games_finished.inc()
+
+    def report_error(self, error: Exception) -> None:
+        """Count exception if it is the game logic exception.
+
+        Args:
+            error (Exception): raised exception.
+        """
+        error_type: type = type(error)
+        if error_type.__module__ == ex.__name__:
+            self.errors.labels(error_type.__name__).inc()
+
+
+def counts_errors(method: Callable[..., Result]) -> Callable[..., Result]:
+    """Decorate controller method to count game logic exceptions it raises.
+
+    Args:
+        method (Callable[..., Result]): public method of the controller.
+
+    Returns:
+        Callable[..., Result]: decorated method.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: "GameControllerApi", *args, **kwargs) -> Result:
+        try:
+            return method(self, *args, **kwargs)
+        except Exception as err:
+            self.metrics.report_error(err)
+            raise
+
+    return wrapper
 
 
 def index_board(board_dto: list[list[dto.CellDto]]) -> list[list[dto.CellDto]]:
@@ -44,7 +194,15 @@ class GameControllerApi(abstract.GameController):
     """
 
     def __init__(
-        self, persistence: abstract.GamePersistence, id_generator: abstract.IdGenerator
+        self,
+        persistence: abstract.GamePersistence,
+        id_generator: abstract.IdGenerator,
+        board_factory: game.BoardFactory | None = None,
+        cache_size: int = session_cache.DEFAULT_MAX_SIZE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        notification_broker: broker.Broker | None = None,
+        bot_registry: bots.BotRegistry | None = None,
+        metrics_registry: metrics.Registry | None = None,
     ) -> None:
         """Initialization of the Controller class.
 
@@ -53,11 +211,38 @@ class GameControllerApi(abstract.GameController):
                 store game session information.
             id_generator (abstract.IdGenerator): generator for creating identifiers for
                 players, game_sessions, etc.
+            board_factory (game.BoardFactory | None, optional): creates board (engine)
+                for the new players. Defaults to None (board.Board is used).
+            cache_size (int, optional): max number of the game sessions cached in the
+                scope (see session_scope). Defaults to session_cache.DEFAULT_MAX_SIZE.
+            max_retries (int, optional): number of the retries of the change rejected
+                because of the version conflict. Defaults to DEFAULT_MAX_RETRIES.
+            notification_broker (broker.Broker | None, optional): receives
+                notifications about the saved changes of the sessions. Defaults to
+                None (notifications are not published).
+            bot_registry (bots.BotRegistry | None, optional): keeps bots of the
+                single-player games. Defaults to None (new registry).
+            metrics_registry (metrics.Registry | None, optional): receives metrics
+                of the sessions. Defaults to None (metrics.REGISTRY).
         """
         self.persistence: abstract.GamePersistence = persistence
         self.id_generator: abstract.IdGenerator = id_generator
-        log.debug("Inited: pers: s%, gen: %s", persistence, id_generator)
+        self.board_factory: game.BoardFactory | None = board_factory
+        self.cache_size: int = cache_size
+        self.max_retries: int = max_retries
+        self.cache_stats: session_cache.CacheStats = session_cache.CacheStats()
+        self.contention_stats: ContentionStats = ContentionStats()
+        self.notification_broker: broker.Broker | None = notification_broker
+        self.bot_registry: bots.BotRegistry = (
+            bots.BotRegistry() if bot_registry is None else bot_registry
+        )
+        self.metrics: ControllerMetrics = ControllerMetrics(
+            metrics.REGISTRY if metrics_registry is None else metrics_registry
+        )
+        self._scope: threading.local = threading.local()
+        log.debug("Inited: pers: %s, gen: %s", persistence, id_generator)
 
+    @counts_errors
     def init_game_session(self) -> str:
         """Init new game session.
 
@@ -80,10 +265,12 @@ class GameControllerApi(abstract.GameController):
         if not res:
             log.error("Session is not saved")
             raise ex.SessionIsNotCreatedException("Save session returned false.")
+        self.metrics.sessions_created.inc()
         log.info("Inited session")
         log.debug("SessionId: %s", session_id)
         return session_id
 
+    @counts_errors
     def create_player_in_session(
         self, session_id: str, player_name: str
     ) -> dto.PlayerDto:
@@ -98,40 +285,279 @@ class GameControllerApi(abstract.GameController):
         Returns:
             dto.PlayerDto: player information object of the created player.
         """
-        game_session: game.Game = self._load_game_session(session_id)
         player_id: str = self.id_generator.generate_id()
-        game_session.add_player(player_id, player_name)
-        player: pl.Player = game_session.players[player_id]
-        log.debug("SessionId: %s, Player: %s", session_id, player)
-        self._save_game_session(game_session, session_id)
+
+        def add_player(game_session: game.Game) -> dto.PlayerDto:
+            game_session.add_player(player_id, player_name)
+            player: pl.Player = game_session.players[player_id]
+            log.debug("SessionId: %s, Player: %s", session_id, player)
+            return dto.from_player(player, session_id)
+
+        created: dto.PlayerDto = self._update_game_session(session_id, add_player)
+        self.metrics.players_joined.inc()
         log.info("Player is created")
-        self._save_game_session(game_session, session_id)
-        return dto.PlayerDto(
-            player_name=player.player_name,
-            player_id=player.player_id,
-            session_id=session_id,
-            is_ready=player.is_ready,
+        self._publish(
+            session_id,
+            broker.EVENT_PLAYER_JOINED,
+            player_id=player_id,
+            player_name=player_name,
         )
+        return created
 
-    def _save_game_session(self, game_session, session_id) -> None:
-        """Save game session.
+    @counts_errors
+    def create_bot_in_session(self, session_id: str) -> dto.PlayerDto:
+        """Add bot (computer) opponent to the session of the single-player game.
 
-        Utility method to create session state dto and save it.
+        Bot places its fleet randomly and becomes ready at once, so it should join
+        the session after the player.
 
         Args:
-            game_session (_type_): Game Session object.
-            session_id (_type_): Unique session id.
+            session_id (str): session id of the created session.
+
+        Raises:
+            ex.PlayerNotFoundException: raised if there is no player in the session.
+
+        Returns:
+            dto.PlayerDto: player information object of the bot.
         """
-        self.persistence.save_session(
+        bot_id: str = bots.BOT_PLAYER_ID_PREFIX + self.id_generator.generate_id()
+        changes: list[CellChange] = []
+        turn: dict[str, Any] = {}
+        shots: list[bool] = []
+        winner_ids: list[str] = []
+
+        def add_bot(game_session: game.Game) -> dto.PlayerDto:
+            changes.clear()
+            turn.clear()
+            shots.clear()
+            game_session.add_player(bot_id, bots.BOT_PLAYER_NAME)
+            game_session.randomize_fleet(bot_id)
+            game_session.make_player_ready(bot_id)
+            if game_session.is_game_ready():
+                changes[:] = self._play_bot_turns(session_id, game_session, shots)
+                turn.update(self._describe_turn(game_session))
+            winner: pl.Player | None = game_session.get_winner()
+            winner_ids[:] = [] if winner is None else [winner.player_id]
+            return dto.from_player(game_session.players[bot_id], session_id)
+
+        created: dto.PlayerDto = self._update_game_session(session_id, add_bot)
+        self.metrics.bots_joined.inc()
+        self.metrics.report_shots(shots, bool(winner_ids))
+        log.info("Bot is created")
+        self._publish(
             session_id,
-            dto.SessionStateDto(
-                session_id=session_id,
-                game_config=game_session.game_config,
-                players=game_session.players,
-                active_player_id=game_session.active_player_id,
-            ),
+            broker.EVENT_PLAYER_JOINED,
+            player_id=bot_id,
+            player_name=bots.BOT_PLAYER_NAME,
         )
-        log.debug("Game Session is Saved")
+        self._publish(session_id, broker.EVENT_PLAYER_READY, player_id=bot_id)
+        if turn:
+            self._publish_changes(session_id, changes)
+            if winner_ids:
+                self._publish(
+                    session_id, broker.EVENT_GAME_OVER, winner_id=winner_ids[0]
+                )
+            else:
+                self._publish(session_id, broker.EVENT_TURN, **turn)
+        return created
+
+    def _play_bot_turns(
+        self, session_id: str, session: game.Game, shots: list[bool] | None = None
+    ) -> list[CellChange]:
+        """Make shots of the bot while it is the active player of the ready game.
+
+        Args:
+            session_id (str): session id.
+            session (game.Game): game session.
+            shots (list[bool] | None, optional): receives hit flags of the bot
+                shots. Defaults to None.
+
+        Returns:
+            list[CellChange]: changed cells of the fields (empty if notifications
+                are not published).
+        """
+        is_published: bool = self.notification_broker is not None
+        before: dict[str, list[str]] = self._encode_fields(session, is_published)
+        while (
+            session.is_game_ready()
+            and not session.is_game_finished()
+            and bots.is_bot_player(session.active_player_id)
+        ):
+            bot_id: str = session.active_player_id
+            with self.bot_registry.acquire(
+                session_id, bot_id, session.game_config
+            ) as bot:
+                bot.observe_board(session.get_opponent_board(bot_id))
+                coordinate: models.Coordinate = bot.choose_shot()
+            log.debug("Bot %s shoots: %s", bot_id, coordinate)
+            is_hit: bool = session.make_shot(bot_id, coordinate)
+            if shots is not None:
+                shots.append(is_hit)
+        if session.is_game_finished():
+            for player_id in session.players:
+                if bots.is_bot_player(player_id):
+                    self.bot_registry.remove(session_id, player_id)
+        return self._diff_fields(before, session)
+
+    def _publish(self, session_id: str, kind: str, **data) -> None:
+        """Publish notification about the saved change of the session.
+
+        Args:
+            session_id (str): session id.
+            kind (str): type of the change (broker.EVENT_*).
+            data: details of the change.
+        """
+        if self.notification_broker is not None:
+            self.notification_broker.publish(
+                session_id, broker.Notification(kind, data)
+            )
+
+    def _get_scope_cache(self) -> session_cache.SessionCache | None:
+        """Return session cache of the scope opened by the current thread.
+
+        Returns:
+            session_cache.SessionCache | None: cache or None if scope is not opened.
+        """
+        return getattr(self._scope, "cache", None)
+
+    def begin_scope(self) -> None:
+        """Open scope (unit of work) for the current thread.
+
+        In the scope loaded game sessions are cached and reused by the reads. Changes
+        are not deferred: every change is saved at once by the atomic persistence
+        update and replaces the cached session. Nested calls are counted and only the
+        outermost end_scope closes the scope.
+        """
+        depth: int = getattr(self._scope, "depth", 0)
+        if depth == 0:
+            self._scope.cache = session_cache.SessionCache(self.cache_size)
+        self._scope.depth = depth + 1
+
+    def end_scope(self) -> None:
+        """Close scope opened by begin_scope and drop its cached game sessions.
+
+        Nothing is saved (changes are already saved). Does nothing if the scope is
+        not opened.
+        """
+        depth: int = getattr(self._scope, "depth", 0)
+        if depth == 0:
+            return
+        self._scope.depth = depth - 1
+        if depth > 1:
+            return
+        cache: session_cache.SessionCache | None = self._get_scope_cache()
+        self._scope.cache = None
+        if cache is None:
+            return
+        self.cache_stats.merge(cache.stats)
+        log.debug("Scope is closed, stats: %s", cache.stats)
+
+    @contextlib.contextmanager
+    def session_scope(self) -> Iterator["GameControllerApi"]:
+        """Context manager for the begin_scope/end_scope.
+
+        Yields:
+            Iterator[GameControllerApi]: this controller.
+        """
+        self.begin_scope()
+        try:
+            yield self
+        finally:
+            self.end_scope()
+
+    @staticmethod
+    def _to_session_state(
+        session_id: str, game_session: game.Game
+    ) -> dto.SessionStateDto:
+        """Utility method to create session state dto from the game session.
+
+        Events recorded by the game session are moved to the session state.
+
+        Args:
+            session_id (str): Unique session id.
+            game_session (game.Game): Game Session object.
+
+        Returns:
+            dto.SessionStateDto: session state.
+        """
+        return dto.SessionStateDto(
+            session_id=session_id,
+            game_config=game_session.game_config,
+            players=game_session.players,
+            active_player_id=game_session.active_player_id,
+            events=game_session.pop_events(),
+        )
+
+    def _create_game(self, session: dto.SessionStateDto) -> game.Game:
+        """Utility method to create Game object from the session state.
+
+        Args:
+            session (dto.SessionStateDto): session state.
+
+        Returns:
+            game.Game: Game Session object.
+        """
+        return game.Game(
+            id_generator=self.id_generator,
+            game_config=session.game_config,
+            players=session.players,
+            active_player_id=session.active_player_id,
+            board_factory=self.board_factory,
+        )
+
+    def _update_game_session(
+        self, session_id: str, action: Callable[[game.Game], Result]
+    ) -> Result:
+        """Apply action to the game session and save it as one atomic operation.
+
+        Session is loaded and saved by persistence update, so concurrent changes of
+        the same session are not lost. If the session was changed concurrently
+        (version conflict), action is applied again to the new state of the session.
+        In the opened scope cached game session is replaced by the changed one.
+
+        Args:
+            session_id (str): Unique session id.
+            action (Callable[[game.Game], Result]): changes the game session.
+
+        Raises:
+            ex.SessionIsNotCreatedException: Raised if session is not found.
+            ex.SessionVersionConflictException: Raised if the change is rejected more
+                than max_retries times.
+
+        Returns:
+            Result: result of the action.
+        """
+        applied: list[tuple[game.Game, Result]] = []
+
+        def apply(session: dto.SessionStateDto) -> dto.SessionStateDto:
+            game_session: game.Game = self._create_game(session)
+            applied.append((game_session, action(game_session)))
+            return self._to_session_state(session_id, game_session)
+
+        conflicts: int = 0
+        while True:
+            try:
+                updated: dto.SessionStateDto | None = self.persistence.update_session(
+                    session_id, apply
+                )
+                break
+            except ex.SessionVersionConflictException:
+                conflicts += 1
+                log.debug("Version conflict: %s, attempt: %d", session_id, conflicts)
+                if conflicts > self.max_retries:
+                    self.contention_stats.record(conflicts, is_saved=False)
+                    log.warning("Session is not updated: %s", session_id)
+                    raise
+        self.contention_stats.record(conflicts, is_saved=updated is not None)
+        if updated is None:
+            log.debug("Game Session is not found: %s", session_id)
+            raise ex.SessionIsNotCreatedException("Can't load session.")
+        game_session, result = applied[-1]
+        cache: session_cache.SessionCache | None = self._get_scope_cache()
+        if cache is not None:
+            cache.put(session_id, game_session)
+        log.debug("Game Session is updated: %s", session_id)
+        return result
 
     def _load_game_session(self, session_id: str) -> game.Game:
         """Load game session.
@@ -148,19 +574,23 @@ class GameControllerApi(abstract.GameController):
         Returns:
             game.Game: Game Session object.
         """
+        cache: session_cache.SessionCache | None = self._get_scope_cache()
+        if cache is not None:
+            cached: game.Game | None = cache.get(session_id)
+            if cached is not None:
+                log.debug("Game Session is taken from cache: %s", session_id)
+                return cached
         session: dto.SessionStateDto | None = self.persistence.load_session(session_id)
         if session is None:
             log.debug("Game Session is not found: %s", session_id)
             raise ex.SessionIsNotCreatedException("Can't load session.")
-        game_session: game.Game = game.Game(
-            id_generator=self.id_generator,
-            game_config=session.game_config,
-            players=session.players,
-            active_player_id=session.active_player_id,
-        )
+        game_session: game.Game = self._create_game(session)
+        if cache is not None:
+            cache.put(session_id, game_session)
         log.debug("Game Session is loaded: %s", game_session)
         return game_session
 
+    @counts_errors
     def get_opponent_prepare_status(
         self, session_id: str, current_player_id: str
     ) -> dto.PlayerDto | None:
@@ -189,6 +619,7 @@ class GameControllerApi(abstract.GameController):
             log.debug("Session: %s", session)
             return None
 
+    @counts_errors
     def get_prepare_ships_list(
         self, session_id: str, player_id: str
     ) -> list[dto.ShipDto]:
@@ -209,6 +640,7 @@ class GameControllerApi(abstract.GameController):
         log.debug("ships: %s", ships_dto)
         return ships_dto
 
+    @counts_errors
     def get_prepare_player_field(
         self, session_id: str, player_id: str
     ) -> list[list[dto.CellDto]]:
@@ -223,14 +655,10 @@ class GameControllerApi(abstract.GameController):
         """
         log.debug("session_id: %s, value: %s", session_id, player_id)
         game_session: game.Game = self._load_game_session(session_id)
-        board: list[list[models.Cell]] = game_session.get_player_board(player_id)
-        board_dto: list[list[dto.CellDto]] = []
-        for row in board:
-            line: list[dto.CellDto] = list(map(dto.from_model_cell, row))
-            board_dto.append(line)
-        log.debug("Field: %s", board_dto)
-        return index_board(board_dto)
+        view: pl.GameBoardView = game_session.get_player_board_view(player_id)
+        return dto.from_board_view(view)
 
+    @counts_errors
     def get_opponent(self, session_id: str, player_id: str) -> dto.PlayerDto | None:
         """Return opponent information to the current player.
 
@@ -253,9 +681,10 @@ class GameControllerApi(abstract.GameController):
                 is_ready=player.is_ready,
             )
         except ex.PlayerNotFoundException:
-            log.debug("Opponent not found for current_player: %", player_id)
+            log.debug("Opponent not found for current_player: %s", player_id)
             return None
 
+    @counts_errors
     def get_active_player(self, session_id: str) -> dto.PlayerDto | None:
         """Return player information who now should have to make a move.
 
@@ -285,6 +714,7 @@ class GameControllerApi(abstract.GameController):
             log.debug("Player not found in the session")
             return None
 
+    @counts_errors
     def get_player_by_id(self, session_id: str, player_id: str) -> dto.PlayerDto | None:
         """Return player for session by its id.
 
@@ -310,6 +740,7 @@ class GameControllerApi(abstract.GameController):
             log.debug("Player not found in the session")
             return None
 
+    @counts_errors
     def get_number_of_cells_left(self, session_id: str, player_id: str) -> int:
         """Return number of available (not touched) cells to the player.
 
@@ -330,6 +761,7 @@ class GameControllerApi(abstract.GameController):
         log.debug("Game is not ready. 0 cells left")
         return 0
 
+    @counts_errors
     def get_field(
         self, session_id: str, player_id: str, is_for_opponent: bool = False
     ) -> list[list[dto.CellDto]]:
@@ -346,21 +778,34 @@ class GameControllerApi(abstract.GameController):
         """
         log.debug("session_id: %s, value: %s", session_id, player_id)
         session: game.Game = self._load_game_session(session_id)
+        view: pl.GameBoardView = session.get_player_board_view(
+            player_id, is_hidden=is_for_opponent
+        )
+        return dto.from_board_view(view)
 
-        board: list[list[models.Cell]]
-        if is_for_opponent:
-            log.debug("Loading board for opponent")
-            board = session.get_player_board(player_id, is_hidden=True)
-        else:
-            log.debug("Loading board for current player")
-            board = session.get_player_board(player_id)
-        board_dto: list[list[dto.CellDto]] = []
-        for row in board:
-            line: list[dto.CellDto] = list(map(dto.from_model_cell, row))
-            board_dto.append(line)
-        log.debug("Board: %s", board_dto)
-        return index_board(board_dto)
+    @counts_errors
+    def get_field_rows(
+        self, session_id: str, player_id: str, is_for_opponent: bool = False
+    ) -> list[str]:
+        """Return compact row encoded field representation for player.
+
+        Args:
+            session_id (str): id of the current game session.
+            player_id (str): player id whose field should be returned.
+            is_for_opponent (bool, optional): Flag to let game know if the ships should
+                be showed or not. True means ships should be hidden. Defaults to False.
+
+        Returns:
+            list[str]: one string per row, see dto.encode_board_rows.
+        """
+        log.debug("session_id: %s, value: %s", session_id, player_id)
+        session: game.Game = self._load_game_session(session_id)
+        view: pl.GameBoardView = session.get_player_board_view(
+            player_id, is_hidden=is_for_opponent
+        )
+        return dto.encode_board_rows(view)
 
+    @counts_errors
     def get_winner(self, session_id: str) -> dto.PlayerDto | None:
         """Return winner of the game.
 
@@ -383,6 +828,159 @@ class GameControllerApi(abstract.GameController):
             session_id=session_id,
         )
 
+    @counts_errors
+    def get_gameplay_snapshot(
+        self, session_id: str, player_id: str
+    ) -> dto.GameplaySnapshotDto:
+        """Return everything required to show gameplay page by one session load.
+
+        Args:
+            session_id (str): id of the current game session.
+            player_id (str): id of the player who requested information.
+
+        Returns:
+            dto.GameplaySnapshotDto: players, fields and counters of the game.
+        """
+        log.debug("session_id: %s, value: %s", session_id, player_id)
+        session: game.Game = self._load_game_session(session_id)
+        player: pl.Player = self._get_player(session, player_id)
+        opponent: pl.Player | None = self._find_opponent(session, player_id)
+        active_player: pl.Player | None = session.players.get(session.active_player_id)
+        winner: pl.Player | None = session.get_winner()
+        opponent_field: list[list[dto.CellDto]] = []
+        if opponent is not None:
+            opponent_field = dto.from_board_view(
+                opponent.board.get_view(is_hidden=True)
+            )
+        return dto.GameplaySnapshotDto(
+            player=dto.from_player(player, session_id),
+            opponent=self._to_player_dto(opponent, session_id),
+            active_player=self._to_player_dto(active_player, session_id),
+            number_of_cells_self=self._count_cells_left(session, player),
+            number_of_cells_opponent=self._count_cells_left(session, opponent),
+            player_field=dto.from_board_view(player.board.get_view()),
+            opponent_field=opponent_field,
+            winner=self._to_player_dto(winner, session_id),
+        )
+
+    @counts_errors
+    def get_prepare_snapshot(
+        self, session_id: str, player_id: str
+    ) -> dto.PrepareSnapshotDto:
+        """Return everything required to show preparation page by one session load.
+
+        Args:
+            session_id (str): id of the current game session.
+            player_id (str): id of the player who requested information.
+
+        Returns:
+            dto.PrepareSnapshotDto: players, available ships and field.
+        """
+        log.debug("session_id: %s, value: %s", session_id, player_id)
+        session: game.Game = self._load_game_session(session_id)
+        player: pl.Player = self._get_player(session, player_id)
+        opponent: pl.Player | None = self._find_opponent(session, player_id)
+        ships: list[dto.ShipDto] = list(
+            map(dto.from_model_ship, session.get_available_ships(player_id))
+        )
+        ships.sort(key=lambda ship: ship.ship_size)
+        field: list[list[dto.CellDto]] = dto.from_board_view(player.board.get_view())
+        return dto.PrepareSnapshotDto(
+            player=dto.from_player(player, session_id),
+            opponent=self._to_player_dto(opponent, session_id),
+            ships=ships,
+            field=dto.mark_not_available_cells(field),
+        )
+
+    @counts_errors
+    def get_wait_snapshot(self, session_id: str, player_id: str) -> dto.WaitSnapshotDto:
+        """Return everything required to show wait page by one session load.
+
+        Args:
+            session_id (str): id of the current game session.
+            player_id (str): id of the player who requested information.
+
+        Returns:
+            dto.WaitSnapshotDto: player and opponent.
+        """
+        log.debug("session_id: %s, value: %s", session_id, player_id)
+        session: game.Game = self._load_game_session(session_id)
+        player: pl.Player = self._get_player(session, player_id)
+        opponent: pl.Player | None = self._find_opponent(session, player_id)
+        return dto.WaitSnapshotDto(
+            player=dto.from_player(player, session_id),
+            opponent=self._to_player_dto(opponent, session_id),
+        )
+
+    @staticmethod
+    def _get_player(session: game.Game, player_id: str) -> pl.Player:
+        """Return player of the session.
+
+        Args:
+            session (game.Game): game session.
+            player_id (str): player id.
+
+        Raises:
+            ex.PlayerNotFoundException: raised if the player is not in the session.
+
+        Returns:
+            pl.Player: player.
+        """
+        try:
+            return session.players[player_id]
+        except KeyError as err:
+            raise ex.PlayerNotFoundException(f"Player {player_id} not found") from err
+
+    @staticmethod
+    def _find_opponent(session: game.Game, player_id: str) -> pl.Player | None:
+        """Return opponent of the player or None if opponent is not joined yet.
+
+        Args:
+            session (game.Game): game session.
+            player_id (str): player id.
+
+        Returns:
+            pl.Player | None: opponent.
+        """
+        try:
+            return session.get_opponent(player_id)
+        except ex.PlayerNotFoundException:
+            log.debug("Opponent not found for current_player: %s", player_id)
+            return None
+
+    @staticmethod
+    def _to_player_dto(
+        player: pl.Player | None, session_id: str
+    ) -> dto.PlayerDto | None:
+        """Map player to dto if it exists.
+
+        Args:
+            player (pl.Player | None): player or None.
+            session_id (str): session id.
+
+        Returns:
+            dto.PlayerDto | None: player information or None.
+        """
+        if player is None:
+            return None
+        return dto.from_player(player, session_id)
+
+    @staticmethod
+    def _count_cells_left(session: game.Game, player: pl.Player | None) -> int:
+        """Return number of not shot cells of the player field.
+
+        Args:
+            session (game.Game): game session.
+            player (pl.Player | None): player or None.
+
+        Returns:
+            int: number of cells, 0 if the game is not ready or player is None.
+        """
+        if player is None or not session.is_game_ready():
+            return 0
+        return player.board.get_amount_of_not_shot_cells()
+
+    @counts_errors
     def add_ship_to_field(
         self,
         session_id: str,
@@ -399,6 +997,13 @@ class GameControllerApi(abstract.GameController):
             ship_id (str): ship type.
             coordinate (models.Coordinate): coordinate of the cell.
             ship_direction (str): direction of the ship.
+
+        Raises:
+            ex.IncorrectStringException: raised if the direction is not a name of
+                models.Direction.
+            ex.ShipNotFoundException: raised if the player has no ship with the id.
+            ex.ShipAlreadyOnTheBoardException: raised if the ship is already on the
+                board.
         """
         log.debug("session_id: %s, value: %s", session_id, player_id)
         log.debug(
@@ -407,13 +1012,27 @@ class GameControllerApi(abstract.GameController):
             coordinate,
             ship_direction,
         )
-        session: game.Game = self._load_game_session(session_id)
-        ships: dict[str, models.Ship] = session.players[player_id].ships_not_on_board
-        ship: models.Ship = ships[ship_id]
-        ship.direction = models.Direction[ship_direction]
-        session.add_ship(player_id, coordinate, ship)
-        self._save_game_session(session, session_id)
 
+        if ship_direction not in models.Direction.__members__:
+            raise ex.IncorrectStringException(
+                f"Ship direction {ship_direction} is not supported"
+            )
+
+        def add_ship(session: game.Game) -> None:
+            player: pl.Player = self._get_player(session, player_id)
+            if ship_id not in player.all_ships:
+                raise ex.ShipNotFoundException(f"Ship {ship_id} is not found")
+            ship: models.Ship | None = player.ships_not_on_board.get(ship_id)
+            if ship is None:
+                raise ex.ShipAlreadyOnTheBoardException(
+                    f"{ship_id} is already on the board"
+                )
+            ship.direction = models.Direction[ship_direction]
+            session.add_ship(player_id, coordinate, ship)
+
+        self._update_game_session(session_id, add_ship)
+
+    @counts_errors
     def remove_ship_from_field(
         self, session_id: str, player_id: str, coordinate: models.Coordinate
     ) -> None:
@@ -430,36 +1049,195 @@ class GameControllerApi(abstract.GameController):
             player_id,
             coordinate,
         )
-        session: game.Game = self._load_game_session(session_id)
-        removed = session.remove_ship(player_id, coordinate)
-        log.debug("Ships is removed: %s", removed)
-        self._save_game_session(session, session_id)
 
+        def remove_ship(session: game.Game) -> None:
+            removed = session.remove_ship(player_id, coordinate)
+            log.debug("Ships is removed: %s", removed)
+
+        self._update_game_session(session_id, remove_ship)
+
+    @counts_errors
+    def randomize_fleet(self, session_id: str, player_id: str) -> None:
+        """Put all ships of the player on the random positions in preparation stage.
+
+        Args:
+            session_id (str): current game session id.
+            player_id (str): player id whose ships are placed.
+
+        Raises:
+            ex.PlayerIsReadyException: raised if the player is already ready.
+        """
+        log.debug("session_id: %s, value: %s", session_id, player_id)
+
+        def randomize(session: game.Game) -> None:
+            session.randomize_fleet(player_id)
+
+        self._update_game_session(session_id, randomize)
+
+    @counts_errors
     def start_game(self, session_id: str, player_id: str) -> None:
         """Start game.
 
         Change state of the player to ready to flag the game that next stage can be
-        switched to gameplay stage.
+        switched to gameplay stage. If the first turn is given to the bot, its shots
+        are made in the same change. Notifications are published after the change is
+        saved.
 
         Args:
             session_id (str): current game session id.
             player_id (str): current player id.
         """
         log.debug("session_id: %s, value: %s", session_id, player_id)
-        session: game.Game = self._load_game_session(session_id)
-        readiness = session.make_player_ready(player_id)
-        log.debug("Player is ready: %s", readiness)
-        self._save_game_session(session, session_id)
+        changes: list[CellChange] = []
+        turn: dict[str, Any] = {}
+        shots: list[bool] = []
+        winner_ids: list[str] = []
+
+        def make_player_ready(session: game.Game) -> None:
+            changes.clear()
+            turn.clear()
+            shots.clear()
+            readiness = session.make_player_ready(player_id)
+            log.debug("Player is ready: %s", readiness)
+            if session.is_game_ready():
+                changes[:] = self._play_bot_turns(session_id, session, shots)
+                turn.update(self._describe_turn(session))
+            winner: pl.Player | None = session.get_winner()
+            winner_ids[:] = [] if winner is None else [winner.player_id]
+
+        self._update_game_session(session_id, make_player_ready)
+        self.metrics.report_shots(shots, bool(winner_ids))
+        self._publish(session_id, broker.EVENT_PLAYER_READY, player_id=player_id)
+        if turn:
+            self._publish_changes(session_id, changes)
+            if winner_ids:
+                self._publish(
+                    session_id, broker.EVENT_GAME_OVER, winner_id=winner_ids[0]
+                )
+            else:
+                self._publish(session_id, broker.EVENT_TURN, **turn)
+
+    @staticmethod
+    def _describe_turn(session: game.Game) -> dict[str, Any]:
+        """Utility method to create details of the turn notification.
+
+        Args:
+            session (game.Game): game session.
+
+        Returns:
+            dict[str, Any]: active player and number of not shot cells of the players.
+        """
+        active: pl.Player = session.players[session.active_player_id]
+        return {
+            "active_player_id": active.player_id,
+            "active_player_name": active.player_name,
+            "cells_left": {
+                player.player_id: player.board.get_amount_of_not_shot_cells()
+                for player in session.players.values()
+            },
+        }
+
+    @staticmethod
+    def _diff_rows(before: list[str], after: list[str]) -> list[tuple[int, int, str]]:
+        """Utility method to find changed cells of the encoded field.
+
+        Args:
+            before (list[str]): rows of the field before the change.
+            after (list[str]): rows of the field after the change.
 
+        Returns:
+            list[tuple[int, int, str]]: row, column and new value of changed cells.
+        """
+        return [
+            (row, col, cell)
+            for row, (old, new) in enumerate(zip(before, after))
+            if old != new
+            for col, cell in enumerate(new)
+            if old[col] != cell
+        ]
+
+    @staticmethod
+    def _encode_fields(
+        session: game.Game, is_published: bool = True
+    ) -> dict[str, list[str]]:
+        """Utility method to encode fields of all players (see dto.encode_board_rows).
+
+        Args:
+            session (game.Game): game session.
+            is_published (bool, optional): False if the fields are not required
+                (notifications are not published). Defaults to True.
+
+        Returns:
+            dict[str, list[str]]: rows of the fields by player id.
+        """
+        if not is_published:
+            return {}
+        return {
+            player.player_id: dto.encode_board_rows(player.board.get_view())
+            for player in session.players.values()
+        }
+
+    def _diff_fields(
+        self, before: dict[str, list[str]], session: game.Game
+    ) -> list[CellChange]:
+        """Utility method to find changed cells of the fields encoded before change.
+
+        Args:
+            before (dict[str, list[str]]): result of the _encode_fields.
+            session (game.Game): changed game session.
+
+        Returns:
+            list[CellChange]: field owner, row, column and new value of the cells.
+        """
+        after: dict[str, list[str]] = self._encode_fields(session, bool(before))
+        return [
+            (player_id, row, col, cell)
+            for player_id, rows in before.items()
+            for row, col, cell in self._diff_rows(rows, after[player_id])
+        ]
+
+    def _publish_changes(self, session_id: str, changes: list[CellChange]) -> None:
+        """Publish notifications about the changed cells of the fields.
+
+        Args:
+            session_id (str): session id.
+            changes (list[CellChange]): result of the _diff_fields.
+        """
+        for player_id, row, col, cell in changes:
+            self._publish(
+                session_id,
+                broker.EVENT_CELL,
+                player_id=player_id,
+                row=row,
+                col=col,
+                cell=cell,
+            )
+
+    @counts_errors
     def make_shot(
-        self, session_id: str, player_id: str, coordinate: models.Coordinate
+        self,
+        session_id: str,
+        player_id: str,
+        coordinate: models.Coordinate,
+        check_turn: bool = False,
     ) -> dto.ShotResultDto:
         """Make a shot by the opponent field.
 
+        If the turn is given to the bot, its shots are made in the same change.
+        Notifications about the changed cells and the next turn (or the end of the
+        game) are published after the change is saved.
+
         Args:
             session_id (str): current game session id.
             player_id (str): player who makes a shot.
             coordinate (models.Coordinate): coordinate of the cell in opponent field.
+            check_turn (bool, optional): True if the shot is rejected when it is not
+                the turn of the player, the turn is checked in the same atomic change
+                as the shot. Defaults to False.
+
+        Raises:
+            ex.NotPlayerTurnException: raised if check_turn is True and the game is not
+                on the gameplay stage or it is the turn of the opponent.
 
         Returns:
             dto.ShotResultDto: Result of the made shot.
@@ -470,16 +1248,48 @@ class GameControllerApi(abstract.GameController):
             player_id,
             coordinate,
         )
-        session: game.Game = self._load_game_session(session_id)
-        is_hit = session.make_shot(player_id, coordinate)
-        is_finished: bool = session.is_game_finished()
-        log.debug(
-            "Is_hit: %s, is_finished: %s, next_pl: %s",
-            is_hit,
-            is_finished,
-            session.active_player_id,
-        )
-        self._save_game_session(session, session_id)
-        return dto.ShotResultDto(
-            is_finished=is_finished, next_player=session.active_player_id
-        )
+        is_published: bool = self.notification_broker is not None
+        changes: list[CellChange] = []
+        turn: dict[str, Any] = {}
+        winner_ids: list[str] = []
+        shots: list[bool] = []
+        finished_now: list[bool] = []
+
+        def shoot(session: game.Game) -> dto.ShotResultDto:
+            if check_turn and (
+                not session.is_game_ready()
+                or session.is_game_finished()
+                or session.active_player_id != player_id
+            ):
+                raise ex.NotPlayerTurnException("It is not the turn of the player")
+            before: dict[str, list[str]] = self._encode_fields(session, is_published)
+            was_finished: bool = session.is_game_finished()
+            is_hit: bool = session.make_shot(player_id, coordinate)
+            log.debug("Is_hit: %s, next_pl: %s", is_hit, session.active_player_id)
+            shots[:] = [is_hit]
+            self._play_bot_turns(session_id, session, shots)
+            is_finished: bool = session.is_game_finished()
+            finished_now[:] = [is_finished and not was_finished]
+            log.debug("Is_finished: %s", is_finished)
+            if is_published:
+                changes[:] = self._diff_fields(before, session)
+                turn.clear()
+                turn.update(self._describe_turn(session))
+                winner: pl.Player | None = session.get_winner() if is_finished else None
+                winner_ids[:] = [] if winner is None else [winner.player_id]
+            return dto.ShotResultDto(
+                is_finished=is_finished,
+                next_player=session.active_player_id,
+                is_hit=is_hit,
+            )
+
+        result: dto.ShotResultDto = self._update_game_session(session_id, shoot)
+        self.metrics.report_shots(shots, finished_now[0])
+        if not is_published:
+            return result
+        self._publish_changes(session_id, changes)
+        if result.is_finished:
+            self._publish(session_id, broker.EVENT_GAME_OVER, winner_id=winner_ids[0])
+        else:
+            self._publish(session_id, broker.EVENT_TURN, **turn)
+        return result
@@ -2,12 +2,19 @@
 import dataclasses
 
 import battleapi.logic.configs as config
+import battleapi.logic.events as game_events
 import battleapi.logic.models as model
 import battleapi.logic.player as player
+import battleapi.logic.utils as utils
 
 Coordinate = tuple[int, int]
 ShipId = str
 
+CELL_EMPTY: str = "."
+CELL_SHIP: str = "s"
+CELL_HIT: str = "x"
+CELL_MISS: str = "o"
+
 
 @dataclasses.dataclass
 class CellDto:
@@ -61,20 +68,89 @@ class PlayerDto:
 
 @dataclasses.dataclass
 class ShotResultDto:
-    """Representation of the shot results."""
+    """Representation of the shot results.
+
+    is_finished - True if the game is finished.
+    next_player - player who makes the next shot.
+    is_hit - True if the shot of the player hit a ship (bot shots made after it are
+        not counted).
+    """
 
     is_finished: bool
     next_player: str
+    is_hit: bool
+
+
+@dataclasses.dataclass
+class GameplaySnapshotDto:
+    """Representation of everything required to show gameplay page.
+
+    player - current player.
+    opponent - opponent of the current player (None if not joined yet).
+    active_player - player who makes a move now (None if the game is not started).
+    number_of_cells_self - number of not shot cells of the current player field.
+    number_of_cells_opponent - number of not shot cells of the opponent field.
+    player_field - field of the current player.
+    opponent_field - field of the opponent with hidden ships.
+    winner - winner of the game or None if the game is not finished.
+    """
+
+    player: PlayerDto
+    opponent: PlayerDto | None
+    active_player: PlayerDto | None
+    number_of_cells_self: int
+    number_of_cells_opponent: int
+    player_field: list[list[CellDto]]
+    opponent_field: list[list[CellDto]]
+    winner: PlayerDto | None = None
+
+
+@dataclasses.dataclass
+class PrepareSnapshotDto:
+    """Representation of everything required to show preparation page.
+
+    player - current player.
+    opponent - opponent of the current player (None if not joined yet).
+    ships - ships that are not on the field yet, sorted by size.
+    field - field of the current player with not available cells marked.
+    """
+
+    player: PlayerDto
+    opponent: PlayerDto | None
+    ships: list[ShipDto]
+    field: list[list[CellDto]]
+
+
+@dataclasses.dataclass
+class WaitSnapshotDto:
+    """Representation of everything required to show wait page.
+
+    player - current player.
+    opponent - opponent of the current player (None if not joined yet).
+    """
+
+    player: PlayerDto
+    opponent: PlayerDto | None
 
 
 @dataclasses.dataclass
 class SessionStateDto:
-    """Representation of the current game session."""
+    """Representation of the current game session.
+
+    version - number of the stored changes of the session, it is increased by the DB
+    client on every save (0 - session is not stored yet).
+    events - changes made since the session was loaded (not stored as the state, used
+    by the event-sourced persistence).
+    """
 
     session_id: str
     game_config: config.GameConfiguration
     players: dict[str, player.Player]
     active_player_id: str = ""
+    version: int = 0
+    events: list[game_events.GameEvent] = dataclasses.field(
+        default_factory=list, repr=False, compare=False
+    )
 
 
 def from_model_cell(cell: model.Cell) -> CellDto:
@@ -101,3 +177,115 @@ def from_model_ship(ship: model.Ship) -> ShipDto:
     return ShipDto(
         ship_id=ship.ship_id, ship_size=ship.ship_size, direction=ship.direction.name
     )
+
+
+def from_player(game_player: player.Player, session_id: str) -> PlayerDto:
+    """Utility to map player.Player object to PlayerDto object.
+
+    Args:
+        game_player (player.Player): original player object.
+        session_id (str): session id of the player.
+
+    Returns:
+        PlayerDto: mapped PlayerDto.
+    """
+    return PlayerDto(
+        player_name=game_player.player_name,
+        player_id=game_player.player_id,
+        session_id=session_id,
+        is_ready=game_player.is_ready,
+    )
+
+
+def from_board_view(view: player.GameBoardView) -> list[list[CellDto]]:
+    """Utility to build indexed field of CellDto objects from the board view.
+
+    Cells are created in one pass with row and column already set.
+
+    Args:
+        view (player.GameBoardView): read-only view of the board.
+
+    Returns:
+        list[list[CellDto]]: field representation.
+    """
+    board_dto: list[list[CellDto]] = []
+    for row in range(utils.SIZE_VERTICAL):
+        line: list[CellDto] = []
+        for col in range(utils.SIZE_HORIZONTAL):
+            line.append(
+                CellDto(
+                    ship_id=view.ship_id(row, col),
+                    has_ship=view.has_ship(row, col),
+                    has_shot=view.has_shot(row, col),
+                    row=row,
+                    col=col,
+                )
+            )
+        board_dto.append(line)
+    return board_dto
+
+
+def encode_board_rows(view: player.GameBoardView) -> list[str]:
+    """Utility to encode board view into the compact list of rows.
+
+    Every cell is represented by one character:
+    CELL_EMPTY - no ship and no shot, CELL_SHIP - ship without shot,
+    CELL_HIT - ship with shot, CELL_MISS - shot without ship.
+
+    Args:
+        view (player.GameBoardView): read-only view of the board.
+
+    Returns:
+        list[str]: one string per row of the field.
+    """
+    rows: list[str] = []
+    for row in range(utils.SIZE_VERTICAL):
+        chars: list[str] = []
+        for col in range(utils.SIZE_HORIZONTAL):
+            if view.has_ship(row, col):
+                chars.append(CELL_HIT if view.has_shot(row, col) else CELL_SHIP)
+            else:
+                chars.append(CELL_MISS if view.has_shot(row, col) else CELL_EMPTY)
+        rows.append("".join(chars))
+    return rows
+
+
+def encode_cell_rows(board_dto: list[list[CellDto]]) -> list[str]:
+    """Utility to encode field of CellDto objects into the compact list of rows.
+
+    Args:
+        board_dto (list[list[CellDto]]): field representation.
+
+    Returns:
+        list[str]: one string per row of the field, see encode_board_rows.
+    """
+    rows: list[str] = []
+    for line in board_dto:
+        chars: list[str] = []
+        for cell in line:
+            if cell.has_ship:
+                chars.append(CELL_HIT if cell.has_shot else CELL_SHIP)
+            else:
+                chars.append(CELL_MISS if cell.has_shot else CELL_EMPTY)
+        rows.append("".join(chars))
+    return rows
+
+
+def mark_not_available_cells(board_dto: list[list[CellDto]]) -> list[list[CellDto]]:
+    """Utility to mark cells around the ships as not available for new ships.
+
+    Args:
+        board_dto (list[list[CellDto]]): field representation.
+
+    Returns:
+        list[list[CellDto]]: the same field with is_not_available flags set.
+    """
+    for line in board_dto:
+        for cell in line:
+            if not cell.has_ship:
+                continue
+            for row, col in utils.get_neighbour_coordinates((cell.row, cell.col)):
+                neighbour_cell: CellDto = board_dto[row][col]
+                if not neighbour_cell.has_ship:
+                    neighbour_cell.is_not_available = True
+    return board_dto
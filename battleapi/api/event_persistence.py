@@ -0,0 +1,309 @@
+"""Implementation of the event-sourced Game Persistence.
+
+Changes of the session are stored as the events (see battleapi.logic.events) appended
+to the session log instead of rewriting the whole session state. Every
+snapshot_interval events the state is stored as a snapshot, so loading of the session
+is the latest snapshot plus replay of the events after it. Full log is kept, so any
+previous state of the session can be restored (game replay). Only the first snapshot
+(base of the replay) and the latest one are kept: older snapshots are pruned when
+the new one is stored, so a long game doesn't keep all its states.
+"""
+import threading
+
+import battleapi.abstract as abstract
+import battleapi.api.dto as dto
+import battleapi.logic.events as events
+import battleapi.logic.exceptions as ex
+import battleapi.logic.game as game
+import battleapi.utils.id_generator as id_generator
+import battleapi.utils.logs as logs
+
+log: logs.StructuredLogger = logs.get_logger(__name__)
+
+DEFAULT_SNAPSHOT_INTERVAL: int = 32
+
+
+class EventSourcedGamePersistence(abstract.GamePersistence):
+    """Implementation for the Persistence API that keeps events of the sessions.
+
+    Args:
+        abstract.GamePersistence (_type_): Inherits interface.
+    """
+
+    def __init__(
+        self,
+        event_store: abstract.EventStore,
+        snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL,
+        board_factory: game.BoardFactory | None = None,
+    ) -> None:
+        """Initialize Persistence.
+
+        Args:
+            event_store (abstract.EventStore): store of the events and snapshots.
+            snapshot_interval (int, optional): number of the events between the
+                snapshots. Defaults to DEFAULT_SNAPSHOT_INTERVAL.
+            board_factory (game.BoardFactory | None, optional): creates boards of the
+                players on replay, should be the same as in the controller. Defaults
+                to None (board.Board is used).
+
+        Raises:
+            ValueError: raised if snapshot_interval is less than 1.
+        """
+        if snapshot_interval < 1:
+            raise ValueError(
+                f"Snapshot interval should be positive, got: {snapshot_interval}"
+            )
+        self.event_store: abstract.EventStore = event_store
+        self.snapshot_interval: int = snapshot_interval
+        self.board_factory: game.BoardFactory | None = board_factory
+        self._id_generator: abstract.IdGenerator = id_generator.Uuid4IdGenerator()
+        self._write_count: int = 0
+        self._write_count_lock: threading.Lock = threading.Lock()
+        log.debug("Inited: %s", event_store)
+
+    @property
+    def write_count(self) -> int:
+        """Number of the writes (appends and snapshots) passed to the event store.
+
+        Returns:
+            int: number of writes.
+        """
+        return self._write_count
+
+    def _count_write(self) -> None:
+        """Increase number of the writes."""
+        with self._write_count_lock:
+            self._write_count += 1
+
+    def _replay(
+        self, session: dto.SessionStateDto, session_events: list[events.GameEvent]
+    ) -> dto.SessionStateDto:
+        """Apply events to the session state.
+
+        Args:
+            session (dto.SessionStateDto): state of the session (snapshot).
+            session_events (list[events.GameEvent]): events made after the state.
+
+        Returns:
+            dto.SessionStateDto: state of the session after the events.
+        """
+        if not session_events:
+            return session
+        game_session = game.Game(
+            id_generator=self._id_generator,
+            game_config=session.game_config,
+            players=session.players,
+            active_player_id=session.active_player_id,
+            board_factory=self.board_factory,
+        )
+        for event in session_events:
+            game_session.apply_event(event)
+        game_session.pop_events()
+        return dto.SessionStateDto(
+            session_id=session.session_id,
+            game_config=game_session.game_config,
+            players=game_session.players,
+            active_player_id=game_session.active_player_id,
+            version=session.version + len(session_events),
+        )
+
+    def _load(self, session_id: str, version: int | None = None) -> dto.SessionStateDto:
+        """Restore state of the session from the latest snapshot and events.
+
+        Args:
+            session_id (str): identifier of the session. Primary Key.
+            version (int | None, optional): version of the state. Defaults to None
+                (current state).
+
+        Raises:
+            KeyError: raised if the session or the version is not found.
+
+        Returns:
+            dto.SessionStateDto: state of the session.
+        """
+        snapshot: dto.SessionStateDto = self.event_store.load_snapshot(
+            session_id, version
+        )
+        tail: list[events.GameEvent] = self.event_store.load_events(
+            session_id, snapshot.version, version
+        )
+        if version is not None and snapshot.version + len(tail) != version:
+            raise KeyError(version)
+        log.debug(
+            "Loaded: %s, snapshot: %d, tail: %d",
+            session_id,
+            snapshot.version,
+            len(tail),
+        )
+        return self._replay(snapshot, tail)
+
+    def save_session(
+        self,
+        session_id: str,
+        session_state: dto.SessionStateDto,
+        expected_version: int | None = None,
+    ) -> bool:
+        """Append events of the session state and store it as the snapshot.
+
+        Args:
+            session_id (str): identifier of the session to be saved. Primary Key.
+            session_state (dto.SessionState): current game session state.
+            expected_version (int | None, optional): version of the session required
+                for the save. Defaults to None (no check).
+
+        Raises:
+            ex.SessionVersionConflictException: raised if the version of the session
+                is not the expected one.
+
+        Returns:
+            bool: result of the save method.
+        """
+        try:
+            log.debug("Save session: %s, state: %s", session_id, session_state)
+            session_state.version = self.event_store.append(
+                session_id, session_state.events, expected_version
+            )
+            session_state.events = []
+            self.event_store.save_snapshot(session_id, session_state)
+        except ex.SessionVersionConflictException:
+            log.debug("Save session: %s, version conflict", session_id)
+            raise
+        except Exception:
+            log.debug("Save session: %s, Failed", session_id)
+            return False
+        self._count_write()
+        return True
+
+    def load_session(self, session_id: str) -> dto.SessionStateDto | None:
+        """Load game session from the latest snapshot and events.
+
+        Args:
+            session_id (str): identifier of the session. Primary Key.
+
+        Returns:
+            dto.SessionState: current game session state.
+        """
+        try:
+            log.debug("Load session: %s", session_id)
+            return self._load(session_id)
+        except Exception:
+            log.debug("load session: %s, Failed", session_id)
+            return None
+
+    def load_session_at(
+        self, session_id: str, version: int
+    ) -> dto.SessionStateDto | None:
+        """Load game session state after the first version events (replay).
+
+        Args:
+            session_id (str): identifier of the session. Primary Key.
+            version (int): number of the applied events.
+
+        Returns:
+            dto.SessionStateDto | None: state of the session or None if the session
+                or version is not found.
+        """
+        try:
+            return self._load(session_id, version)
+        except Exception:
+            log.debug("load session: %s, version: %d, Failed", session_id, version)
+            return None
+
+    def load_events(self, session_id: str) -> list[events.GameEvent] | None:
+        """Load all the events of the game session.
+
+        Args:
+            session_id (str): identifier of the session. Primary Key.
+
+        Returns:
+            list[events.GameEvent] | None: events or None if session is not found.
+        """
+        try:
+            return self.event_store.load_events(session_id)
+        except KeyError:
+            return None
+
+    def remove_session(self, session_id: str) -> bool:
+        """Remove events and snapshots of the game session.
+
+        Args:
+            session_id (str): identifier of the session. Primary Key.
+
+        Returns:
+            bool: result of deletion. False if error or absence of the session.
+        """
+        try:
+            log.debug("Delete session: %s", session_id)
+            return self.event_store.remove(session_id)
+        except Exception:
+            log.debug("Delete session: %s, Failed", session_id)
+            return False
+
+    def update_session(
+        self, session_id: str, update_fn: abstract.SessionUpdate
+    ) -> dto.SessionStateDto | None:
+        """Change game session and append events of the change.
+
+        Only the changes recorded as events (SessionStateDto.events) are stored. The
+        events are appended only if no other events were added after the load.
+
+        Args:
+            session_id (str): identifier of the session to be changed. Primary Key.
+            update_fn (abstract.SessionUpdate): function that receives current session
+                and returns changed session. Its exceptions are passed to the caller.
+
+        Raises:
+            ex.SessionVersionConflictException: raised if the session was changed
+                concurrently and the change was not saved.
+
+        Returns:
+            dto.SessionStateDto | None: changed session or None if the session is not
+                found or error happened in the store.
+        """
+        try:
+            log.debug("Update session: %s", session_id)
+            loaded: dto.SessionStateDto = self._load(session_id)
+        except Exception:
+            log.debug("Update session: %s, Failed", session_id)
+            return None
+        loaded_version: int = loaded.version
+        updated: dto.SessionStateDto = update_fn(loaded)
+        new_events: list[events.GameEvent] = updated.events
+        updated.events = []
+        updated.version = loaded_version
+        if not new_events:
+            return updated
+        try:
+            updated.version = self.event_store.append(
+                session_id, new_events, loaded_version
+            )
+        except ex.SessionVersionConflictException:
+            log.debug("Update session: %s, version conflict", session_id)
+            raise
+        except Exception:
+            log.debug("Update session: %s, Failed", session_id)
+            return None
+        self._count_write()
+        if (
+            updated.version // self.snapshot_interval
+            > loaded_version // self.snapshot_interval
+        ):
+            self._save_snapshot(session_id, updated)
+        return updated
+
+    def _save_snapshot(self, session_id: str, session: dto.SessionStateDto) -> None:
+        """Store the snapshot and remove the older ones except the first one.
+
+        Failure is not critical (events are already stored).
+
+        Args:
+            session_id (str): identifier of the session. Primary Key.
+            session (dto.SessionStateDto): state of the session.
+        """
+        try:
+            self.event_store.save_snapshot(session_id, session)
+            self.event_store.prune_snapshots(session_id, session.version)
+        except Exception as err:
+            log.warning("Snapshot is not saved: %s, %s", session_id, err)
+            return
+        self._count_write()
@@ -1,10 +1,14 @@
 """Implementation of the Game Persistence functionality."""
-import logging
+import threading
+import time
 
 import battleapi.abstract as abstract
 import battleapi.api.dto as dto
+import battleapi.logic.exceptions as ex
+import battleapi.utils.logs as logs
+import battleapi.utils.metrics as metrics
 
-log: logging.Logger = logging.getLogger(__name__)
+log: logs.StructuredLogger = logs.get_logger(__name__)
 
 
 class GamePersistenceApi(abstract.GamePersistence):
@@ -14,27 +18,82 @@ class GamePersistenceApi(abstract.GamePersistence):
         abstract.GamePersistence (_type_): Inherits interface.
     """
 
-    def __init__(self, db_client: abstract.DbClient) -> None:
-        """Initialize Persistence."""
+    def __init__(
+        self,
+        db_client: abstract.DbClient,
+        metrics_registry: metrics.Registry | None = None,
+    ) -> None:
+        """Initialize Persistence.
+
+        Args:
+            db_client (abstract.DbClient): DB client that stores sessions.
+            metrics_registry (metrics.Registry | None, optional): receives latency
+                of the operations. Defaults to None (metrics.REGISTRY).
+        """
         self.db_client = db_client
+        self._write_count: int = 0
+        self._write_count_lock: threading.Lock = threading.Lock()
+        latency: metrics.Histogram = (
+            metrics.REGISTRY if metrics_registry is None else metrics_registry
+        ).histogram(
+            "battleship_persistence_seconds",
+            "Latency of the persistence operations.",
+            ("operation",),
+        )
+        self._save_latency: metrics.HistogramChild = latency.labels("save")
+        self._load_latency: metrics.HistogramChild = latency.labels("load")
+        self._update_latency: metrics.HistogramChild = latency.labels("update")
         log.debug("Inited: %s", db_client)
 
-    def save_session(self, session_id: str, session_state: dto.SessionStateDto) -> bool:
+    @property
+    def write_count(self) -> int:
+        """Number of the save requests passed to the db client.
+
+        Difference of the value before and after an operation shows number of writes
+        made by the operation.
+
+        Returns:
+            int: number of writes.
+        """
+        return self._write_count
+
+    def save_session(
+        self,
+        session_id: str,
+        session_state: dto.SessionStateDto,
+        expected_version: int | None = None,
+    ) -> bool:
         """Save game session via db_client object.
 
         Args:
             session_id (str): identifier of the session to be saved. Primary Key.
             session_state (dto.SessionState): current game session state.
+            expected_version (int | None, optional): stored version required for the
+                save. Defaults to None (no check).
+
+        Raises:
+            ex.SessionVersionConflictException: raised if the stored version is not
+                the expected one.
 
         Returns:
             bool: result of the save method.
         """
+        with self._write_count_lock:
+            self._write_count += 1
+        start: float = time.perf_counter()
         try:
             log.debug("Save session: %s, state: %s", session_id, session_state)
-            return self.db_client.save(session_id, session_state)
+            if expected_version is None:
+                return self.db_client.save(session_id, session_state)
+            return self.db_client.save(session_id, session_state, expected_version)
+        except ex.SessionVersionConflictException:
+            log.debug("Save session: %s, version conflict", session_id)
+            raise
         except Exception:
             log.debug("Save session: %s, Failed", session_id)
             return False
+        finally:
+            self._save_latency.observe(time.perf_counter() - start)
 
     def load_session(self, session_id: str) -> dto.SessionStateDto | None:
         """Load game session via db_client object.
@@ -45,12 +104,15 @@ class GamePersistenceApi(abstract.GamePersistence):
         Returns:
             dto.SessionState: saved earlier game session state.
         """
+        start: float = time.perf_counter()
         try:
             log.debug("Load session: %s", session_id)
             return self.db_client.load(session_id)
         except Exception:
             log.debug("load session: %s, Failed", session_id)
             return None
+        finally:
+            self._load_latency.observe(time.perf_counter() - start)
 
     def remove_session(self, session_id: str) -> bool:
         """Remove game session via db_client object.
@@ -67,3 +129,49 @@ class GamePersistenceApi(abstract.GamePersistence):
         except Exception:
             log.debug("Delete session: %s, Failed", session_id)
             return False
+
+    def update_session(
+        self, session_id: str, update_fn: abstract.SessionUpdate
+    ) -> dto.SessionStateDto | None:
+        """Atomically change game session via db_client object.
+
+        Args:
+            session_id (str): identifier of the session to be changed. Primary Key.
+            update_fn (abstract.SessionUpdate): function that receives stored session
+                and returns session to be saved. Its exceptions are passed to the
+                caller.
+
+        Raises:
+            ex.SessionVersionConflictException: raised if the session was changed
+                concurrently and the change was not saved.
+
+        Returns:
+            dto.SessionStateDto | None: saved session or None if the session is not
+                found or error happened in the DB.
+        """
+        failures: list[Exception] = []
+
+        def apply(session_state: dto.SessionStateDto) -> dto.SessionStateDto:
+            try:
+                return update_fn(session_state)
+            except Exception as err:
+                failures.append(err)
+                raise
+
+        start: float = time.perf_counter()
+        try:
+            log.debug("Update session: %s", session_id)
+            updated: dto.SessionStateDto = self.db_client.update(session_id, apply)
+        except ex.SessionVersionConflictException:
+            log.debug("Update session: %s, version conflict", session_id)
+            raise
+        except Exception:
+            if failures:
+                raise
+            log.debug("Update session: %s, Failed", session_id)
+            return None
+        finally:
+            self._update_latency.observe(time.perf_counter() - start)
+        with self._write_count_lock:
+            self._write_count += 1
+        return updated
@@ -0,0 +1,124 @@
+"""Identity map for the loaded game sessions.
+
+Cache keeps created game.Game objects by session id, so controller calls made in the
+scope of the same request reuse the same Game instance instead of loading and
+validating the session every time. Cache only serves reads: changes are written by
+the atomic persistence update at once and the changed session replaces the cached
+one, so evicted or dropped sessions are never saved.
+"""
+import collections
+import dataclasses
+import threading
+
+import battleapi.logic.game as game
+import battleapi.utils.logs as logs
+
+log: logs.StructuredLogger = logs.get_logger(__name__)
+
+SessionId = str
+
+DEFAULT_MAX_SIZE: int = 16
+
+
+@dataclasses.dataclass
+class CacheStats:
+    """Counters of the cache usage.
+
+    hits - Number of the requests served from the cache.
+    misses - Number of the requests that required loading of the session.
+    evictions - Number of the sessions removed from the cache by LRU bound.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    _lock: threading.Lock = dataclasses.field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def merge(self, other: "CacheStats") -> None:
+        """Add counters of other stats to this stats.
+
+        Args:
+            other (CacheStats): stats to be added.
+        """
+        with self._lock:
+            self.hits += other.hits
+            self.misses += other.misses
+            self.evictions += other.evictions
+
+
+class SessionCache:
+    """LRU bounded identity map of the game sessions.
+
+    Cache is not thread safe, it is expected to be used by one thread (request).
+    """
+
+    max_size: int
+    stats: CacheStats
+    _entries: collections.OrderedDict[SessionId, game.Game]
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        """Initialization of the cache.
+
+        Args:
+            max_size (int, optional): max number of the cached sessions.
+                Defaults to DEFAULT_MAX_SIZE.
+
+        Raises:
+            ValueError: raised if max_size is less than 1.
+        """
+        if max_size < 1:
+            raise ValueError(f"Max size should be positive, got: {max_size}")
+        self.max_size = max_size
+        self.stats = CacheStats()
+        self._entries = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        """Return number of the cached sessions.
+
+        Returns:
+            int: number of the cached sessions.
+        """
+        return len(self._entries)
+
+    def get(self, session_id: SessionId) -> game.Game | None:
+        """Return cached game session.
+
+        Args:
+            session_id (SessionId): session id.
+
+        Returns:
+            game.Game | None: cached game session or None if it is not cached.
+        """
+        game_session: game.Game | None = self._entries.get(session_id)
+        if game_session is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        self._entries.move_to_end(session_id)
+        return game_session
+
+    def put(self, session_id: SessionId, game_session: game.Game) -> None:
+        """Add game session to the cache.
+
+        If the cache is full, least recently used session is evicted.
+
+        Args:
+            session_id (SessionId): session id.
+            game_session (game.Game): game session.
+        """
+        self._entries[session_id] = game_session
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self.max_size:
+            evicted_id, _ = self._entries.popitem(last=False)
+            self.stats.evictions += 1
+            log.debug("Evicted session: %s", evicted_id)
+
+    def invalidate(self, session_id: SessionId) -> None:
+        """Remove game session from the cache.
+
+        Args:
+            session_id (SessionId): session id.
+        """
+        self._entries.pop(session_id, None)
@@ -0,0 +1,441 @@
+"""DB client wrapper that removes abandoned game sessions.
+
+Wrapper keeps last access time and size of every session saved or loaded through it.
+Sessions that were not accessed longer than the idle TTL are expired (on access or
+by the sweep), and when the number of sessions or their total size is bigger than
+the configured limits, least recently used sessions are evicted. Sweep can be run by
+the background daemon thread.
+
+Sessions that exist in the wrapped client but were never accessed through the
+wrapper (for example stored before restart) are tracked from the first access.
+
+Access of the session and its removal by the sweep or the eviction are serialized by
+the lock of the session, expiry is checked again right before the removal, so a
+session changed concurrently is not removed after it is saved.
+
+Size of the session is estimated by its layout (codec.estimate_size) instead of
+encoding it on every save. Metrics are reported to the metrics registry: expired
+and evicted sessions as counters, tracked sessions and bytes as gauges (of the last
+created client if several clients use the same registry).
+"""
+import collections
+import dataclasses
+import threading
+import time
+from typing import Callable
+
+import battleapi.abstract as types
+import battleapi.api.codec as codec
+import battleapi.api.dto as dto
+import battleapi.db.striped_lock as striped_lock
+import battleapi.utils.logs as logs
+import battleapi.utils.metrics as metrics
+
+log: logs.StructuredLogger = logs.get_logger(__name__)
+
+Clock = Callable[[], float]
+SizeFunction = Callable[[dto.SessionStateDto], int]
+
+
+def encoded_size(session: dto.SessionStateDto) -> int:
+    """Return size of the session in the compact binary form.
+
+    Args:
+        session (dto.SessionStateDto): session.
+
+    Returns:
+        int: number of bytes.
+    """
+    return len(codec.encode(session))
+
+
+@dataclasses.dataclass
+class SessionEntry:
+    """Access information of the stored session.
+
+    last_access - time of the last access (clock of the client).
+    size - size of the session in bytes.
+    """
+
+    last_access: float
+    size: int
+
+
+@dataclasses.dataclass
+class ExpiryMetrics:
+    """Counters of the expiring client.
+
+    live - number of the tracked sessions.
+    bytes - total size of the tracked sessions.
+    expired - number of the sessions removed by the idle TTL.
+    evicted - number of the sessions removed by the count or bytes limits.
+    """
+
+    live: int = 0
+    bytes: int = 0
+    expired: int = 0
+    evicted: int = 0
+
+
+class ExpiringDbClient(types.DbClient):
+    """DB client wrapper with idle TTL and LRU eviction of the sessions.
+
+    Args:
+        abstract.DbClient (_type_): Inherited interface.
+    """
+
+    db_client: types.DbClient
+    ttl: float | None
+    max_sessions: int | None
+    max_bytes: int | None
+    _clock: Clock
+    _size_fn: SizeFunction
+    _entries: collections.OrderedDict[str, SessionEntry]
+    _metrics: ExpiryMetrics
+    _lock: threading.Lock
+    _session_locks: striped_lock.StripedLock
+    _sweeper: threading.Thread | None
+    _stop_sweeper: threading.Event
+
+    def __init__(
+        self,
+        db_client: types.DbClient,
+        ttl: float | None = None,
+        max_sessions: int | None = None,
+        max_bytes: int | None = None,
+        clock: Clock = time.monotonic,
+        size_fn: SizeFunction = codec.estimate_size,
+        metrics_registry: metrics.Registry | None = None,
+    ) -> None:
+        """Initialize expiring client.
+
+        Args:
+            db_client (types.DbClient): client that stores the sessions.
+            ttl (float | None, optional): idle time in seconds after which session
+                is expired. Defaults to None (no expiration).
+            max_sessions (int | None, optional): max number of the sessions.
+                Defaults to None (no limit).
+            max_bytes (int | None, optional): max total size of the sessions.
+                Defaults to None (no limit).
+            clock (Clock, optional): source of time. Defaults to time.monotonic.
+            size_fn (SizeFunction, optional): calculates size of the session.
+                Defaults to codec.estimate_size (encoded_size is exact, but encodes
+                the session).
+            metrics_registry (metrics.Registry | None, optional): receives metrics
+                of the client. Defaults to None (metrics.REGISTRY).
+        """
+        self.db_client = db_client
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._size_fn = size_fn
+        self._entries = collections.OrderedDict()
+        self._metrics = ExpiryMetrics()
+        self._lock = threading.Lock()
+        self._session_locks = striped_lock.StripedLock()
+        self._sweeper = None
+        self._stop_sweeper = threading.Event()
+        registry: metrics.Registry = (
+            metrics.REGISTRY if metrics_registry is None else metrics_registry
+        )
+        self._expired_counter: metrics.CounterChild = registry.counter(
+            "battleship_sessions_expired_total", "Sessions removed by the idle TTL."
+        ).labels()
+        self._evicted_counter: metrics.CounterChild = registry.counter(
+            "battleship_sessions_evicted_total",
+            "Sessions removed by the count or bytes limits.",
+        ).labels()
+        registry.gauge(
+            "battleship_expiring_sessions", "Sessions tracked by the expiring client."
+        ).set_function(metrics.weak_method(self.get_live))
+        registry.gauge(
+            "battleship_expiring_bytes",
+            "Estimated size of the sessions tracked by the expiring client.",
+        ).set_function(metrics.weak_method(self.get_bytes))
+        log.debug("Inited: %s, ttl: %s", db_client, ttl)
+
+    def _is_expired(self, entry: SessionEntry, now: float) -> bool:
+        """Check if the session is idle longer than TTL.
+
+        Args:
+            entry (SessionEntry): session access information.
+            now (float): current time.
+
+        Returns:
+            bool: True if the session is expired.
+        """
+        return self.ttl is not None and now - entry.last_access > self.ttl
+
+    def _forget(self, session_id: str) -> SessionEntry | None:
+        """Stop tracking of the session. Should be called under the lock.
+
+        Args:
+            session_id (str): session id.
+
+        Returns:
+            SessionEntry | None: removed entry.
+        """
+        entry: SessionEntry | None = self._entries.pop(session_id, None)
+        if entry is not None:
+            self._metrics.bytes -= entry.size
+        return entry
+
+    def _touch(self, session_id: str, size: int | None = None) -> list[str]:
+        """Update last access time (and size) of the session and stop tracking of the
+        sessions over the limits.
+
+        Args:
+            session_id (str): session id.
+            size (int | None, optional): new size of the session. Defaults to None
+                (size is not changed).
+
+        Returns:
+            list[str]: evicted sessions, should be passed to _remove_evicted after
+                the lock of the session is released.
+        """
+        evicted: list[str] = []
+        with self._lock:
+            entry: SessionEntry | None = self._entries.get(session_id)
+            if entry is None:
+                entry = SessionEntry(self._clock(), 0)
+                self._entries[session_id] = entry
+            entry.last_access = self._clock()
+            if size is not None:
+                self._metrics.bytes += size - entry.size
+                entry.size = size
+            self._entries.move_to_end(session_id)
+            while len(self._entries) > 1 and self._is_over_limits():
+                victim_id: str = next(iter(self._entries))
+                self._forget(victim_id)
+                self._metrics.evicted += 1
+                evicted.append(victim_id)
+        if evicted:
+            self._evicted_counter.inc(len(evicted))
+        return evicted
+
+    def _remove_evicted(self, evicted: list[str]) -> None:
+        """Remove evicted sessions from the wrapped client.
+
+        Session is not removed if it was accessed again after the eviction.
+
+        Args:
+            evicted (list[str]): evicted sessions.
+        """
+        for victim_id in evicted:
+            with self._session_locks.for_key(victim_id):
+                with self._lock:
+                    if victim_id in self._entries:
+                        continue
+                log.debug("Session is evicted: %s", victim_id)
+                self.db_client.remove(victim_id)
+
+    def _is_over_limits(self) -> bool:
+        """Check limits of the sessions count and size. Should be called under lock.
+
+        Returns:
+            bool: True if some session should be evicted.
+        """
+        if self.max_sessions is not None and len(self._entries) > self.max_sessions:
+            return True
+        return self.max_bytes is not None and self._metrics.bytes > self.max_bytes
+
+    def _expire_if_needed(self, session_id: str) -> None:
+        """Remove the session if it is expired. Should be called under the lock of the
+        session.
+
+        Args:
+            session_id (str): session id.
+
+        Raises:
+            KeyError: raised if the session is expired.
+        """
+        with self._lock:
+            entry: SessionEntry | None = self._entries.get(session_id)
+            if entry is None or not self._is_expired(entry, self._clock()):
+                return
+            self._forget(session_id)
+            self._metrics.expired += 1
+        self._expired_counter.inc()
+        log.debug("Session is expired: %s", session_id)
+        self.db_client.remove(session_id)
+        raise KeyError(session_id)
+
+    def save(
+        self,
+        session_id: str,
+        session: dto.SessionStateDto,
+        expected_version: int | None = None,
+    ) -> bool:
+        """Save SessionStateDto object to the DB with passed session_id.
+
+        Args:
+            session_id (str): unique identifier of the session. Primary Key.
+            session (dto.SessionState): Game Session Object.
+            expected_version (int | None, optional): required version of the stored
+                session. Defaults to None (session is overwritten).
+
+        Raises:
+            SessionVersionConflictException: raised by the wrapped client if the
+                stored version is not the expected one.
+
+        Returns:
+            bool: success of the operation. True - OK, False - Failure.
+        """
+        evicted: list[str] = []
+        with self._session_locks.for_key(session_id):
+            is_saved: bool = self.db_client.save(session_id, session, expected_version)
+            if is_saved:
+                evicted = self._touch(session_id, self._size_fn(session))
+        self._remove_evicted(evicted)
+        return is_saved
+
+    def load(self, session_id: str) -> dto.SessionStateDto:
+        """Load SessionStateDto object from the DB with passed session_id.
+
+        Args:
+            session_id (str): unique identifier of the session. Primary Key.
+
+        Raises:
+            KeyError: raised if the session is not found or expired.
+
+        Returns:
+            dto.SessionState: Game Session Object.
+        """
+        with self._session_locks.for_key(session_id):
+            self._expire_if_needed(session_id)
+            session: dto.SessionStateDto = self.db_client.load(session_id)
+            with self._lock:
+                is_tracked: bool = session_id in self._entries
+            evicted: list[str] = self._touch(
+                session_id, None if is_tracked else self._size_fn(session)
+            )
+        self._remove_evicted(evicted)
+        return session
+
+    def remove(self, session_id: str) -> bool:
+        """Remove SessionStateDto object from the DB with passed session_id.
+
+        Args:
+            session_id (str): unique identifier of the session. Primary Key.
+
+        Returns:
+            bool: success of the operation. True - OK, session deleted, False - Failure
+                or session was already deleted or even never exist in the DB.
+        """
+        with self._session_locks.for_key(session_id):
+            with self._lock:
+                self._forget(session_id)
+            return self.db_client.remove(session_id)
+
+    def update(
+        self, session_id: str, update_fn: types.SessionUpdate
+    ) -> dto.SessionStateDto:
+        """Atomically load, change and save SessionStateDto object.
+
+        Args:
+            session_id (str): unique identifier of the session. Primary Key.
+            update_fn (types.SessionUpdate): function that receives stored session and
+                returns session to be saved.
+
+        Raises:
+            KeyError: raised if the session is not found or expired.
+
+        Returns:
+            dto.SessionStateDto: saved Game Session Object.
+        """
+        with self._session_locks.for_key(session_id):
+            self._expire_if_needed(session_id)
+            updated: dto.SessionStateDto = self.db_client.update(session_id, update_fn)
+            evicted: list[str] = self._touch(session_id, self._size_fn(updated))
+        self._remove_evicted(evicted)
+        return updated
+
+    def sweep(self) -> int:
+        """Remove all the expired sessions.
+
+        Expiry of every found session is checked again under the lock of the session
+        right before the removal (session could be accessed after it was found).
+
+        Returns:
+            int: number of the removed sessions.
+        """
+        now: float = self._clock()
+        candidates: list[str] = []
+        with self._lock:
+            for session_id, entry in self._entries.items():
+                if not self._is_expired(entry, now):
+                    # entries are ordered by access time, the rest are newer
+                    break
+                candidates.append(session_id)
+        expired: int = 0
+        for session_id in candidates:
+            with self._session_locks.for_key(session_id):
+                with self._lock:
+                    entry: SessionEntry | None = self._entries.get(session_id)
+                    if entry is None or not self._is_expired(entry, self._clock()):
+                        continue
+                    self._forget(session_id)
+                    self._metrics.expired += 1
+                self.db_client.remove(session_id)
+            expired += 1
+        if expired:
+            self._expired_counter.inc(expired)
+            log.info("Expired sessions: %d", expired)
+        return expired
+
+    def get_metrics(self) -> ExpiryMetrics:
+        """Return copy of the current metrics.
+
+        Returns:
+            ExpiryMetrics: metrics.
+        """
+        with self._lock:
+            return dataclasses.replace(self._metrics, live=len(self._entries))
+
+    def get_live(self) -> int:
+        """Return number of the tracked sessions.
+
+        Returns:
+            int: number of the sessions.
+        """
+        return len(self._entries)
+
+    def get_bytes(self) -> int:
+        """Return total size of the tracked sessions.
+
+        Returns:
+            int: number of bytes.
+        """
+        return self._metrics.bytes
+
+    def start_sweeper(self, interval: float) -> None:
+        """Start background daemon thread that calls sweep every interval seconds.
+
+        Args:
+            interval (float): seconds between sweeps.
+        """
+        if self._sweeper is not None:
+            return
+        self._stop_sweeper.clear()
+
+        def run() -> None:
+            while not self._stop_sweeper.wait(interval):
+                try:
+                    self.sweep()
+                except Exception as err:
+                    log.warning("Sweep failed: %s", err)
+
+        self._sweeper = threading.Thread(
+            target=run, name="session-sweeper", daemon=True
+        )
+        self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        """Stop background sweeper thread if it is started."""
+        sweeper: threading.Thread | None = self._sweeper
+        if sweeper is None:
+            return
+        self._stop_sweeper.set()
+        sweeper.join()
+        self._sweeper = None
@@ -1,10 +1,41 @@
-"""Implementation of DB client for in memory keeping Game Session Data."""
-import logging
+"""Implementation of DB client for in memory keeping Game Session Data.
+
+Client is thread safe: operations are guarded by the per session striped locks, so
+concurrent requests to the same session are serialized and update is atomic.
+
+Number of the stored sessions, number of the stored sessions of the not finished
+games and their size (estimated by battleapi.api.codec.estimate_size) are reported
+as gauges (of the last created client if several clients use the same registry).
+Size and state of every session are tracked on save and remove, so rendering of the
+metrics doesn't touch the sessions.
+"""
+import dataclasses
+import threading
 
 import battleapi.abstract as types
+import battleapi.api.codec as codec
 import battleapi.api.dto as dto
+import battleapi.db.striped_lock as striped_lock
+import battleapi.logic.exceptions as ex
+import battleapi.utils.logs as logs
+import battleapi.utils.metrics as metrics
+
+log: logs.StructuredLogger = logs.get_logger(__name__)
 
-log: logging.Logger = logging.getLogger(__name__)
+
+def _is_finished(session: dto.SessionStateDto) -> bool:
+    """Check if the game of the session is over (ready player lost all the ships).
+
+    Args:
+        session (dto.SessionStateDto): session state.
+
+    Returns:
+        bool: True if the game is finished.
+    """
+    return any(
+        player.is_ready and player.board.get_amount_of_alive_ships() == 0
+        for player in session.players.values()
+    )
 
 
 class InMemoryDbClient(types.DbClient):
@@ -15,26 +46,129 @@ class InMemoryDbClient(types.DbClient):
     """
 
     data_source: dict[str, dto.SessionStateDto]
+    _locks: striped_lock.StripedLock
+    _sizes: dict[str, int]
+    _finished: set[str]
+    _bytes: int
+    _stats_lock: threading.Lock
+
+    def __init__(
+        self,
+        stripes: int = striped_lock.DEFAULT_STRIPES,
+        metrics_registry: metrics.Registry | None = None,
+    ) -> None:
+        """Initialize in memory client.
 
-    def __init__(self) -> None:
-        """Initialize in memory client."""
+        Args:
+            stripes (int, optional): number of the locks shared by sessions.
+                Defaults to striped_lock.DEFAULT_STRIPES.
+            metrics_registry (metrics.Registry | None, optional): receives size of
+                the store. Defaults to None (metrics.REGISTRY).
+        """
         self.data_source = {}
+        self._locks = striped_lock.StripedLock(stripes)
+        self._sizes = {}
+        self._finished = set()
+        self._bytes = 0
+        self._stats_lock = threading.Lock()
+        registry: metrics.Registry = (
+            metrics.REGISTRY if metrics_registry is None else metrics_registry
+        )
+        registry.gauge(
+            "battleship_store_sessions", "Number of the sessions in the store."
+        ).set_function(metrics.weak_method(self.get_size))
+        registry.gauge(
+            "battleship_store_bytes", "Encoded size of the sessions in the store."
+        ).set_function(metrics.weak_method(self.get_bytes))
+        registry.gauge(
+            "battleship_active_sessions",
+            "Stored sessions of the not finished games (expired and removed sessions "
+            "are not counted).",
+        ).set_function(metrics.weak_method(self.get_active))
         log.debug("Datasource inited: %s", self.data_source)
 
-    def save(self, session_id: str, session: dto.SessionStateDto) -> bool:
+    def get_size(self) -> int:
+        """Return number of the stored sessions.
+
+        Returns:
+            int: number of the sessions.
+        """
+        return len(self.data_source)
+
+    def get_bytes(self) -> int:
+        """Return estimated size of the stored sessions in the compact binary form.
+
+        Returns:
+            int: number of bytes.
+        """
+        return self._bytes
+
+    def get_active(self) -> int:
+        """Return number of the stored sessions of the not finished games.
+
+        Returns:
+            int: number of the sessions.
+        """
+        with self._stats_lock:
+            return len(self._sizes) - len(self._finished)
+
+    def _track(self, session_id: str, session: dto.SessionStateDto | None) -> None:
+        """Update size and state of the session. Should be called under the lock of
+        the session.
+
+        Args:
+            session_id (str): session id.
+            session (dto.SessionStateDto | None): saved session or None if the
+                session is removed.
+        """
+        size: int = 0 if session is None else codec.estimate_size(session)
+        is_finished: bool = session is not None and _is_finished(session)
+        with self._stats_lock:
+            self._bytes += size - self._sizes.pop(session_id, 0)
+            if session is not None:
+                self._sizes[session_id] = size
+            if is_finished:
+                self._finished.add(session_id)
+            else:
+                self._finished.discard(session_id)
+
+    def save(
+        self,
+        session_id: str,
+        session: dto.SessionStateDto,
+        expected_version: int | None = None,
+    ) -> bool:
         """Save SessionStateDto object to the DB with passed session_id.
 
         Args:
             session_id (str): unique identifier of the session. Primary Key.
             session (dto.SessionState): Game Session Object.
+            expected_version (int | None, optional): required version of the stored
+                session. Defaults to None (session is overwritten).
+
+        Raises:
+            ex.SessionVersionConflictException: raised if the stored version is not
+                the expected one.
 
         Returns:
             bool: success of the operation. True - OK, False - Failure.
         """
         log.debug(
-            "Adding session to data source: id=%s, session=%d", session_id, session
+            "Adding session to data source: id=%s, session=%s", session_id, session
         )
-        self.data_source[session_id] = session
+        with self._locks.for_key(session_id):
+            if expected_version is not None:
+                stored: dto.SessionStateDto | None = self.data_source.get(session_id)
+                stored_version: int = 0 if stored is None else stored.version
+                if stored_version != expected_version:
+                    raise ex.SessionVersionConflictException(
+                        f"Expected version {expected_version}, got {stored_version}"
+                    )
+            else:
+                expected_version = session.version
+            session.version = expected_version + 1
+            self.data_source[session_id] = session
+            self._track(session_id, session)
         return True
 
     def load(self, session_id: str) -> dto.SessionStateDto:
@@ -47,7 +181,8 @@ class InMemoryDbClient(types.DbClient):
             dto.SessionState: Game Session Object.
         """
         log.debug("Loading session from data source: id=%s", session_id)
-        return self.data_source[session_id]
+        with self._locks.for_key(session_id):
+            return self.data_source[session_id]
 
     def remove(self, session_id: str) -> bool:
         """Remove SessionStateDto object from the DB with passed session_id.
@@ -61,8 +196,48 @@ class InMemoryDbClient(types.DbClient):
         """
         try:
             log.debug("Removing session from data source: id=%s", session_id)
-            del self.data_source[session_id]
+            with self._locks.for_key(session_id):
+                del self.data_source[session_id]
+                self._track(session_id, None)
         except KeyError as err:
             log.debug("Removing failed. %s", err)
             return False
         return True
+
+    def update(
+        self, session_id: str, update_fn: types.SessionUpdate
+    ) -> dto.SessionStateDto:
+        """Atomically load, change and save SessionStateDto object.
+
+        update_fn receives a copy of the stored session, so the stored session is
+        replaced only if the function succeeds and a failed function changes
+        nothing. Only the players (boards and ships) are copied, configuration of
+        the game is shared as it is not changed: the copy takes about the fifth of
+        the time of the round trip through battleapi.api.codec and is done on every
+        update.
+
+        Args:
+            session_id (str): unique identifier of the session. Primary Key.
+            update_fn (types.SessionUpdate): function that receives stored session and
+                returns session to be saved.
+
+        Raises:
+            KeyError: raised if the session is not found.
+
+        Returns:
+            dto.SessionStateDto: saved Game Session Object.
+        """
+        log.debug("Updating session in data source: id=%s", session_id)
+        with self._locks.for_key(session_id):
+            stored: dto.SessionStateDto = self.load(session_id)
+            loaded: dto.SessionStateDto = dataclasses.replace(
+                stored,
+                players={
+                    player_id: player.copy()
+                    for player_id, player in stored.players.items()
+                },
+                events=[],
+            )
+            updated: dto.SessionStateDto = update_fn(loaded)
+            self.save(session_id, updated, expected_version=stored.version)
+        return updated
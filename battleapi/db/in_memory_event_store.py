@@ -0,0 +1,203 @@
+"""Implementation of the event store for in memory keeping of the session events.
+
+Events are immutable, so they are kept as is. Snapshots are kept in the compact
+binary form (see battleapi.api.codec), so loaded snapshots can be changed by the
+caller without changing the stored ones. Store is thread safe: operations are guarded
+by the per session striped locks.
+"""
+import bisect
+import dataclasses
+
+import battleapi.abstract as types
+import battleapi.api.codec as codec
+import battleapi.api.dto as dto
+import battleapi.db.striped_lock as striped_lock
+import battleapi.logic.events as game_events
+import battleapi.logic.exceptions as ex
+import battleapi.utils.logs as logs
+
+log: logs.StructuredLogger = logs.get_logger(__name__)
+
+
+@dataclasses.dataclass
+class SessionLog:
+    """Stored events and snapshots of the session.
+
+    events - events in the order of the changes.
+    snapshot_versions - versions of the snapshots in ascending order.
+    snapshots - encoded snapshots in the order of the versions.
+    """
+
+    events: list[game_events.GameEvent] = dataclasses.field(default_factory=list)
+    snapshot_versions: list[int] = dataclasses.field(default_factory=list)
+    snapshots: list[bytes] = dataclasses.field(default_factory=list)
+
+
+class InMemoryEventStore(types.EventStore):
+    """Implementation for the event store required for the event-sourced persistence.
+
+    Args:
+        abstract.EventStore (_type_): Inherited interface.
+    """
+
+    data_source: dict[str, SessionLog]
+    _locks: striped_lock.StripedLock
+
+    def __init__(self, stripes: int = striped_lock.DEFAULT_STRIPES) -> None:
+        """Initialize in memory store.
+
+        Args:
+            stripes (int, optional): number of the locks shared by sessions.
+                Defaults to striped_lock.DEFAULT_STRIPES.
+        """
+        self.data_source = {}
+        self._locks = striped_lock.StripedLock(stripes)
+        log.debug("Datasource inited")
+
+    def append(
+        self,
+        session_id: str,
+        new_events: list[game_events.GameEvent],
+        expected_version: int | None = None,
+    ) -> int:
+        """Add events to the end of the session log (log is created if needed).
+
+        Args:
+            session_id (str): unique identifier of the session. Primary Key.
+            new_events (list[game_events.GameEvent]): events to be added.
+            expected_version (int | None, optional): if passed, events are added only
+                if the current version is equal to it. Defaults to None (no check).
+
+        Raises:
+            ex.SessionVersionConflictException: raised if the current version is not
+                the expected one.
+
+        Returns:
+            int: new version of the session.
+        """
+        log.debug("Append events: id=%s, events=%s", session_id, new_events)
+        with self._locks.for_key(session_id):
+            session_log: SessionLog | None = self.data_source.get(session_id)
+            version: int = 0 if session_log is None else len(session_log.events)
+            if expected_version is not None and version != expected_version:
+                raise ex.SessionVersionConflictException(
+                    f"Expected version {expected_version}, got {version}"
+                )
+            if session_log is None:
+                session_log = SessionLog()
+                self.data_source[session_id] = session_log
+            session_log.events.extend(new_events)
+            return len(session_log.events)
+
+    def load_events(
+        self, session_id: str, start: int = 0, end: int | None = None
+    ) -> list[game_events.GameEvent]:
+        """Load events of the session.
+
+        Args:
+            session_id (str): unique identifier of the session. Primary Key.
+            start (int, optional): version to start from. Defaults to 0.
+            end (int | None, optional): version to stop at (exclusive). Defaults to
+                None (till the end of the log).
+
+        Raises:
+            KeyError: raised if the session is not found.
+
+        Returns:
+            list[game_events.GameEvent]: events in the order of the changes.
+        """
+        with self._locks.for_key(session_id):
+            return self.data_source[session_id].events[start:end]
+
+    def save_snapshot(self, session_id: str, session: dto.SessionStateDto) -> None:
+        """Save state of the session after session.version events.
+
+        Args:
+            session_id (str): unique identifier of the session. Primary Key.
+            session (dto.SessionStateDto): state of the session.
+
+        Raises:
+            KeyError: raised if the session is not found.
+        """
+        data: bytes = codec.encode(session)
+        with self._locks.for_key(session_id):
+            session_log: SessionLog = self.data_source[session_id]
+            index: int = bisect.bisect_left(
+                session_log.snapshot_versions, session.version
+            )
+            if (
+                index < len(session_log.snapshot_versions)
+                and session_log.snapshot_versions[index] == session.version
+            ):
+                session_log.snapshots[index] = data
+            else:
+                session_log.snapshot_versions.insert(index, session.version)
+                session_log.snapshots.insert(index, data)
+        log.debug("Snapshot is saved: id=%s, version=%d", session_id, session.version)
+
+    def prune_snapshots(self, session_id: str, version: int) -> int:
+        """Remove snapshots older than version except the first one of the session.
+
+        Args:
+            session_id (str): unique identifier of the session. Primary Key.
+            version (int): snapshots with the lower versions are removed.
+
+        Raises:
+            KeyError: raised if the session is not found.
+
+        Returns:
+            int: number of the removed snapshots.
+        """
+        with self._locks.for_key(session_id):
+            session_log: SessionLog = self.data_source[session_id]
+            end: int = bisect.bisect_left(session_log.snapshot_versions, version)
+            if end <= 1:
+                return 0
+            del session_log.snapshot_versions[1:end]
+            del session_log.snapshots[1:end]
+        log.debug("Snapshots are pruned: id=%s, removed=%d", session_id, end - 1)
+        return end - 1
+
+    def load_snapshot(
+        self, session_id: str, max_version: int | None = None
+    ) -> dto.SessionStateDto:
+        """Load latest snapshot of the session.
+
+        Args:
+            session_id (str): unique identifier of the session. Primary Key.
+            max_version (int | None, optional): max version of the snapshot.
+                Defaults to None (latest snapshot).
+
+        Raises:
+            KeyError: raised if the session or the snapshot is not found.
+
+        Returns:
+            dto.SessionStateDto: state of the session.
+        """
+        with self._locks.for_key(session_id):
+            session_log: SessionLog = self.data_source[session_id]
+            index: int = (
+                len(session_log.snapshots)
+                if max_version is None
+                else bisect.bisect_right(session_log.snapshot_versions, max_version)
+            )
+            if index == 0:
+                raise KeyError(session_id)
+            version: int = session_log.snapshot_versions[index - 1]
+            data: bytes = session_log.snapshots[index - 1]
+        session: dto.SessionStateDto = codec.decode(data)
+        session.version = version
+        return session
+
+    def remove(self, session_id: str) -> bool:
+        """Remove events and snapshots of the session.
+
+        Args:
+            session_id (str): unique identifier of the session. Primary Key.
+
+        Returns:
+            bool: True if the session was removed, False if it doesn't exist.
+        """
+        log.debug("Removing session: id=%s", session_id)
+        with self._locks.for_key(session_id):
+            return self.data_source.pop(session_id, None) is not None
@@ -0,0 +1,356 @@
+"""Implementation of DB client that keeps Game Session Data in the SQLite database.
+
+Sessions are stored in the compact binary form (see battleapi.api.codec). Database
+works in the WAL mode, every thread uses own connection, SQL statements are constant,
+so they are prepared once and reused by the statement cache of the connection.
+
+Changes can be committed in batches: saved and removed sessions are kept in the
+pending buffer (visible for load) and written in one transaction when the buffer has
+batch_size changes or flush is called. With batches the background daemon thread
+should flush the buffer every interval (start_flusher), so changes are not kept
+unwritten while the application is idle, and close should be called on shutdown.
+
+Every row keeps version of the session. Writes with expected version (and updates)
+are compare-and-swap: they are checked against the pending change of the session or
+committed at once by the conditional SQL statement, so concurrent changes of other
+threads and processes are not overwritten (conflict is raised instead).
+"""
+import sqlite3
+import threading
+
+import battleapi.abstract as types
+import battleapi.api.codec as codec
+import battleapi.api.dto as dto
+import battleapi.db.striped_lock as striped_lock
+import battleapi.logic.exceptions as ex
+import battleapi.utils.logs as logs
+
+log: logs.StructuredLogger = logs.get_logger(__name__)
+
+SQL_CREATE_TABLE: str = (
+    "CREATE TABLE IF NOT EXISTS sessions ("
+    "session_id TEXT PRIMARY KEY, data BLOB NOT NULL, "
+    "version INTEGER NOT NULL DEFAULT 0) WITHOUT ROWID"
+)
+SQL_COLUMNS: str = "PRAGMA table_info(sessions)"
+SQL_ADD_VERSION: str = (
+    "ALTER TABLE sessions ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+)
+SQL_SAVE: str = (
+    "INSERT INTO sessions (session_id, data, version) VALUES (?, ?, ?) "
+    "ON CONFLICT (session_id) DO UPDATE "
+    "SET data = excluded.data, version = excluded.version"
+)
+SQL_INSERT_IF_ABSENT: str = (
+    "INSERT INTO sessions (session_id, data, version) VALUES (?, ?, ?) "
+    "ON CONFLICT (session_id) DO UPDATE "
+    "SET data = excluded.data, version = excluded.version WHERE sessions.version = 0"
+)
+SQL_UPDATE_IF_VERSION: str = (
+    "UPDATE sessions SET data = ?, version = ? WHERE session_id = ? AND version = ?"
+)
+SQL_LOAD: str = "SELECT data, version FROM sessions WHERE session_id = ?"
+SQL_EXISTS: str = "SELECT 1 FROM sessions WHERE session_id = ?"
+SQL_REMOVE: str = "DELETE FROM sessions WHERE session_id = ?"
+SQL_COUNT: str = "SELECT COUNT(*) FROM sessions"
+
+PendingChange = tuple[bytes, int] | None
+
+
+class SqliteDbClient(types.DbClient):
+    """Implementation for the DB client required for the game.
+
+    Args:
+        abstract.DbClient (_type_): Inherited interface.
+    """
+
+    path: str
+    batch_size: int
+    _local: threading.local
+    _connections: list[sqlite3.Connection]
+    _pending: dict[str, PendingChange]
+    _lock: threading.Lock
+    _session_locks: striped_lock.StripedLock
+    _flusher: threading.Thread | None
+    _stop_flusher: threading.Event
+
+    def __init__(self, path: str, batch_size: int = 1) -> None:
+        """Initialize SQLite client and create table if needed.
+
+        Args:
+            path (str): path to the database file.
+            batch_size (int, optional): number of changes committed in one
+                transaction. Defaults to 1 (every change is committed at once).
+
+        Raises:
+            ValueError: raised if batch_size is less than 1.
+        """
+        if batch_size < 1:
+            raise ValueError(f"Batch size should be positive, got: {batch_size}")
+        self.path = path
+        self.batch_size = batch_size
+        self._local = threading.local()
+        self._connections = []
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._session_locks = striped_lock.StripedLock()
+        self._flusher = None
+        self._stop_flusher = threading.Event()
+        with self._connection() as connection:
+            connection.execute(SQL_CREATE_TABLE)
+            columns: list[str] = [row[1] for row in connection.execute(SQL_COLUMNS)]
+            if "version" not in columns:
+                connection.execute(SQL_ADD_VERSION)
+        log.debug("Datasource inited: %s", path)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return connection of the current thread (creates it on the first call).
+
+        Returns:
+            sqlite3.Connection: connection.
+        """
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+        if connection is None:
+            # connection is used only by own thread, close is called from any thread
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _put_change(self, session_id: str, change: PendingChange) -> None:
+        """Add change to the pending buffer and flush it if it is full.
+
+        Args:
+            session_id (str): unique identifier of the session.
+            change (PendingChange): encoded session or None for removal.
+        """
+        with self._lock:
+            self._pending[session_id] = change
+            is_full: bool = len(self._pending) >= self.batch_size
+        if is_full:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all the pending changes in one transaction."""
+        connection: sqlite3.Connection = self._connection()
+        with self._lock:
+            if not self._pending:
+                return
+            changes: dict[str, PendingChange] = self._pending
+            self._pending = {}
+            saved: list[tuple[str, bytes, int]] = []
+            removed: list[tuple[str]] = []
+            for session_id, change in changes.items():
+                if change is None:
+                    removed.append((session_id,))
+                else:
+                    saved.append((session_id, *change))
+            with connection:
+                connection.executemany(SQL_SAVE, saved)
+                connection.executemany(SQL_REMOVE, removed)
+        log.debug("Flushed: saved=%d, removed=%d", len(saved), len(removed))
+
+    def save(
+        self,
+        session_id: str,
+        session: dto.SessionStateDto,
+        expected_version: int | None = None,
+    ) -> bool:
+        """Save SessionStateDto object to the DB with passed session_id.
+
+        Args:
+            session_id (str): unique identifier of the session. Primary Key.
+            session (dto.SessionState): Game Session Object.
+            expected_version (int | None, optional): required version of the stored
+                session. Defaults to None (session is overwritten).
+
+        Raises:
+            ex.SessionVersionConflictException: raised if the stored version is not
+                the expected one.
+
+        Returns:
+            bool: success of the operation. True - OK, False - Failure.
+        """
+        log.debug("Adding session to data source: id=%s", session_id)
+        if expected_version is None:
+            session.version += 1
+            self._put_change(session_id, (codec.encode(session), session.version))
+            return True
+        with self._session_locks.for_key(session_id):
+            self._compare_and_save(session_id, codec.encode(session), expected_version)
+        session.version = expected_version + 1
+        return True
+
+    def _compare_and_save(
+        self, session_id: str, data: bytes, expected_version: int
+    ) -> None:
+        """Save encoded session if the stored version is the expected one.
+
+        Pending change of the session is replaced in the buffer, otherwise session is
+        written at once by the conditional statement.
+
+        Args:
+            session_id (str): unique identifier of the session.
+            data (bytes): encoded session.
+            expected_version (int): required version of the stored session.
+
+        Raises:
+            ex.SessionVersionConflictException: raised if the stored version is not
+                the expected one.
+        """
+        change: PendingChange = (data, expected_version + 1)
+        with self._lock:
+            is_pending: bool = session_id in self._pending
+            if is_pending:
+                pending: PendingChange = self._pending[session_id]
+                stored_version: int = 0 if pending is None else pending[1]
+                if stored_version != expected_version:
+                    raise ex.SessionVersionConflictException(
+                        f"Expected version {expected_version}, got {stored_version}"
+                    )
+                self._pending[session_id] = change
+                is_full: bool = len(self._pending) >= self.batch_size
+        if is_pending:
+            if is_full:
+                self.flush()
+            return
+        connection: sqlite3.Connection = self._connection()
+        with connection:
+            if expected_version == 0:
+                cursor: sqlite3.Cursor = connection.execute(
+                    SQL_INSERT_IF_ABSENT, (session_id, *change)
+                )
+            else:
+                cursor = connection.execute(
+                    SQL_UPDATE_IF_VERSION,
+                    (data, change[1], session_id, expected_version),
+                )
+        if cursor.rowcount == 0:
+            raise ex.SessionVersionConflictException(
+                f"Session {session_id} is not of version {expected_version}"
+            )
+
+    def load(self, session_id: str) -> dto.SessionStateDto:
+        """Load SessionStateDto object from the DB with passed session_id.
+
+        Args:
+            session_id (str): unique identifier of the session. Primary Key.
+
+        Raises:
+            KeyError: raised if the session is not found.
+
+        Returns:
+            dto.SessionState: Game Session Object.
+        """
+        log.debug("Loading session from data source: id=%s", session_id)
+        with self._lock:
+            is_pending: bool = session_id in self._pending
+            stored: PendingChange = self._pending.get(session_id)
+        if not is_pending:
+            stored = self._connection().execute(SQL_LOAD, (session_id,)).fetchone()
+        if stored is None:
+            raise KeyError(session_id)
+        data, version = stored
+        session: dto.SessionStateDto = codec.decode(data)
+        session.version = version
+        return session
+
+    def remove(self, session_id: str) -> bool:
+        """Remove SessionStateDto object from the DB with passed session_id.
+
+        Args:
+            session_id (str): unique identifier of the session. Primary Key.
+
+        Returns:
+            bool: success of the operation. True - OK, session deleted, False - Failure
+                or session was already deleted or even never exist in the DB.
+        """
+        log.debug("Removing session from data source: id=%s", session_id)
+        with self._lock:
+            is_pending: bool = session_id in self._pending
+            exists: bool = self._pending.get(session_id) is not None
+        if not is_pending:
+            exists = (
+                self._connection().execute(SQL_EXISTS, (session_id,)).fetchone()
+                is not None
+            )
+        if not exists:
+            return False
+        self._put_change(session_id, None)
+        return True
+
+    def update(
+        self, session_id: str, update_fn: types.SessionUpdate
+    ) -> dto.SessionStateDto:
+        """Atomically load, change and save SessionStateDto object.
+
+        Args:
+            session_id (str): unique identifier of the session. Primary Key.
+            update_fn (types.SessionUpdate): function that receives stored session and
+                returns session to be saved.
+
+        Raises:
+            KeyError: raised if the session is not found.
+            ex.SessionVersionConflictException: raised if the session was changed by
+                another process after load.
+
+        Returns:
+            dto.SessionStateDto: saved Game Session Object.
+        """
+        with self._session_locks.for_key(session_id):
+            loaded: dto.SessionStateDto = self.load(session_id)
+            loaded_version: int = loaded.version
+            updated: dto.SessionStateDto = update_fn(loaded)
+            self.save(session_id, updated, expected_version=loaded_version)
+        return updated
+
+    def count(self) -> int:
+        """Return number of the stored sessions (pending changes are flushed).
+
+        Returns:
+            int: number of the sessions.
+        """
+        self.flush()
+        return self._connection().execute(SQL_COUNT).fetchone()[0]
+
+    def start_flusher(self, interval: float) -> None:
+        """Start background daemon thread that calls flush every interval seconds.
+
+        Args:
+            interval (float): seconds between flushes.
+        """
+        if self._flusher is not None:
+            return
+        self._stop_flusher.clear()
+
+        def run() -> None:
+            while not self._stop_flusher.wait(interval):
+                try:
+                    self.flush()
+                except Exception as err:
+                    log.warning("Flush failed: %s", err)
+
+        self._flusher = threading.Thread(target=run, name="sqlite-flusher", daemon=True)
+        self._flusher.start()
+
+    def stop_flusher(self) -> None:
+        """Stop background flusher thread if it is started."""
+        flusher: threading.Thread | None = self._flusher
+        if flusher is None:
+            return
+        self._stop_flusher.set()
+        flusher.join()
+        self._flusher = None
+
+    def close(self) -> None:
+        """Stop the flusher, flush pending changes and close all the connections."""
+        self.stop_flusher()
+        self.flush()
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+        self._local = threading.local()
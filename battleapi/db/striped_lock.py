@@ -0,0 +1,47 @@
+"""Lock striping for the DB clients.
+
+Sessions are mapped to a fixed number of locks by the hash of the session id, so
+operations with different sessions mostly don't wait for each other and operations
+with the same session are serialized.
+"""
+import threading
+
+DEFAULT_STRIPES: int = 64
+
+
+class StripedLock:
+    """Fixed set of reentrant locks selected by the key."""
+
+    _locks: tuple[threading.RLock, ...]
+
+    def __init__(self, stripes: int = DEFAULT_STRIPES) -> None:
+        """Initialization of the locks.
+
+        Args:
+            stripes (int, optional): number of locks. Defaults to DEFAULT_STRIPES.
+
+        Raises:
+            ValueError: raised if stripes is less than 1.
+        """
+        if stripes < 1:
+            raise ValueError(f"Number of stripes should be positive, got: {stripes}")
+        self._locks = tuple(threading.RLock() for _ in range(stripes))
+
+    def __len__(self) -> int:
+        """Return number of the locks.
+
+        Returns:
+            int: number of the locks.
+        """
+        return len(self._locks)
+
+    def for_key(self, key: str) -> threading.RLock:
+        """Return lock of the key.
+
+        Args:
+            key (str): key (session id).
+
+        Returns:
+            threading.RLock: lock that guards the key.
+        """
+        return self._locks[hash(key) % len(self._locks)]
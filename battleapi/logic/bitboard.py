@@ -0,0 +1,355 @@
+"""Module contains bitmask based logic of the game board.
+
+Every cell of the field is represented by one bit of the python integer
+(index = row * SIZE_HORIZONTAL + column), so placement checks, hit detection and
+sunk checks are done by a few bitwise operations instead of walking the cells.
+
+Raises:
+    ex.CellIsNotEmptyException: raised on the tries to use occupied cell.
+    ex.ShipWithoutIdException: raised if the ship cell doesn't have ship id.
+"""
+import copy
+
+import battleapi.logic.exceptions as ex
+import battleapi.logic.models as models
+import battleapi.logic.utils as utils
+import battleapi.utils.logs as logs
+
+log: logs.StructuredLogger = logs.get_logger(__name__)
+
+ShipId = str
+Mask = int
+BoardOrNone = models.Board | None
+
+BOARD_CELLS: int = utils.SIZE_VERTICAL * utils.SIZE_HORIZONTAL
+NEIGHBOUR_MASKS: tuple[Mask, ...] = utils.get_neighbour_mask_index()
+
+
+class BitBoardView:
+    """Read-only view of the bit board.
+
+    Masks are immutable integers, so the view keeps the state of the board at the
+    moment of creation and doesn't create any cells.
+    """
+
+    __slots__ = ("_ships", "_shots", "_cell_ships", "_is_hidden")
+
+    _ships: Mask
+    _shots: Mask
+    _cell_ships: tuple[ShipId | None, ...]
+    _is_hidden: bool
+
+    def __init__(
+        self,
+        ships: Mask,
+        shots: Mask,
+        cell_ships: tuple[ShipId | None, ...],
+        is_hidden: bool = False,
+    ) -> None:
+        """Initialization of the view.
+
+        Args:
+            ships (Mask): mask of the ship cells.
+            shots (Mask): mask of the shot cells.
+            cell_ships (tuple[ShipId | None, ...]): ship id of every cell.
+            is_hidden (bool, optional): True if not hit ships should be hidden.
+                Defaults to False.
+        """
+        self._ships = ships & shots if is_hidden else ships
+        self._shots = shots
+        self._cell_ships = cell_ships
+        self._is_hidden = is_hidden
+
+    def has_ship(self, row: int, col: int) -> bool:
+        """Check if the ship should be shown in the cell.
+
+        Args:
+            row (int): row index.
+            col (int): column index.
+
+        Returns:
+            bool: True if the cell has visible ship.
+        """
+        return bool(self._ships >> (row * utils.SIZE_HORIZONTAL + col) & 1)
+
+    def has_shot(self, row: int, col: int) -> bool:
+        """Check if the cell has shot.
+
+        Args:
+            row (int): row index.
+            col (int): column index.
+
+        Returns:
+            bool: True if the cell has shot.
+        """
+        return bool(self._shots >> (row * utils.SIZE_HORIZONTAL + col) & 1)
+
+    def ship_id(self, row: int, col: int) -> ShipId | None:
+        """Return ship id of the cell.
+
+        Args:
+            row (int): row index.
+            col (int): column index.
+
+        Returns:
+            ShipId | None: ship id or None if the cell is empty or view is hidden.
+        """
+        if self._is_hidden:
+            return None
+        return self._cell_ships[row * utils.SIZE_HORIZONTAL + col]
+
+
+class BitBoard:
+    """Implementation of the game board logic based on the integer bitmasks.
+
+    Has the same public methods as battleapi.logic.board.Board, so the game can
+    use any of them.
+
+    Raises:
+        ex.CellIsNotEmptyException: Raised on the tries to use occupied cell.
+
+    Returns:
+        _type_: BitBoard
+    """
+
+    _ships: Mask
+    _shots: Mask
+    _blocked: Mask
+    _ship_masks: dict[ShipId, Mask]
+    _ship_halos: dict[ShipId, Mask]
+    _cell_ships: list[ShipId | None]
+
+    def __init__(self, board: BoardOrNone = None) -> None:
+        """Initialization of the game board (field).
+
+        Args:
+            board (BoardOrNone, optional): If the game is loaded, masks will be
+                created from the passed board. Defaults to None.
+        """
+        self._ships = 0
+        self._shots = 0
+        self._blocked = 0
+        self._ship_masks = {}
+        self._ship_halos = {}
+        self._cell_ships = [None] * BOARD_CELLS
+        if board is not None:
+            self._load_board(board)
+        log.debug("Inited. ships: %x, shots: %x", self._ships, self._shots)
+
+    def _load_board(self, board: models.Board) -> None:
+        """Fill masks from the list of cells.
+
+        Args:
+            board (models.Board): Game Board.
+        """
+        for row_index, row in enumerate(board):
+            for col_index, cell in enumerate(row):
+                index: int = utils.coordinate_to_index((row_index, col_index))
+                bit: Mask = 1 << index
+                if cell.has_shot:
+                    self._shots |= bit
+                if cell.has_ship:
+                    self._ships |= bit
+                    self._cell_ships[index] = cell.ship_id
+                    if cell.ship_id is not None:
+                        mask: Mask = self._ship_masks.get(cell.ship_id, 0)
+                        self._ship_masks[cell.ship_id] = mask | bit
+        for ship_id, mask in self._ship_masks.items():
+            self._ship_halos[ship_id] = self._create_halo(mask)
+        self._blocked = self._create_blocked()
+
+    @staticmethod
+    def _create_halo(ship_mask: Mask) -> Mask:
+        """Creates mask of the neighbour cells around the ship.
+
+        Args:
+            ship_mask (Mask): mask of the ship cells.
+
+        Returns:
+            Mask: mask of the cells around the ship (without ship cells).
+        """
+        halo: Mask = 0
+        remaining: Mask = ship_mask
+        while remaining:
+            lowest: Mask = remaining & -remaining
+            halo |= NEIGHBOUR_MASKS[lowest.bit_length() - 1]
+            remaining ^= lowest
+        return halo & ~ship_mask
+
+    def _create_blocked(self) -> Mask:
+        """Creates mask of cells where new ship can't be placed.
+
+        Returns:
+            Mask: ship cells and cells around them.
+        """
+        blocked: Mask = 0
+        for ship_id, mask in self._ship_masks.items():
+            blocked |= mask | self._ship_halos[ship_id]
+        return blocked
+
+    def add_ship(self, coordinate: models.Coordinate, ship: models.Ship) -> None:
+        """Add ship to the board.
+
+        Args:
+            coordinate (models.Coordinate): Ship base coordinate.
+            ship (models.Ship): Ship.
+
+        Raises:
+            ex.CellIsNotEmptyException: raised if the ship touches another ship.
+        """
+        mask, halo = utils.get_ship_footprint_masks(
+            coordinate, ship.ship_size, ship.direction
+        )
+        if mask & self._blocked:
+            raise ex.CellIsNotEmptyException(f"Coordinate isn't correct {coordinate}")
+        if log.is_debug:
+            log.debug("ship: %s, coord: %s, mask: %x", ship, coordinate, mask)
+        self._ships |= mask
+        self._blocked |= mask | halo
+        self._ship_masks[ship.ship_id] = mask
+        self._ship_halos[ship.ship_id] = halo
+        remaining: Mask = mask
+        while remaining:
+            lowest: Mask = remaining & -remaining
+            self._cell_ships[lowest.bit_length() - 1] = ship.ship_id
+            remaining ^= lowest
+
+    def remove_ship(self, coordinate: models.Coordinate) -> ShipId | None:
+        """Remove ship from the board (field).
+
+        Args:
+            coordinate (models.Coordinate): Any of the ship coordinates (if many)
+
+        Raises:
+            ex.ShipWithoutIdException: raised if the ship cell doesn't have ship id.
+
+        Returns:
+            Union[ShipId, None]: ship_id if coordinate had ship or None
+        """
+        utils.validate_coordinate(coordinate)
+        index: int = utils.coordinate_to_index(coordinate)
+        if not self._ships >> index & 1:
+            return None
+        ship_id: ShipId | None = self._cell_ships[index]
+        if ship_id is None:
+            raise ex.ShipWithoutIdException("Ship doesn't have id")
+        mask: Mask = self._ship_masks.pop(ship_id)
+        del self._ship_halos[ship_id]
+        self._ships &= ~mask
+        self._blocked = self._create_blocked()
+        remaining: Mask = mask
+        while remaining:
+            lowest: Mask = remaining & -remaining
+            self._cell_ships[lowest.bit_length() - 1] = None
+            remaining ^= lowest
+        log.debug("removed ship: %s, mask: %x", ship_id, mask)
+        return ship_id
+
+    def make_shot(self, coordinate: models.Coordinate) -> bool:
+        """Make shot.
+
+        If the shot destroys the ship, all the cells around the ship are marked as
+        shot.
+
+        Args:
+            coordinate (models.Coordinate): coordinate where shot should be done.
+
+        Returns:
+            bool: True if the was hit.
+        """
+        utils.validate_coordinate(coordinate)
+        index: int = utils.coordinate_to_index(coordinate)
+        self._shots |= 1 << index
+        if not self._ships >> index & 1:
+            return False
+        ship_id: ShipId | None = self._cell_ships[index]
+        if ship_id is not None:
+            mask: Mask = self._ship_masks[ship_id]
+            if mask & self._shots == mask:
+                self._shots |= self._ship_halos[ship_id]
+        return True
+
+    def get_board(self, is_hidden: bool = False) -> models.Board:
+        """Return game board.
+
+        Args:
+            is_hidden (bool, optional): If board requested for by opponent
+            (display on UI) - this parameter will hide not hit ships.
+            Defaults to False.
+
+        Returns:
+            models.Board: Game Board.
+        """
+        log.debug("is_hidden: %s", is_hidden)
+        visible_ships: Mask = self._ships & self._shots if is_hidden else self._ships
+        field_to_return: models.Board = []
+        index: int = 0
+        for _ in range(utils.SIZE_VERTICAL):
+            new_row: list[models.Cell] = []
+            for _ in range(utils.SIZE_HORIZONTAL):
+                new_row.append(
+                    models.Cell(
+                        ship_id=None if is_hidden else self._cell_ships[index],
+                        has_ship=bool(visible_ships >> index & 1),
+                        has_shot=bool(self._shots >> index & 1),
+                    )
+                )
+                index += 1
+            field_to_return.append(new_row)
+        return field_to_return
+
+    def get_view(self, is_hidden: bool = False) -> BitBoardView:
+        """Return read-only view of the game board without creating the cells.
+
+        Args:
+            is_hidden (bool, optional): If board requested for by opponent
+            (display on UI) - this parameter will hide not hit ships.
+            Defaults to False.
+
+        Returns:
+            BitBoardView: view of the board.
+        """
+        return BitBoardView(
+            self._ships, self._shots, tuple(self._cell_ships), is_hidden
+        )
+
+    def copy(self) -> "BitBoard":
+        """Create independent copy of the board.
+
+        Returns:
+            BitBoard: copy.
+        """
+        copied: BitBoard = copy.copy(self)
+        copied._ship_masks = dict(self._ship_masks)
+        copied._ship_halos = dict(self._ship_halos)
+        copied._cell_ships = list(self._cell_ships)
+        return copied
+
+    def get_amount_of_not_shot_cells(self) -> int:
+        """Return amount of the cells without shot.
+
+        Returns:
+            int: number of cells.
+        """
+        return BOARD_CELLS - self._shots.bit_count()
+
+    def get_amount_of_alive_ships(self) -> int:
+        """Returns number of cells with ships without hit.
+
+        Returns:
+            int: amount of cells.
+        """
+        return (self._ships & ~self._shots).bit_count()
+
+    def get_amount_of_alive_ships_by_size(self) -> dict[int, int]:
+        """Returns number of not destroyed ships grouped by the ship size.
+
+        Returns:
+            dict[int, int]: ship size to amount of alive ships.
+        """
+        alive_ships: dict[int, int] = {}
+        for mask in self._ship_masks.values():
+            if mask & ~self._shots:
+                size: int = mask.bit_count()
+                alive_ships[size] = alive_ships.get(size, 0) + 1
+        return alive_ships
@@ -3,16 +3,18 @@
 Raises:
     ex.CellIsNotEmptyException: raised on the tries to use occupied cell.
 """
-import logging
+import copy
+import dataclasses
 from typing import Callable
 
 import battleapi.logic.exceptions as ex
 import battleapi.logic.models as models
 import battleapi.logic.utils as utils
+import battleapi.utils.logs as logs
 
-log: logging.Logger = logging.getLogger(__name__)
+log: logs.StructuredLogger = logs.get_logger(__name__)
 
-CoordinateSet = set[tuple[int, int]]
+CoordinateSet = frozenset[tuple[int, int]]
 CoordinateList = list[tuple[int, int]]
 CoordinateCollection = CoordinateList | CoordinateSet
 BoardOrNone = models.Board | None
@@ -20,6 +22,93 @@ ShipId = str
 Filter = Callable[[models.Cell], bool]
 
 
+@dataclasses.dataclass
+class ShipState:
+    """State of the ship placed on the board.
+
+    ship_size - Number of cells in the ship.
+    halo - Coordinates around the ship that are shot when the ship is destroyed.
+    hits - Number of the ship cells with shot.
+    """
+
+    ship_size: int
+    halo: CoordinateSet
+    hits: int = 0
+
+    @property
+    def is_destroyed(self) -> bool:
+        """Check if all the cells of the ship have shots.
+
+        Returns:
+            bool: True if the ship is destroyed.
+        """
+        return self.hits >= self.ship_size
+
+
+class BoardView:
+    """Read-only view of the board cells.
+
+    View doesn't create new cells, masked state (hidden ships for the opponent) is
+    calculated on every access from the cells of the board. View reflects the current
+    state of the board, so it should not be kept between board changes.
+    """
+
+    __slots__ = ("_cells", "_is_hidden")
+
+    _cells: models.Board
+    _is_hidden: bool
+
+    def __init__(self, cells: models.Board, is_hidden: bool = False) -> None:
+        """Initialization of the view.
+
+        Args:
+            cells (models.Board): cells of the board.
+            is_hidden (bool, optional): True if not hit ships should be hidden.
+                Defaults to False.
+        """
+        self._cells = cells
+        self._is_hidden = is_hidden
+
+    def has_ship(self, row: int, col: int) -> bool:
+        """Check if the ship should be shown in the cell.
+
+        Args:
+            row (int): row index.
+            col (int): column index.
+
+        Returns:
+            bool: True if the cell has visible ship.
+        """
+        cell: models.Cell = self._cells[row][col]
+        return cell.has_ship and (not self._is_hidden or cell.has_shot)
+
+    def has_shot(self, row: int, col: int) -> bool:
+        """Check if the cell has shot.
+
+        Args:
+            row (int): row index.
+            col (int): column index.
+
+        Returns:
+            bool: True if the cell has shot.
+        """
+        return self._cells[row][col].has_shot
+
+    def ship_id(self, row: int, col: int) -> ShipId | None:
+        """Return ship id of the cell.
+
+        Args:
+            row (int): row index.
+            col (int): column index.
+
+        Returns:
+            ShipId | None: ship id or None if the cell is empty or view is hidden.
+        """
+        if self._is_hidden:
+            return None
+        return self._cells[row][col].ship_id
+
+
 class Board:
     """Implementation of the game board logic.
 
@@ -32,26 +121,94 @@ class Board:
 
     _board: models.Board
     _ships_on_board: dict[ShipId, CoordinateSet]
+    _ship_states: dict[ShipId, ShipState]
+    _not_shot_cells: int
+    _alive_ship_cells: int
+    _alive_ships_by_size: dict[int, int]
 
     def __init__(self, board: BoardOrNone = None) -> None:
         """Initialization of the game board (field).
 
         Args:
             board (BoardOrNone, optional): If the game is loaded, new board will not be
-                created and passed board will be used. Defaults to None.
+                created and passed board will be used. Ships and counters are restored
+                from the passed board cells. Defaults to None.
         """
         self._ships_on_board = {}
+        self._ship_states = {}
+        self._alive_ships_by_size = {}
         if board is None:
             self._board = [
                 [models.Cell() for _ in range(utils.SIZE_HORIZONTAL)]
                 for _ in range(utils.SIZE_VERTICAL)
             ]
+            self._not_shot_cells = utils.SIZE_HORIZONTAL * utils.SIZE_VERTICAL
+            self._alive_ship_cells = 0
         else:
             self._board = board
+            self._restore_state()
         log.debug(
             "Inited. board: %s, ships_on_board: %s", self._board, self._ships_on_board
         )
 
+    def _restore_state(self) -> None:
+        """Restore ships on board and counters from the cells of the loaded board."""
+        ships: dict[ShipId, set[tuple[int, int]]] = {}
+        for row_index, row in enumerate(self._board):
+            for col_index, cell in enumerate(row):
+                if cell.has_ship and cell.ship_id is not None:
+                    ships.setdefault(cell.ship_id, set()).add((row_index, col_index))
+        for ship_id, coordinates in ships.items():
+            self._ships_on_board[ship_id] = frozenset(coordinates)
+            self._add_ship_state(ship_id, self._ships_on_board[ship_id])
+        self._not_shot_cells = self._count_amount(lambda cell: not cell.has_shot)
+        self._alive_ship_cells = self._count_amount(
+            lambda cell: not cell.has_shot and cell.has_ship
+        )
+
+    def _add_ship_state(
+        self,
+        ship_id: ShipId,
+        ship_coordinates: CoordinateSet,
+        halo: CoordinateSet | None = None,
+    ) -> None:
+        """Create state record for the ship that is placed on the board.
+
+        Args:
+            ship_id (ShipId): ship id.
+            ship_coordinates (CoordinateSet): ship coordinates.
+            halo (CoordinateSet | None, optional): already calculated coordinates
+                around the ship. Defaults to None.
+        """
+        if halo is None:
+            halo = self._create_neighbour_coordinates(ship_coordinates)
+            halo = halo - ship_coordinates
+        hits: int = 0
+        for row, col in ship_coordinates:
+            if self._board[row][col].has_shot:
+                hits += 1
+        state: ShipState = ShipState(
+            ship_size=len(ship_coordinates),
+            halo=halo,
+            hits=hits,
+        )
+        self._ship_states[ship_id] = state
+        if not state.is_destroyed:
+            self._change_alive_ships(state.ship_size, 1)
+
+    def _change_alive_ships(self, ship_size: int, diff: int) -> None:
+        """Change counter of the alive ships with passed size.
+
+        Args:
+            ship_size (int): size of the ship.
+            diff (int): value that will be added to the counter.
+        """
+        amount: int = self._alive_ships_by_size.get(ship_size, 0) + diff
+        if amount > 0:
+            self._alive_ships_by_size[ship_size] = amount
+        else:
+            self._alive_ships_by_size.pop(ship_size, None)
+
     @staticmethod
     def _create_ship_coordinates(
         coordinate: models.Coordinate, ship: models.Ship
@@ -65,15 +222,8 @@ class Board:
         Returns:
             CoordinateSet: set of coordinates from 1 to 5.
         """
-        coordinates: CoordinateSet = set()
-        row, col = coordinate
-        for diff in range(ship.ship_size):
-            if ship.direction == models.Direction.HORIZONTAL:
-                coordinates.add((row, col + diff))
-            else:
-                coordinates.add((row + diff, col))
-        log.debug(
-            "Ship: %s, Orig coord: %s, created: %s", ship, coordinate, coordinates
+        coordinates, _ = utils.get_ship_footprint(
+            coordinate, ship.ship_size, ship.direction
         )
         return coordinates
 
@@ -89,13 +239,10 @@ class Board:
         Returns:
             set: set of coordinates of neighbours around the ship coordinates.
         """
-        coordinates: CoordinateSet = set()
+        coordinates: set[tuple[int, int]] = set()
         for coordinate in ship_coordinates:
-            neighbours = utils.get_neighbour_coordinates(coordinate)
-            for neighbour in neighbours:
-                coordinates.add(neighbour)
-        log.debug("orig: %s, neighbours: %s", ship_coordinates, coordinates)
-        return coordinates
+            coordinates.update(utils.get_neighbour_coordinates(coordinate))
+        return frozenset(coordinates)
 
     def _validate_coordinates(self, coordinates: CoordinateCollection) -> None:
         """Validation of the all coordinates.
@@ -125,29 +272,28 @@ class Board:
             coordinate (models.Coordinate): Ship base coordinate.
             ship (models.Ship): Ship.
         """
-        ship_coordinates: CoordinateSet = self._create_ship_coordinates(
-            coordinate, ship
+        ship_coordinates, halo = utils.get_ship_footprint(
+            coordinate, ship.ship_size, ship.direction
         )
         self._validate_coordinates(ship_coordinates)
-
-        neighbour_coordinates: CoordinateSet = self._create_neighbour_coordinates(
-            ship_coordinates
-        )
-        self._validate_coordinates(neighbour_coordinates)
+        self._validate_coordinates(halo)
 
         log.debug(
-            "ship: %s, coord: %s, coordinates: %s, neighbours: %s",
+            "ship: %s, coord: %s, coordinates: %s, halo: %s",
             ship,
             coordinate,
             ship_coordinates,
-            neighbour_coordinates,
+            halo,
         )
         for ship_coordinate in ship_coordinates:
             row, col = ship_coordinate
             cell: models.Cell = self._board[row][col]
             cell.has_ship = True
             cell.ship_id = ship.ship_id
+            if not cell.has_shot:
+                self._alive_ship_cells += 1
         self._ships_on_board[ship.ship_id] = ship_coordinates
+        self._add_ship_state(ship.ship_id, ship_coordinates, halo)
 
     def remove_ship(self, coordinate: models.Coordinate) -> ShipId | None:
         """Remove ship from the board (field).
@@ -168,10 +314,15 @@ class Board:
                 raise ex.ShipWithoutIdException("Ship doesn't have id")
             log.debug("ship id: %s", ship_id)
             coordinates: CoordinateSet = self._ships_on_board[ship_id]
+            state: ShipState = self._ship_states.pop(ship_id)
+            if not state.is_destroyed:
+                self._change_alive_ships(state.ship_size, -1)
             for current_coordinate in coordinates:
                 row, col = current_coordinate
                 self._board[row][col].has_ship = False
                 self._board[row][col].ship_id = None
+                if not self._board[row][col].has_shot:
+                    self._alive_ship_cells -= 1
             del self._ships_on_board[ship_id]
             log.debug("removed coordinates: %s", coordinates)
             return ship_id
@@ -189,9 +340,14 @@ class Board:
         utils.validate_coordinate(coordinate)
         row, col = coordinate
         cell: models.Cell = self._board[row][col]
-        log.debug("coord: %s, cell: %s", coordinate, cell)
+        if log.is_debug:
+            log.debug_sampled("coord: %s, cell: %s", coordinate, cell)
+        if cell.has_shot:
+            return cell.has_ship
         cell.has_shot = True
+        self._not_shot_cells -= 1
         if cell.has_ship:
+            self._alive_ship_cells -= 1
             self._process_cells_after_shot(coordinate)
         return cell.has_ship
 
@@ -213,26 +369,57 @@ class Board:
             for cell in row:
                 has_ship: bool = cell.has_ship
                 has_shot: bool = cell.has_shot
-                show_ship: bool = (not is_hidden and has_ship) or (
-                    is_hidden and has_ship and has_shot
-                )
-                log.debug("show_ship: %s", show_ship)
+                show_ship: bool = has_ship and (not is_hidden or has_shot)
                 ship_id = None if is_hidden else cell.ship_id
                 new_cell = models.Cell(
                     ship_id=ship_id, has_ship=show_ship, has_shot=has_shot
                 )
                 new_row.append(new_cell)
             field_to_return.append(new_row)
-        log.debug("field_to_return: %s", field_to_return)
         return field_to_return
 
+    def get_view(self, is_hidden: bool = False) -> BoardView:
+        """Return read-only view of the game board without copying the cells.
+
+        Args:
+            is_hidden (bool, optional): If board requested for by opponent
+            (display on UI) - this parameter will hide not hit ships.
+            Defaults to False.
+
+        Returns:
+            BoardView: view of the board.
+        """
+        return BoardView(self._board, is_hidden)
+
+    def copy(self) -> "Board":
+        """Create independent copy of the board.
+
+        Cells and states of the ships are copied, coordinates of the ships are
+        shared (they are immutable).
+
+        Returns:
+            Board: copy.
+        """
+        copied: Board = copy.copy(self)
+        copied._board = [
+            [models.Cell(cell.ship_id, cell.has_ship, cell.has_shot) for cell in row]
+            for row in self._board
+        ]
+        copied._ships_on_board = dict(self._ships_on_board)
+        copied._ship_states = {
+            ship_id: dataclasses.replace(state)
+            for ship_id, state in self._ship_states.items()
+        }
+        copied._alive_ships_by_size = dict(self._alive_ships_by_size)
+        return copied
+
     def get_amount_of_not_shot_cells(self) -> int:
         """Return amount of the cells without shot.
 
         Returns:
             int: number of cells.
         """
-        return self._count_amount(lambda cell: not cell.has_shot)
+        return self._not_shot_cells
 
     def get_amount_of_alive_ships(self) -> int:
         """Returns number of cells with ships without hit.
@@ -240,7 +427,15 @@ class Board:
         Returns:
             int: amount of cells.
         """
-        return self._count_amount(lambda cell: not cell.has_shot and cell.has_ship)
+        return self._alive_ship_cells
+
+    def get_amount_of_alive_ships_by_size(self) -> dict[int, int]:
+        """Returns number of not destroyed ships grouped by the ship size.
+
+        Returns:
+            dict[int, int]: ship size to amount of alive ships.
+        """
+        return dict(self._alive_ships_by_size)
 
     def _count_amount(self, cell_filter: Filter) -> int:
         """Utility method to count cells by criteria filter.
@@ -263,7 +458,7 @@ class Board:
     def _process_cells_after_shot(self, coordinate: models.Coordinate) -> None:
         """Recalculate board state when shot was made.
 
-        Add shots to the empty cell around destroyed ship.
+        Count hit of the ship and add shots to the empty cells around destroyed ship.
 
         Args:
             coordinate (models.Coordinate): coordinate of shot.
@@ -272,21 +467,12 @@ class Board:
         cell = self._board[row][col]
         assert cell.has_ship
         assert cell.ship_id is not None
-        ship_coordinates: CoordinateSet = self._ships_on_board[cell.ship_id]
-        ship_size: int = len(ship_coordinates)
-        ship_destroyed_cells: int = 0
-        for ship_coordinate in ship_coordinates:
-            ship_row, ship_col = ship_coordinate
-            ship_cell: models.Cell = self._board[ship_row][ship_col]
-            if ship_cell.has_ship and ship_cell.has_shot:
-                ship_destroyed_cells += 1
-        is_destroyed: bool = ship_destroyed_cells == ship_size
-        if is_destroyed:
-            for process_coordinate in ship_coordinates:
-                neighbours: CoordinateSet = utils.get_neighbour_coordinates(
-                    process_coordinate
-                )
-                for neighbour in neighbours:
-                    n_row, n_col = neighbour
-                    n_cell: models.Cell = self._board[n_row][n_col]
+        state: ShipState = self._ship_states[cell.ship_id]
+        state.hits += 1
+        if state.is_destroyed:
+            self._change_alive_ships(state.ship_size, -1)
+            for n_row, n_col in state.halo:
+                n_cell: models.Cell = self._board[n_row][n_col]
+                if not n_cell.has_shot:
                     n_cell.has_shot = True
+                    self._not_shot_cells -= 1
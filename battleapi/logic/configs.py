@@ -1,11 +1,11 @@
 """Definition of the abstract configuration."""
 import abc
 import enum
-import logging
 
 import battleapi.logic.models as models
+import battleapi.utils.logs as logs
 
-log: logging.Logger = logging.getLogger(__name__)
+log: logs.StructuredLogger = logs.get_logger(__name__)
 
 Amount = int
 Size = int
@@ -139,3 +139,41 @@ class CustomGameConfiguration(GameConfiguration):
             models.ShipType.Battleship: 2,
             models.ShipType.Carrier: 1,
         }
+
+
+class MappingGameConfiguration(GameConfiguration):
+    """Game Configuration defined by passed mappings.
+
+    Args:
+        config (_type_): GameConfiguration
+    """
+
+    def __init__(
+        self,
+        size_mapping: dict[models.ShipType, Size],
+        amount_mapping: dict[models.ShipType, Amount],
+    ) -> None:
+        """Initialization of the configuration.
+
+        Args:
+            size_mapping (dict[models.ShipType, Size]): ship_type to size map.
+            amount_mapping (dict[models.ShipType, Amount]): ship_type to amount map.
+        """
+        self._size_mapping: dict[models.ShipType, Size] = dict(size_mapping)
+        self._amount_mapping: dict[models.ShipType, Amount] = dict(amount_mapping)
+
+    def get_size_mapping(self) -> dict[models.ShipType, Size]:
+        """Return mapping of the ShipType to its Size in cells amount.
+
+        Returns:
+            dict[models.ShipType, int]: ship_type to size map.
+        """
+        return dict(self._size_mapping)
+
+    def get_amount_mapping(self) -> dict[models.ShipType, Amount]:
+        """Return mapping of the ShipType to its amount available for player.
+
+        Returns:
+            dict[models.ShipType, int]: ship_type to amount map.
+        """
+        return dict(self._amount_mapping)
@@ -0,0 +1,76 @@
+"""Events of the game.
+
+Every change of the game made by game.Game is recorded as an event. Applying the
+events to the game in the same order recreates the same game state, so list of the
+events is a full history (replay) of the game session.
+"""
+import dataclasses
+
+import battleapi.logic.models as models
+
+
+@dataclasses.dataclass(frozen=True)
+class PlayerJoined:
+    """Player is added to the game.
+
+    player_id - id of the player.
+    player_name - name of the player.
+    ship_ids - ids of the created ships in the order of the game config.
+    """
+
+    player_id: str
+    player_name: str
+    ship_ids: tuple[str, ...]
+
+
+@dataclasses.dataclass(frozen=True)
+class ShipPlaced:
+    """Ship is added to the board of the player.
+
+    player_id - id of the player.
+    ship_id - id of the ship.
+    coordinate - base coordinate of the ship.
+    direction - name of the ship direction.
+    """
+
+    player_id: str
+    ship_id: str
+    coordinate: models.Coordinate
+    direction: str
+
+
+@dataclasses.dataclass(frozen=True)
+class ShipRemoved:
+    """Ship is removed from the board of the player.
+
+    player_id - id of the player.
+    coordinate - any coordinate of the removed ship.
+    """
+
+    player_id: str
+    coordinate: models.Coordinate
+
+
+@dataclasses.dataclass(frozen=True)
+class PlayerReady:
+    """Player finished preparation (or tried to).
+
+    player_id - id of the player.
+    """
+
+    player_id: str
+
+
+@dataclasses.dataclass(frozen=True)
+class ShotFired:
+    """Player made shot by the opponent board.
+
+    player_id - id of the player who made the shot.
+    coordinate - coordinate of the shot.
+    """
+
+    player_id: str
+    coordinate: models.Coordinate
+
+
+GameEvent = PlayerJoined | ShipPlaced | ShipRemoved | PlayerReady | ShotFired
@@ -97,3 +97,34 @@ class SessionIsNotCreatedException(Exception):
 
     def __init__(self, message: str) -> None:
         Exception.__init__(self, message)
+
+
+class SessionVersionConflictException(Exception):
+    """Exception is raised when session was changed by someone else after it was loaded
+    (stored version is not the expected one)."""
+
+    def __init__(self, message: str = "") -> None:
+        Exception.__init__(self, message)
+
+
+class NotPlayerTurnException(Exception):
+    """Exception is raised when player makes a shot not in its turn or not on the
+    gameplay stage."""
+
+    def __init__(self, message: str = "") -> None:
+        Exception.__init__(self, message)
+
+
+class PlayerIsReadyException(Exception):
+    """Exception is raised when fleet of the player is changed after the player became
+    ready."""
+
+    def __init__(self, message: str = "") -> None:
+        Exception.__init__(self, message)
+
+
+class ShipNotFoundException(Exception):
+    """Exception is raised when ship is not found among the ships of the player."""
+
+    def __init__(self, message: str = "") -> None:
+        Exception.__init__(self, message)
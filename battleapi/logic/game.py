@@ -1,16 +1,24 @@
 """Implementation of the game logic"""
 
-import logging
+import random
+from typing import Callable, Iterable, Iterator
 
 import battleapi.abstract as abstract
 import battleapi.logic.board as board
 import battleapi.logic.configs as config
+import battleapi.logic.events as events
 import battleapi.logic.exceptions as ex
 import battleapi.logic.models as models
+import battleapi.logic.placement as placement
 import battleapi.logic.player as pl
 import battleapi.logic.utils as utils
+import battleapi.utils.logs as logs
 
-log: logging.Logger = logging.getLogger(__name__)
+log: logs.StructuredLogger = logs.get_logger(__name__)
+
+BoardFactory = Callable[[], pl.GameBoard]
+
+RANDOM: random.Random = random.Random()
 
 
 class Game:
@@ -35,6 +43,8 @@ class Game:
     _game_config: config.GameConfiguration
     _players: dict[str, pl.Player]
     _active_player_id: str
+    _board_factory: BoardFactory
+    _events: list[events.GameEvent]
 
     def __init__(
         self,
@@ -42,6 +52,7 @@ class Game:
         game_config: config.GameConfiguration,
         players: dict[str, pl.Player] | None = None,
         active_player_id: str | None = None,
+        board_factory: BoardFactory | None = None,
     ) -> None:
         """Initialization of the game.
 
@@ -52,6 +63,8 @@ class Game:
                 Defaults to None.
             active_player_id (str | None, optional): id if the active player
                 (who should do the turn). Defaults to None.
+            board_factory (BoardFactory | None, optional): creates board (engine) for
+                the new players. Defaults to None (board.Board is used).
         """
         utils.validate_is_not_none(id_generator, "id_generator")
         utils.validate_is_not_none(game_config, "game_config")
@@ -59,6 +72,8 @@ class Game:
         self._game_config = game_config
         self._players = {} if players is None else players
         self._active_player_id = "" if active_player_id is None else active_player_id
+        self._board_factory = board.Board if board_factory is None else board_factory
+        self._events = []
         log.debug(
             "id_gen: %s, config: %s, players: %s, active: %s",
             id_generator,
@@ -67,12 +82,19 @@ class Game:
             self._active_player_id,
         )
 
-    def add_player(self, player_id: str, player_name: str) -> None:
+    def add_player(
+        self,
+        player_id: str,
+        player_name: str,
+        ship_ids: Iterable[str] | None = None,
+    ) -> None:
         """Add player to the game session.
 
         Args:
             player_id (str): player id.
             player_name (str): player name.
+            ship_ids (Iterable[str] | None, optional): ids of the ships in the order of
+                the game config. Defaults to None (ids are generated).
 
         Raises:
             ex.ToManyPlayersException: raised on the number of players > 2.
@@ -89,21 +111,32 @@ class Game:
             raise ex.PlayerExistException(f"Player {player_id} already exist")
         ships_not_on_board = {}
         all_ships = {}
+        ids: Iterator[str] | None = None if ship_ids is None else iter(ship_ids)
         for config in self._game_config.get_ship_configs():
             size = config.ship_size
             amount = config.ship_amount
             for _ in range(amount):
-                ship_id = self._id_generator.generate_id()
+                if ids is None:
+                    ship_id = self._id_generator.generate_id()
+                else:
+                    ship_id = next(ids)
                 ship = models.Ship(ship_id, size)
                 ships_not_on_board[ship_id] = ship
                 all_ships[ship_id] = ship
         log.debug("ships not on board: %s", ships_not_on_board)
         log.debug("all ships: %s", all_ships)
         player = pl.Player(
-            player_id, player_name, board.Board(), ships_not_on_board, all_ships
+            player_id,
+            player_name,
+            self._board_factory(),
+            ships_not_on_board,
+            all_ships,
         )
         log.debug("player: %s", player)
         self._players[player.player_id] = player
+        self._events.append(
+            events.PlayerJoined(player_id, player_name, tuple(all_ships.keys()))
+        )
 
     def is_game_initialized(self) -> bool:
         """Check if the game initialized.
@@ -155,9 +188,12 @@ class Game:
         player: pl.Player = self._players[player_id]
         if ship.ship_id not in player.ships_not_on_board.keys():
             raise ex.ShipAlreadyOnTheBoardException(f"{ship.ship_id} can't be added")
-        game_board: board.Board = player.board
+        game_board: pl.GameBoard = player.board
         game_board.add_ship(coordinate, ship)
         del player.ships_not_on_board[ship.ship_id]
+        self._events.append(
+            events.ShipPlaced(player_id, ship.ship_id, coordinate, ship.direction.name)
+        )
         return True
 
     def remove_ship(self, player_id: str, coordinate: models.Coordinate) -> bool:
@@ -179,8 +215,48 @@ class Game:
             return False
         ship: models.Ship = player.all_ships[ship_id]
         player.ships_not_on_board[ship_id] = ship
+        self._events.append(events.ShipRemoved(player_id, coordinate))
         return True
 
+    def randomize_fleet(self, player_id: str, rng: random.Random | None = None) -> None:
+        """Put all ships of the player on the random legal positions.
+
+        Ships that are already on the board are removed first. Positions are sampled
+        from the precomputed placement tables (see placement.sample_fleet), ships are
+        added one by one, so the changes are recorded as usual events.
+
+        Args:
+            player_id (str): player id.
+            rng (random.Random | None, optional): random generator.
+                Defaults to None (shared generator).
+
+        Raises:
+            ex.PlayerIsReadyException: raised if the player is already ready (so the
+                game may be started).
+        """
+        utils.validate_player_id(player_id)
+        player: pl.Player = self._players[player_id]
+        if player.is_ready or self.is_game_ready():
+            raise ex.PlayerIsReadyException(f"Player {player_id} is already ready")
+        view: pl.GameBoardView = player.board.get_view()
+        removed: set[str] = set()
+        for row in range(utils.SIZE_VERTICAL):
+            for col in range(utils.SIZE_HORIZONTAL):
+                ship_id: str | None = view.ship_id(row, col)
+                if ship_id is not None and ship_id not in removed:
+                    removed.add(ship_id)
+                    self.remove_ship(player_id, (row, col))
+        ships: list[models.Ship] = sorted(
+            player.all_ships.values(), key=lambda ship: ship.ship_size, reverse=True
+        )
+        fleet: list[placement.Placement] = placement.sample_fleet(
+            tuple(ship.ship_size for ship in ships), RANDOM if rng is None else rng
+        )
+        log.debug("player id: %s, fleet: %s", player_id, fleet)
+        for ship, ship_placement in zip(ships, fleet):
+            ship.direction = ship_placement.direction
+            self.add_ship(player_id, ship_placement.coordinate, ship)
+
     def make_player_ready(self, player_id: str) -> bool:
         """Change player status to ready.
 
@@ -198,6 +274,7 @@ class Game:
         if len(player.ships_not_on_board) == 0:
             player.is_ready = True
         self._select_active_player(player)
+        self._events.append(events.PlayerReady(player_id))
         return player.is_ready
 
     def _select_active_player(self, player: pl.Player) -> None:
@@ -244,6 +321,23 @@ class Game:
         player: pl.Player = self._players[current_player_id]
         return player.board.get_board(is_hidden)
 
+    def get_player_board_view(
+        self, current_player_id: str, is_hidden: bool = False
+    ) -> pl.GameBoardView:
+        """Return read-only view of the game board (field) for player.
+
+        Args:
+            current_player_id (str): player id.
+            is_hidden (bool, optional): flag to sho ships if requested for opponent.
+                Defaults to False.
+
+        Returns:
+            pl.GameBoardView: view of the game board (field).
+        """
+        utils.validate_player_id(current_player_id)
+        player: pl.Player = self._players[current_player_id]
+        return player.board.get_view(is_hidden)
+
     def get_opponent_board(self, current_player_id: str) -> models.Board:
         """Return opponent board with hidden ships.
 
@@ -275,6 +369,7 @@ class Game:
             self._active_player_id = player_id
         else:
             self._active_player_id = enemy.player_id
+        self._events.append(events.ShotFired(player_id, coordinate))
         return success
 
     def is_game_finished(self) -> bool:
@@ -289,6 +384,23 @@ class Game:
                 return True
         return False
 
+    def get_alive_ships_by_type(self, player_id: str) -> dict[models.ShipType, int]:
+        """Return amount of not destroyed ships of the player by ship type.
+
+        Args:
+            player_id (str): player id.
+
+        Returns:
+            dict[models.ShipType, int]: ship type to amount of alive ships.
+        """
+        utils.validate_player_id(player_id)
+        player: pl.Player = self._players[player_id]
+        alive_by_size: dict[int, int] = player.board.get_amount_of_alive_ships_by_size()
+        return {
+            ship_type: alive_by_size.get(ship_size, 0)
+            for ship_type, ship_size in self._game_config.get_size_mapping().items()
+        }
+
     def get_winner(self) -> pl.Player | None:
         """Get winner of the game.
 
@@ -333,6 +445,37 @@ class Game:
             f"Opponent is not found. {self.players.keys()}"
         )
 
+    def apply_event(self, event: events.GameEvent) -> None:
+        """Repeat change recorded by the event.
+
+        Args:
+            event (events.GameEvent): recorded event.
+        """
+        log.debug("event: %s", event)
+        match event:
+            case events.PlayerJoined(player_id, player_name, ship_ids):
+                self.add_player(player_id, player_name, ship_ids)
+            case events.ShipPlaced(player_id, ship_id, coordinate, direction):
+                ship: models.Ship = self._players[player_id].ships_not_on_board[ship_id]
+                ship.direction = models.Direction[direction]
+                self.add_ship(player_id, coordinate, ship)
+            case events.ShipRemoved(player_id, coordinate):
+                self.remove_ship(player_id, coordinate)
+            case events.PlayerReady(player_id):
+                self.make_player_ready(player_id)
+            case events.ShotFired(player_id, coordinate):
+                self.make_shot(player_id, coordinate)
+
+    def pop_events(self) -> list[events.GameEvent]:
+        """Return events of the changes made since the previous call.
+
+        Returns:
+            list[events.GameEvent]: events in the order of the changes.
+        """
+        recorded: list[events.GameEvent] = self._events
+        self._events = []
+        return recorded
+
     @property
     def game_config(self) -> config.GameConfiguration:
         """Return current game configuration.
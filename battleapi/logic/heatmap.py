@@ -0,0 +1,324 @@
+"""Bot player that shoots by the placement probability heatmap.
+
+Heatmap of the opponent board is the number of the possible placements of the alive
+ships covering every cell. Placements are taken from the precomputed tables
+(battleapi.logic.placement), every placement is impossible when it covers a miss or a
+destroyed ship or touches the hit cell without covering it. Placements that cover
+not destroyed hits get HIT_WEIGHT times more weight for every hit, so the bot
+finishes the damaged ship.
+
+The heatmap is not recalculated: only placements that cover or touch the newly shot
+cells are changed, so the choice of the shot takes well below 1 ms, and the state of
+the bot is a few lists (many bots can be kept in one process).
+"""
+import dataclasses
+import functools
+import random
+
+import battleapi.logic.configs as configs
+import battleapi.logic.models as models
+import battleapi.logic.placement as placement
+import battleapi.logic.utils as utils
+import battleapi.utils.logs as logs
+
+log: logs.StructuredLogger = logs.get_logger(__name__)
+
+Mask = int
+
+BOARD_CELLS: int = utils.SIZE_VERTICAL * utils.SIZE_HORIZONTAL
+NEIGHBOUR_MASKS: tuple[Mask, ...] = utils.get_neighbour_mask_index()
+HIT_WEIGHT: int = 50
+
+
+def iterate_cells(mask: Mask) -> list[int]:
+    """Return indexes of the cells of the mask.
+
+    Args:
+        mask (Mask): cells.
+
+    Returns:
+        list[int]: indexes of the cells (bit indexes), lowest first.
+    """
+    cells: list[int] = []
+    while mask:
+        lowest: Mask = mask & -mask
+        cells.append(lowest.bit_length() - 1)
+        mask ^= lowest
+    return cells
+
+
+def board_to_masks(cells: models.Board) -> tuple[Mask, Mask]:
+    """Convert the board (for example Board.get_board(is_hidden=True)) to the masks.
+
+    Args:
+        cells (models.Board): cells of the board.
+
+    Returns:
+        tuple[Mask, Mask]: cells with shots and cells with visible ships.
+    """
+    shots: Mask = 0
+    ships: Mask = 0
+    bit: Mask = 1
+    for row in cells:
+        for cell in row:
+            if cell.has_shot:
+                shots |= bit
+            if cell.has_ship:
+                ships |= bit
+            bit <<= 1
+    return shots, ships
+
+
+def find_destroyed_ship(cell: int, shots: Mask, hits: Mask) -> Mask:
+    """Find hits of the ship and check that the ship is destroyed.
+
+    Ship is destroyed when all cells around its hits have shots (board marks them
+    when the ship is destroyed, ships can't touch each other).
+
+    Args:
+        cell (int): index of the hit cell.
+        shots (Mask): cells with shots.
+        hits (Mask): cells with visible (hit) ships.
+
+    Returns:
+        Mask: cells of the destroyed ship or 0 if it is not destroyed.
+    """
+    ship: Mask = 1 << cell
+    frontier: Mask = ship
+    while frontier:
+        around: Mask = 0
+        for index in iterate_cells(frontier):
+            around |= NEIGHBOUR_MASKS[index]
+        frontier = around & hits & ~ship
+        ship |= frontier
+    around = 0
+    for index in iterate_cells(ship):
+        around |= NEIGHBOUR_MASKS[index]
+    if around & ~ship & ~shots:
+        return 0
+    return ship
+
+
+@dataclasses.dataclass(frozen=True)
+class PlacementIndex:
+    """Placements of all ship sizes of the fleet with the indexes by cell.
+
+    Attributes:
+        sizes (tuple[int, ...]): ship size of every placement.
+        cells (tuple[tuple[int, ...], ...]): cells of every placement.
+        covering (tuple[tuple[int, ...], ...]): placements covering the cell.
+        touching (tuple[tuple[int, ...], ...]): placements that have the cell
+            around the ship.
+    """
+
+    sizes: tuple[int, ...]
+    cells: tuple[tuple[int, ...], ...]
+    covering: tuple[tuple[int, ...], ...]
+    touching: tuple[tuple[int, ...], ...]
+
+
+@functools.lru_cache(maxsize=None)
+def get_placement_index(ship_sizes: tuple[int, ...]) -> PlacementIndex:
+    """Build index of the placements of the different ship sizes (cached).
+
+    Args:
+        ship_sizes (tuple[int, ...]): different sizes of the ships.
+
+    Returns:
+        PlacementIndex: placements.
+    """
+    sizes: list[int] = []
+    cells: list[tuple[int, ...]] = []
+    covering: list[list[int]] = [[] for _ in range(BOARD_CELLS)]
+    touching: list[list[int]] = [[] for _ in range(BOARD_CELLS)]
+    for size in ship_sizes:
+        for ship_placement in placement.get_placements(size):
+            index: int = len(sizes)
+            sizes.append(size)
+            cells.append(tuple(iterate_cells(ship_placement.mask)))
+            for cell in cells[-1]:
+                covering[cell].append(index)
+            for cell in iterate_cells(ship_placement.blocked & ~ship_placement.mask):
+                touching[cell].append(index)
+    return PlacementIndex(
+        tuple(sizes),
+        tuple(cells),
+        tuple(tuple(indexes) for indexes in covering),
+        tuple(tuple(indexes) for indexes in touching),
+    )
+
+
+class HeatmapBot:
+    """Bot that chooses the shot with the highest placement probability.
+
+    Bot observes the hidden opponent board after every shot (its own and the
+    following ones) and updates the heatmap by the newly shot cells only.
+    """
+
+    _fleet: tuple[int, ...]
+    _index: PlacementIndex
+    _rng: random.Random
+    _alive: dict[int, int]
+    _weights: list[int]
+    _heatmap: dict[int, list[int]]
+    _shots: Mask
+    _hits: Mask
+
+    def __init__(
+        self,
+        game_config: configs.GameConfiguration | None = None,
+        rng: random.Random | None = None,
+    ) -> None:
+        """Initialization of the bot.
+
+        Args:
+            game_config (configs.GameConfiguration | None, optional): fleet of the
+                opponent. Defaults to None (classic).
+            rng (random.Random | None, optional): random generator of the choice
+                between cells with the same weight. Defaults to None (new generator).
+        """
+        if game_config is None:
+            game_config = configs.ClassicGameConfiguration()
+        self._fleet = placement.get_fleet_sizes(game_config)
+        self._index = get_placement_index(tuple(sorted(set(self._fleet))))
+        self._rng = random.Random() if rng is None else rng
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all observed shots."""
+        self._alive = {}
+        for size in self._fleet:
+            self._alive[size] = self._alive.get(size, 0) + 1
+        self._weights = [1] * len(self._index.sizes)
+        self._heatmap = {size: [0] * BOARD_CELLS for size in self._alive}
+        for index, cells in enumerate(self._index.cells):
+            heatmap: list[int] = self._heatmap[self._index.sizes[index]]
+            for cell in cells:
+                heatmap[cell] += 1
+        self._shots = 0
+        self._hits = 0
+
+    def _change_weight(self, index: int, weight: int) -> None:
+        """Change weight of the placement and the heatmap of its cells.
+
+        Args:
+            index (int): index of the placement.
+            weight (int): new weight, 0 if the placement is impossible.
+        """
+        diff: int = weight - self._weights[index]
+        if not diff:
+            return
+        self._weights[index] = weight
+        heatmap: list[int] = self._heatmap[self._index.sizes[index]]
+        for cell in self._index.cells[index]:
+            heatmap[cell] += diff
+
+    def _exclude_covering(self, cell: int) -> None:
+        """Exclude placements covering the cell (miss or destroyed ship).
+
+        Args:
+            cell (int): index of the cell.
+        """
+        for index in self._index.covering[cell]:
+            self._change_weight(index, 0)
+
+    def _on_hit(self, cell: int) -> None:
+        """Update placements after the hit.
+
+        Args:
+            cell (int): index of the cell.
+        """
+        for index in self._index.touching[cell]:
+            self._change_weight(index, 0)
+        for index in self._index.covering[cell]:
+            self._change_weight(index, self._weights[index] * HIT_WEIGHT)
+
+    def _on_destroyed(self, ship: Mask) -> None:
+        """Update alive ships and placements after the ship is destroyed.
+
+        Args:
+            ship (Mask): cells of the destroyed ship.
+        """
+        cells: list[int] = iterate_cells(ship)
+        size: int = len(cells)
+        if self._alive.get(size, 0) > 0:
+            self._alive[size] -= 1
+        for cell in cells:
+            self._exclude_covering(cell)
+
+    def observe(self, shots: Mask, hits: Mask) -> None:
+        """Update heatmap by the current state of the opponent board.
+
+        Only the cells shot since the previous observation are processed. If the
+        state doesn't continue the observed one (other game or the changes were
+        rolled back), the bot starts from the scratch.
+
+        Args:
+            shots (Mask): cells with shots.
+            hits (Mask): cells with visible (hit) ships.
+        """
+        if self._shots & ~shots or self._hits & ~hits:
+            log.debug("Board doesn't continue observed state, reset")
+            self.reset()
+        new_shots: Mask = shots & ~self._shots
+        self._shots = shots
+        self._hits = hits
+        new_hits: Mask = new_shots & hits
+        for cell in iterate_cells(new_shots & ~hits):
+            self._exclude_covering(cell)
+        for cell in iterate_cells(new_hits):
+            self._on_hit(cell)
+        while new_hits:
+            cell: int = (new_hits & -new_hits).bit_length() - 1
+            ship: Mask = find_destroyed_ship(cell, self._shots, self._hits)
+            if ship:
+                self._on_destroyed(ship)
+                new_hits &= ~ship
+            else:
+                new_hits &= ~(1 << cell)
+
+    def observe_board(self, cells: models.Board) -> None:
+        """Update heatmap by the hidden opponent board (see observe).
+
+        Args:
+            cells (models.Board): result of Board.get_board(is_hidden=True).
+        """
+        self.observe(*board_to_masks(cells))
+
+    def get_heatmap(self) -> list[int]:
+        """Return weight of every cell (0 for the cells with shots).
+
+        Returns:
+            list[int]: weights by the cell index.
+        """
+        heatmap: list[int] = [0] * BOARD_CELLS
+        for size, alive in self._alive.items():
+            if alive:
+                for cell, weight in enumerate(self._heatmap[size]):
+                    heatmap[cell] += alive * weight
+        for cell in iterate_cells(self._shots):
+            heatmap[cell] = 0
+        return heatmap
+
+    def choose_shot(self, rng: random.Random | None = None) -> models.Coordinate:
+        """Choose the cell without shot with the highest weight.
+
+        Args:
+            rng (random.Random | None, optional): random generator of the choice
+                between cells with the same weight. Defaults to None (generator of
+                the bot).
+
+        Returns:
+            models.Coordinate: coordinate of the shot.
+        """
+        heatmap: list[int] = self.get_heatmap()
+        best: int = max(heatmap)
+        if best:
+            cells: list[int] = [
+                cell for cell, value in enumerate(heatmap) if value == best
+            ]
+        else:
+            cells = iterate_cells(~self._shots & ((1 << BOARD_CELLS) - 1))
+        return utils.index_to_coordinate(
+            (self._rng if rng is None else rng).choice(cells)
+        )
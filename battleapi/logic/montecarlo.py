@@ -0,0 +1,451 @@
+"""Bot player that shoots by the Monte-Carlo estimation of the cell occupancy.
+
+Bot samples random fleets consistent with the observed opponent board: every hit is
+covered by a ship, misses (including cells around the destroyed ships marked by the
+board) are not, destroyed ships are removed from the fleet. Probability of the ship
+in the cell is the share of the sampled fleets that occupy it.
+
+Fleet is sampled by covering the unresolved hits first (placements from the
+precomputed tables of battleapi.logic.placement that cover the hit and don't touch
+other hits), the rest of the alive ships are placed randomly. Fleets are kept only as
+the masks of all ship cells, so a sample stays valid for the next moves while it
+agrees with the new shots: cached samples are filtered after every move and only
+the missing ones are sampled again.
+
+Sampling takes the per-move time budget. It can be split between the worker
+processes by passing the executor (for example shared ProcessPoolExecutor),
+otherwise fleets are sampled in the current process.
+"""
+import concurrent.futures
+import dataclasses
+import functools
+import random
+import time
+
+import battleapi.logic.configs as configs
+import battleapi.logic.heatmap as heatmap
+import battleapi.logic.models as models
+import battleapi.logic.placement as placement
+import battleapi.logic.utils as utils
+import battleapi.utils.logs as logs
+
+log: logs.StructuredLogger = logs.get_logger(__name__)
+
+Mask = int
+PlacementMasks = tuple[tuple[Mask, Mask], ...]
+
+BOARD_MASK: Mask = (1 << heatmap.BOARD_CELLS) - 1
+DEFAULT_SAMPLES: int = 2000
+DEFAULT_TIME_BUDGET: float = 0.05
+DEFAULT_TASKS: int = 4
+TIME_CHECK_INTERVAL: int = 16
+
+
+@dataclasses.dataclass(frozen=True)
+class SamplerState:
+    """Observed state of the opponent board prepared for sampling (picklable).
+
+    Attributes:
+        ship_sizes (tuple[int, ...]): sizes of the alive ships, the biggest first.
+        shots (Mask): cells with shots.
+        hits (Mask): cells with visible (hit) ships.
+        unresolved (Mask): hits of the not destroyed ships.
+        forbidden (Mask): cells that can't have alive ships (misses and destroyed
+            ships).
+    """
+
+    ship_sizes: tuple[int, ...]
+    shots: Mask
+    hits: Mask
+    unresolved: Mask
+    forbidden: Mask
+
+
+def create_sampler_state(
+    fleet: tuple[int, ...], shots: Mask, hits: Mask
+) -> SamplerState:
+    """Find destroyed ships and prepare the state for sampling.
+
+    Args:
+        fleet (tuple[int, ...]): sizes of all ships, the biggest first.
+        shots (Mask): cells with shots.
+        hits (Mask): cells with visible (hit) ships.
+
+    Returns:
+        SamplerState: state of the board.
+    """
+    alive: list[int] = list(fleet)
+    destroyed: Mask = 0
+    rest: Mask = hits
+    while rest:
+        cell: int = (rest & -rest).bit_length() - 1
+        ship: Mask = heatmap.find_destroyed_ship(cell, shots, hits)
+        if ship:
+            destroyed |= ship
+            size: int = bin(ship).count("1")
+            if size in alive:
+                alive.remove(size)
+            rest &= ~ship
+        else:
+            rest &= ~(1 << cell)
+    return SamplerState(
+        ship_sizes=tuple(alive),
+        shots=shots,
+        hits=hits,
+        unresolved=hits & ~destroyed,
+        forbidden=(shots & ~hits) | destroyed,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_placement_masks(ship_size: int) -> PlacementMasks:
+    """Return masks of the ship and blocked cells of all placements (cached).
+
+    Args:
+        ship_size (int): number of the ship cells.
+
+    Returns:
+        PlacementMasks: pairs of the ship mask and blocked mask.
+    """
+    return tuple(
+        (ship_placement.mask, ship_placement.blocked)
+        for ship_placement in placement.get_placements(ship_size)
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_covering_masks(ship_size: int) -> tuple[PlacementMasks, ...]:
+    """Return placements covering every cell of the board (cached).
+
+    Args:
+        ship_size (int): number of the ship cells.
+
+    Returns:
+        tuple[PlacementMasks, ...]: placements by the cell index.
+    """
+    covering: list[list[tuple[Mask, Mask]]] = [[] for _ in range(heatmap.BOARD_CELLS)]
+    for mask, blocked in get_placement_masks(ship_size):
+        for cell in heatmap.iterate_cells(mask):
+            covering[cell].append((mask, blocked))
+    return tuple(tuple(masks) for masks in covering)
+
+
+@dataclasses.dataclass(frozen=True)
+class SamplerTables:
+    """Placements of the alive ships allowed by the observed board.
+
+    Attributes:
+        free (dict[int, PlacementMasks]): placements that don't cover forbidden
+            cells and hits and don't touch hits, by ship size.
+        covering (dict[int, dict[int, PlacementMasks]]): placements that cover the
+            unresolved hit and don't touch other hits, by ship size and hit cell.
+    """
+
+    free: dict[int, PlacementMasks]
+    covering: dict[int, dict[int, PlacementMasks]]
+
+
+def create_sampler_tables(state: SamplerState) -> SamplerTables:
+    """Filter placements of the alive ships by the observed board.
+
+    Args:
+        state (SamplerState): state of the board.
+
+    Returns:
+        SamplerTables: allowed placements.
+    """
+    free: dict[int, PlacementMasks] = {}
+    covering: dict[int, dict[int, PlacementMasks]] = {}
+    unresolved_cells: list[int] = heatmap.iterate_cells(state.unresolved)
+    for size in set(state.ship_sizes):
+        free[size] = tuple(
+            (mask, blocked)
+            for mask, blocked in get_placement_masks(size)
+            if not mask & state.forbidden and not blocked & state.unresolved
+        )
+        covering[size] = {
+            cell: tuple(
+                (mask, blocked)
+                for mask, blocked in get_covering_masks(size)[cell]
+                if not mask & state.forbidden and not blocked & ~mask & state.unresolved
+            )
+            for cell in unresolved_cells
+        }
+    return SamplerTables(free, covering)
+
+
+def sample_fleet_mask(
+    state: SamplerState, rng: random.Random, tables: SamplerTables | None = None
+) -> Mask | None:
+    """Sample cells of the alive ships consistent with the observed board.
+
+    Args:
+        state (SamplerState): state of the board.
+        rng (random.Random): random generator.
+        tables (SamplerTables | None, optional): result of the
+            create_sampler_tables for the state. Defaults to None (created).
+
+    Returns:
+        Mask | None: cells of all ships (destroyed ones included) or None if the
+            sample is rejected.
+    """
+    if tables is None:
+        tables = create_sampler_tables(state)
+    sizes: list[int] = list(state.ship_sizes)
+    occupied: Mask = 0
+    ships: Mask = 0
+    uncovered: Mask = state.unresolved
+    while uncovered:
+        cell: int = (uncovered & -uncovered).bit_length() - 1
+        candidates: list[tuple[int, Mask, Mask]] = [
+            (size, mask, blocked)
+            for size in set(sizes)
+            for mask, blocked in tables.covering[size][cell]
+            if not mask & occupied
+        ]
+        if not candidates:
+            return None
+        size, mask, blocked = rng.choice(candidates)
+        sizes.remove(size)
+        occupied |= blocked
+        ships |= mask
+        uncovered &= ~mask
+    rand = rng.random
+    for size in sizes:
+        table: PlacementMasks = tables.free[size]
+        count: int = len(table)
+        if not count:
+            return None
+        for _ in range(placement.RANDOM_PICKS):
+            mask, blocked = table[int(rand() * count)]
+            if not mask & occupied:
+                break
+        else:
+            free: list[tuple[Mask, Mask]] = [
+                pair for pair in table if not pair[0] & occupied
+            ]
+            if not free:
+                return None
+            mask, blocked = rng.choice(free)
+        occupied |= blocked
+        ships |= mask
+    return ships | (state.hits & ~state.unresolved)
+
+
+def sample_fleet_masks(
+    state: SamplerState, count: int, time_budget: float, seed: int
+) -> list[Mask]:
+    """Sample fleets until the count is reached or the time budget is spent.
+
+    Function is executed by the worker processes, so it is defined on the module
+    level and takes only picklable arguments.
+
+    Args:
+        state (SamplerState): state of the board.
+        count (int): number of the fleets.
+        time_budget (float): seconds for sampling.
+        seed (int): seed of the random generator.
+
+    Returns:
+        list[Mask]: cells of the ships of every accepted fleet.
+    """
+    rng: random.Random = random.Random(seed)
+    deadline: float = time.perf_counter() + time_budget
+    tables: SamplerTables = create_sampler_tables(state)
+    fleets: list[Mask] = []
+    tries: int = 0
+    while len(fleets) < count:
+        tries += 1
+        if tries % TIME_CHECK_INTERVAL == 0 and time.perf_counter() > deadline:
+            break
+        ships: Mask | None = sample_fleet_mask(state, rng, tables)
+        if ships is not None:
+            fleets.append(ships)
+    log.debug("Sampled: %d, tries: %d", len(fleets), tries)
+    return fleets
+
+
+class MonteCarloBot:
+    """Bot that chooses the shot with the highest sampled occupancy probability.
+
+    Bot has the same interface as heatmap.HeatmapBot: observe the hidden opponent
+    board, then choose the shot.
+
+    Attributes:
+        samples (int): number of the fleets used for the move.
+        time_budget (float): seconds for sampling of the move.
+        reused (int): number of the cached fleets used by the last move.
+        sampled (int): number of the new fleets sampled for the last move.
+    """
+
+    samples: int
+    time_budget: float
+    reused: int
+    sampled: int
+    _fleet: tuple[int, ...]
+    _rng: random.Random
+    _executor: concurrent.futures.Executor | None
+    _tasks: int
+    _shots: Mask
+    _hits: Mask
+    _fleets: list[Mask]
+
+    def __init__(
+        self,
+        game_config: configs.GameConfiguration | None = None,
+        rng: random.Random | None = None,
+        samples: int = DEFAULT_SAMPLES,
+        time_budget: float = DEFAULT_TIME_BUDGET,
+        executor: concurrent.futures.Executor | None = None,
+        tasks: int = DEFAULT_TASKS,
+    ) -> None:
+        """Initialization of the bot.
+
+        Args:
+            game_config (configs.GameConfiguration | None, optional): fleet of the
+                opponent. Defaults to None (classic).
+            rng (random.Random | None, optional): random generator. Defaults to None
+                (new generator).
+            samples (int, optional): number of the fleets used for the move.
+                Defaults to DEFAULT_SAMPLES.
+            time_budget (float, optional): seconds for sampling of the move.
+                Defaults to DEFAULT_TIME_BUDGET.
+            executor (concurrent.futures.Executor | None, optional): executor of
+                the sampling tasks. Defaults to None (sampling in this process).
+            tasks (int, optional): number of the tasks the sampling is split into
+                for the executor. Defaults to DEFAULT_TASKS.
+
+        Raises:
+            ValueError: raised if samples or tasks is less than 1.
+        """
+        if samples < 1 or tasks < 1:
+            raise ValueError(
+                f"Samples and tasks should be positive: {samples}, {tasks}"
+            )
+        if game_config is None:
+            game_config = configs.ClassicGameConfiguration()
+        self.samples = samples
+        self.time_budget = time_budget
+        self._fleet = placement.get_fleet_sizes(game_config)
+        self._rng = random.Random() if rng is None else rng
+        self._executor = executor
+        self._tasks = tasks
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all observed shots and cached fleets."""
+        self._shots = 0
+        self._hits = 0
+        self._fleets = []
+        self.reused = 0
+        self.sampled = 0
+
+    def observe(self, shots: Mask, hits: Mask) -> None:
+        """Update state by the current opponent board and drop inconsistent fleets.
+
+        Args:
+            shots (Mask): cells with shots.
+            hits (Mask): cells with visible (hit) ships.
+        """
+        if self._shots & ~shots or self._hits & ~hits:
+            log.debug("Board doesn't continue observed state, reset")
+            self.reset()
+        if shots != self._shots:
+            self._fleets = [ships for ships in self._fleets if ships & shots == hits]
+        self._shots = shots
+        self._hits = hits
+
+    def observe_board(self, cells: models.Board) -> None:
+        """Update state by the hidden opponent board (see observe).
+
+        Args:
+            cells (models.Board): result of Board.get_board(is_hidden=True).
+        """
+        self.observe(*heatmap.board_to_masks(cells))
+
+    def _sample(self, count: int, rng: random.Random) -> list[Mask]:
+        """Sample new fleets for the current state in the time budget.
+
+        Args:
+            count (int): number of the fleets.
+            rng (random.Random): generator of the seeds of the sampling tasks.
+
+        Returns:
+            list[Mask]: accepted fleets.
+        """
+        state: SamplerState = create_sampler_state(self._fleet, self._shots, self._hits)
+        if self._executor is None:
+            return sample_fleet_masks(
+                state, count, self.time_budget, rng.getrandbits(64)
+            )
+        chunk: int = -(-count // self._tasks)
+        futures: list[concurrent.futures.Future] = [
+            self._executor.submit(
+                sample_fleet_masks,
+                state,
+                chunk,
+                self.time_budget,
+                rng.getrandbits(64),
+            )
+            for _ in range(self._tasks)
+        ]
+        done, not_done = concurrent.futures.wait(futures, timeout=2 * self.time_budget)
+        for future in not_done:
+            future.cancel()
+        fleets: list[Mask] = []
+        for future in done:
+            if future.exception() is None:
+                fleets += future.result()
+            else:
+                log.warning("Sampling task failed: %s", future.exception())
+        return fleets[:count]
+
+    def get_occupancy(self, rng: random.Random | None = None) -> list[int]:
+        """Sample missing fleets and count them for every cell without shot.
+
+        Args:
+            rng (random.Random | None, optional): random generator of the sampling.
+                Defaults to None (generator of the bot).
+
+        Returns:
+            list[int]: number of the fleets occupying the cell by the cell index.
+        """
+        self.reused = len(self._fleets)
+        missing: int = self.samples - self.reused
+        new_fleets: list[Mask] = (
+            self._sample(missing, self._rng if rng is None else rng)
+            if missing > 0
+            else []
+        )
+        self.sampled = len(new_fleets)
+        self._fleets += new_fleets
+        occupancy: list[int] = [0] * heatmap.BOARD_CELLS
+        free: Mask = ~self._shots & BOARD_MASK
+        for ships in self._fleets:
+            for cell in heatmap.iterate_cells(ships & free):
+                occupancy[cell] += 1
+        log.debug("Reused: %d, sampled: %d", self.reused, self.sampled)
+        return occupancy
+
+    def choose_shot(self, rng: random.Random | None = None) -> models.Coordinate:
+        """Choose the cell without shot with the highest occupancy.
+
+        Args:
+            rng (random.Random | None, optional): random generator of the sampling
+                and the choice between cells with the same occupancy. Defaults to
+                None (generator of the bot).
+
+        Returns:
+            models.Coordinate: coordinate of the shot.
+        """
+        occupancy: list[int] = self.get_occupancy(rng)
+        best: int = max(occupancy)
+        if best:
+            cells: list[int] = [
+                cell for cell, value in enumerate(occupancy) if value == best
+            ]
+        else:
+            cells = heatmap.iterate_cells(~self._shots & BOARD_MASK)
+        return utils.index_to_coordinate(
+            (self._rng if rng is None else rng).choice(cells)
+        )
@@ -0,0 +1,287 @@
+"""Module contains NumPy based boards of many games for the bulk simulations.
+
+All boards are kept in one uint8 array of shape (games, 10, 10). Every cell holds
+the planes of the state:
+    bit 0 - cell has ship (SHIP_BIT),
+    bit 1 - cell has shot (SHOT_BIT),
+    bits 2-7 - number of the ship in the game, 1-63 (0 for the empty cell).
+
+Shots, sunk detection and marking of the cells around the destroyed ships (the same
+rules as battleapi.logic.board.Board._process_cells_after_shot) are made for all
+games at once by the array operations.
+
+Requires numpy (optional dependency, "numpy" extra):
+    pip install "battleship-py[numpy]"
+
+Raises:
+    ex.ShipWithoutIdException: raised if the converted board has ship without id.
+"""
+from typing import Sequence
+
+import battleapi.logic.board as board
+import battleapi.logic.exceptions as ex
+import battleapi.logic.models as models
+import battleapi.logic.player as pl
+import battleapi.logic.utils as utils
+import battleapi.utils.logs as logs
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+log: logs.StructuredLogger = logs.get_logger(__name__)
+
+ShipId = str
+
+SHIP_BIT: int = 1
+SHOT_BIT: int = 2
+SHIP_NUMBER_SHIFT: int = 2
+MAX_SHIPS: int = (0xFF >> SHIP_NUMBER_SHIFT) - 1
+BOARD_SHAPE: tuple[int, int] = (utils.SIZE_VERTICAL, utils.SIZE_HORIZONTAL)
+
+
+def _dilate(masks: "np.ndarray") -> "np.ndarray":
+    """Extend every True cell of the masks to its 8 neighbours.
+
+    Args:
+        masks (np.ndarray): bool array of shape (games, 10, 10).
+
+    Returns:
+        np.ndarray: bool array of the same shape.
+    """
+    padded: np.ndarray = np.pad(masks, ((0, 0), (1, 1), (1, 1)))
+    result: np.ndarray = np.zeros_like(masks)
+    for row_mod in range(3):
+        for col_mod in range(3):
+            result |= padded[
+                :,
+                row_mod : row_mod + utils.SIZE_VERTICAL,
+                col_mod : col_mod + utils.SIZE_HORIZONTAL,
+            ]
+    return result
+
+
+class MultiBoard:
+    """Boards of many games in one NumPy array.
+
+    Raises:
+        RuntimeError: raised if numpy is not installed.
+        ex.ShipWithoutIdException: raised if the converted board has ship without id.
+
+    Returns:
+        _type_: MultiBoard
+    """
+
+    cells: "np.ndarray"
+    ship_ids: list[list[ShipId]]
+    _cells_left: "np.ndarray"
+
+    def __init__(
+        self,
+        games: int,
+        ship_ids: list[list[ShipId]] | None = None,
+        cells: "np.ndarray | None" = None,
+    ) -> None:
+        """Initialization of the boards.
+
+        Cells shouldn't be changed directly after the initialization, the number of
+        the not hit cells of every ship is counted once and updated by the shots.
+
+        Args:
+            games (int): number of the games (boards).
+            ship_ids (list[list[ShipId]] | None, optional): ids of the ships of every
+                game, ship number N has id ship_ids[game][N - 1]. Defaults to None.
+            cells (np.ndarray | None, optional): uint8 cells of shape (games, 10, 10),
+                the array is used without copying. Defaults to None (empty boards).
+
+        Raises:
+            RuntimeError: raised if numpy is not installed.
+        """
+        if np is None:
+            raise RuntimeError('numpy is required: pip install "battleship-py[numpy]"')
+        if cells is None:
+            cells = np.zeros((games,) + BOARD_SHAPE, dtype=np.uint8)
+        self.cells = cells
+        self.ship_ids = [[] for _ in range(games)] if ship_ids is None else ship_ids
+        self._count_cells_left()
+        log.debug("Inited. games: %d", games)
+
+    def _count_cells_left(self) -> None:
+        """Count not hit cells of every ship of every game."""
+        games: int = len(self)
+        alive: np.ndarray = (self.cells & (SHIP_BIT | SHOT_BIT)) == SHIP_BIT
+        numbers: np.ndarray = (self.cells >> SHIP_NUMBER_SHIFT).astype(np.intp)
+        keys: np.ndarray = numbers + np.arange(games)[:, None, None] * (MAX_SHIPS + 1)
+        self._cells_left = (
+            np.bincount(keys[alive], minlength=games * (MAX_SHIPS + 1))
+            .reshape(games, MAX_SHIPS + 1)
+            .astype(np.uint8)
+        )
+
+    @classmethod
+    def from_boards(cls, boards: Sequence[pl.GameBoard]) -> "MultiBoard":
+        """Create boards from the boards of the game engine.
+
+        Args:
+            boards (Sequence[pl.GameBoard]): boards (board.Board or bitboard.BitBoard).
+
+        Raises:
+            ex.ShipWithoutIdException: raised if the board has ship without id.
+            ValueError: raised if the board has more than MAX_SHIPS ships.
+
+        Returns:
+            MultiBoard: boards of the games.
+        """
+        cells: np.ndarray = np.zeros((len(boards),) + BOARD_SHAPE, dtype=np.uint8)
+        ship_ids: list[list[ShipId]] = [[] for _ in boards]
+        for game, game_board in enumerate(boards):
+            numbers: dict[ShipId, int] = {}
+            for row_index, row in enumerate(game_board.get_board()):
+                for col_index, cell in enumerate(row):
+                    value: int = SHOT_BIT if cell.has_shot else 0
+                    if cell.has_ship:
+                        if cell.ship_id is None:
+                            raise ex.ShipWithoutIdException(
+                                f"Ship in {row_index, col_index} doesn't have id"
+                            )
+                        if cell.ship_id not in numbers:
+                            if len(numbers) == MAX_SHIPS:
+                                raise ValueError(
+                                    f"Board has more than {MAX_SHIPS} ships"
+                                )
+                            ship_ids[game].append(cell.ship_id)
+                            numbers[cell.ship_id] = len(numbers) + 1
+                        value |= SHIP_BIT | numbers[cell.ship_id] << SHIP_NUMBER_SHIFT
+                    cells[game, row_index, col_index] = value
+        return cls(len(boards), ship_ids, cells)
+
+    def copy(self) -> "MultiBoard":
+        """Create independent copy of the boards.
+
+        Returns:
+            MultiBoard: copy.
+        """
+        return MultiBoard(
+            len(self), [list(ids) for ids in self.ship_ids], self.cells.copy()
+        )
+
+    def to_boards(self) -> list[board.Board]:
+        """Create boards of the reference game engine (board.Board).
+
+        Returns:
+            list[board.Board]: boards of the games.
+        """
+        boards: list[board.Board] = []
+        for game in range(len(self)):
+            game_cells: models.Board = []
+            for row in self.cells[game].tolist():
+                game_row: list[models.Cell] = []
+                for value in row:
+                    number: int = value >> SHIP_NUMBER_SHIFT
+                    game_row.append(
+                        models.Cell(
+                            ship_id=self.ship_ids[game][number - 1] if number else None,
+                            has_ship=bool(value & SHIP_BIT),
+                            has_shot=bool(value & SHOT_BIT),
+                        )
+                    )
+                game_cells.append(game_row)
+            boards.append(board.Board(game_cells))
+        return boards
+
+    def __len__(self) -> int:
+        return self.cells.shape[0]
+
+    def make_shot(
+        self,
+        rows: "np.ndarray",
+        cols: "np.ndarray",
+        games: "np.ndarray | None" = None,
+    ) -> tuple["np.ndarray", "np.ndarray"]:
+        """Make one shot in every passed game.
+
+        Repeated shot to the cell returns the same result as board.Board (hit if the
+        cell has ship) and doesn't change the board.
+
+        Args:
+            rows (np.ndarray): rows of the shots.
+            cols (np.ndarray): columns of the shots.
+            games (np.ndarray | None, optional): indexes of the games of the shots,
+                every game only once. Defaults to None (one shot in every game).
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: bool arrays: shot was a hit, shot
+                destroyed the ship.
+        """
+        if games is None:
+            games = np.arange(len(self))
+        values: np.ndarray = self.cells[games, rows, cols]
+        self.cells[games, rows, cols] = values | SHOT_BIT
+        hits: np.ndarray = (values & SHIP_BIT) != 0
+        sunk: np.ndarray = np.zeros(hits.shape, dtype=bool)
+        new_hits: np.ndarray = np.flatnonzero(hits & ((values & SHOT_BIT) == 0))
+        if new_hits.size:
+            hit_games: np.ndarray = games[new_hits]
+            numbers: np.ndarray = values[new_hits] >> SHIP_NUMBER_SHIFT
+            self._cells_left[hit_games, numbers] -= 1
+            destroyed: np.ndarray = self._cells_left[hit_games, numbers] == 0
+            sunk[new_hits] = destroyed
+            if destroyed.any():
+                sunk_games: np.ndarray = hit_games[destroyed]
+                ships: np.ndarray = (
+                    self.cells[sunk_games] >> SHIP_NUMBER_SHIFT
+                ) == numbers[destroyed, None, None]
+                halos: np.ndarray = _dilate(ships)
+                self.cells[sunk_games] |= halos.astype(np.uint8) * SHOT_BIT
+        return hits, sunk
+
+    def get_ship_mask(self) -> "np.ndarray":
+        """Return cells with ships.
+
+        Returns:
+            np.ndarray: bool array of shape (games, 10, 10).
+        """
+        return (self.cells & SHIP_BIT) != 0
+
+    def get_shot_mask(self) -> "np.ndarray":
+        """Return cells with shots.
+
+        Returns:
+            np.ndarray: bool array of shape (games, 10, 10).
+        """
+        return (self.cells & SHOT_BIT) != 0
+
+    def get_hidden_ship_mask(self) -> "np.ndarray":
+        """Return cells with hit ships (ships visible for the opponent).
+
+        Returns:
+            np.ndarray: bool array of shape (games, 10, 10).
+        """
+        return (self.cells & (SHIP_BIT | SHOT_BIT)) == SHIP_BIT | SHOT_BIT
+
+    def get_amount_of_alive_ships(self) -> "np.ndarray":
+        """Return number of cells with ships without hit in every game.
+
+        Returns:
+            np.ndarray: int array of shape (games,).
+        """
+        return np.count_nonzero(
+            (self.cells & (SHIP_BIT | SHOT_BIT)) == SHIP_BIT, axis=(1, 2)
+        )
+
+    def get_amount_of_not_shot_cells(self) -> "np.ndarray":
+        """Return number of cells without shot in every game.
+
+        Returns:
+            np.ndarray: int array of shape (games,).
+        """
+        return np.count_nonzero((self.cells & SHOT_BIT) == 0, axis=(1, 2))
+
+    def is_finished(self) -> "np.ndarray":
+        """Check which games don't have alive ships.
+
+        Returns:
+            np.ndarray: bool array of shape (games,).
+        """
+        return self.get_amount_of_alive_ships() == 0
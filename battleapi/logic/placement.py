@@ -0,0 +1,225 @@
+"""Precomputed tables of the legal ship placements and random fleet generation.
+
+Every placement (ship size, direction, base coordinate) that fits into the empty
+board is calculated once and kept as bitmasks of the ship cells and the cells around
+the ship (index = row * SIZE_HORIZONTAL + column, the same as in
+battleapi.logic.bitboard). Random fleet is sampled by picking placements that don't
+intersect the mask of the occupied cells, so there are no tries of the board
+validation and no exceptions.
+"""
+import dataclasses
+import functools
+import random
+from typing import Iterator
+
+import battleapi.logic.configs as configs
+import battleapi.logic.models as models
+import battleapi.logic.utils as utils
+import battleapi.utils.logs as logs
+
+log: logs.StructuredLogger = logs.get_logger(__name__)
+
+Mask = int
+FleetMasks = tuple[Mask, ...]
+
+RANDOM_PICKS: int = 8
+
+
+@dataclasses.dataclass(frozen=True)
+class Placement:
+    """Legal position of the ship on the empty board.
+
+    Attributes:
+        ship_size (int): number of the ship cells.
+        direction (models.Direction): direction of the ship.
+        coordinate (models.Coordinate): base (first) coordinate of the ship.
+        mask (Mask): cells of the ship.
+        blocked (Mask): cells of the ship and cells around it, other ships can't
+            use them.
+    """
+
+    ship_size: int
+    direction: models.Direction
+    coordinate: models.Coordinate
+    mask: Mask
+    blocked: Mask
+
+
+@functools.lru_cache(maxsize=None)
+def get_placements(ship_size: int) -> tuple[Placement, ...]:
+    """Return all legal placements of the ship on the empty board.
+
+    Ship of size 1 has only horizontal placements (vertical ones are the same cells).
+
+    Args:
+        ship_size (int): number of the ship cells.
+
+    Returns:
+        tuple[Placement, ...]: placements in the row-major order of base coordinate.
+    """
+    directions: tuple[models.Direction, ...] = tuple(models.Direction)
+    if ship_size == 1:
+        directions = (models.Direction.HORIZONTAL,)
+    placements: list[Placement] = []
+    for direction in directions:
+        max_row: int = utils.SIZE_VERTICAL
+        max_col: int = utils.SIZE_HORIZONTAL
+        if direction == models.Direction.HORIZONTAL:
+            max_col -= ship_size - 1
+        else:
+            max_row -= ship_size - 1
+        for row in range(max_row):
+            for col in range(max_col):
+                mask, halo = utils.get_ship_footprint_masks(
+                    (row, col), ship_size, direction
+                )
+                placements.append(
+                    Placement(ship_size, direction, (row, col), mask, mask | halo)
+                )
+    log.debug("ship_size: %d, placements: %d", ship_size, len(placements))
+    return tuple(placements)
+
+
+def get_fleet_sizes(game_config: configs.GameConfiguration) -> tuple[int, ...]:
+    """Return sizes of all ships of the game configuration, the biggest first.
+
+    Args:
+        game_config (configs.GameConfiguration): game configuration.
+
+    Returns:
+        tuple[int, ...]: ship sizes.
+    """
+    sizes: list[int] = []
+    for ship_config in game_config.get_ship_configs():
+        sizes += [ship_config.ship_size] * ship_config.ship_amount
+    return tuple(sorted(sizes, reverse=True))
+
+
+def _pick_placement(
+    placements: tuple[Placement, ...], blocked: Mask, rng: random.Random
+) -> Placement | None:
+    """Pick random placement that doesn't intersect blocked cells.
+
+    A few random placements are checked first (enough for the most ships), then
+    the choice is made from all free placements.
+
+    Args:
+        placements (tuple[Placement, ...]): placements of the ship size.
+        blocked (Mask): occupied cells.
+        rng (random.Random): random generator.
+
+    Returns:
+        Placement | None: placement or None if the ship doesn't fit.
+    """
+    size: int = len(placements)
+    for _ in range(RANDOM_PICKS):
+        placement: Placement = placements[int(rng.random() * size)]
+        if not placement.mask & blocked:
+            return placement
+    free: list[Placement] = [p for p in placements if not p.mask & blocked]
+    return rng.choice(free) if free else None
+
+
+def sample_fleet(
+    ship_sizes: tuple[int, ...], rng: random.Random, blocked: Mask = 0
+) -> list[Placement]:
+    """Sample random legal placements of the fleet.
+
+    If the last ships don't fit (very rare for the classic fleet), sampling starts
+    again.
+
+    Args:
+        ship_sizes (tuple[int, ...]): sizes of the ships, the biggest should be
+            first (see get_fleet_sizes).
+        rng (random.Random): random generator.
+        blocked (Mask, optional): cells that can't be used (ships that are already
+            on the board with cells around them). Defaults to 0.
+
+    Raises:
+        ValueError: raised if the fleet can't be placed.
+
+    Returns:
+        list[Placement]: placements in the order of ship_sizes.
+    """
+    tables: list[tuple[Placement, ...]] = [get_placements(size) for size in ship_sizes]
+    for _ in range(utils.SIZE_VERTICAL * utils.SIZE_HORIZONTAL):
+        occupied: Mask = blocked
+        fleet: list[Placement] = []
+        for placements in tables:
+            placement: Placement | None = _pick_placement(placements, occupied, rng)
+            if placement is None:
+                break
+            fleet.append(placement)
+            occupied |= placement.blocked
+        else:
+            return fleet
+    raise ValueError(f"Fleet {ship_sizes} can't be placed")
+
+
+def iterate_fleets(
+    ship_sizes: tuple[int, ...], rng: random.Random
+) -> Iterator[FleetMasks]:
+    """Generate random fleets as masks of the ships (bulk mode for simulations).
+
+    The same sampling as sample_fleet, but only the masks are created, so millions of
+    fleets can be generated without Placement objects.
+
+    Args:
+        ship_sizes (tuple[int, ...]): sizes of the ships, the biggest first.
+        rng (random.Random): random generator.
+
+    Raises:
+        ValueError: raised if the fleet can't be placed (the same number of attempts
+            as sample_fleet fail in a row).
+
+    Yields:
+        Iterator[FleetMasks]: masks of the ships in the order of ship_sizes
+            (infinite).
+    """
+    tables: list[list[tuple[Mask, Mask]]] = [
+        [(placement.mask, placement.blocked) for placement in get_placements(size)]
+        for size in ship_sizes
+    ]
+    sized_tables: list[tuple[list[tuple[Mask, Mask]], int]] = [
+        (table, len(table)) for table in tables
+    ]
+    rand = rng.random
+    failed: int = 0
+    while failed < utils.SIZE_VERTICAL * utils.SIZE_HORIZONTAL:
+        occupied: Mask = 0
+        masks: list[Mask] = []
+        for table, size in sized_tables:
+            for _ in range(RANDOM_PICKS):
+                mask, blocked = table[int(rand() * size)]
+                if not mask & occupied:
+                    break
+            else:
+                free = [pair for pair in table if not pair[0] & occupied]
+                if not free:
+                    break
+                mask, blocked = rng.choice(free)
+            masks.append(mask)
+            occupied |= blocked
+        else:
+            failed = 0
+            yield tuple(masks)
+            continue
+        failed += 1
+    raise ValueError(f"Fleet {ship_sizes} can't be placed")
+
+
+def sample_fleets(
+    ship_sizes: tuple[int, ...], count: int, rng: random.Random
+) -> list[FleetMasks]:
+    """Generate list of the random fleets (see iterate_fleets).
+
+    Args:
+        ship_sizes (tuple[int, ...]): sizes of the ships, the biggest first.
+        count (int): number of the fleets.
+        rng (random.Random): random generator.
+
+    Returns:
+        list[FleetMasks]: masks of the ships of every fleet.
+    """
+    fleets: Iterator[FleetMasks] = iterate_fleets(ship_sizes, rng)
+    return [next(fleets) for _ in range(count)]
@@ -1,9 +1,13 @@
 """Player info module."""
 import dataclasses
 
+import battleapi.logic.bitboard as bitboard
 import battleapi.logic.board as board
 import battleapi.logic.models as models
 
+GameBoard = board.Board | bitboard.BitBoard
+GameBoardView = board.BoardView | bitboard.BitBoardView
+
 
 @dataclasses.dataclass
 class Player:
@@ -11,7 +15,26 @@ class Player:
 
     player_id: str
     player_name: str
-    board: board.Board
+    board: GameBoard
     ships_not_on_board: dict[models.ShipId, models.Ship]
     all_ships: dict[models.ShipId, models.Ship]
     is_ready: bool = False
+
+    def copy(self) -> "Player":
+        """Create independent copy of the player with the board and the ships.
+
+        Returns:
+            Player: copy.
+        """
+        ships: dict[models.ShipId, models.Ship] = {
+            ship_id: dataclasses.replace(ship)
+            for ship_id, ship in self.all_ships.items()
+        }
+        return dataclasses.replace(
+            self,
+            board=self.board.copy(),
+            ships_not_on_board={
+                ship_id: ships[ship_id] for ship_id in self.ships_not_on_board
+            },
+            all_ships=ships,
+        )
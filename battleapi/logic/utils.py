@@ -9,16 +9,32 @@ Raises:
 Returns:
     _type_: module
 """
-import logging
+import functools
 from typing import Union
 
 import battleapi.logic.exceptions as ex
+import battleapi.logic.models as models
+import battleapi.utils.logs as logs
 
-log: logging.Logger = logging.getLogger(__name__)
+log: logs.StructuredLogger = logs.get_logger(__name__)
 
 SIZE_HORIZONTAL: int = 10
 SIZE_VERTICAL: int = 10
 
+Coordinate = tuple[int, int]
+NeighbourSet = frozenset[Coordinate]
+
+NEIGHBOUR_MODIFIERS: tuple[Coordinate, ...] = (
+    (-1, -1),
+    (-1, 0),
+    (-1, 1),
+    (0, -1),
+    (0, 1),
+    (1, -1),
+    (1, 0),
+    (1, 1),
+)
+
 
 def validate_player_id(player_id: str) -> None:
     """Check if player id is valid.
@@ -61,7 +77,8 @@ def validate_coordinate(coordinate: tuple[int, int]) -> None:
     Raises:
         ex.CoordinateException: raised if the coordinate out of bounds.
     """
-    log.debug("coordinate: %s", coordinate)
+    if log.is_debug:
+        log.debug_sampled("coordinate: %s", coordinate)
     row, column = coordinate
     if row < 0 or row >= SIZE_VERTICAL:
         raise ex.CoordinateException(f"Row coordinate is out of bounds: {row}")
@@ -69,6 +86,32 @@ def validate_coordinate(coordinate: tuple[int, int]) -> None:
         raise ex.CoordinateException(f"Row coordinate is out of bounds: {column}")
 
 
+def coordinate_to_index(coordinate: Coordinate) -> int:
+    """Convert coordinate to the index of the cell (bit index in the masks).
+
+    Args:
+        coordinate (Coordinate): coordinate of the cell.
+
+    Returns:
+        int: index of the cell.
+    """
+    row, column = coordinate
+    return row * SIZE_HORIZONTAL + column
+
+
+def index_to_coordinate(index: int) -> Coordinate:
+    """Convert index of the cell (bit index in the masks) to the coordinate.
+
+    Args:
+        index (int): index of the cell.
+
+    Returns:
+        Coordinate: coordinate of the cell.
+    """
+    row, column = divmod(index, SIZE_HORIZONTAL)
+    return row, column
+
+
 def validate_is_not_none(obj: Union[object, None], obj_name: str = "") -> None:
     """Check if the project is not None.
 
@@ -84,40 +127,154 @@ def validate_is_not_none(obj: Union[object, None], obj_name: str = "") -> None:
         raise ex.ObjectIsNoneException(f"Object is None. {obj_name}")
 
 
-def get_neighbour_coordinates(
-    current_coordinate: tuple[int, int],
-) -> set[tuple[int, int]]:
-    """Find neighbour coordinates for the passed coordinate.
+def _calculate_neighbour_coordinates(
+    current_coordinate: Coordinate,
+    size_vertical: int = SIZE_VERTICAL,
+    size_horizontal: int = SIZE_HORIZONTAL,
+) -> NeighbourSet:
+    """Calculate neighbour coordinates for the passed coordinate.
 
     Args:
-        current_coordinate (models.Coordinate): initial coordinate.
+        current_coordinate (Coordinate): initial coordinate.
+        size_vertical (int, optional): number of rows. Defaults to SIZE_VERTICAL.
+        size_horizontal (int, optional): number of columns.
+            Defaults to SIZE_HORIZONTAL.
 
     Returns:
-        set[models.Coordinate]: coordinates around the current coordinate.
+        NeighbourSet: coordinates around the current coordinate.
     """
     row, column = current_coordinate
-    coordinate_modifiers: set[tuple[int, int]] = {
-        (-1, -1),
-        (-1, 0),
-        (-1, 1),
-        (0, -1),
-        (0, 1),
-        (1, -1),
-        (1, 0),
-        (1, 1),
-    }
-    result_set: set[tuple[int, int]] = set()
-    for row_modifier, column_modifier in coordinate_modifiers:
+    result_set: set[Coordinate] = set()
+    for row_modifier, column_modifier in NEIGHBOUR_MODIFIERS:
         neighbour_row: int = row + row_modifier
         neighbour_col: int = column + column_modifier
-        is_not_valid_row: bool = (neighbour_row < 0) or (neighbour_row >= SIZE_VERTICAL)
-        is_not_valid_col: bool = (neighbour_col < 0) or (
-            neighbour_col >= SIZE_HORIZONTAL
+        is_valid_row: bool = 0 <= neighbour_row < size_vertical
+        is_valid_col: bool = 0 <= neighbour_col < size_horizontal
+        if is_valid_row and is_valid_col:
+            result_set.add((neighbour_row, neighbour_col))
+    return frozenset(result_set)
+
+
+@functools.lru_cache(maxsize=None)
+def get_neighbour_index(
+    size_vertical: int = SIZE_VERTICAL, size_horizontal: int = SIZE_HORIZONTAL
+) -> tuple[tuple[NeighbourSet, ...], ...]:
+    """Build index of the neighbour coordinates for every cell of the board.
+
+    Index is built once per board size and cached.
+
+    Args:
+        size_vertical (int, optional): number of rows. Defaults to SIZE_VERTICAL.
+        size_horizontal (int, optional): number of columns.
+            Defaults to SIZE_HORIZONTAL.
+
+    Returns:
+        tuple[tuple[NeighbourSet, ...], ...]: neighbours by [row][column].
+    """
+    log.debug("Build neighbour index: %d x %d", size_vertical, size_horizontal)
+    return tuple(
+        tuple(
+            _calculate_neighbour_coordinates(
+                (row, column), size_vertical, size_horizontal
+            )
+            for column in range(size_horizontal)
         )
-        is_current_cell: bool = neighbour_row == row and neighbour_col == column
-        if is_not_valid_row or is_not_valid_col or is_current_cell:
-            log.debug("Filter coordinates that are not valid")
-            continue
-        result_set.add((neighbour_row, neighbour_col))
-    log.debug("get_neighbour_coordinates. result num: %d", len(result_set))
-    return result_set
+        for row in range(size_vertical)
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_neighbour_mask_index(
+    size_vertical: int = SIZE_VERTICAL, size_horizontal: int = SIZE_HORIZONTAL
+) -> tuple[int, ...]:
+    """Build index of the neighbour bitmasks for every cell of the board.
+
+    Bit of the cell is 1 << (row * size_horizontal + column).
+
+    Args:
+        size_vertical (int, optional): number of rows. Defaults to SIZE_VERTICAL.
+        size_horizontal (int, optional): number of columns.
+            Defaults to SIZE_HORIZONTAL.
+
+    Returns:
+        tuple[int, ...]: neighbour masks by the bit index of the cell.
+    """
+    masks: list[int] = []
+    for row in get_neighbour_index(size_vertical, size_horizontal):
+        for neighbours in row:
+            mask: int = 0
+            for n_row, n_column in neighbours:
+                mask |= 1 << (n_row * size_horizontal + n_column)
+            masks.append(mask)
+    return tuple(masks)
+
+
+def get_neighbour_coordinates(current_coordinate: Coordinate) -> NeighbourSet:
+    """Find neighbour coordinates for the passed coordinate.
+
+    Args:
+        current_coordinate (models.Coordinate): initial coordinate.
+
+    Returns:
+        NeighbourSet: immutable coordinates around the current coordinate.
+    """
+    row, column = current_coordinate
+    if 0 <= row < SIZE_VERTICAL and 0 <= column < SIZE_HORIZONTAL:
+        return get_neighbour_index()[row][column]
+    return _calculate_neighbour_coordinates(current_coordinate)
+
+
+@functools.lru_cache(maxsize=4096)
+def get_ship_footprint(
+    coordinate: Coordinate, ship_size: int, direction: models.Direction
+) -> tuple[NeighbourSet, NeighbourSet]:
+    """Find ship cells and cells around the ship (halo).
+
+    Cells of the ship are not validated and can be out of bounds, halo contains only
+    cells in bounds of the board.
+
+    Args:
+        coordinate (Coordinate): base (or first) coordinate of the ship.
+        ship_size (int): number of cells in the ship.
+        direction (models.Direction): direction of the ship.
+
+    Returns:
+        tuple[NeighbourSet, NeighbourSet]: ship coordinates and halo coordinates.
+    """
+    row, column = coordinate
+    if direction == models.Direction.HORIZONTAL:
+        footprint = frozenset((row, column + diff) for diff in range(ship_size))
+    else:
+        footprint = frozenset((row + diff, column) for diff in range(ship_size))
+    halo: set[Coordinate] = set()
+    for ship_coordinate in footprint:
+        halo.update(get_neighbour_coordinates(ship_coordinate))
+    return footprint, frozenset(halo - footprint)
+
+
+@functools.lru_cache(maxsize=4096)
+def get_ship_footprint_masks(
+    coordinate: Coordinate, ship_size: int, direction: models.Direction
+) -> tuple[int, int]:
+    """Find bitmasks of the ship cells and cells around the ship (halo).
+
+    Args:
+        coordinate (Coordinate): base (or first) coordinate of the ship.
+        ship_size (int): number of cells in the ship.
+        direction (models.Direction): direction of the ship.
+
+    Raises:
+        ex.CoordinateException: raised if any of the ship cells is out of bounds.
+
+    Returns:
+        tuple[int, int]: ship mask and halo mask.
+    """
+    footprint, halo = get_ship_footprint(coordinate, ship_size, direction)
+    ship_mask: int = 0
+    for ship_coordinate in footprint:
+        validate_coordinate(ship_coordinate)
+        ship_mask |= 1 << coordinate_to_index(ship_coordinate)
+    halo_mask: int = 0
+    for halo_coordinate in halo:
+        halo_mask |= 1 << coordinate_to_index(halo_coordinate)
+    return ship_mask, halo_mask
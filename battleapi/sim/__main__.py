@@ -0,0 +1,41 @@
+"""Command line interface of the simulation.
+
+Run:
+    python -m battleapi.sim [--strategies random hunt_target] [--games N]
+        [--workers N] [--seed N] [--bitboard]
+"""
+import argparse
+import logging
+
+import battleapi.logic.bitboard as bitboard
+import battleapi.sim.engine as engine
+import battleapi.sim.strategies as strategies
+
+
+def main() -> None:
+    """Entry point of the simulation."""
+    parser = argparse.ArgumentParser(description="Games between shooting strategies")
+    parser.add_argument(
+        "--strategies",
+        nargs="+",
+        choices=sorted(strategies.STRATEGIES),
+        default=sorted(strategies.STRATEGIES),
+    )
+    parser.add_argument("--games", type=int, default=1000, help="games of every pair")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bitboard", action="store_true", help="use bitboard engine")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    result = engine.run_simulation(
+        [strategies.STRATEGIES[name]() for name in args.strategies],
+        args.games,
+        workers=args.workers,
+        seed=args.seed,
+        board_factory=bitboard.BitBoard if args.bitboard else None,
+    )
+    print(result.format())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""Headless engine of the games between the shooting strategies (bots).
+
+Games are played directly on battleapi.logic.game.Game without persistence, DTOs and
+controllers. Batches of the games are distributed between worker processes
+(ProcessPoolExecutor), every batch returns only the counters (SimulationReport), so
+the throughput grows with the number of the cores.
+
+Raises:
+    StrategyException: raised if the strategy chooses the cell with shot.
+"""
+import concurrent.futures
+import dataclasses
+import itertools
+import os
+import random
+import time
+from typing import Callable, Sequence
+
+import battleapi.abstract as abstract
+import battleapi.logic.board as board
+import battleapi.logic.configs as configs
+import battleapi.logic.game as game
+import battleapi.logic.models as models
+import battleapi.logic.player as pl
+import battleapi.logic.utils as utils
+import battleapi.sim.report as report
+import battleapi.sim.strategies as strategies
+import battleapi.utils.logs as logs
+
+log: logs.StructuredLogger = logs.get_logger(__name__)
+
+BoardFactory = Callable[[], pl.GameBoard]
+
+PLAYER_IDS: tuple[str, str] = ("player_0", "player_1")
+TASKS_PER_WORKER: int = 4
+MAX_SHOTS: int = 2 * utils.SIZE_VERTICAL * utils.SIZE_HORIZONTAL
+
+
+class StrategyException(Exception):
+    """Exception is raised when the strategy chooses the cell that already has shot."""
+
+    def __init__(self, message: str = "") -> None:
+        Exception.__init__(self, message)
+
+
+class SequenceIdGenerator(abstract.IdGenerator):
+    """Cheap ids for the simulated games (ids are unique only inside the game)."""
+
+    _counter: Callable[[], int]
+
+    def __init__(self) -> None:
+        self._counter = itertools.count().__next__
+
+    def generate_id(self) -> str:
+        """Generate next id of the sequence.
+
+        Returns:
+            str: id.
+        """
+        return str(self._counter())
+
+
+@dataclasses.dataclass(frozen=True)
+class GameResult:
+    """Result of the one game.
+
+    Attributes:
+        winner (int): index of the winner in the pair of the strategies (0 or 1).
+        shots (tuple[int, int]): number of the shots made by every player.
+    """
+
+    winner: int
+    shots: tuple[int, int]
+
+
+@dataclasses.dataclass(frozen=True)
+class SimulationTask:
+    """Batch of the games between two strategies, executed by one worker.
+
+    Attributes:
+        strategies (tuple[strategies.Strategy, ...]): all strategies of simulation.
+        first (int): index of the first strategy of the pair.
+        second (int): index of the second strategy of the pair.
+        games (int): number of the games.
+        seed (int): seed of the random generator of the batch.
+        board_factory (BoardFactory | None): board engine, None for board.Board.
+        start (int): number of the games of the pair played by the previous batches.
+    """
+
+    strategies: tuple[strategies.Strategy, ...]
+    first: int
+    second: int
+    games: int
+    seed: int
+    board_factory: BoardFactory | None = None
+    start: int = 0
+
+
+def place_fleet(game_obj: game.Game, player_id: str, rng: random.Random) -> None:
+    """Put all ships of the player on the random cells (see Game.randomize_fleet).
+
+    Args:
+        game_obj (game.Game): game.
+        player_id (str): player id.
+        rng (random.Random): random generator.
+    """
+    game_obj.randomize_fleet(player_id, rng)
+
+
+def play_game(
+    pair: tuple[strategies.Strategy, strategies.Strategy],
+    rng: random.Random,
+    board_factory: BoardFactory | None = None,
+    game_config: configs.GameConfiguration | None = None,
+) -> GameResult:
+    """Play one game between two strategies. First strategy makes the first shot.
+
+    Args:
+        pair (tuple[strategies.Strategy, strategies.Strategy]): strategies.
+        rng (random.Random): random generator of the placement and strategies.
+        board_factory (BoardFactory | None, optional): board engine.
+            Defaults to None (board.Board).
+        game_config (configs.GameConfiguration | None, optional): fleet.
+            Defaults to None (classic).
+
+    Raises:
+        StrategyException: raised if the strategy shoots the cell with shot.
+
+    Returns:
+        GameResult: result of the game.
+    """
+    game_obj = game.Game(
+        SequenceIdGenerator(),
+        configs.ClassicGameConfiguration() if game_config is None else game_config,
+        board_factory=board.Board if board_factory is None else board_factory,
+    )
+    players: tuple[strategies.Strategy, ...] = tuple(
+        strategy.start_game() for strategy in pair
+    )
+    for player_id, strategy in zip(PLAYER_IDS, players):
+        game_obj.add_player(player_id, strategy.name or type(strategy).__name__)
+        place_fleet(game_obj, player_id, rng)
+    for player_id in PLAYER_IDS:
+        game_obj.make_player_ready(player_id)
+
+    shots: list[int] = [0, 0]
+    for _ in range(MAX_SHOTS):
+        active: int = PLAYER_IDS.index(game_obj.active_player_id)
+        view: pl.GameBoardView = game_obj.get_player_board_view(
+            PLAYER_IDS[1 - active], is_hidden=True
+        )
+        coordinate: models.Coordinate = players[active].choose_shot(view, rng)
+        if view.has_shot(*coordinate):
+            raise StrategyException(f"{players[active]} shot again to {coordinate}")
+        shots[active] += 1
+        if game_obj.make_shot(PLAYER_IDS[active], coordinate):
+            if game_obj.is_game_finished():
+                return GameResult(active, (shots[0], shots[1]))
+    raise StrategyException(f"Game is not finished after {MAX_SHOTS} shots")
+
+
+def run_task(task: SimulationTask) -> report.SimulationReport:
+    """Play batch of the games (executed in the worker process).
+
+    Strategies of the pair make the first shot in turns (even games of the pair -
+    first strategy).
+
+    Args:
+        task (SimulationTask): batch of the games.
+
+    Returns:
+        report.SimulationReport: counters of the batch.
+    """
+    rng = random.Random(task.seed)
+    result = report.SimulationReport([s.name for s in task.strategies])
+    for index in range(task.games):
+        pair: tuple[int, int] = (task.first, task.second)
+        if (task.start + index) % 2:
+            pair = (task.second, task.first)
+        game_result: GameResult = play_game(
+            (task.strategies[pair[0]], task.strategies[pair[1]]),
+            rng,
+            task.board_factory,
+        )
+        winner: int = pair[game_result.winner]
+        loser: int = pair[1 - game_result.winner]
+        result.add_game(
+            winner,
+            loser,
+            game_result.shots[game_result.winner],
+            game_result.winner == 0,
+        )
+    return result
+
+
+def create_tasks(
+    strategy_list: Sequence[strategies.Strategy],
+    games_per_pair: int,
+    workers: int,
+    seed: int,
+    board_factory: BoardFactory | None = None,
+) -> list[SimulationTask]:
+    """Split games of every pair of the strategies into batches.
+
+    Every pair of the different strategies plays games_per_pair games, single
+    strategy plays against itself. Number of the batches is about TASKS_PER_WORKER
+    per worker, so slow batches don't leave other workers idle at the end.
+
+    Args:
+        strategy_list (Sequence[strategies.Strategy]): strategies.
+        games_per_pair (int): number of the games of every pair.
+        workers (int): number of the worker processes.
+        seed (int): seed of the simulation.
+        board_factory (BoardFactory | None, optional): board engine.
+            Defaults to None (board.Board).
+
+    Returns:
+        list[SimulationTask]: batches of the games.
+    """
+    all_strategies: tuple[strategies.Strategy, ...] = tuple(strategy_list)
+    pairs: list[tuple[int, int]] = list(
+        itertools.combinations(range(len(all_strategies)), 2)
+    ) or [(0, 0)]
+    chunks: int = max(1, min(games_per_pair, workers * TASKS_PER_WORKER // len(pairs)))
+    chunk_size, rest = divmod(games_per_pair, chunks)
+    tasks: list[SimulationTask] = []
+    for first, second in pairs:
+        start: int = 0
+        for chunk in range(chunks):
+            games: int = chunk_size + (chunk < rest)
+            tasks.append(
+                SimulationTask(
+                    all_strategies,
+                    first,
+                    second,
+                    games,
+                    seed * 1_000_003 + len(tasks),
+                    board_factory,
+                    start,
+                )
+            )
+            start += games
+    return tasks
+
+
+def run_simulation(
+    strategy_list: Sequence[strategies.Strategy],
+    games_per_pair: int,
+    workers: int | None = None,
+    seed: int = 0,
+    board_factory: BoardFactory | None = None,
+) -> report.SimulationReport:
+    """Play games between all pairs of the strategies.
+
+    Results are reproducible for the same seed and number of the workers.
+
+    Args:
+        strategy_list (Sequence[strategies.Strategy]): strategies (picklable).
+        games_per_pair (int): number of the games of every pair.
+        workers (int | None, optional): number of the worker processes, 1 plays all
+            games in the current process. Defaults to None (number of CPUs).
+        seed (int, optional): seed of the simulation. Defaults to 0.
+        board_factory (BoardFactory | None, optional): board engine (picklable).
+            Defaults to None (board.Board).
+
+    Raises:
+        ValueError: raised if there are no strategies.
+
+    Returns:
+        report.SimulationReport: aggregated results.
+    """
+    if not strategy_list:
+        raise ValueError("At least one strategy is required")
+    workers = (os.cpu_count() or 1) if workers is None else max(1, workers)
+    tasks: list[SimulationTask] = create_tasks(
+        strategy_list, games_per_pair, workers, seed, board_factory
+    )
+    log.info(
+        "strategies: %s, tasks: %d, workers: %d", strategy_list, len(tasks), workers
+    )
+    result = report.SimulationReport([s.name for s in strategy_list])
+    start: float = time.perf_counter()
+    if workers == 1:
+        for task in tasks:
+            result.add(run_task(task))
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            for task_result in executor.map(run_task, tasks):
+                result.add(task_result)
+    result.elapsed_seconds = time.perf_counter() - start
+    return result
@@ -0,0 +1,128 @@
+"""Aggregated results of the simulated games."""
+import dataclasses
+
+
+@dataclasses.dataclass
+class SimulationReport:
+    """Results of the simulated games.
+
+    Worker processes return partial reports of their batches, the engine merges them
+    with the add method, so only the counters are sent between processes.
+
+    Attributes:
+        strategy_names (list[str]): names of the strategies (indexes of the matrix).
+        wins (list[list[int]]): wins[winner][loser] - number of the won games. Games
+            of the strategy against itself are counted on the diagonal.
+        winning_shots (list[int]): sum of the shots made by the strategy in the won
+            games.
+        first_player_wins (int): number of the games won by the player who made the
+            first shot.
+        games (int): number of the played games.
+        elapsed_seconds (float): wall time of the simulation.
+    """
+
+    strategy_names: list[str]
+    wins: list[list[int]] = dataclasses.field(default_factory=list)
+    winning_shots: list[int] = dataclasses.field(default_factory=list)
+    first_player_wins: int = 0
+    games: int = 0
+    elapsed_seconds: float = 0.0
+
+    def __post_init__(self) -> None:
+        size: int = len(self.strategy_names)
+        if not self.wins:
+            self.wins = [[0] * size for _ in range(size)]
+        if not self.winning_shots:
+            self.winning_shots = [0] * size
+
+    def add_game(self, winner: int, loser: int, shots: int, is_first: bool) -> None:
+        """Count result of the game.
+
+        Args:
+            winner (int): index of the winner strategy.
+            loser (int): index of the loser strategy.
+            shots (int): number of the shots made by the winner.
+            is_first (bool): True if the winner made the first shot.
+        """
+        self.wins[winner][loser] += 1
+        self.winning_shots[winner] += shots
+        self.first_player_wins += is_first
+        self.games += 1
+
+    def add(self, other: "SimulationReport") -> None:
+        """Merge counters of the other report (with the same strategies).
+
+        Args:
+            other (SimulationReport): report of the other batch of games.
+        """
+        for row, other_row in zip(self.wins, other.wins):
+            for index, value in enumerate(other_row):
+                row[index] += value
+        for index, value in enumerate(other.winning_shots):
+            self.winning_shots[index] += value
+        self.first_player_wins += other.first_player_wins
+        self.games += other.games
+
+    def count_wins(self, index: int) -> int:
+        """Return number of the games won by the strategy.
+
+        Args:
+            index (int): index of the strategy.
+
+        Returns:
+            int: number of the won games.
+        """
+        return sum(self.wins[index])
+
+    def get_average_shots_to_win(self, index: int) -> float:
+        """Return average number of the shots made by the strategy in the won games.
+
+        Args:
+            index (int): index of the strategy.
+
+        Returns:
+            float: average shots to win, 0 if the strategy didn't win.
+        """
+        wins: int = self.count_wins(index)
+        return self.winning_shots[index] / wins if wins else 0.0
+
+    @property
+    def games_per_second(self) -> float:
+        """Return throughput of the simulation.
+
+        Returns:
+            float: games per second, 0 if the time is not measured.
+        """
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.games / self.elapsed_seconds
+
+    def format(self) -> str:
+        """Format report as a text table.
+
+        Returns:
+            str: report.
+        """
+        width: int = max([len(name) for name in self.strategy_names] + [8])
+        lines: list[str] = [
+            f"games: {self.games}, time: {self.elapsed_seconds:.2f} s, "
+            f"games/s: {self.games_per_second:.1f}, "
+            f"first player wins: {self.first_player_wins}",
+            "",
+            f"{'strategy':{width}}  {'wins':>8}  {'shots to win':>12}",
+        ]
+        for index, name in enumerate(self.strategy_names):
+            lines.append(
+                f"{name:{width}}  {self.count_wins(index):8d}  "
+                f"{self.get_average_shots_to_win(index):12.2f}"
+            )
+        lines += ["", "win matrix (row won against column):"]
+        lines.append(
+            f"{'':{width}}  "
+            + "  ".join(f"{name:>{width}}" for name in self.strategy_names)
+        )
+        for name, row in zip(self.strategy_names, self.wins):
+            lines.append(
+                f"{name:{width}}  " + "  ".join(f"{value:{width}d}" for value in row)
+            )
+        return "\n".join(lines)
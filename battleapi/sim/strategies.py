@@ -0,0 +1,309 @@
+"""Shooting strategies of the simulated (bot) players.
+
+Strategy chooses the next shot by the hidden view of the opponent board, the same
+information the real player has: shots and hits. Cells around the destroyed ship are
+marked as shot by the board, so the strategy never needs to track sunk ships.
+
+Strategies are pickled to the worker processes of the simulation, so they should be
+defined on the module level and keep only picklable configuration.
+"""
+import abc
+import random
+
+import battleapi.logic.heatmap as heatmap
+import battleapi.logic.models as models
+import battleapi.logic.montecarlo as montecarlo
+import battleapi.logic.player as pl
+import battleapi.logic.utils as utils
+
+ALL_COORDINATES: tuple[models.Coordinate, ...] = tuple(
+    (row, col)
+    for row in range(utils.SIZE_VERTICAL)
+    for col in range(utils.SIZE_HORIZONTAL)
+)
+ORTHOGONAL_MODIFIERS: tuple[models.Coordinate, ...] = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+class Strategy(abc.ABC):
+    """Interface of the shooting strategy."""
+
+    name: str = ""
+
+    def start_game(self) -> "Strategy":
+        """Return strategy for the new game.
+
+        Stateless strategies return itself, strategies with the state of the game
+        return new object.
+
+        Returns:
+            Strategy: strategy that plays the game.
+        """
+        return self
+
+    @abc.abstractmethod
+    def choose_shot(
+        self, view: pl.GameBoardView, rng: random.Random
+    ) -> models.Coordinate:
+        """Choose coordinate of the next shot.
+
+        Args:
+            view (pl.GameBoardView): hidden view of the opponent board.
+            rng (random.Random): random generator of the game (seeded).
+
+        Returns:
+            models.Coordinate: coordinate of the cell without shot.
+        """
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r})"
+
+
+def get_free_coordinates(view: pl.GameBoardView) -> list[models.Coordinate]:
+    """Return coordinates of the cells without shots.
+
+    Args:
+        view (pl.GameBoardView): view of the board.
+
+    Returns:
+        list[models.Coordinate]: coordinates in the row-major order.
+    """
+    return [(row, col) for row, col in ALL_COORDINATES if not view.has_shot(row, col)]
+
+
+def is_free(view: pl.GameBoardView, row: int, col: int) -> bool:
+    """Check if the cell is on the board and doesn't have shot.
+
+    Args:
+        view (pl.GameBoardView): view of the board.
+        row (int): row of the cell.
+        col (int): column of the cell.
+
+    Returns:
+        bool: True if the cell can be shot.
+    """
+    return (
+        0 <= row < utils.SIZE_VERTICAL
+        and 0 <= col < utils.SIZE_HORIZONTAL
+        and not view.has_shot(row, col)
+    )
+
+
+def view_to_masks(view: pl.GameBoardView) -> tuple[heatmap.Mask, heatmap.Mask]:
+    """Convert the view of the board to the masks (see heatmap.board_to_masks).
+
+    Args:
+        view (pl.GameBoardView): hidden view of the opponent board.
+
+    Returns:
+        tuple[heatmap.Mask, heatmap.Mask]: cells with shots and cells with hits.
+    """
+    shots: heatmap.Mask = 0
+    hits: heatmap.Mask = 0
+    for index, (row, col) in enumerate(ALL_COORDINATES):
+        if view.has_shot(row, col):
+            shots |= 1 << index
+            if view.has_ship(row, col):
+                hits |= 1 << index
+    return shots, hits
+
+
+class RandomStrategy(Strategy):
+    """Shoots to the random cell without shot. Baseline for the other strategies."""
+
+    name: str = "random"
+
+    def choose_shot(
+        self, view: pl.GameBoardView, rng: random.Random
+    ) -> models.Coordinate:
+        """Choose random cell without shot (see Strategy.choose_shot).
+
+        Args:
+            view (pl.GameBoardView): hidden view of the opponent board.
+            rng (random.Random): random generator of the game (seeded).
+
+        Returns:
+            models.Coordinate: coordinate of the cell without shot.
+        """
+        return rng.choice(get_free_coordinates(view))
+
+
+class HuntTargetStrategy(Strategy):
+    """Hunt/target strategy.
+
+    Hunt: shoots to the random cell (by default only to the cells of one color of
+    the checkerboard, every ship longer than 1 cell covers one of them).
+    Target: after the hit finishes the damaged ship, shooting along the line of the
+    hits when the direction is known.
+    """
+
+    name: str = "hunt_target"
+    parity: bool
+
+    def __init__(self, parity: bool = True) -> None:
+        """Initialize strategy.
+
+        Args:
+            parity (bool, optional): hunt only on the checkerboard cells.
+                Defaults to True.
+        """
+        self.parity = parity
+        if not parity:
+            self.name = "hunt_target_no_parity"
+
+    def _get_targets(self, view: pl.GameBoardView) -> list[models.Coordinate]:
+        """Find cells near the hits of the damaged ships.
+
+        Args:
+            view (pl.GameBoardView): hidden view of the opponent board.
+
+        Returns:
+            list[models.Coordinate]: cells on the line of the hits if the direction
+                is known, otherwise all free cells around the hits.
+        """
+        around: list[models.Coordinate] = []
+        on_line: list[models.Coordinate] = []
+        for row, col in ALL_COORDINATES:
+            if not view.has_ship(row, col):
+                continue
+            for row_mod, col_mod in ORTHOGONAL_MODIFIERS:
+                target_row, target_col = row + row_mod, col + col_mod
+                if not is_free(view, target_row, target_col):
+                    continue
+                around.append((target_row, target_col))
+                behind_row, behind_col = row - row_mod, col - col_mod
+                if (
+                    0 <= behind_row < utils.SIZE_VERTICAL
+                    and 0 <= behind_col < utils.SIZE_HORIZONTAL
+                    and view.has_ship(behind_row, behind_col)
+                ):
+                    on_line.append((target_row, target_col))
+        return on_line or around
+
+    def choose_shot(
+        self, view: pl.GameBoardView, rng: random.Random
+    ) -> models.Coordinate:
+        """Choose cell by the hunt/target rules (see Strategy.choose_shot).
+
+        Args:
+            view (pl.GameBoardView): hidden view of the opponent board.
+            rng (random.Random): random generator of the game (seeded).
+
+        Returns:
+            models.Coordinate: coordinate of the cell without shot.
+        """
+        targets: list[models.Coordinate] = self._get_targets(view)
+        if targets:
+            return rng.choice(targets)
+        free: list[models.Coordinate] = get_free_coordinates(view)
+        if self.parity:
+            checkerboard: list[models.Coordinate] = [
+                (row, col) for row, col in free if (row + col) % 2 == 0
+            ]
+            if checkerboard:
+                return rng.choice(checkerboard)
+        return rng.choice(free)
+
+
+class HeatmapStrategy(Strategy):
+    """Shoots by the placement probability heatmap (see heatmap.HeatmapBot)."""
+
+    name: str = "heatmap"
+    _bot: heatmap.HeatmapBot | None
+
+    def __init__(self) -> None:
+        """Initialize strategy, the bot is created for every game."""
+        self._bot = None
+
+    def start_game(self) -> "HeatmapStrategy":
+        """Return strategy with the new bot (see Strategy.start_game).
+
+        Returns:
+            HeatmapStrategy: strategy that plays the game.
+        """
+        strategy = HeatmapStrategy()
+        strategy._bot = heatmap.HeatmapBot()
+        return strategy
+
+    def choose_shot(
+        self, view: pl.GameBoardView, rng: random.Random
+    ) -> models.Coordinate:
+        """Choose cell with the highest weight (see Strategy.choose_shot).
+
+        Args:
+            view (pl.GameBoardView): hidden view of the opponent board.
+            rng (random.Random): random generator of the game (seeded).
+
+        Returns:
+            models.Coordinate: coordinate of the cell without shot.
+        """
+        if self._bot is None:
+            self._bot = heatmap.HeatmapBot()
+        self._bot.observe(*view_to_masks(view))
+        return self._bot.choose_shot(rng)
+
+
+class MonteCarloStrategy(Strategy):
+    """Shoots by the sampled occupancy probability (see montecarlo.MonteCarloBot).
+
+    Fleets are sampled in the worker process of the simulation, the games are
+    already distributed between the processes.
+    """
+
+    name: str = "montecarlo"
+    samples: int
+    time_budget: float
+    _bot: montecarlo.MonteCarloBot | None
+
+    def __init__(
+        self,
+        samples: int = montecarlo.DEFAULT_SAMPLES,
+        time_budget: float = montecarlo.DEFAULT_TIME_BUDGET,
+    ) -> None:
+        """Initialize strategy, the bot is created for every game.
+
+        Args:
+            samples (int, optional): number of the fleets used for the move.
+                Defaults to montecarlo.DEFAULT_SAMPLES.
+            time_budget (float, optional): seconds for sampling of the move.
+                Defaults to montecarlo.DEFAULT_TIME_BUDGET.
+        """
+        self.samples = samples
+        self.time_budget = time_budget
+        self._bot = None
+
+    def start_game(self) -> "MonteCarloStrategy":
+        """Return strategy with the new bot (see Strategy.start_game).
+
+        Returns:
+            MonteCarloStrategy: strategy that plays the game.
+        """
+        strategy = MonteCarloStrategy(self.samples, self.time_budget)
+        strategy._bot = montecarlo.MonteCarloBot(
+            samples=self.samples, time_budget=self.time_budget
+        )
+        return strategy
+
+    def choose_shot(
+        self, view: pl.GameBoardView, rng: random.Random
+    ) -> models.Coordinate:
+        """Choose cell with the highest occupancy (see Strategy.choose_shot).
+
+        Args:
+            view (pl.GameBoardView): hidden view of the opponent board.
+            rng (random.Random): random generator of the game (seeded).
+
+        Returns:
+            models.Coordinate: coordinate of the cell without shot.
+        """
+        if self._bot is None:
+            self._bot = self.start_game()._bot
+        self._bot.observe(*view_to_masks(view))
+        return self._bot.choose_shot(rng)
+
+
+STRATEGIES: dict[str, type[Strategy]] = {
+    RandomStrategy.name: RandomStrategy,
+    HuntTargetStrategy.name: HuntTargetStrategy,
+    HeatmapStrategy.name: HeatmapStrategy,
+    MonteCarloStrategy.name: MonteCarloStrategy,
+}
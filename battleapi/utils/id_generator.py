@@ -1,10 +1,10 @@
 """Implementation of the ID generator functionality."""
-import logging
 import uuid
 
 import battleapi.abstract as types
+import battleapi.utils.logs as logs
 
-log: logging.Logger = logging.getLogger(__name__)
+log: logs.StructuredLogger = logs.get_logger(__name__)
 
 
 class Uuid4IdGenerator(types.IdGenerator):
@@ -0,0 +1,271 @@
+"""Logging facade of the hot paths with cheap disabled levels and context fields.
+
+Loggers are the usual logging.Logger objects wrapped by StructuredLogger:
+
+- is_debug and is_info are the plain attributes (the isEnabledFor cache), so the
+  check of the disabled level is one attribute read. Attributes of all loggers are
+  recalculated when the logging levels are changed (Logger.setLevel,
+  logging.disable, logging.basicConfig, ...) or by refresh_levels.
+- debug_sampled logs only every n-th event of the message, it is used for the
+  events repeated by cells or shots.
+- log_context binds fields (session_id, player_id) to the current thread or task,
+  ContextFilter adds them to all log records as the context attribute.
+"""
+import contextlib
+import contextvars
+import itertools
+import logging
+import threading
+from typing import Any, Iterator
+
+ContextFields = dict[str, str]
+
+DEFAULT_SAMPLE_RATE: int = 100
+SECRET_FIELDS: frozenset[str] = frozenset({"player_id"})
+SECRET_VISIBLE_CHARS: int = 8
+
+_CONTEXT: contextvars.ContextVar[ContextFields] = contextvars.ContextVar(
+    "log_context", default={}
+)
+_LOGGERS: dict[str, "StructuredLogger"] = {}
+_LOGGERS_LOCK: threading.Lock = threading.Lock()
+
+
+class StructuredLogger:
+    """Logger wrapper with the cached enabled levels and sampled debug events.
+
+    Attributes:
+        logger (logging.Logger): wrapped logger.
+        is_debug (bool): True if DEBUG level is enabled.
+        is_info (bool): True if INFO level is enabled.
+    """
+
+    logger: logging.Logger
+    is_debug: bool
+    is_info: bool
+    _counters: dict[str, Iterator[int]]
+
+    def __init__(self, logger: logging.Logger) -> None:
+        """Initialization of the logger.
+
+        Args:
+            logger (logging.Logger): wrapped logger.
+        """
+        self.logger = logger
+        self._counters = {}
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Recalculate cached enabled levels."""
+        self.is_debug = self.logger.isEnabledFor(logging.DEBUG)
+        self.is_info = self.logger.isEnabledFor(logging.INFO)
+
+    def debug(self, msg: str, *args: Any) -> None:
+        """Log message with DEBUG level.
+
+        Args:
+            msg (str): message format.
+            args (Any): message arguments.
+        """
+        if self.is_debug:
+            self.logger.debug(msg, *args, stacklevel=2)
+
+    def debug_sampled(
+        self, msg: str, *args: Any, rate: int = DEFAULT_SAMPLE_RATE
+    ) -> None:
+        """Log every rate-th event of the message with DEBUG level.
+
+        Args:
+            msg (str): message format, events are counted by it.
+            args (Any): message arguments.
+            rate (int, optional): logged events ratio. Defaults to
+                DEFAULT_SAMPLE_RATE.
+        """
+        if not self.is_debug:
+            return
+        counter: Iterator[int] | None = self._counters.get(msg)
+        if counter is None:
+            counter = self._counters.setdefault(msg, itertools.count())
+        if next(counter) % rate == 0:
+            self.logger.debug(msg, *args, stacklevel=2)
+
+    def info(self, msg: str, *args: Any) -> None:
+        """Log message with INFO level.
+
+        Args:
+            msg (str): message format.
+            args (Any): message arguments.
+        """
+        if self.is_info:
+            self.logger.info(msg, *args, stacklevel=2)
+
+    def warning(self, msg: str, *args: Any) -> None:
+        """Log message with WARNING level.
+
+        Args:
+            msg (str): message format.
+            args (Any): message arguments.
+        """
+        self.logger.warning(msg, *args, stacklevel=2)
+
+    def error(self, msg: str, *args: Any) -> None:
+        """Log message with ERROR level.
+
+        Args:
+            msg (str): message format.
+            args (Any): message arguments.
+        """
+        self.logger.error(msg, *args, stacklevel=2)
+
+    def exception(self, msg: str, *args: Any) -> None:
+        """Log message with ERROR level and the current exception.
+
+        Args:
+            msg (str): message format.
+            args (Any): message arguments.
+        """
+        self.logger.exception(msg, *args, stacklevel=2)
+
+
+def get_logger(name: str) -> StructuredLogger:
+    """Return logger of the module (the same object for the same name).
+
+    Args:
+        name (str): logger name, usually __name__.
+
+    Returns:
+        StructuredLogger: logger.
+    """
+    logger: StructuredLogger | None = _LOGGERS.get(name)
+    if logger is None:
+        # logging lock is not taken under _LOGGERS_LOCK (refresh_levels can be
+        # called by logging with its lock taken)
+        created = StructuredLogger(logging.getLogger(name))
+        with _LOGGERS_LOCK:
+            logger = _LOGGERS.setdefault(name, created)
+        logger.refresh()
+    return logger
+
+
+def refresh_levels() -> None:
+    """Recalculate cached enabled levels of all the loggers."""
+    with _LOGGERS_LOCK:
+        loggers: list[StructuredLogger] = list(_LOGGERS.values())
+    for logger in loggers:
+        logger.refresh()
+
+
+def _install_refresh_hook() -> None:
+    """Refresh cached levels when logging clears its own isEnabledFor cache.
+
+    logging.Manager._clear_cache is called by logging on every change of the
+    levels, so the cached levels of the loggers are changed at the same time.
+    """
+    manager_type = type(logging.Logger.manager)
+    clear_cache = manager_type._clear_cache
+    if getattr(clear_cache, "refreshes_levels", False):
+        return
+
+    def _clear_cache(manager: logging.Manager) -> None:
+        clear_cache(manager)
+        refresh_levels()
+
+    _clear_cache.refreshes_levels = True  # type: ignore[attr-defined]
+    manager_type._clear_cache = _clear_cache  # type: ignore[method-assign]
+
+
+_install_refresh_hook()
+
+
+def get_context() -> ContextFields:
+    """Return context fields of the current thread or task.
+
+    Returns:
+        ContextFields: fields (the object must not be changed).
+    """
+    return _CONTEXT.get()
+
+
+def bind_context(**fields: str | None) -> contextvars.Token:
+    """Add fields to the context of the current thread or task until reset_context.
+
+    Args:
+        fields (str | None): fields to be added, None and empty values are skipped.
+
+    Returns:
+        contextvars.Token: token of the previous context.
+    """
+    context: ContextFields = dict(_CONTEXT.get())
+    context.update((key, value) for key, value in fields.items() if value)
+    return _CONTEXT.set(context)
+
+
+def reset_context(token: contextvars.Token) -> None:
+    """Restore context replaced by bind_context.
+
+    Args:
+        token (contextvars.Token): result of bind_context.
+    """
+    _CONTEXT.reset(token)
+
+
+@contextlib.contextmanager
+def log_context(**fields: str | None) -> Iterator[ContextFields]:
+    """Add fields to the context of the log records of the block.
+
+    Args:
+        fields (str | None): fields to be added, None and empty values are skipped.
+
+    Yields:
+        Iterator[ContextFields]: all context fields of the block.
+    """
+    token: contextvars.Token = bind_context(**fields)
+    try:
+        yield _CONTEXT.get()
+    finally:
+        reset_context(token)
+
+
+def format_context(context: ContextFields) -> str:
+    """Format context fields, secret fields are shortened.
+
+    Args:
+        context (ContextFields): fields.
+
+    Returns:
+        str: fields as " key=value" pairs or empty string.
+    """
+    parts: list[str] = []
+    for key, value in context.items():
+        if key in SECRET_FIELDS and len(value) > SECRET_VISIBLE_CHARS:
+            value = value[:SECRET_VISIBLE_CHARS] + "..."
+        parts.append(f" {key}={value}")
+    return "".join(parts)
+
+
+class ContextFilter(logging.Filter):
+    """Handler filter that adds the context attribute to every log record."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Add formatted context fields to the record (see format_context).
+
+        Args:
+            record (logging.LogRecord): log record.
+
+        Returns:
+            bool: always True.
+        """
+        context: ContextFields = _CONTEXT.get()
+        record.context = format_context(context) if context else ""
+        return True
+
+
+def install_context_filter(logger: logging.Logger | None = None) -> None:
+    """Add ContextFilter to the handlers of the logger.
+
+    Args:
+        logger (logging.Logger | None, optional): logger. Defaults to None (root).
+    """
+    for handler in (logger or logging.getLogger()).handlers:
+        if not any(isinstance(item, ContextFilter) for item in handler.filters):
+            handler.addFilter(ContextFilter())
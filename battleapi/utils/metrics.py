@@ -0,0 +1,671 @@
+"""Metrics of the game and persistence operations in the Prometheus text format.
+
+Counters, gauges and histograms are kept by the Registry (REGISTRY by default) and
+rendered in the text exposition format (version 0.0.4) by Registry.render.
+
+Metric changes don't take locks: every thread changes only its own cell of the
+value (threading.local), cells are summed when the metrics are rendered and cells
+of the finished threads are merged into the base value. So the change is a few
+attribute reads and one addition, the locks are taken only by the first change
+made by the thread and by the render.
+
+Metrics with labels return the labeled children by labels(...), the children
+should be kept by the caller when they are used in the hot paths.
+"""
+import abc
+import bisect
+import math
+import threading
+import weakref
+from typing import Callable, Iterator
+
+import battleapi.utils.logs as logs
+
+log: logs.StructuredLogger = logs.get_logger(__name__)
+
+Labels = tuple[str, ...]
+Sample = tuple[str, Labels, Labels, float]
+ValueFunction = Callable[[], float]
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+TYPE_COUNTER: str = "counter"
+TYPE_GAUGE: str = "gauge"
+TYPE_HISTOGRAM: str = "histogram"
+
+
+class ShardedValue:
+    """Numbers changed by many threads without locks (one cell per thread)."""
+
+    _size: int
+    _base: list[float]
+    _cells: list[tuple[threading.Thread, list[float]]]
+    _local: threading.local
+    _lock: threading.Lock
+
+    def __init__(self, size: int = 1) -> None:
+        """Initialization of the value.
+
+        Args:
+            size (int, optional): amount of the numbers. Defaults to 1.
+        """
+        self._size = size
+        self._base = [0.0] * size
+        self._cells = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def get_cell(self) -> list[float]:
+        """Return cell of the current thread, only this thread can change it.
+
+        Returns:
+            list[float]: numbers of the current thread.
+        """
+        try:
+            return self._local.cell
+        except AttributeError:
+            cell: list[float] = [0.0] * self._size
+            self._local.cell = cell
+            with self._lock:
+                self._merge_finished()
+                self._cells.append((threading.current_thread(), cell))
+            return cell
+
+    def _merge_finished(self) -> None:
+        """Merge cells of the finished threads into the base. Called under lock."""
+        alive: list[tuple[threading.Thread, list[float]]] = []
+        for thread, cell in self._cells:
+            if thread.is_alive():
+                alive.append((thread, cell))
+            else:
+                for index, number in enumerate(cell):
+                    self._base[index] += number
+        self._cells = alive
+
+    def collect(self) -> list[float]:
+        """Return sums of the numbers of all threads.
+
+        Returns:
+            list[float]: numbers.
+        """
+        with self._lock:
+            self._merge_finished()
+            totals: list[float] = list(self._base)
+            for _, cell in self._cells:
+                for index, number in enumerate(cell):
+                    totals[index] += number
+        return totals
+
+
+class CounterChild:
+    """Counter value of one set of the labels."""
+
+    _value: ShardedValue
+
+    def __init__(self) -> None:
+        """Initialization of the counter."""
+        self._value = ShardedValue()
+
+    def inc(self, amount: float = 1) -> None:
+        """Increase the counter.
+
+        Args:
+            amount (float, optional): not negative amount. Defaults to 1.
+        """
+        self._value.get_cell()[0] += amount
+
+    def get(self) -> float:
+        """Return value of the counter.
+
+        Returns:
+            float: value.
+        """
+        return self._value.collect()[0]
+
+
+class GaugeChild:
+    """Gauge value of one set of the labels.
+
+    Value is changed by inc and dec or is calculated by the function set by
+    set_function when the metrics are rendered.
+    """
+
+    _value: ShardedValue
+    _function: ValueFunction | None
+
+    def __init__(self) -> None:
+        """Initialization of the gauge."""
+        self._value = ShardedValue()
+        self._function = None
+
+    def inc(self, amount: float = 1) -> None:
+        """Increase the gauge.
+
+        Args:
+            amount (float, optional): amount. Defaults to 1.
+        """
+        self._value.get_cell()[0] += amount
+
+    def dec(self, amount: float = 1) -> None:
+        """Decrease the gauge.
+
+        Args:
+            amount (float, optional): amount. Defaults to 1.
+        """
+        self._value.get_cell()[0] -= amount
+
+    def set_function(self, function: ValueFunction | None) -> None:
+        """Calculate the value by the function instead of inc and dec.
+
+        Args:
+            function (ValueFunction | None): function or None to use inc and dec.
+        """
+        self._function = function
+
+    def get(self) -> float:
+        """Return value of the gauge.
+
+        Returns:
+            float: value, NaN if the function failed.
+        """
+        if self._function is None:
+            return self._value.collect()[0]
+        try:
+            return float(self._function())
+        except Exception as err:
+            log.warning("Gauge function failed: %s", err)
+            return math.nan
+
+
+class HistogramChild:
+    """Histogram value of one set of the labels."""
+
+    bounds: tuple[float, ...]
+    _value: ShardedValue
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        """Initialization of the histogram.
+
+        Args:
+            bounds (tuple[float, ...]): sorted upper bounds of the buckets, +Inf
+                bucket is added.
+        """
+        self.bounds = bounds
+        # not cumulative counts of the buckets and the sum of the values
+        self._value = ShardedValue(len(bounds) + 2)
+
+    def observe(self, value: float) -> None:
+        """Add value to the histogram.
+
+        Args:
+            value (float): observed value.
+        """
+        cell: list[float] = self._value.get_cell()
+        cell[bisect.bisect_left(self.bounds, value)] += 1
+        cell[-1] += value
+
+    def get(self) -> tuple[list[float], float, float]:
+        """Return cumulative bucket counts, sum and count of the values.
+
+        Returns:
+            tuple[list[float], float, float]: counts of the buckets by bounds (the
+                last one is +Inf), sum and count of the values.
+        """
+        numbers: list[float] = self._value.collect()
+        cumulative: list[float] = []
+        total: float = 0
+        for count in numbers[:-1]:
+            total += count
+            cumulative.append(total)
+        return cumulative, numbers[-1], total
+
+
+class Metric(abc.ABC):
+    """Metric family: children by the values of the labels."""
+
+    metric_type: str = ""
+    name: str
+    documentation: str
+    labelnames: Labels
+    _children: dict[Labels, object]
+    _lock: threading.Lock
+
+    def __init__(self, name: str, documentation: str, labelnames: Labels = ()):
+        """Initialization of the metric.
+
+        Args:
+            name (str): metric name.
+            documentation (str): help text.
+            labelnames (Labels, optional): names of the labels. Defaults to ().
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._children = {}
+        self._lock = threading.Lock()
+
+    @abc.abstractmethod
+    def _create_child(self) -> object:
+        """Create value of the new set of the labels.
+
+        Returns:
+            object: child.
+        """
+
+    def _get_child(self, values: Labels) -> object:
+        """Return child of the labels values, it is created if it doesn't exist.
+
+        Args:
+            values (Labels): values of the labels.
+
+        Raises:
+            ValueError: raised if the number of the values is not the number of the
+                labels.
+
+        Returns:
+            object: child.
+        """
+        child: object | None = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"Metric {self.name} has labels {self.labelnames}, got: {values}"
+                )
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._create_child()
+                    self._children[values] = child
+        return child
+
+    def _iterate_children(self) -> list[tuple[Labels, object]]:
+        """Return children sorted by the labels values.
+
+        Returns:
+            list[tuple[Labels, object]]: labels values and children.
+        """
+        with self._lock:
+            return sorted(self._children.items(), key=lambda item: item[0])
+
+    @abc.abstractmethod
+    def collect(self) -> Iterator[Sample]:
+        """Return samples of the metric.
+
+        Yields:
+            Iterator[Sample]: sample name, label names, label values and value.
+        """
+
+
+class Counter(Metric):
+    """Counter: value that only increases."""
+
+    metric_type: str = TYPE_COUNTER
+
+    def _create_child(self) -> CounterChild:
+        """Create counter of the new set of the labels.
+
+        Returns:
+            CounterChild: counter.
+        """
+        return CounterChild()
+
+    def labels(self, *values: str) -> CounterChild:
+        """Return counter of the labels values.
+
+        Args:
+            values (str): values of the labels.
+
+        Returns:
+            CounterChild: counter.
+        """
+        return self._get_child(values)  # type: ignore[return-value]
+
+    def inc(self, amount: float = 1) -> None:
+        """Increase counter without labels.
+
+        Args:
+            amount (float, optional): not negative amount. Defaults to 1.
+        """
+        self.labels().inc(amount)
+
+    def get(self) -> float:
+        """Return value of the counter without labels.
+
+        Returns:
+            float: value.
+        """
+        return self.labels().get()
+
+    def collect(self) -> Iterator[Sample]:
+        """Return samples of the counter.
+
+        Yields:
+            Iterator[Sample]: sample name, label names, label values and value.
+        """
+        for values, child in self._iterate_children():
+            yield self.name, self.labelnames, values, child.get()  # type: ignore
+
+
+class Gauge(Metric):
+    """Gauge: value that increases and decreases or is calculated on render."""
+
+    metric_type: str = TYPE_GAUGE
+
+    def _create_child(self) -> GaugeChild:
+        """Create gauge of the new set of the labels.
+
+        Returns:
+            GaugeChild: gauge.
+        """
+        return GaugeChild()
+
+    def labels(self, *values: str) -> GaugeChild:
+        """Return gauge of the labels values.
+
+        Args:
+            values (str): values of the labels.
+
+        Returns:
+            GaugeChild: gauge.
+        """
+        return self._get_child(values)  # type: ignore[return-value]
+
+    def inc(self, amount: float = 1) -> None:
+        """Increase gauge without labels.
+
+        Args:
+            amount (float, optional): amount. Defaults to 1.
+        """
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1) -> None:
+        """Decrease gauge without labels.
+
+        Args:
+            amount (float, optional): amount. Defaults to 1.
+        """
+        self.labels().dec(amount)
+
+    def set_function(self, function: ValueFunction | None) -> None:
+        """Calculate the value of the gauge without labels by the function.
+
+        Args:
+            function (ValueFunction | None): function or None to use inc and dec.
+        """
+        self.labels().set_function(function)
+
+    def get(self) -> float:
+        """Return value of the gauge without labels.
+
+        Returns:
+            float: value.
+        """
+        return self.labels().get()
+
+    def collect(self) -> Iterator[Sample]:
+        """Return samples of the gauge.
+
+        Yields:
+            Iterator[Sample]: sample name, label names, label values and value.
+        """
+        for values, child in self._iterate_children():
+            yield self.name, self.labelnames, values, child.get()  # type: ignore
+
+
+class Histogram(Metric):
+    """Histogram: counts of the observed values by buckets, sum and count."""
+
+    metric_type: str = TYPE_HISTOGRAM
+    bounds: tuple[float, ...]
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Labels = (),
+        bounds: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Initialization of the histogram.
+
+        Args:
+            name (str): metric name.
+            documentation (str): help text.
+            labelnames (Labels, optional): names of the labels. Defaults to ().
+            bounds (tuple[float, ...], optional): upper bounds of the buckets.
+                Defaults to DEFAULT_BUCKETS.
+        """
+        super().__init__(name, documentation, labelnames)
+        self.bounds = tuple(sorted(bounds))
+
+    def _create_child(self) -> HistogramChild:
+        """Create histogram of the new set of the labels.
+
+        Returns:
+            HistogramChild: histogram.
+        """
+        return HistogramChild(self.bounds)
+
+    def labels(self, *values: str) -> HistogramChild:
+        """Return histogram of the labels values.
+
+        Args:
+            values (str): values of the labels.
+
+        Returns:
+            HistogramChild: histogram.
+        """
+        return self._get_child(values)  # type: ignore[return-value]
+
+    def observe(self, value: float) -> None:
+        """Add value to the histogram without labels.
+
+        Args:
+            value (float): observed value.
+        """
+        self.labels().observe(value)
+
+    def collect(self) -> Iterator[Sample]:
+        """Return samples of the histogram.
+
+        Yields:
+            Iterator[Sample]: sample name, label names, label values and value.
+        """
+        bucket_labels: Labels = self.labelnames + ("le",)
+        bounds: list[str] = [format_value(bound) for bound in self.bounds]
+        bounds.append("+Inf")
+        for values, child in self._iterate_children():
+            buckets, total, count = child.get()  # type: ignore[attr-defined]
+            for bound, bucket in zip(bounds, buckets):
+                yield f"{self.name}_bucket", bucket_labels, values + (bound,), bucket
+            yield f"{self.name}_sum", self.labelnames, values, total
+            yield f"{self.name}_count", self.labelnames, values, count
+
+
+def format_value(value: float) -> str:
+    """Format sample value of the text format.
+
+    Args:
+        value (float): value.
+
+    Returns:
+        str: formatted value.
+    """
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def escape_label(value: str) -> str:
+    """Escape label value of the text format.
+
+    Args:
+        value (str): label value.
+
+    Returns:
+        str: escaped value.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def weak_method(method: Callable[[], float], default: float = 0.0) -> ValueFunction:
+    """Wrap bound method for set_function, so the gauge doesn't keep its object.
+
+    Args:
+        method (Callable[[], float]): bound method.
+        default (float, optional): value when the object is removed. Defaults to 0.
+
+    Returns:
+        ValueFunction: function of the gauge.
+    """
+    reference: weakref.WeakMethod = weakref.WeakMethod(method)  # type: ignore
+
+    def call() -> float:
+        bound: Callable[[], float] | None = reference()
+        return default if bound is None else bound()
+
+    return call
+
+
+class Registry:
+    """Registry of the metrics (thread safe)."""
+
+    _metrics: dict[str, Metric]
+    _lock: threading.Lock
+
+    def __init__(self) -> None:
+        """Initialization of the registry."""
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: Metric) -> Metric:
+        """Add metric or return already registered one with the same name.
+
+        Args:
+            metric (Metric): new metric.
+
+        Raises:
+            ValueError: raised if the registered metric has other type or labels.
+
+        Returns:
+            Metric: registered metric.
+        """
+        with self._lock:
+            registered: Metric | None = self._metrics.get(metric.name)
+            if registered is None:
+                self._metrics[metric.name] = metric
+                return metric
+        if (
+            type(registered) is not type(metric)
+            or registered.labelnames != metric.labelnames
+        ):
+            raise ValueError(
+                f"Metric {metric.name} is registered as {registered.metric_type} "
+                f"with labels {registered.labelnames}"
+            )
+        return registered
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Labels = ()
+    ) -> Counter:
+        """Return counter, it is registered if it doesn't exist.
+
+        Args:
+            name (str): metric name.
+            documentation (str): help text.
+            labelnames (Labels, optional): names of the labels. Defaults to ().
+
+        Returns:
+            Counter: counter.
+        """
+        return self._register(Counter(name, documentation, labelnames))  # type: ignore
+
+    def gauge(self, name: str, documentation: str, labelnames: Labels = ()) -> Gauge:
+        """Return gauge, it is registered if it doesn't exist.
+
+        Args:
+            name (str): metric name.
+            documentation (str): help text.
+            labelnames (Labels, optional): names of the labels. Defaults to ().
+
+        Returns:
+            Gauge: gauge.
+        """
+        return self._register(Gauge(name, documentation, labelnames))  # type: ignore
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Labels = (),
+        bounds: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Return histogram, it is registered if it doesn't exist.
+
+        Args:
+            name (str): metric name.
+            documentation (str): help text.
+            labelnames (Labels, optional): names of the labels. Defaults to ().
+            bounds (tuple[float, ...], optional): upper bounds of the buckets.
+                Defaults to DEFAULT_BUCKETS.
+
+        Returns:
+            Histogram: histogram.
+        """
+        return self._register(  # type: ignore[return-value]
+            Histogram(name, documentation, labelnames, bounds)
+        )
+
+    def get(self, name: str) -> Metric | None:
+        """Return registered metric.
+
+        Args:
+            name (str): metric name.
+
+        Returns:
+            Metric | None: metric or None if it is not registered.
+        """
+        with self._lock:
+            return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render all metrics in the text exposition format.
+
+        Returns:
+            str: metrics.
+        """
+        with self._lock:
+            registered: list[Metric] = sorted(
+                self._metrics.values(), key=lambda metric: metric.name
+            )
+        lines: list[str] = []
+        for metric in registered:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.metric_type}")
+            for name, labelnames, values, value in metric.collect():
+                if labelnames:
+                    labels: str = ",".join(
+                        f'{label}="{escape_label(item)}"'
+                        for label, item in zip(labelnames, values)
+                    )
+                    name = f"{name}{{{labels}}}"
+                lines.append(f"{name} {format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY: Registry = Registry()
@@ -1,15 +1,203 @@
-"""Context module. Has public constants."""
+"""Context module. Has public constants.
+
+DB client is selected by environment variables:
+    BATTLESHIP_DB_CLIENT - "memory" (default) or "sqlite".
+    BATTLESHIP_DB_PATH - path to the SQLite database file (sqlite only).
+    BATTLESHIP_DB_BATCH_SIZE - number of changes committed at once (sqlite only).
+    BATTLESHIP_DB_FLUSH_INTERVAL - seconds between background flushes of the not
+        full batch (sqlite only, batch size > 1). Client is closed (pending changes
+        are written) at exit.
+
+Persistence is selected by BATTLESHIP_PERSISTENCE:
+    "state" (default) - whole session state is saved by the DB client.
+    "events" - changes are appended to the in memory event log with snapshots
+        (BATTLESHIP_SNAPSHOT_INTERVAL - number of events between snapshots).
+
+Abandoned sessions are removed by the expiring client (state persistence only):
+    BATTLESHIP_SESSION_TTL - idle seconds before session expires (0 - never).
+    BATTLESHIP_MAX_SESSIONS - max number of the stored sessions (0 - no limit).
+    BATTLESHIP_MAX_SESSION_BYTES - max total size of the sessions (0 - no limit).
+    BATTLESHIP_SWEEP_INTERVAL - seconds between background sweeps (0 - no sweeper,
+        default: sessions are expired on access and evicted by the limits).
+
+Bot of the single-player games is selected by BATTLESHIP_BOT:
+    "heatmap" (default) - placement probability heatmap, below 1 ms per move.
+    "montecarlo" - Monte-Carlo sampling of the fleets (stronger, slower):
+        BATTLESHIP_BOT_TIME_BUDGET - seconds of sampling per move.
+        BATTLESHIP_BOT_WORKERS - number of the sampling processes (0 - sampling in
+            the request thread).
+"""
+import atexit
+import concurrent.futures
+import functools
+import os
+
 import battleapi.abstract as abstract
+import battleapi.api.bots as bots
+import battleapi.api.broker as broker
 import battleapi.api.controller as controller
+import battleapi.api.event_persistence as event_persistence
 import battleapi.api.persistence as persistence
+import battleapi.db.expiring_db_client as expiring_db_client
 import battleapi.db.in_memory_db_client as db_client
+import battleapi.db.in_memory_event_store as event_store
+import battleapi.db.sqlite_db_client as sqlite_db_client
+import battleapi.logic.montecarlo as montecarlo
 import battleapi.utils.id_generator as id_generator
 
-IN_MEMORY_DB_CLIENT: abstract.DbClient = db_client.InMemoryDbClient()
+DB_CLIENT_MEMORY: str = "memory"
+DB_CLIENT_SQLITE: str = "sqlite"
+PERSISTENCE_STATE: str = "state"
+PERSISTENCE_EVENTS: str = "events"
+BOT_HEATMAP: str = "heatmap"
+BOT_MONTECARLO: str = "montecarlo"
+DEFAULT_DB_PATH: str = "battleship.sqlite"
+DEFAULT_SESSION_TTL: str = "86400"
+DEFAULT_MAX_SESSIONS: str = "100000"
+DEFAULT_SWEEP_INTERVAL: str = "0"
+DEFAULT_FLUSH_INTERVAL: str = "1"
+
+
+def _get_limit(name: str, default: str) -> float | None:
+    """Read positive limit from the environment variable.
+
+    Args:
+        name (str): name of the variable.
+        default (str): default value.
+
+    Returns:
+        float | None: limit or None if it is disabled (0).
+    """
+    value: float = float(os.environ.get(name, default))
+    return value if value > 0 else None
+
+
+def create_db_client() -> abstract.DbClient:
+    """Create DB client selected by the environment variables.
+
+    Raises:
+        ValueError: raised if the client type is unknown.
+
+    Returns:
+        abstract.DbClient: DB client.
+    """
+    client_type: str = os.environ.get("BATTLESHIP_DB_CLIENT", DB_CLIENT_MEMORY)
+    if client_type == DB_CLIENT_MEMORY:
+        return db_client.InMemoryDbClient()
+    if client_type == DB_CLIENT_SQLITE:
+        client = sqlite_db_client.SqliteDbClient(
+            path=os.environ.get("BATTLESHIP_DB_PATH", DEFAULT_DB_PATH),
+            batch_size=int(os.environ.get("BATTLESHIP_DB_BATCH_SIZE", "1")),
+        )
+        if client.batch_size > 1:
+            client.start_flusher(
+                float(
+                    os.environ.get(
+                        "BATTLESHIP_DB_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL
+                    )
+                )
+            )
+        atexit.register(client.close)
+        return client
+    raise ValueError(f"Unknown DB client: {client_type}")
+
+
+def create_expiring_db_client(
+    storage: abstract.DbClient,
+) -> expiring_db_client.ExpiringDbClient:
+    """Wrap DB client to remove abandoned sessions and start the sweeper if it is
+    enabled.
+
+    Args:
+        storage (abstract.DbClient): DB client that stores sessions.
+
+    Returns:
+        expiring_db_client.ExpiringDbClient: expiring DB client.
+    """
+    max_sessions: float | None = _get_limit(
+        "BATTLESHIP_MAX_SESSIONS", DEFAULT_MAX_SESSIONS
+    )
+    max_bytes: float | None = _get_limit("BATTLESHIP_MAX_SESSION_BYTES", "0")
+    client = expiring_db_client.ExpiringDbClient(
+        storage,
+        ttl=_get_limit("BATTLESHIP_SESSION_TTL", DEFAULT_SESSION_TTL),
+        max_sessions=int(max_sessions) if max_sessions is not None else None,
+        max_bytes=int(max_bytes) if max_bytes is not None else None,
+    )
+    interval: float | None = _get_limit(
+        "BATTLESHIP_SWEEP_INTERVAL", DEFAULT_SWEEP_INTERVAL
+    )
+    if interval is not None:
+        client.start_sweeper(interval)
+    return client
+
+
+def create_persistence() -> abstract.GamePersistence:
+    """Create persistence selected by the environment variables.
+
+    Raises:
+        ValueError: raised if the persistence type is unknown.
+
+    Returns:
+        abstract.GamePersistence: persistence.
+    """
+    persistence_type: str = os.environ.get("BATTLESHIP_PERSISTENCE", PERSISTENCE_STATE)
+    if persistence_type == PERSISTENCE_STATE:
+        return persistence.GamePersistenceApi(
+            create_expiring_db_client(create_db_client())
+        )
+    if persistence_type == PERSISTENCE_EVENTS:
+        return event_persistence.EventSourcedGamePersistence(
+            event_store.InMemoryEventStore(),
+            snapshot_interval=int(
+                os.environ.get(
+                    "BATTLESHIP_SNAPSHOT_INTERVAL",
+                    str(event_persistence.DEFAULT_SNAPSHOT_INTERVAL),
+                )
+            ),
+        )
+    raise ValueError(f"Unknown persistence: {persistence_type}")
+
+
+def create_bot_registry() -> bots.BotRegistry:
+    """Create registry of the bots selected by the environment variables.
+
+    Raises:
+        ValueError: raised if the bot type is unknown.
+
+    Returns:
+        bots.BotRegistry: registry of the bots.
+    """
+    bot_type: str = os.environ.get("BATTLESHIP_BOT", BOT_HEATMAP)
+    if bot_type == BOT_HEATMAP:
+        return bots.BotRegistry()
+    if bot_type == BOT_MONTECARLO:
+        workers: int = int(os.environ.get("BATTLESHIP_BOT_WORKERS", "0"))
+        executor: concurrent.futures.Executor | None = (
+            concurrent.futures.ProcessPoolExecutor(workers) if workers > 0 else None
+        )
+        return bots.BotRegistry(
+            bot_factory=functools.partial(
+                montecarlo.MonteCarloBot,
+                time_budget=float(
+                    os.environ.get(
+                        "BATTLESHIP_BOT_TIME_BUDGET",
+                        str(montecarlo.DEFAULT_TIME_BUDGET),
+                    )
+                ),
+                executor=executor,
+                tasks=max(1, workers),
+            )
+        )
+    raise ValueError(f"Unknown bot: {bot_type}")
+
+
 ID_GENERATOR: abstract.IdGenerator = id_generator.Uuid4IdGenerator()
-PERSISTENCE_API: abstract.GamePersistence = persistence.GamePersistenceApi(
-    IN_MEMORY_DB_CLIENT
-)
+PERSISTENCE_API: abstract.GamePersistence = create_persistence()
+BROKER: broker.Broker = broker.Broker()
 GAME_API: abstract.GameController = controller.GameControllerApi(
-    persistence=PERSISTENCE_API, id_generator=ID_GENERATOR
+    persistence=PERSISTENCE_API,
+    id_generator=ID_GENERATOR,
+    notification_broker=BROKER,
+    bot_registry=create_bot_registry(),
 )
@@ -0,0 +1,394 @@
+"""JSON API (version 1) requests controller.
+
+Exposes game operations for bots, load testers and other non browser clients. Player
+is identified by the X-Player-Id header with the id returned on create/join. Fields
+are returned as the compact list of rows, one character per cell (see
+battleapi.api.dto.CELL_*), ships of the opponent are hidden.
+
+Process requests to the next endpoints:
+    - POST base_url/api/v1/sessions {"player_name", "with_bot"}
+        Create new game session with the player (and the computer opponent if
+            with_bot is true). Returns session and player ids.
+    - POST base_url/api/v1/sessions/<string:session_id>/players {"player_name"}
+        Join player to the session. Returns session and player ids.
+    - GET base_url/api/v1/sessions/<string:session_id>
+        Returns snapshot of the session: stage, players, counters and fields.
+    - GET base_url/api/v1/sessions/<string:session_id>/ships
+        Returns ships that are not placed to the field yet.
+    - POST base_url/api/v1/sessions/<string:session_id>/ships
+        {"ship_id", "row", "col", "direction"}
+        Place ship to the field. Returns field of the player.
+    - POST base_url/api/v1/sessions/<string:session_id>/ships/random
+        Place all ships to the random positions. Returns field of the player.
+    - DELETE base_url/api/v1/sessions/<string:session_id>/ships/<int:row>/<int:col>
+        Remove ship from the field. Returns field of the player.
+    - POST base_url/api/v1/sessions/<string:session_id>/ready
+        Finish preparation stage. Returns readiness of the player.
+    - POST base_url/api/v1/sessions/<string:session_id>/shots {"row", "col"}
+        Make shot by the opponent field. Returns result of the shot.
+    - GET base_url/api/v1/sessions/<string:session_id>/events
+        Returns Server-Sent Events stream with the changes of the game session (see
+        battleflask.app.controllers.notifications).
+
+Errors are returned as {"error": exception name, "message": text} with the error status.
+"""
+from typing import Any
+
+import flask
+import werkzeug
+
+import battleapi.api.dto as dto
+import battleapi.logic.exceptions as game_ex
+import battleapi.utils.logs as logs
+import battleflask.app.context as ctx
+import battleflask.app.controllers.constants as const
+import battleflask.app.controllers.notifications as notifications
+import battleflask.app.controllers.request_utils as request_utils
+import battleflask.app.exceptions as ex
+import battleflask.app.validation_utils as validation
+
+log: logs.StructuredLogger = logs.get_logger(__name__)
+
+API_V1_CONTROLLER: flask.Blueprint = flask.Blueprint(
+    const.CONTROLLER_API_V1, __name__, url_prefix="/api/v1"
+)
+
+STAGE_WAIT: str = "wait"
+STAGE_PREPARE: str = "prepare"
+STAGE_GAMEPLAY: str = "gameplay"
+STAGE_FINISHED: str = "finished"
+
+ERROR_STATUSES: dict[type[Exception], int] = {
+    ex.IsEmptyStringException: 400,
+    ex.IsNotValidCoordinateException: 400,
+    game_ex.CoordinateException: 400,
+    game_ex.IncorrectStringException: 400,
+    game_ex.ShipWithoutIdException: 400,
+    ex.PlayerIsNotInSessionException: 404,
+    game_ex.SessionIsNotCreatedException: 404,
+    game_ex.PlayerNotFoundException: 404,
+    game_ex.PlayerDoesNotExistException: 404,
+    game_ex.ShipNotFoundException: 404,
+    game_ex.NotPlayerTurnException: 409,
+    game_ex.ToManyPlayersException: 409,
+    game_ex.PlayerExistException: 409,
+    game_ex.CellIsNotEmptyException: 409,
+    game_ex.ShipAlreadyOnTheBoardException: 409,
+    game_ex.PlayerIsReadyException: 409,
+    game_ex.SessionVersionConflictException: 409,
+}
+
+
+@API_V1_CONTROLLER.errorhandler(Exception)
+def _handle_error(error: Exception) -> tuple[flask.Response, int]:
+    """Convert exception to the JSON error response.
+
+    Args:
+        error (Exception): raised exception.
+
+    Returns:
+        tuple[flask.Response, int]: error response and its status.
+    """
+    status: int | None = ERROR_STATUSES.get(type(error))
+    if status is None and isinstance(error, werkzeug.exceptions.HTTPException):
+        status = error.code
+    if status is None:
+        log.exception("Request failed: %s", error)
+        status = 500
+    return flask.jsonify(error=type(error).__name__, message=str(error)), status
+
+
+def _get_player_id(session_id: str) -> str:
+    """Return id of the player who made the request.
+
+    Args:
+        session_id (str): game session id.
+
+    Raises:
+        ex.PlayerIsNotInSessionException: raised if the player is not in the session.
+
+    Returns:
+        str: player id.
+    """
+    player_id: str = request_utils.get_header_string(const.HEADER_PLAYER_ID)
+    validation.validate_is_not_empty_string(player_id, const.HEADER_PLAYER_ID)
+    if ctx.GAME_API.get_player_by_id(session_id, player_id) is None:
+        raise ex.PlayerIsNotInSessionException(
+            f"Player is not found in the session {session_id}"
+        )
+    return player_id
+
+
+def _get_coordinate() -> tuple[int, int]:
+    """Return coordinate passed in the JSON body (row, col).
+
+    Returns:
+        tuple[int, int]: coordinate.
+    """
+    row: int = request_utils.get_json_int("row")
+    col: int = request_utils.get_json_int("col")
+    validation.validate_is_correct_coordinate(row, "row")
+    validation.validate_is_correct_coordinate(col, "col")
+    return row, col
+
+
+def _get_stage(
+    player: dto.PlayerDto, opponent: dto.PlayerDto | None, winner: dto.PlayerDto | None
+) -> str:
+    """Return stage of the game.
+
+    Args:
+        player (dto.PlayerDto): current player.
+        opponent (dto.PlayerDto | None): opponent (if joined).
+        winner (dto.PlayerDto | None): winner (if finished).
+
+    Returns:
+        str: one of STAGE_* values.
+    """
+    if opponent is None:
+        return STAGE_WAIT
+    if not player.is_ready or not opponent.is_ready:
+        return STAGE_PREPARE
+    if winner is not None:
+        return STAGE_FINISHED
+    return STAGE_GAMEPLAY
+
+
+def _to_player_json(player: dto.PlayerDto | None) -> dict[str, Any] | None:
+    """Convert player to JSON object without id (id is a secret of the player).
+
+    Args:
+        player (dto.PlayerDto | None): player.
+
+    Returns:
+        dict[str, Any] | None: name and readiness of the player.
+    """
+    if player is None:
+        return None
+    return {"player_name": player.player_name, "is_ready": player.is_ready}
+
+
+@API_V1_CONTROLLER.route("/sessions", methods=[const.METHOD_POST])
+def _post_api_create_session() -> tuple[flask.Response, int]:
+    """Create game session with the player (and the bot opponent if requested).
+
+    Returns:
+        tuple[flask.Response, int]: session id and player id.
+    """
+    player_name: str = request_utils.get_json_string(const.FORM_PLAYER_NAME)
+    with_bot: bool = request_utils.get_json_bool(const.FORM_WITH_BOT)
+    validation.validate_is_not_empty_string(player_name, "player_name")
+
+    session_id: str = ctx.GAME_API.init_game_session()
+    player: dto.PlayerDto = ctx.GAME_API.create_player_in_session(
+        session_id, player_name
+    )
+    log.debug("Created session: %s, player: %s", session_id, player)
+    if with_bot:
+        bot: dto.PlayerDto = ctx.GAME_API.create_bot_in_session(session_id)
+        log.debug("Created bot: %s", bot)
+    return flask.jsonify(session_id=session_id, player_id=player.player_id), 201
+
+
+@API_V1_CONTROLLER.route(
+    "/sessions/<string:session_id>/players", methods=[const.METHOD_POST]
+)
+def _post_api_join_session(session_id: str) -> tuple[flask.Response, int]:
+    """Join player to the game session.
+
+    Args:
+        session_id (str): game session id.
+
+    Returns:
+        tuple[flask.Response, int]: session id and player id.
+    """
+    player_name: str = request_utils.get_json_string(const.FORM_PLAYER_NAME)
+    validation.validate_is_not_empty_string(player_name, "player_name")
+
+    player: dto.PlayerDto = ctx.GAME_API.create_player_in_session(
+        session_id, player_name
+    )
+    log.debug("Joined session: %s, player: %s", session_id, player)
+    return flask.jsonify(session_id=session_id, player_id=player.player_id), 201
+
+
+@API_V1_CONTROLLER.route("/sessions/<string:session_id>", methods=[const.METHOD_GET])
+def _get_api_session_snapshot(session_id: str) -> flask.Response:
+    """Return snapshot of the game session for the player.
+
+    Args:
+        session_id (str): game session id.
+
+    Returns:
+        flask.Response: stage, players, counters and fields of the game.
+    """
+    player_id: str = request_utils.get_header_string(const.HEADER_PLAYER_ID)
+    validation.validate_is_not_empty_string(player_id, const.HEADER_PLAYER_ID)
+    snapshot: dto.GameplaySnapshotDto = ctx.GAME_API.get_gameplay_snapshot(
+        session_id, player_id
+    )
+    active_player: dto.PlayerDto | None = snapshot.active_player
+    winner: dto.PlayerDto | None = snapshot.winner
+    return flask.jsonify(
+        session_id=session_id,
+        stage=_get_stage(snapshot.player, snapshot.opponent, winner),
+        player=_to_player_json(snapshot.player),
+        opponent=_to_player_json(snapshot.opponent),
+        is_active=active_player is not None and active_player.player_id == player_id,
+        is_winner=winner is not None and winner.player_id == player_id,
+        cells_self=snapshot.number_of_cells_self,
+        cells_opponent=snapshot.number_of_cells_opponent,
+        field=dto.encode_cell_rows(snapshot.player_field),
+        opponent_field=dto.encode_cell_rows(snapshot.opponent_field),
+    )
+
+
+@API_V1_CONTROLLER.route(
+    "/sessions/<string:session_id>/ships", methods=[const.METHOD_GET]
+)
+def _get_api_ships(session_id: str) -> flask.Response:
+    """Return ships that are not placed to the field.
+
+    Args:
+        session_id (str): game session id.
+
+    Returns:
+        flask.Response: list of the ships.
+    """
+    player_id: str = _get_player_id(session_id)
+    ships: list[dto.ShipDto] = ctx.GAME_API.get_prepare_ships_list(
+        session_id, player_id
+    )
+    return flask.jsonify(
+        ships=[
+            {
+                "ship_id": ship.ship_id,
+                "ship_size": ship.ship_size,
+                "direction": ship.direction,
+            }
+            for ship in ships
+        ]
+    )
+
+
+@API_V1_CONTROLLER.route(
+    "/sessions/<string:session_id>/ships", methods=[const.METHOD_POST]
+)
+def _post_api_add_ship(session_id: str) -> flask.Response:
+    """Place ship to the field of the player.
+
+    Args:
+        session_id (str): game session id.
+
+    Returns:
+        flask.Response: field of the player.
+    """
+    player_id: str = _get_player_id(session_id)
+    ship_id: str = request_utils.get_json_string("ship_id")
+    direction: str = request_utils.get_json_string("direction")
+    validation.validate_is_not_empty_string(ship_id, "ship_id")
+    validation.validate_is_not_empty_string(direction, "direction")
+    coordinate: tuple[int, int] = _get_coordinate()
+
+    ctx.GAME_API.add_ship_to_field(
+        session_id, player_id, ship_id, coordinate, direction.upper()
+    )
+    return flask.jsonify(field=ctx.GAME_API.get_field_rows(session_id, player_id))
+
+
+@API_V1_CONTROLLER.route(
+    "/sessions/<string:session_id>/ships/random", methods=[const.METHOD_POST]
+)
+def _post_api_random_ships(session_id: str) -> flask.Response:
+    """Place all ships of the player to the random positions.
+
+    Args:
+        session_id (str): game session id.
+
+    Returns:
+        flask.Response: field of the player.
+    """
+    player_id: str = _get_player_id(session_id)
+    ctx.GAME_API.randomize_fleet(session_id, player_id)
+    return flask.jsonify(field=ctx.GAME_API.get_field_rows(session_id, player_id))
+
+
+@API_V1_CONTROLLER.route(
+    "/sessions/<string:session_id>/ships/<int:row>/<int:col>",
+    methods=[const.METHOD_DELETE],
+)
+def _delete_api_ship(session_id: str, row: int, col: int) -> flask.Response:
+    """Remove ship from the field of the player.
+
+    Args:
+        session_id (str): game session id.
+        row (int): row of any cell of the ship.
+        col (int): column of any cell of the ship.
+
+    Returns:
+        flask.Response: field of the player.
+    """
+    player_id: str = _get_player_id(session_id)
+    validation.validate_is_correct_coordinate(row, "row")
+    validation.validate_is_correct_coordinate(col, "col")
+
+    ctx.GAME_API.remove_ship_from_field(session_id, player_id, (row, col))
+    return flask.jsonify(field=ctx.GAME_API.get_field_rows(session_id, player_id))
+
+
+@API_V1_CONTROLLER.route(
+    "/sessions/<string:session_id>/ready", methods=[const.METHOD_POST]
+)
+def _post_api_ready(session_id: str) -> flask.Response:
+    """Finish preparation stage of the player.
+
+    Args:
+        session_id (str): game session id.
+
+    Returns:
+        flask.Response: readiness of the player (False if not all ships are placed).
+    """
+    player_id: str = _get_player_id(session_id)
+    ctx.GAME_API.start_game(session_id, player_id)
+    player: dto.PlayerDto = ctx.GAME_API.get_player_by_id(session_id, player_id)
+    return flask.jsonify(is_ready=player.is_ready)
+
+
+@API_V1_CONTROLLER.route(
+    "/sessions/<string:session_id>/shots", methods=[const.METHOD_POST]
+)
+def _post_api_shot(session_id: str) -> flask.Response:
+    """Make shot by the opponent field.
+
+    Args:
+        session_id (str): game session id.
+
+    Returns:
+        flask.Response: result of the shot.
+    """
+    player_id: str = _get_player_id(session_id)
+    coordinate: tuple[int, int] = _get_coordinate()
+    result: dto.ShotResultDto = ctx.GAME_API.make_shot(
+        session_id, player_id, coordinate, check_turn=True
+    )
+    return flask.jsonify(
+        is_hit=result.is_hit,
+        is_finished=result.is_finished,
+        is_active=result.next_player == player_id and not result.is_finished,
+    )
+
+
+@API_V1_CONTROLLER.route(
+    "/sessions/<string:session_id>/events", methods=[const.METHOD_GET]
+)
+def _get_api_events_stream(session_id: str) -> flask.Response:
+    """Return stream of the game session changes.
+
+    Args:
+        session_id (str): game session id.
+
+    Returns:
+        flask.Response: Server-Sent Events response.
+    """
+    player_id: str = _get_player_id(session_id)
+    return notifications.create_events_response(session_id, player_id)
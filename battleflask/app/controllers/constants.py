@@ -5,9 +5,15 @@ CONTROLLER_PLAYERS: str = "players_controller"
 CONTROLLER_GAME_COMMON: str = "game_common_controller"
 CONTROLLER_PREPARATION: str = "preparation_controller"
 CONTROLLER_GAMEPLAY: str = "gameplay_controller"
+CONTROLLER_NOTIFICATIONS: str = "notifications_controller"
+CONTROLLER_API_V1: str = "api_v1_controller"
+CONTROLLER_METRICS: str = "metrics_controller"
 
 METHOD_GET: str = "GET"
 METHOD_POST: str = "POST"
+METHOD_DELETE: str = "DELETE"
+
+HEADER_PLAYER_ID: str = "X-Player-Id"
 
 COOKIE_SESSION_ID: str = "cookie_session_id"
 COOKIE_PLAYER_ID: str = "cookie_player_id"
@@ -17,6 +23,7 @@ COOKIE_LAST_URL: str = "cookie_last_url"
 COOKIE_LAST_PAGE: str = "cookie_last_page_name"
 
 FORM_PLAYER_NAME: str = "player_name"
+FORM_WITH_BOT: str = "with_bot"
 FORM_SESSION_ID: str = "session_id"
 FORM_SHIP_ID: str = "active_ship_id"
 FORM_SHIP_DIRECTION: str = "ship_direction"
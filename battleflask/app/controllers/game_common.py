@@ -8,11 +8,10 @@ Process requests to the next endpoints:
 Raises:
     ex.GameIsNotFinishedException: raised when winner was requested before game finished.
 """
-import logging
-
 import flask
 
 import battleapi.api.dto as dto
+import battleapi.utils.logs as logs
 import battleflask.app.context as ctx
 import battleflask.app.controllers.constants as const
 import battleflask.app.controllers.render_utils as render_utils
@@ -20,7 +19,7 @@ import battleflask.app.controllers.request_utils as request_utils
 import battleflask.app.exceptions as ex
 import battleflask.app.validation_utils as validation
 
-log: logging.Logger = logging.getLogger(__name__)
+log: logs.StructuredLogger = logs.get_logger(__name__)
 
 GAME_COMMON_CONTROLLER: flask.Blueprint = flask.Blueprint(
     const.CONTROLLER_GAME_COMMON,
@@ -59,10 +58,11 @@ def _get_session_wait_page(session_id: str) -> str:
         "check is in cookies: ship_direction",
     )
 
-    player: dto.PlayerDto = ctx.GAME_API.get_player_by_id(session_id, current_player_id)
-    opponent: dto.PlayerDto | None = ctx.GAME_API.get_opponent(
-        session_id, player.player_id
+    snapshot: dto.WaitSnapshotDto = ctx.GAME_API.get_wait_snapshot(
+        session_id, current_player_id
     )
+    player: dto.PlayerDto = snapshot.player
+    opponent: dto.PlayerDto | None = snapshot.opponent
     log.debug("Player: %s, opponent: %s", player, opponent)
     opponent_name = opponent.player_name if opponent is not None else ""
     return render_utils.render_wait_page(
@@ -95,18 +95,19 @@ def _get_session_finish_page(session_id: str) -> str:
         request_utils.get_cookies_string(const.COOKIE_SESSION_ID),
         "check is in cookies: session_id",
     )
-    winner_player: dto.PlayerDto = ctx.GAME_API.get_winner(session_id)
+    snapshot: dto.GameplaySnapshotDto = ctx.GAME_API.get_gameplay_snapshot(
+        session_id, cookies_player_id
+    )
+    winner_player: dto.PlayerDto | None = snapshot.winner
     log.debug("winner: %s", winner_player)
 
     if winner_player is None:
         raise ex.GameIsNotFinishedException("Winner information is not available!")
 
-    player: dto.PlayerDto = ctx.GAME_API.get_player_by_id(session_id, cookies_player_id)
-    opponent: dto.PlayerDto = ctx.GAME_API.get_opponent(session_id, player.player_id)
-    player_field: list[list] = ctx.GAME_API.get_field(session_id, cookies_player_id)
-    opponent_field: list[list] = ctx.GAME_API.get_field(
-        session_id, opponent.player_id, is_for_opponent=True
-    )
+    player: dto.PlayerDto = snapshot.player
+    opponent: dto.PlayerDto = snapshot.opponent
+    player_field: list[list] = snapshot.player_field
+    opponent_field: list[list] = snapshot.opponent_field
     return render_utils.render_finish_page(
         session_id,
         winner_player_name=winner_player.player_name,
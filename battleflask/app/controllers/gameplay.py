@@ -12,12 +12,11 @@ Raises:
     ex.ActivePlayerIsNotSetException: Raised when active player id is
         not set in the session.
 """
-import logging
-
 import flask
 import werkzeug
 
 import battleapi.api.dto as dto
+import battleapi.utils.logs as logs
 import battleflask.app.context as ctx
 import battleflask.app.controllers.constants as const
 import battleflask.app.controllers.render_utils as render_utils
@@ -25,7 +24,7 @@ import battleflask.app.controllers.request_utils as request_utils
 import battleflask.app.exceptions as ex
 import battleflask.app.validation_utils as validation
 
-log: logging.Logger = logging.getLogger(__name__)
+log: logs.StructuredLogger = logs.get_logger(__name__)
 
 GAME_PLAY_CONTROLLER: flask.Blueprint = flask.Blueprint(
     const.CONTROLLER_GAMEPLAY, __name__, template_folder="templates", url_prefix="/game"
@@ -52,33 +51,29 @@ def _get_session_gameplay_page(session_id: str) -> str | werkzeug.Response:
 
     validation.validate_is_not_empty_string(cookies_player_id, "cookies_player_id")
 
-    player: dto.PlayerDto = ctx.GAME_API.get_player_by_id(session_id, cookies_player_id)
-    opponent: dto.PlayerDto = ctx.GAME_API.get_opponent(session_id, player.player_id)
+    snapshot: dto.GameplaySnapshotDto = ctx.GAME_API.get_gameplay_snapshot(
+        session_id, cookies_player_id
+    )
+    player: dto.PlayerDto = snapshot.player
+    opponent: dto.PlayerDto = snapshot.opponent
     log.debug("Player: %s, opponent: %s", player, opponent)
 
-    active_player: dto.PlayerDto | None = ctx.GAME_API.get_active_player(session_id)
+    active_player: dto.PlayerDto | None = snapshot.active_player
     if active_player is None:
         raise ex.ActivePlayerIsNotSetException("Active pLayer is not set!")
     active_player_name: str = active_player.player_name
     log.debug("active_player_name: %s", active_player_name)
-    number_of_cells_self: int = ctx.GAME_API.get_number_of_cells_left(
-        session_id, cookies_player_id
-    )
-    number_of_cells_opponent: int = ctx.GAME_API.get_number_of_cells_left(
-        session_id, opponent.player_id
-    )
+    number_of_cells_self: int = snapshot.number_of_cells_self
+    number_of_cells_opponent: int = snapshot.number_of_cells_opponent
     log.debug(
-        "Cells self: %d, Cells opponent: %d", number_of_cells_self, number_of_cells_self
-    )
-    player_field: list[list] = ctx.GAME_API.get_field(session_id, cookies_player_id)
-    opponent_field: list[list] = ctx.GAME_API.get_field(
-        session_id, opponent.player_id, is_for_opponent=True
+        "Cells self: %d, Cells opponent: %d",
+        number_of_cells_self,
+        number_of_cells_opponent,
     )
-    log.debug("Player Field: %s", player_field)
-    log.debug("Opponent Field: %s", opponent_field)
+    player_field: list[list] = snapshot.player_field
+    opponent_field: list[list] = snapshot.opponent_field
 
-    result: dto.PlayerDto | None = ctx.GAME_API.get_winner(session_id)
-    if result is not None:
+    if snapshot.winner is not None:
         return render_utils.redirect_to_id_finish_page(session_id)
     is_opponent_ready: bool = opponent.is_ready
     return render_utils.render_gameplay_page(
@@ -8,16 +8,15 @@ Process requests to the next endpoints:
     - GET base_url/join
         Returns join game page with form for joining player to existing game.
 """
-import logging
-
 import flask
 
+import battleapi.utils.logs as logs
 import battleflask.app.controllers.constants as const
 import battleflask.app.controllers.render_utils as render_utils
 import battleflask.app.controllers.request_utils as request_utils
 from battleflask.app.controllers.constants import CONTROLLER_INDEX, METHOD_GET
 
-log: logging.Logger = logging.getLogger(__name__)
+log: logs.StructuredLogger = logs.get_logger(__name__)
 
 INDEX_CONTROLLER: flask.Blueprint = flask.Blueprint(
     CONTROLLER_INDEX, __name__, template_folder="templates"
@@ -0,0 +1,31 @@
+"""Metrics requests controller.
+
+Process requests to the next endpoints:
+    - GET base_url/metrics
+        Returns metrics of the game sessions, persistence and (if profiling is
+        enabled, see battleflask.app.profiling) requests in the Prometheus text
+        format.
+"""
+import flask
+
+import battleapi.utils.logs as logs
+import battleapi.utils.metrics as metrics
+import battleflask.app.controllers.constants as const
+
+log: logs.StructuredLogger = logs.get_logger(__name__)
+
+METRICS_CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+METRICS_CONTROLLER: flask.Blueprint = flask.Blueprint(
+    const.CONTROLLER_METRICS, __name__
+)
+
+
+@METRICS_CONTROLLER.route("/metrics", methods=[const.METHOD_GET])
+def _get_metrics() -> flask.Response:
+    """Return metrics of the application.
+
+    Returns:
+        flask.Response: metrics in the Prometheus text format.
+    """
+    return flask.Response(metrics.REGISTRY.render(), content_type=METRICS_CONTENT_TYPE)
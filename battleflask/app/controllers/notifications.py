@@ -0,0 +1,234 @@
+"""Notifications requests controller.
+
+Process requests to the next endpoints:
+    - GET base_url/game/<string:session_id>/events
+        Returns Server-Sent Events stream with the changes of the game session.
+
+Notifications published by the game controller contain ids of the players, which are
+used as credentials (cookies), so they are converted to the view of the player who
+receives the stream before sending:
+    - player_joined: {"player_name"}
+    - player_ready: {}
+    - cell: {"field": "player" | "opponent", "row", "col", "cell"}
+    - turn: {"is_active", "active_player_name", "cells_self", "cells_opponent"}
+    - game_over: {"is_winner"}
+    - resync: {} (notifications were lost, page should be reloaded)
+
+Every stream starts with the state event, it is created after the subscription, so
+the changes made before the stream is opened (or while the browser reconnects) are
+not lost:
+    - state: {"opponent_name", "is_opponent_ready", "is_finished", "is_active",
+        "active_player_name", "cells_self", "cells_opponent", "field",
+        "opponent_field"} (fields are the compact rows, see dto.encode_board_rows)
+"""
+import json
+import time
+from typing import Any, Iterator
+
+import flask
+
+import battleapi.api.broker as broker
+import battleapi.api.dto as dto
+import battleapi.utils.logs as logs
+import battleflask.app.context as ctx
+import battleflask.app.controllers.constants as const
+import battleflask.app.controllers.request_utils as request_utils
+import battleflask.app.validation_utils as validation
+
+log: logs.StructuredLogger = logs.get_logger(__name__)
+
+NOTIFICATIONS_CONTROLLER: flask.Blueprint = flask.Blueprint(
+    const.CONTROLLER_NOTIFICATIONS, __name__, url_prefix="/game"
+)
+
+EVENT_STATE: str = "state"
+KEEP_ALIVE_SECONDS: float = 15
+MAX_STREAM_SECONDS: float = 300
+RETRY_MILLISECONDS: int = 3000
+RETRY_MESSAGE: str = f"retry: {RETRY_MILLISECONDS}\n\n"
+KEEP_ALIVE_MESSAGE: str = ": keep-alive\n\n"
+STREAM_HEADERS: dict[str, str] = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+
+def to_player_view(
+    notification: broker.Notification, player_id: str
+) -> dict[str, Any] | None:
+    """Convert notification to the data visible by the player.
+
+    Args:
+        notification (broker.Notification): published notification.
+        player_id (str): player who receives the notification.
+
+    Returns:
+        dict[str, Any] | None: data of the event or None if the kind is unknown.
+    """
+    data: dict[str, Any] = notification.data
+    match notification.kind:
+        case broker.EVENT_PLAYER_JOINED:
+            return {"player_name": data["player_name"]}
+        case broker.EVENT_PLAYER_READY | broker.EVENT_RESYNC:
+            return {}
+        case broker.EVENT_CELL:
+            return {
+                "field": "player" if data["player_id"] == player_id else "opponent",
+                "row": data["row"],
+                "col": data["col"],
+                "cell": data["cell"],
+            }
+        case broker.EVENT_TURN:
+            cells_left: dict[str, int] = data["cells_left"]
+            return {
+                "is_active": data["active_player_id"] == player_id,
+                "active_player_name": data["active_player_name"],
+                "cells_self": cells_left.get(player_id, 0),
+                "cells_opponent": sum(
+                    cells
+                    for cells_player_id, cells in cells_left.items()
+                    if cells_player_id != player_id
+                ),
+            }
+        case broker.EVENT_GAME_OVER:
+            return {"is_winner": data["winner_id"] == player_id}
+    return None
+
+
+def to_state_view(snapshot: dto.GameplaySnapshotDto, player_id: str) -> dict[str, Any]:
+    """Convert snapshot of the session to the data of the state event.
+
+    Args:
+        snapshot (dto.GameplaySnapshotDto): snapshot loaded after the subscription.
+        player_id (str): player who receives the stream.
+
+    Returns:
+        dict[str, Any]: current state of the session visible by the player.
+    """
+    opponent: dto.PlayerDto | None = snapshot.opponent
+    active_player: dto.PlayerDto | None = snapshot.active_player
+    return {
+        "opponent_name": opponent.player_name if opponent is not None else "",
+        "is_opponent_ready": opponent is not None and opponent.is_ready,
+        "is_finished": snapshot.winner is not None,
+        "is_active": active_player is not None and active_player.player_id == player_id,
+        "active_player_name": (
+            active_player.player_name if active_player is not None else ""
+        ),
+        "cells_self": snapshot.number_of_cells_self,
+        "cells_opponent": snapshot.number_of_cells_opponent,
+        "field": dto.encode_cell_rows(snapshot.player_field),
+        "opponent_field": dto.encode_cell_rows(snapshot.opponent_field),
+    }
+
+
+def format_event(kind: str, data: dict[str, Any]) -> str:
+    """Format event in the Server-Sent Events format.
+
+    Args:
+        kind (str): name of the event.
+        data (dict[str, Any]): data of the event.
+
+    Returns:
+        str: event message.
+    """
+    return f"event: {kind}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def stream_events(
+    subscription: broker.Subscription,
+    player_id: str,
+    max_seconds: float = MAX_STREAM_SECONDS,
+    state: dict[str, Any] | None = None,
+) -> Iterator[str]:
+    """Generate messages of the event stream till max_seconds pass.
+
+    Stream is closed periodically, browser reconnects to it automatically.
+
+    Args:
+        subscription (broker.Subscription): subscription to the session.
+        player_id (str): player who receives the stream.
+        max_seconds (float, optional): max duration of the stream. Defaults to
+            MAX_STREAM_SECONDS.
+        state (dict[str, Any] | None, optional): data of the state event sent
+            first (see to_state_view). Defaults to None (not sent).
+
+    Yields:
+        Iterator[str]: messages of the stream.
+    """
+    yield RETRY_MESSAGE
+    if state is not None:
+        yield format_event(EVENT_STATE, state)
+    deadline: float = time.monotonic() + max_seconds
+    while (left := deadline - time.monotonic()) > 0:
+        notification: broker.Notification | None = subscription.get(
+            timeout=min(left, KEEP_ALIVE_SECONDS)
+        )
+        if notification is None:
+            yield KEEP_ALIVE_MESSAGE
+            continue
+        data: dict[str, Any] | None = to_player_view(notification, player_id)
+        if data is not None:
+            yield format_event(notification.kind, data)
+
+
+@NOTIFICATIONS_CONTROLLER.route(
+    "/<string:session_id>/events", methods=[const.METHOD_GET]
+)
+def _get_session_events_stream(session_id: str) -> flask.Response:
+    """Return stream of the game session changes.
+
+    Args:
+        session_id (str): game session id.
+
+    Returns:
+        flask.Response: Server-Sent Events response.
+    """
+    cookies_player_id: str = request_utils.get_cookies_string(const.COOKIE_PLAYER_ID)
+    cookies_session_id: str = request_utils.get_cookies_string(const.COOKIE_SESSION_ID)
+    log.debug("cookies_player_id: %s", cookies_player_id)
+    log.debug("cookies_session_id: %s", cookies_session_id)
+
+    validation.validate_is_not_empty_string(cookies_player_id, "cookies_player_id")
+    validation.validate_is_session_in_cookies_the_same(session_id, cookies_session_id)
+    if ctx.GAME_API.get_player_by_id(session_id, cookies_player_id) is None:
+        flask.abort(404)
+
+    return create_events_response(session_id, cookies_player_id)
+
+
+def create_events_response(session_id: str, player_id: str) -> flask.Response:
+    """Create Server-Sent Events response for the player of the session.
+
+    Subscription is created before the response is returned, so notifications
+    published while the response starts are queued. It is closed by the stream or,
+    if the stream is never started, when the response is closed. State of the
+    session is loaded by the stream after the subscription.
+
+    Args:
+        session_id (str): game session id.
+        player_id (str): player who receives the stream (should be checked).
+
+    Returns:
+        flask.Response: Server-Sent Events response.
+    """
+    subscription: broker.Subscription = ctx.BROKER.subscribe(session_id)
+
+    def generate() -> Iterator[str]:
+        try:
+            snapshot: dto.GameplaySnapshotDto = ctx.GAME_API.get_gameplay_snapshot(
+                session_id, player_id
+            )
+            yield from stream_events(
+                subscription, player_id, state=to_state_view(snapshot, player_id)
+            )
+        finally:
+            ctx.BROKER.unsubscribe(subscription)
+
+    response: flask.Response = flask.Response(
+        flask.stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers=STREAM_HEADERS,
+    )
+    response.call_on_close(lambda: ctx.BROKER.unsubscribe(subscription))
+    return response
@@ -2,16 +2,16 @@
 
 Process requests to the next endpoints:
     - POST base_url/game/start
-        Create new game started by a player and redirects to the wait page.
+        Create new game started by a player and redirects to the wait page (or to
+            the preparation page if the player plays against computer).
     - POST base_url/game/join
         Join player to started game and redirects to the preparation page.
 """
-import logging
-
 import flask
 import werkzeug
 
 import battleapi.api.dto as dto
+import battleapi.utils.logs as logs
 import battleflask.app.context as ctx
 import battleflask.app.controllers.constants as const
 import battleflask.app.controllers.render_utils as render_utils
@@ -19,7 +19,7 @@ import battleflask.app.controllers.request_utils as request_utils
 import battleflask.app.controllers.utils as utils
 import battleflask.app.validation_utils as validation
 
-log: logging.Logger = logging.getLogger(__name__)
+log: logs.StructuredLogger = logs.get_logger(__name__)
 
 PLAYERS_CONTROLLER: flask.Blueprint = flask.Blueprint(
     const.CONTROLLER_PLAYERS, __name__, template_folder="templates", url_prefix="/game"
@@ -30,11 +30,15 @@ PLAYERS_CONTROLLER: flask.Blueprint = flask.Blueprint(
 def _post_start_redirect_to_wait_page() -> werkzeug.Response:
     """Start game session and redirect to the wait page.
 
+    If the player chose to play against computer, the bot joins the session and the
+    player is redirected to the preparation page.
+
     Returns:
-        werkzeug.Response: Redirect to the wait page.
+        werkzeug.Response: Redirect to the wait (or preparation) page.
     """
     player_name: str = request_utils.get_form_string(const.FORM_PLAYER_NAME)
-    log.debug("player_name: %s", player_name)
+    with_bot: bool = len(request_utils.get_form_string(const.FORM_WITH_BOT)) > 0
+    log.debug("player_name: %s, with_bot: %s", player_name, with_bot)
 
     validation.validate_is_not_empty_string(player_name, "player_name")
 
@@ -43,6 +47,9 @@ def _post_start_redirect_to_wait_page() -> werkzeug.Response:
         session_id, player_name
     )
     log.debug("Created session: %s, player: %s", session_id, player)
+    if with_bot:
+        bot: dto.PlayerDto = ctx.GAME_API.create_bot_in_session(session_id)
+        log.debug("Created bot: %s", bot)
 
     ships_list: list[dto.ShipDto] = ctx.GAME_API.get_prepare_ships_list(
         session_id, player.player_id
@@ -52,7 +59,11 @@ def _post_start_redirect_to_wait_page() -> werkzeug.Response:
     ship_id: str = utils.get_ship_id(ships_list)
     ship_direction: str = utils.get_ship_direction(ships_list)
 
-    response: werkzeug.Response = render_utils.redirect_to_id_wait_page(session_id)
+    response: werkzeug.Response = (
+        render_utils.redirect_to_id_prepare_page(session_id)
+        if with_bot
+        else render_utils.redirect_to_id_wait_page(session_id)
+    )
     response.set_cookie(const.COOKIE_PLAYER_ID, player.player_id)
     response.set_cookie(const.COOKIE_SESSION_ID, session_id)
     response.set_cookie(const.COOKIE_SHIP_ID, ship_id)
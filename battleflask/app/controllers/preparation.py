@@ -7,17 +7,19 @@ Process requests to the next endpoints:
         Adds ship to the player board and redirects to the preparation page.
     - POST base_url/game/<string:session_id>/prepare/delship
         Removes ship from the player board and redirects to the preparation page.
+    - POST base_url/game/<string:session_id>/prepare/random
+        Puts all ships of the player on the random positions and redirects to the
+            preparation page.
     - POST base_url/game/<string:session_id>/prepare/chose
         Chooses current ship that will be added to the board next and redirects to the
             preparation page.
 """
-import logging
-
 import flask
 import werkzeug
 
 import battleapi.api.dto as dto
-import battleapi.logic.utils as logic_utils
+import battleapi.logic.exceptions as game_ex
+import battleapi.utils.logs as logs
 import battleflask.app.context as ctx
 import battleflask.app.controllers.constants as const
 import battleflask.app.controllers.render_utils as render_utils
@@ -25,7 +27,7 @@ import battleflask.app.controllers.request_utils as request_utils
 import battleflask.app.controllers.utils as utils
 import battleflask.app.validation_utils as validation
 
-log: logging.Logger = logging.getLogger(__name__)
+log: logs.StructuredLogger = logs.get_logger(__name__)
 
 PREPARATION_CONTROLLER: flask.Blueprint = flask.Blueprint(
     const.CONTROLLER_PREPARATION,
@@ -64,38 +66,18 @@ def _get_session_prepare_page(session_id: str) -> str:
     validation.validate_is_not_empty_string(cookie_player_id, "cookie_player_id")
     validation.validate_is_not_empty_string(cookie_session_id, "cookie_session_id")
 
-    player: dto.PlayerDto | None = ctx.GAME_API.get_player_by_id(
-        session_id, cookie_player_id
-    )
-    log.debug("Player: %s", player)
-
-    opponent: dto.PlayerDto | None = ctx.GAME_API.get_opponent_prepare_status(
+    snapshot: dto.PrepareSnapshotDto = ctx.GAME_API.get_prepare_snapshot(
         session_id, cookie_player_id
     )
-    log.debug("Opponent: %s", opponent)
+    player: dto.PlayerDto = snapshot.player
+    opponent: dto.PlayerDto | None = snapshot.opponent
+    log.debug("Player: %s, opponent: %s", player, opponent)
 
-    ships_list: list[dto.ShipDto] = ctx.GAME_API.get_prepare_ships_list(
-        session_id, cookie_player_id
-    )
+    ships_list: list[dto.ShipDto] = snapshot.ships
     for ship in ships_list:
         if ship.ship_id == cookie_ship_id:
             ship.direction = cookie_ship_direction
-    field: list[list[dto.CellDto]] = ctx.GAME_API.get_prepare_player_field(
-        session_id, cookie_player_id
-    )
-    for row in field:
-        for cell in row:
-            if cell.has_ship:
-                row = cell.row
-                col = cell.col
-                coordinates = logic_utils.get_neighbour_coordinates((row, col))
-                for coord in coordinates:
-                    c_row, c_col = coord
-                    neighbour_cell = field[c_row][c_col]
-                    if not neighbour_cell.has_ship:
-                        neighbour_cell.is_not_available = True
-
-    log.debug("Field: %s", field)
+    field: list[list[dto.CellDto]] = snapshot.field
 
     render_ship_id = _get_ship_id(cookie_ship_id, ships_list)
     render_ship_direction = _get_ship_direction(cookie_ship_direction, ships_list)
@@ -276,6 +258,43 @@ def _post_session_prepare_delship_redirect_to_prepare_page(
     return response
 
 
+@PREPARATION_CONTROLLER.route(
+    "/<string:session_id>/prepare/random", methods=[const.METHOD_POST]
+)
+def _post_session_prepare_random_redirect_to_prepare_page(
+    session_id: str,
+) -> werkzeug.Response:
+    """Put all ships on the random positions and redirect to the preparation page.
+
+    Args:
+        session_id (str): game session.
+
+    Returns:
+        werkzeug.Response: Redirect to preparation page.
+    """
+    cookies_player_id: str = request_utils.get_cookies_string(const.COOKIE_PLAYER_ID)
+    cookies_session_id: str = request_utils.get_cookies_string(const.COOKIE_SESSION_ID)
+    log.debug("cookies_player_id: %s", cookies_player_id)
+    log.debug("cookies_session_id: %s", cookies_session_id)
+
+    validation.validate_is_not_empty_string(cookies_session_id, "cookies_session_id")
+    validation.validate_is_not_empty_string(cookies_player_id, "cookies_player_id")
+    validation.validate_is_session_in_cookies_the_same(session_id, cookies_session_id)
+
+    try:
+        ctx.GAME_API.randomize_fleet(session_id, cookies_player_id)
+    except (
+        game_ex.PlayerIsReadyException,
+        game_ex.SessionVersionConflictException,
+    ) as ex:
+        log.warning(ex)
+
+    response: werkzeug.Response = render_utils.redirect_to_id_prepare_page(session_id)
+    _refresh_cookies_for_prepare_page(cookies_player_id, response, session_id)
+    log.debug("Response: %s", response)
+    return response
+
+
 @PREPARATION_CONTROLLER.route(
     "/<string:session_id>/prepare/chose", methods=[const.METHOD_POST]
 )
@@ -1,10 +1,9 @@
 """Utility module that contains all the logic for rendering all available pages."""
-import logging
-
 import flask
 import werkzeug
 
 import battleapi.api.dto as dto
+import battleapi.utils.logs as logs
 import battleflask.app.controllers.constants as const
 
 URL_GET_INDEX = "_get_index_page"
@@ -18,14 +17,16 @@ URL_GET_ID_WAIT = "_get_session_wait_page"
 
 URL_GET_ID_GAMEPLAY = "_get_session_gameplay_page"
 URL_GET_ID_FINISH = "_get_session_finish_page"
+URL_GET_ID_EVENTS = "_get_session_events_stream"
 
 URL_POST_ID_PREPARE_DELSHIP = "_post_session_prepare_delship_redirect_to_prepare_page"
 URL_POST_ID_PREPARE_CHOSE = "_post_session_prepare_chose_ship_redirect_to_prepare_page"
 URL_POST_ID_PREPARE_ADD_SHIP = "_post_session_prepare_addship_redirect_to_prepare_page"
+URL_POST_ID_PREPARE_RANDOM = "_post_session_prepare_random_redirect_to_prepare_page"
 URL_POST_ID_GAMEPLAY_START = "_post_session_gameplay_start_redirect_to_gameplay_page"
 URL_POST_ID_GAMEPLAY_SHOT = "_post_session_gameplay_shot_redirect_to_gameplay_page"
 
-log: logging.Logger = logging.getLogger(__name__)
+log: logs.StructuredLogger = logs.get_logger(__name__)
 
 
 def render_index_page(url_last_page_url: str = "", last_page_name: str = "") -> str:
@@ -157,11 +158,13 @@ def render_wait_page(
     url_get_join_game_view: str = gen_url_index(URL_GET_JOIN)
     url_get_update: str = gen_url_game(URL_GET_ID_WAIT, session_id)
     url_get_prepare: str = gen_url_prepare(URL_GET_ID_PREPARE, session_id)
+    url_get_events: str = gen_url_notifications(URL_GET_ID_EVENTS, session_id)
 
     log.debug("url_get_new_game_view: %s", url_get_new_game_view)
     log.debug("url_get_join_game_view: %s", url_get_join_game_view)
     log.debug("url_get_update: %s", url_get_update)
     log.debug("url_get_prepare: %s", url_get_prepare)
+    log.debug("url_get_events: %s", url_get_events)
     log.debug("url_last_page_url: %s", url_last_page_url)
     log.debug("last_page_name: %s", last_page_name)
 
@@ -171,6 +174,7 @@ def render_wait_page(
         url_get_join_game_view=url_get_join_game_view,
         url_get_update=url_get_update,
         url_get_prepare=url_get_prepare,
+        url_get_events=url_get_events,
         player_name=player_name,
         game_session_id=session_id,
         opponent_name=opponent_name,
@@ -219,6 +223,7 @@ def render_prepare_page(
     url_post_addship: str = gen_url_prepare(URL_POST_ID_PREPARE_ADD_SHIP, session_id)
     url_post_chose_ship: str = gen_url_prepare(URL_POST_ID_PREPARE_CHOSE, session_id)
     url_post_delship: str = gen_url_prepare(URL_POST_ID_PREPARE_DELSHIP, session_id)
+    url_post_random: str = gen_url_prepare(URL_POST_ID_PREPARE_RANDOM, session_id)
 
     log.debug("url_get_new_game_view: %s", url_get_new_game_view)
     log.debug("url_get_join_game_view: %s", url_get_join_game_view)
@@ -226,6 +231,7 @@ def render_prepare_page(
     log.debug("url_post_addship: %s", url_post_addship)
     log.debug("url_post_chose_ship: %s", url_post_chose_ship)
     log.debug("url_post_delship: %s", url_post_delship)
+    log.debug("url_post_random: %s", url_post_random)
     log.debug("url_last_page_url: %s", url_last_page_url)
     log.debug("last_page_name: %s", last_page_name)
 
@@ -237,6 +243,7 @@ def render_prepare_page(
         url_post_addship=url_post_addship,
         url_post_chose_ship=url_post_chose_ship,
         url_post_delship=url_post_delship,
+        url_post_random=url_post_random,
         player_name=player_name,
         opponent_name=opponent_name,
         opponent_status=opponent_status,
@@ -291,11 +298,15 @@ def render_gameplay_page(
     url_get_join_game_view: str = gen_url_index(URL_GET_JOIN)
     url_post_shot: str = gen_url_gameplay(URL_POST_ID_GAMEPLAY_SHOT, session_id)
     url_get_update: str = gen_url_gameplay(URL_GET_ID_GAMEPLAY, session_id)
+    url_get_finish: str = gen_url_game(URL_GET_ID_FINISH, session_id)
+    url_get_events: str = gen_url_notifications(URL_GET_ID_EVENTS, session_id)
 
     log.debug("url_get_new_game_view: %s", url_get_new_game_view)
     log.debug("url_get_join_game_view: %s", url_get_join_game_view)
     log.debug("url_post_shot: %s", url_post_shot)
     log.debug("url_get_update: %s", url_get_update)
+    log.debug("url_get_finish: %s", url_get_finish)
+    log.debug("url_get_events: %s", url_get_events)
     log.debug("url_last_page_url: %s", url_last_page_url)
     log.debug("last_page_name: %s", last_page_name)
 
@@ -305,6 +316,8 @@ def render_gameplay_page(
         url_get_join_game_view=url_get_join_game_view,
         url_post_shot=url_post_shot,
         url_get_update=url_get_update,
+        url_get_finish=url_get_finish,
+        url_get_events=url_get_events,
         current_player_name=current_player_name,
         opponent_name=opponent_name,
         active_player_name=active_player_name,
@@ -452,6 +465,19 @@ def gen_url_gameplay(method: str, session: str = "") -> str:
     return gen_url(const.CONTROLLER_GAMEPLAY, method, session)
 
 
+def gen_url_notifications(method: str, session: str = "") -> str:
+    """Generate url for notifications controller.
+
+    Args:
+        method (str): function name that should process request.
+        session (str, optional): game session id. Defaults to "".
+
+    Returns:
+        str: generated url.
+    """
+    return gen_url(const.CONTROLLER_NOTIFICATIONS, method, session)
+
+
 def gen_redirect(
     blue_print: str, method_name: str, session_id: str, page_name: str = ""
 ) -> werkzeug.Response:
@@ -1,9 +1,9 @@
 """Utility functions for requests."""
-import logging
-
 import flask
 
-log: logging.Logger = logging.getLogger(__name__)
+import battleapi.utils.logs as logs
+
+log: logs.StructuredLogger = logs.get_logger(__name__)
 
 
 def get_form_string(key: str, default_value: str = "") -> str:
@@ -67,3 +67,74 @@ def get_cookies_string(key: str, default_value: str = "") -> str:
         return default_value
     except Exception:
         return default_value
+
+
+def get_header_string(key: str, default_value: str = "") -> str:
+    """Retrieve string value from the headers of the request.
+
+    Args:
+        key (str): header name.
+        default_value (str, optional): Default value if not found. Defaults to "".
+
+    Returns:
+        str: string value.
+    """
+    log.debug("key: %s, default: %s", key, default_value)
+    value: str | None = flask.request.headers.get(key)
+    if value and len(value.strip()) > 0:
+        return value.strip()
+    return default_value
+
+
+def get_json_string(key: str, default_value: str = "") -> str:
+    """Retrieve string value from the JSON body of the request.
+
+    Args:
+        key (str): key of the JSON object.
+        default_value (str, optional): Default value if not found. Defaults to "".
+
+    Returns:
+        str: string value for JSON key.
+    """
+    log.debug("key: %s, default: %s", key, default_value)
+    body = flask.request.get_json(silent=True)
+    value = body.get(key) if isinstance(body, dict) else None
+    if isinstance(value, str) and len(value.strip()) > 0:
+        return value.strip()
+    return default_value
+
+
+def get_json_int(key: str, default_value: int = -1) -> int:
+    """Retrieve integer value from the JSON body of the request.
+
+    Args:
+        key (str): key of the JSON object.
+        default_value (int, optional): Default value if not found. Defaults to -1.
+
+    Returns:
+        int: integer value for JSON key.
+    """
+    log.debug("key: %s, default: %d", key, default_value)
+    body = flask.request.get_json(silent=True)
+    value = body.get(key) if isinstance(body, dict) else None
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    return default_value
+
+
+def get_json_bool(key: str, default_value: bool = False) -> bool:
+    """Retrieve boolean value from the JSON body of the request.
+
+    Args:
+        key (str): key of the JSON object.
+        default_value (bool, optional): Default value if not found. Defaults to False.
+
+    Returns:
+        bool: boolean value for JSON key.
+    """
+    log.debug("key: %s, default: %s", key, default_value)
+    body = flask.request.get_json(silent=True)
+    value = body.get(key) if isinstance(body, dict) else None
+    if isinstance(value, bool):
+        return value
+    return default_value
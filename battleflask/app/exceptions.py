@@ -55,3 +55,14 @@ class GameIsNotFinishedException(Exception):
 
     def __init__(self, message: str) -> None:
         Exception.__init__(self, message)
+
+
+class PlayerIsNotInSessionException(Exception):
+    """Represent exception that is raised when player doesn't belong to the session.
+
+    Args:
+        Exception (_type_): Inherited base exception.
+    """
+
+    def __init__(self, message: str) -> None:
+        Exception.__init__(self, message)
@@ -0,0 +1,288 @@
+"""Opt-in request profiling of the Flask application.
+
+Profiling is enabled by the PROFILING application config (environment variable
+BATTLESHIP_PROFILING=1). Profiler measures every call of the game controller
+methods and of the persistence methods and every template render made by the
+request:
+
+- response has Server-Timing header with the total time of every call name
+  (controller.get_gameplay_snapshot, persistence.load_session, render, ...) and
+  the time of the whole request (total);
+- request latency histograms and the totals of the calls are reported to the
+  metrics registry (battleapi.utils.metrics, GET /metrics) by the route (URL
+  rule: /game/<session_id>/prepare, /game/<session_id>/gameplay,
+  /game/<session_id>/gameplay/shot, /game/<session_id>/wait,
+  /game/<session_id>/finish, ...) and method.
+
+Calls are measured by the proxies of the controller and persistence objects, so
+only the outer calls are counted (controller calls its own methods directly).
+"""
+import contextvars
+import functools
+import re
+import time
+from typing import Any
+
+import flask
+
+import battleapi.utils.logs as logs
+import battleapi.utils.metrics as metrics
+import battleflask.app.context as ctx
+
+log: logs.StructuredLogger = logs.get_logger(__name__)
+
+Spans = dict[str, list[float]]
+
+EXTENSION_NAME: str = "battleship_profiler"
+CONFIG_PROFILING: str = "PROFILING"
+HEADER_SERVER_TIMING: str = "Server-Timing"
+SPAN_RENDER: str = "render"
+SPAN_TOTAL: str = "total"
+ROUTE_UNKNOWN: str = "unknown"
+_CONVERTER_PATTERN: re.Pattern = re.compile(r"<(?:[^:<>]+:)?([^:<>]+)>")
+
+_SPANS: contextvars.ContextVar[Spans | None] = contextvars.ContextVar(
+    "profiling_spans", default=None
+)
+
+
+def record_span(name: str, seconds: float) -> None:
+    """Add the call time to the profile of the current request.
+
+    Args:
+        name (str): call name.
+        seconds (float): duration of the call.
+    """
+    spans: Spans | None = _SPANS.get()
+    if spans is None:
+        return
+    span: list[float] | None = spans.get(name)
+    if span is None:
+        spans[name] = [seconds, 1]
+    else:
+        span[0] += seconds
+        span[1] += 1
+
+
+class ProfiledProxy:
+    """Proxy that records the time of every public method call of the object."""
+
+    def __init__(self, target: Any, prefix: str) -> None:
+        """Initialization of the proxy.
+
+        Args:
+            target (Any): wrapped object.
+            prefix (str): prefix of the call names (controller, persistence).
+        """
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_prefix", prefix)
+
+    def __getattr__(self, name: str) -> Any:
+        """Return attribute of the object, public methods are measured.
+
+        Args:
+            name (str): attribute name.
+
+        Returns:
+            Any: attribute value.
+        """
+        value: Any = getattr(self._target, name)
+        if name.startswith("_") or not callable(value):
+            return value
+        span_name: str = f"{self._prefix}.{name}"
+
+        @functools.wraps(value)
+        def measured(*args, **kwargs):
+            start: float = time.perf_counter()
+            try:
+                return value(*args, **kwargs)
+            finally:
+                record_span(span_name, time.perf_counter() - start)
+
+        object.__setattr__(self, name, measured)
+        return measured
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set attribute of the object.
+
+        Args:
+            name (str): attribute name.
+            value (Any): attribute value.
+        """
+        setattr(self._target, name, value)
+
+
+def get_route_name() -> str:
+    """Return route of the current request (URL rule without converter types).
+
+    Returns:
+        str: route.
+    """
+    rule = flask.request.url_rule
+    if rule is None:
+        return ROUTE_UNKNOWN
+    return _CONVERTER_PATTERN.sub(r"<\1>", rule.rule)
+
+
+def format_server_timing(spans: Spans, total: float) -> str:
+    """Format Server-Timing header value.
+
+    Args:
+        spans (Spans): time and number of the calls by call name.
+        total (float): request duration.
+
+    Returns:
+        str: header value, durations are in milliseconds.
+    """
+    timings: list[str] = [
+        f"{name};dur={seconds * 1000:.3f}" for name, (seconds, _) in spans.items()
+    ]
+    timings.append(f"{SPAN_TOTAL};dur={total * 1000:.3f}")
+    return ", ".join(timings)
+
+
+class Profiler:
+    """Profiler of the requests of the Flask application (thread safe)."""
+
+    _duration: metrics.Histogram
+    _span_seconds: metrics.Counter
+    _span_calls: metrics.Counter
+
+    def __init__(self, registry: metrics.Registry | None = None) -> None:
+        """Initialization of the profiler.
+
+        Args:
+            registry (metrics.Registry | None, optional): receives aggregated
+                profiles. Defaults to None (metrics.REGISTRY).
+        """
+        if registry is None:
+            registry = metrics.REGISTRY
+        self._duration = registry.histogram(
+            "battleship_request_duration_seconds",
+            "Request latency by route.",
+            ("route", "method"),
+        )
+        self._span_seconds = registry.counter(
+            "battleship_request_span_seconds_total",
+            "Time of the controller, persistence and render calls by route.",
+            ("route", "method", "span"),
+        )
+        self._span_calls = registry.counter(
+            "battleship_request_span_calls_total",
+            "Number of the controller, persistence and render calls by route.",
+            ("route", "method", "span"),
+        )
+
+    def start_request(self) -> None:
+        """Start profile of the current request."""
+        flask.g.profiling_token = _SPANS.set({})
+        flask.g.profiling_start = time.perf_counter()
+        flask.g.profiling_renders = []
+
+    def finish_request(self, response: flask.Response) -> flask.Response:
+        """Add Server-Timing header to the response and aggregate the profile.
+
+        Args:
+            response (flask.Response): response of the request.
+
+        Returns:
+            flask.Response: the same response.
+        """
+        spans: Spans | None = _SPANS.get()
+        start: float | None = flask.g.get("profiling_start")
+        if spans is None or start is None:
+            return response
+        total: float = time.perf_counter() - start
+        response.headers[HEADER_SERVER_TIMING] = format_server_timing(spans, total)
+        self.observe(get_route_name(), flask.request.method, total, spans)
+        return response
+
+    def teardown_request(self, _error=None) -> None:
+        """Remove profile of the current request.
+
+        Args:
+            _error (BaseException | None, optional): request error. Defaults to None.
+        """
+        token = flask.g.pop("profiling_token", None)
+        if token is not None:
+            _SPANS.reset(token)
+
+    def on_before_render(self, _sender, **_kwargs) -> None:
+        """Remember start of the template render (before_render_template signal).
+
+        Args:
+            _sender (flask.Flask): application.
+        """
+        renders: list[float] | None = flask.g.get("profiling_renders")
+        if renders is not None:
+            renders.append(time.perf_counter())
+
+    def on_rendered(self, _sender, **_kwargs) -> None:
+        """Record time of the template render (template_rendered signal).
+
+        Args:
+            _sender (flask.Flask): application.
+        """
+        renders: list[float] | None = flask.g.get("profiling_renders")
+        if renders:
+            record_span(SPAN_RENDER, time.perf_counter() - renders.pop())
+
+    def observe(self, route: str, method: str, total: float, spans: Spans) -> None:
+        """Report profile of the request to the metrics.
+
+        Args:
+            route (str): route of the request.
+            method (str): HTTP method.
+            total (float): request duration.
+            spans (Spans): time and number of the calls by call name.
+        """
+        self._duration.labels(route, method).observe(total)
+        for name, (seconds, calls) in spans.items():
+            self._span_seconds.labels(route, method, name).inc(seconds)
+            self._span_calls.labels(route, method, name).inc(calls)
+
+
+def get_profiler(application: flask.Flask | None = None) -> Profiler | None:
+    """Return profiler of the application.
+
+    Args:
+        application (flask.Flask | None, optional): application. Defaults to None
+            (current application).
+
+    Returns:
+        Profiler | None: profiler or None if profiling is not enabled.
+    """
+    app: flask.Flask = flask.current_app if application is None else application
+    return app.extensions.get(EXTENSION_NAME)
+
+
+def install(application: flask.Flask) -> Profiler:
+    """Enable profiling of the application requests.
+
+    Hooks are registered before the other request hooks, so the measured time
+    includes them. Game controller of the context (and its persistence) is
+    replaced by the proxy.
+
+    Args:
+        application (flask.Flask): application.
+
+    Returns:
+        Profiler: profiler of the application.
+    """
+    profiler: Profiler | None = application.extensions.get(EXTENSION_NAME)
+    if profiler is not None:
+        return profiler
+    profiler = Profiler()
+    application.extensions[EXTENSION_NAME] = profiler
+    application.before_request(profiler.start_request)
+    application.after_request(profiler.finish_request)
+    application.teardown_request(profiler.teardown_request)
+    flask.before_render_template.connect(profiler.on_before_render, application)
+    flask.template_rendered.connect(profiler.on_rendered, application)
+    if not isinstance(ctx.GAME_API, ProfiledProxy):
+        persistence: Any = getattr(ctx.GAME_API, "persistence", None)
+        if persistence is not None:
+            ctx.GAME_API.persistence = ProfiledProxy(persistence, "persistence")
+        ctx.GAME_API = ProfiledProxy(ctx.GAME_API, "controller")  # type: ignore
+    log.info("Profiling is enabled")
+    return profiler
@@ -0,0 +1,426 @@
+"""Entry point module to run the game as an asyncio (ASGI) server.
+
+Streams of the game session changes (GET /game/<session_id>/events and
+GET /api/v1/sessions/<session_id>/events) are served by the coroutines of the event
+loop, so idle connected players don't hold threads. Other requests (JSON API, pages)
+are passed to the Flask application, it is called in the bounded thread pool, so the
+blocking game controller and persistence don't block the event loop.
+
+Server requires uvicorn (optional dependency, "asgi" extra):
+    pip install "battleship-py[asgi]"
+    battleships-asgi
+    (or: uvicorn battleflask.asgi_app:ASGI_APP)
+
+Environment variables:
+    BATTLESHIP_ASGI_WORKERS - number of the threads calling Flask application.
+"""
+import asyncio
+import concurrent.futures
+import functools
+import http.cookies
+import io
+import os
+import re
+import sys
+import time
+from typing import Any, Awaitable, Callable
+
+import battleapi.abstract as abstract
+import battleapi.api.broker as broker
+import battleapi.api.dto as dto
+import battleapi.utils.logs as logs
+import battleflask.app.context as ctx
+import battleflask.app.controllers.constants as const
+import battleflask.app.controllers.notifications as notifications
+from battleflask.flask_app import FLASK_APP
+
+try:
+    import uvicorn
+except ImportError:  # pragma: no cover - optional dependency
+    uvicorn = None
+
+log: logs.StructuredLogger = logs.get_logger(__name__)
+
+Scope = dict[str, Any]
+Message = dict[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+WsgiApp = Callable[[dict[str, Any], Callable], Any]
+WsgiResult = tuple[int, list[tuple[bytes, bytes]], bytes]
+
+EVENTS_PATH: re.Pattern = re.compile(r"^/(?:game|api/v1/sessions)/([^/]+)/events$")
+DEFAULT_MAX_WORKERS: int = 32
+DEFAULT_PORT: int = 8000
+DEFAULT_BACKLOG: int = 4096
+
+
+def build_environ(scope: Scope, body: bytes) -> dict[str, Any]:
+    """Create WSGI environment of the ASGI HTTP request.
+
+    Args:
+        scope (Scope): ASGI connection scope.
+        body (bytes): body of the request.
+
+    Returns:
+        dict[str, Any]: WSGI environment.
+    """
+    server: tuple[str, int] = scope.get("server") or ("localhost", 80)
+    client: tuple[str, int] = scope.get("client") or ("", 0)
+    environ: dict[str, Any] = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode().decode("latin1"),
+        "PATH_INFO": scope["path"].encode().decode("latin1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for raw_name, raw_value in scope.get("headers", []):
+        name: str = raw_name.decode("latin1").upper().replace("-", "_")
+        value: str = raw_value.decode("latin1")
+        if name == "CONTENT_LENGTH":
+            continue
+        key: str = name if name == "CONTENT_TYPE" else f"HTTP_{name}"
+        if key in environ:
+            separator: str = "; " if key == "HTTP_COOKIE" else ","
+            value = f"{environ[key]}{separator}{value}"
+        environ[key] = value
+    return environ
+
+
+def run_wsgi(wsgi_app: WsgiApp, environ: dict[str, Any]) -> WsgiResult:
+    """Call WSGI application and collect its response.
+
+    Args:
+        wsgi_app (WsgiApp): WSGI application.
+        environ (dict[str, Any]): WSGI environment.
+
+    Returns:
+        WsgiResult: status, headers and body of the response.
+    """
+    started: list[Any] = []
+    chunks: list[bytes] = []
+
+    def start_response(status: str, headers: list[tuple[str, str]], exc_info=None):
+        started[:] = [status, headers]
+        return chunks.append
+
+    result = wsgi_app(environ, start_response)
+    try:
+        chunks.extend(result)
+    finally:
+        if hasattr(result, "close"):
+            result.close()
+    status, headers = started
+    return (
+        int(status.split(" ", 1)[0]),
+        [
+            (name.lower().encode("latin1"), value.encode("latin1"))
+            for name, value in headers
+        ],
+        b"".join(chunks),
+    )
+
+
+def get_player_id(scope: Scope, session_id: str) -> str:
+    """Return id of the player who opened the stream.
+
+    Player is identified by the X-Player-Id header (JSON API) or by the cookies of
+    the browser (the session in the cookies should be the same).
+
+    Args:
+        scope (Scope): ASGI connection scope.
+        session_id (str): game session id.
+
+    Returns:
+        str: player id or empty string.
+    """
+    headers: dict[bytes, bytes] = dict(scope.get("headers", []))
+    header: str = headers.get(const.HEADER_PLAYER_ID.lower().encode(), b"").decode(
+        "latin1"
+    )
+    if header.strip():
+        return header.strip()
+    cookies = http.cookies.SimpleCookie()
+    try:
+        cookies.load(headers.get(b"cookie", b"").decode("latin1"))
+    except http.cookies.CookieError:
+        return ""
+    cookie_session = cookies.get(const.COOKIE_SESSION_ID)
+    cookie_player = cookies.get(const.COOKIE_PLAYER_ID)
+    if cookie_session is None or cookie_player is None:
+        return ""
+    if cookie_session.value.strip() != session_id:
+        return ""
+    return cookie_player.value.strip()
+
+
+class GameAsgiApp:
+    """ASGI application serving game session streams and Flask application."""
+
+    wsgi_app: WsgiApp
+    game_api: abstract.GameController
+    notification_broker: broker.Broker
+    max_stream_seconds: float
+    _executor: concurrent.futures.ThreadPoolExecutor
+
+    def __init__(
+        self,
+        wsgi_app: WsgiApp,
+        game_api: abstract.GameController,
+        notification_broker: broker.Broker,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_stream_seconds: float = notifications.MAX_STREAM_SECONDS,
+    ) -> None:
+        """Initialize application.
+
+        Args:
+            wsgi_app (WsgiApp): application serving other requests.
+            game_api (abstract.GameController): controller used by wsgi_app.
+            notification_broker (broker.Broker): broker the controller publishes to.
+            max_workers (int, optional): number of the threads calling wsgi_app.
+                Defaults to DEFAULT_MAX_WORKERS.
+            max_stream_seconds (float, optional): max duration of the stream.
+                Defaults to notifications.MAX_STREAM_SECONDS.
+        """
+        self.wsgi_app = wsgi_app
+        self.game_api = game_api
+        self.notification_broker = notification_broker
+        self.max_stream_seconds = max_stream_seconds
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="asgi-wsgi"
+        )
+        log.debug("Inited: workers: %d", max_workers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process ASGI connection.
+
+        Args:
+            scope (Scope): ASGI connection scope.
+            receive (Receive): receives messages of the client.
+            send (Send): sends messages to the client.
+        """
+        if scope["type"] == "lifespan":
+            await self._run_lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            log.debug("Connection is not supported: %s", scope["type"])
+            return
+        match: re.Match | None = EVENTS_PATH.match(scope["path"])
+        if match is not None and scope["method"] == const.METHOD_GET:
+            await self._stream_events(scope, receive, send, match.group(1))
+        else:
+            await self._call_wsgi(scope, receive, send)
+
+    async def _run_lifespan(self, receive: Receive, send: Send) -> None:
+        """Process startup and shutdown of the server.
+
+        Args:
+            receive (Receive): receives lifespan messages.
+            send (Send): sends lifespan messages.
+        """
+        while True:
+            message: Message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self._executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _run_blocking(self, function: Callable[..., Any], *args) -> Any:
+        """Run blocking function in the thread pool.
+
+        Args:
+            function (Callable[..., Any]): function.
+            args: arguments of the function.
+
+        Returns:
+            Any: result of the function.
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(function, *args)
+        )
+
+    async def _call_wsgi(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Pass request to the WSGI application.
+
+        Args:
+            scope (Scope): ASGI connection scope.
+            receive (Receive): receives messages of the client.
+            send (Send): sends messages to the client.
+        """
+        body: list[bytes] = []
+        while True:
+            message: Message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        environ: dict[str, Any] = build_environ(scope, b"".join(body))
+        status, headers, content = await self._run_blocking(
+            run_wsgi, self.wsgi_app, environ
+        )
+        await send(
+            {"type": "http.response.start", "status": status, "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": content})
+
+    def _is_player_in_session(self, session_id: str, player_id: str) -> bool:
+        """Check that the player belongs to the session (blocking).
+
+        Args:
+            session_id (str): game session id.
+            player_id (str): player id.
+
+        Returns:
+            bool: True if the player is in the session.
+        """
+        self.game_api.begin_scope()
+        try:
+            return self.game_api.get_player_by_id(session_id, player_id) is not None
+        except Exception as err:
+            log.debug("Player is not checked: %s, %s", session_id, err)
+            return False
+        finally:
+            self.game_api.end_scope()
+
+    async def _stream_events(
+        self, scope: Scope, receive: Receive, send: Send, session_id: str
+    ) -> None:
+        """Send Server-Sent Events of the session till the client disconnects or
+        max_stream_seconds pass.
+
+        Stream starts with the state of the session loaded after the subscription.
+
+        Args:
+            scope (Scope): ASGI connection scope.
+            receive (Receive): receives messages of the client.
+            send (Send): sends messages to the client.
+            session_id (str): game session id.
+        """
+        player_id: str = get_player_id(scope, session_id)
+        if not player_id or not await self._run_blocking(
+            self._is_player_in_session, session_id, player_id
+        ):
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 404,
+                    "headers": [(b"content-type", b"text/plain; charset=utf-8")],
+                }
+            )
+            await send({"type": "http.response.body", "body": b"Not Found"})
+            return
+        subscription: broker.AsyncSubscription = (
+            self.notification_broker.subscribe_async(session_id)
+        )
+        disconnect: asyncio.Task = asyncio.ensure_future(self._wait_disconnect(receive))
+        try:
+            headers: list[tuple[bytes, bytes]] = [
+                (b"content-type", b"text/event-stream; charset=utf-8")
+            ] + [
+                (name.lower().encode(), value.encode())
+                for name, value in notifications.STREAM_HEADERS.items()
+            ]
+            await send(
+                {"type": "http.response.start", "status": 200, "headers": headers}
+            )
+            await self._send_chunk(send, notifications.RETRY_MESSAGE)
+            snapshot: dto.GameplaySnapshotDto = await self._run_blocking(
+                self.game_api.get_gameplay_snapshot, session_id, player_id
+            )
+            await self._send_chunk(
+                send,
+                notifications.format_event(
+                    notifications.EVENT_STATE,
+                    notifications.to_state_view(snapshot, player_id),
+                ),
+            )
+            deadline: float = time.monotonic() + self.max_stream_seconds
+            while (left := deadline - time.monotonic()) > 0:
+                getter: asyncio.Task = asyncio.ensure_future(
+                    subscription.get(min(left, notifications.KEEP_ALIVE_SECONDS))
+                )
+                await asyncio.wait(
+                    {getter, disconnect}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if disconnect.done():
+                    getter.cancel()
+                    return
+                notification: broker.Notification | None = getter.result()
+                if notification is None:
+                    await self._send_chunk(send, notifications.KEEP_ALIVE_MESSAGE)
+                    continue
+                data: dict[str, Any] | None = notifications.to_player_view(
+                    notification, player_id
+                )
+                if data is not None:
+                    await self._send_chunk(
+                        send, notifications.format_event(notification.kind, data)
+                    )
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            disconnect.cancel()
+            self.notification_broker.unsubscribe(subscription)
+
+    @staticmethod
+    async def _wait_disconnect(receive: Receive) -> None:
+        """Wait till the client disconnects.
+
+        Args:
+            receive (Receive): receives messages of the client.
+        """
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+    @staticmethod
+    async def _send_chunk(send: Send, text: str) -> None:
+        """Send part of the stream.
+
+        Args:
+            send (Send): sends messages to the client.
+            text (str): part of the stream.
+        """
+        await send(
+            {"type": "http.response.body", "body": text.encode(), "more_body": True}
+        )
+
+
+ASGI_APP: GameAsgiApp = GameAsgiApp(
+    FLASK_APP,
+    ctx.GAME_API,
+    ctx.BROKER,
+    max_workers=int(os.environ.get("BATTLESHIP_ASGI_WORKERS", DEFAULT_MAX_WORKERS)),
+)
+
+
+def run_app(host: str = "0.0.0.0", port: int = DEFAULT_PORT) -> None:
+    """Entry point to run the game by the asyncio server.
+
+    Args:
+        host (str, optional): host to expose server. Defaults to "0.0.0.0".
+        port (int, optional): port of the server. Defaults to DEFAULT_PORT.
+
+    Raises:
+        RuntimeError: raised if uvicorn is not installed.
+    """
+    if uvicorn is None:
+        raise RuntimeError('uvicorn is required: pip install "battleship-py[asgi]"')
+    log.info("ASGI app is started with params: %s, %s", host, port)
+    uvicorn.run(ASGI_APP, host=host, port=port, backlog=DEFAULT_BACKLOG)
+
+
+if __name__ == "__main__":
+    run_app()
@@ -3,12 +3,15 @@ import logging
 
 import flask
 
+import battleapi.utils.logs as logs
 from battleflask.flask_app_config import configure_flask_app
 
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s %(levelname)s [%(name)s %(funcName)s] %(message)s",
+    format="%(asctime)s %(levelname)s [%(name)s %(funcName)s%(context)s] "
+    "%(message)s",
 )
+logs.install_context_filter()
 
 log: logging.Logger = logging.getLogger(__name__)
 
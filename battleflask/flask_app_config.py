@@ -1,17 +1,73 @@
 """Configuration of the Flask application."""
 import os
 
+import flask
 from flask import Flask
 
+import battleapi.utils.logs as logs
+import battleflask.app.context as ctx
+import battleflask.app.controllers.constants as const
+import battleflask.app.profiling as profiling
 from battleflask.app.controllers import (
+    api_v1,
     game_common,
     gameplay,
     index,
+    metrics,
+    notifications,
     players,
     preparation,
 )
 
 
+def bind_log_context() -> None:
+    """Add session and player of the request to the context of the log records."""
+    view_args: dict = flask.request.view_args or {}
+    flask.g.log_context_token = logs.bind_context(
+        session_id=view_args.get("session_id"),
+        player_id=flask.request.cookies.get(const.COOKIE_PLAYER_ID)
+        or flask.request.headers.get(const.HEADER_PLAYER_ID),
+    )
+
+
+def reset_log_context(_error=None) -> None:
+    """Remove fields added by bind_log_context.
+
+    Args:
+        _error (BaseException | None, optional): request error. Defaults to None.
+    """
+    token = flask.g.pop("log_context_token", None)
+    if token is not None:
+        logs.reset_context(token)
+
+
+def open_game_scope() -> None:
+    """Open game controller scope, so one request reuses loaded game session."""
+    ctx.GAME_API.begin_scope()
+
+
+def close_game_scope(response):
+    """Close game controller scope before response (changes are already saved).
+
+    Args:
+        response (flask.Response): response of the request.
+
+    Returns:
+        flask.Response: the same response.
+    """
+    ctx.GAME_API.end_scope()
+    return response
+
+
+def teardown_game_scope(_error=None) -> None:
+    """Close game controller scope if it wasn't closed (request failed).
+
+    Args:
+        _error (BaseException | None, optional): request error. Defaults to None.
+    """
+    ctx.GAME_API.end_scope()
+
+
 def configure_flask_app(application: Flask, test_config=None) -> None:
     """Configure flask application.
 
@@ -22,7 +78,10 @@ def configure_flask_app(application: Flask, test_config=None) -> None:
     key: str = os.environ["FLASK_APP_KEY"]
     app_key = key if key and len(key) > 0 else "development_key_tmp"
 
-    application.config.from_mapping(SECRET_KEY=app_key)
+    application.config.from_mapping(
+        SECRET_KEY=app_key,
+        PROFILING=os.environ.get("BATTLESHIP_PROFILING", "0") == "1",
+    )
     if test_config is None:
         # load the instance config, if it exists, when not testing
         application.config.from_pyfile("configs.py", silent=True)
@@ -36,8 +95,19 @@ def configure_flask_app(application: Flask, test_config=None) -> None:
         pass
     application.jinja_env.trim_blocks = True
     application.jinja_env.lstrip_blocks = True
+    if application.config[profiling.CONFIG_PROFILING]:
+        # registered first, so the profile includes the other request hooks
+        profiling.install(application)
+    application.before_request(bind_log_context)
+    application.before_request(open_game_scope)
+    application.after_request(close_game_scope)
+    application.teardown_request(teardown_game_scope)
+    application.teardown_request(reset_log_context)
     application.register_blueprint(index.INDEX_CONTROLLER)
     application.register_blueprint(players.PLAYERS_CONTROLLER)
     application.register_blueprint(game_common.GAME_COMMON_CONTROLLER)
     application.register_blueprint(preparation.PREPARATION_CONTROLLER)
     application.register_blueprint(gameplay.GAME_PLAY_CONTROLLER)
+    application.register_blueprint(notifications.NOTIFICATIONS_CONTROLLER)
+    application.register_blueprint(api_v1.API_V1_CONTROLLER)
+    application.register_blueprint(metrics.METRICS_CONTROLLER)
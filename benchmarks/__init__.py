@@ -0,0 +1 @@
+"""Performance benchmarks of the game engine (not a part of the package)."""
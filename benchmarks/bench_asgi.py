@@ -0,0 +1,359 @@
+"""Load test of the asyncio (ASGI) server compared with the threaded WSGI server.
+
+Server is started in a separate process. The test opens many idle Server-Sent
+Events connections (players waiting for the opponent move) and, while they are
+connected, plays full games through the JSON API by concurrent clients. Reported:
+JSON API requests per second and latency, number of the notifications received by
+the idle streams, threads and memory (RSS) of the server process.
+
+Threaded WSGI server holds one thread per connected stream, asyncio server holds one
+coroutine, so the difference grows with the number of the idle connections. 10k
+connections need open files limit above 10k for both processes (the limit is raised
+to the hard limit automatically, see "ulimit -Hn").
+
+Run (ASGI mode requires uvicorn):
+    python -m benchmarks.bench_asgi [--servers asgi wsgi] [--idle N] [--games N]
+        [--clients N]
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any
+
+from benchmarks.bench_board import ALL_COORDINATES, CLASSIC_FLEET
+
+HOST: str = "127.0.0.1"
+SERVER_ASGI: str = "asgi"
+SERVER_WSGI: str = "wsgi"
+PLAYER_HEADER: str = "X-Player-Id"
+START_TIMEOUT_SECONDS: float = 30
+STOP_TIMEOUT_SECONDS: float = 10
+
+
+def raise_open_files_limit() -> None:
+    """Raise soft limit of the open files to the hard limit."""
+    _, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def serve(server: str, port: int) -> None:
+    """Run server in the current process (called in the started subprocess).
+
+    Args:
+        server (str): SERVER_ASGI or SERVER_WSGI.
+        port (int): port of the server.
+    """
+    raise_open_files_limit()
+    os.environ.setdefault("FLASK_APP_KEY", "benchmark")
+    import logging
+
+    logging.disable(logging.CRITICAL)
+    if server == SERVER_ASGI:
+        import uvicorn
+
+        import battleflask.asgi_app as asgi_app
+
+        uvicorn.run(
+            asgi_app.ASGI_APP,
+            host=HOST,
+            port=port,
+            backlog=asgi_app.DEFAULT_BACKLOG,
+            log_level="error",
+        )
+    else:
+        import werkzeug.serving
+
+        from battleflask.flask_app import FLASK_APP
+
+        werkzeug.serving.WSGIRequestHandler.log_request = lambda *args: None
+        http_server = werkzeug.serving.make_server(HOST, port, FLASK_APP, threaded=True)
+        http_server.socket.listen(4096)
+        http_server.serve_forever()
+
+
+async def request(
+    port: int, method: str, path: str, body: Any = None, player_id: str = ""
+) -> tuple[int, Any]:
+    """Make HTTP request to the JSON API (new connection per request).
+
+    Args:
+        port (int): port of the server.
+        method (str): HTTP method.
+        path (str): path of the endpoint.
+        body (Any, optional): JSON body. Defaults to None.
+        player_id (str, optional): value of the player header. Defaults to "".
+
+    Returns:
+        tuple[int, Any]: status and JSON body of the response.
+    """
+    content: bytes = b"" if body is None else json.dumps(body).encode()
+    headers: str = (
+        f"{method} {path} HTTP/1.1\r\nHost: {HOST}\r\nConnection: close\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(content)}\r\n"
+    )
+    if player_id:
+        headers += f"{PLAYER_HEADER}: {player_id}\r\n"
+    reader, writer = await asyncio.open_connection(HOST, port)
+    writer.write(headers.encode() + b"\r\n" + content)
+    await writer.drain()
+    response: bytes = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    status: int = int(head.split(b" ", 2)[1])
+    return status, json.loads(payload) if payload else None
+
+
+async def open_stream(
+    port: int, session_id: str, player_id: str, received: list[int]
+) -> asyncio.StreamWriter:
+    """Open Server-Sent Events stream and count received events in background.
+
+    Args:
+        port (int): port of the server.
+        session_id (str): game session id.
+        player_id (str): player id.
+        received (list[int]): counter of the received events ([0]).
+
+    Returns:
+        asyncio.StreamWriter: connection, should be closed at the end.
+    """
+    reader, writer = await asyncio.open_connection(HOST, port)
+    writer.write(
+        (
+            f"GET /api/v1/sessions/{session_id}/events HTTP/1.1\r\nHost: {HOST}\r\n"
+            f"{PLAYER_HEADER}: {player_id}\r\nAccept: text/event-stream\r\n\r\n"
+        ).encode()
+    )
+    await writer.drain()
+
+    async def count_events() -> None:
+        while line := await reader.readline():
+            if line.startswith(b"event:"):
+                received[0] += 1
+
+    asyncio.ensure_future(count_events())
+    return writer
+
+
+async def create_session(port: int) -> tuple[str, list[str]]:
+    """Create session with two players through the JSON API.
+
+    Args:
+        port (int): port of the server.
+
+    Returns:
+        tuple[str, list[str]]: session id and player ids.
+    """
+    _, created = await request(port, "POST", "/api/v1/sessions", {"player_name": "a"})
+    session_id: str = created["session_id"]
+    _, joined = await request(
+        port, "POST", f"/api/v1/sessions/{session_id}/players", {"player_name": "b"}
+    )
+    return session_id, [created["player_id"], joined["player_id"]]
+
+
+async def play_game(port: int, latencies: list[float]) -> None:
+    """Play full game through the JSON API.
+
+    Args:
+        port (int): port of the server.
+        latencies (list[float]): latencies of the requests (seconds).
+    """
+
+    async def timed(*args, **kwargs) -> tuple[int, Any]:
+        start: float = time.perf_counter()
+        result = await request(port, *args, **kwargs)
+        latencies.append(time.perf_counter() - start)
+        return result
+
+    session_id, player_ids = await create_session(port)
+    base: str = f"/api/v1/sessions/{session_id}"
+    for player_id in player_ids:
+        _, body = await timed("GET", f"{base}/ships", player_id=player_id)
+        ships: list[dict] = sorted(
+            body["ships"], key=lambda ship: ship["ship_size"], reverse=True
+        )
+        for ship, ((row, col), _, direction) in zip(ships, CLASSIC_FLEET):
+            await timed(
+                "POST",
+                f"{base}/ships",
+                {
+                    "ship_id": ship["ship_id"],
+                    "row": row,
+                    "col": col,
+                    "direction": direction.name,
+                },
+                player_id=player_id,
+            )
+        await timed("POST", f"{base}/ready", player_id=player_id)
+    _, snapshot = await timed("GET", base, player_id=player_ids[0])
+    active: int = 0 if snapshot["is_active"] else 1
+    targets: list[list] = [list(ALL_COORDINATES), list(ALL_COORDINATES)]
+    while targets[active]:
+        row, col = targets[active].pop()
+        status, result = await timed(
+            "POST",
+            f"{base}/shots",
+            {"row": row, "col": col},
+            player_id=player_ids[active],
+        )
+        if status != 200 or result["is_finished"]:
+            return
+        if not result["is_active"]:
+            active = 1 - active
+
+
+def read_process_status(pid: int) -> dict[str, int]:
+    """Read threads and memory of the process (Linux only).
+
+    Args:
+        pid (int): process id.
+
+    Returns:
+        dict[str, int]: threads and RSS in KiB (empty if not available).
+    """
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as status:
+            fields = dict(line.split(":", 1) for line in status if ":" in line)
+    except OSError:
+        return {}
+    return {
+        "threads": int(fields["Threads"]),
+        "rss_kib": int(fields["VmRSS"].split()[0]),
+    }
+
+
+async def wait_for_server(port: int, process: subprocess.Popen) -> None:
+    """Wait till the server accepts connections.
+
+    Args:
+        port (int): port of the server.
+        process (subprocess.Popen): server process.
+
+    Raises:
+        RuntimeError: raised if the server is not started.
+    """
+    deadline: float = time.monotonic() + START_TIMEOUT_SECONDS
+    while time.monotonic() < deadline and process.poll() is None:
+        try:
+            _, writer = await asyncio.open_connection(HOST, port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("Server is not started")
+
+
+async def run(
+    server: str, port: int, idle: int, games: int, clients: int
+) -> dict[str, float]:
+    """Start server and run the load.
+
+    Args:
+        server (str): SERVER_ASGI or SERVER_WSGI.
+        port (int): port of the server.
+        idle (int): number of the idle streams.
+        games (int): number of the played games.
+        clients (int): number of the concurrently played games.
+
+    Returns:
+        dict[str, float]: measured values.
+    """
+    process = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.bench_asgi", "--serve", server]
+        + ["--port", str(port)]
+    )
+    streams: list[asyncio.StreamWriter] = []
+    try:
+        await wait_for_server(port, process)
+        received: list[int] = [0]
+        sessions: list[tuple[str, list[str]]] = [
+            await create_session(port) for _ in range(max(1, idle // 100))
+        ]
+        for index in range(idle):
+            session_id, player_ids = sessions[index % len(sessions)]
+            streams.append(
+                await open_stream(port, session_id, player_ids[index % 2], received)
+            )
+        await asyncio.sleep(1)
+        idle_status: dict[str, int] = read_process_status(process.pid)
+        for session_id, player_ids in sessions:
+            await request(
+                port,
+                "POST",
+                f"/api/v1/sessions/{session_id}/ready",
+                player_id=player_ids[0],
+            )
+
+        latencies: list[float] = []
+        queue: asyncio.Queue = asyncio.Queue()
+        for _ in range(games):
+            queue.put_nowait(None)
+
+        async def client() -> None:
+            while not queue.empty():
+                queue.get_nowait()
+                await play_game(port, latencies)
+
+        start: float = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(clients)))
+        elapsed: float = time.perf_counter() - start
+        await asyncio.sleep(0.5)
+        latencies.sort()
+        return {
+            "requests_per_second": len(latencies) / elapsed,
+            "p50_ms": statistics.median(latencies) * 1000,
+            "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+            "stream_events": received[0],
+            "threads": idle_status.get("threads", -1),
+            "rss_mib": idle_status.get("rss_kib", -1024) / 1024,
+        }
+    finally:
+        for writer in streams:
+            writer.close()
+        await asyncio.gather(
+            *(writer.wait_closed() for writer in streams), return_exceptions=True
+        )
+        process.terminate()
+        try:
+            process.wait(timeout=STOP_TIMEOUT_SECONDS)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def main() -> None:
+    """Entry point of the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--servers", nargs="+", default=[SERVER_ASGI, SERVER_WSGI])
+    parser.add_argument("--idle", type=int, default=1000)
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--clients", type=int, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--serve", choices=[SERVER_ASGI, SERVER_WSGI])
+    args = parser.parse_args()
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+    raise_open_files_limit()
+    print(f"idle streams: {args.idle}, games: {args.games}, clients: {args.clients}")
+    for server in args.servers:
+        result = asyncio.run(
+            run(server, args.port, args.idle, args.games, args.clients)
+        )
+        print(
+            f"{server:5} {result['requests_per_second']:8.0f} req/s  "
+            f"p50 {result['p50_ms']:7.1f} ms  p99 {result['p99_ms']:7.1f} ms  "
+            f"stream events: {result['stream_events']:6.0f}  "
+            f"threads: {result['threads']:6.0f}  rss: {result['rss_mib']:7.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Benchmark of the board engines.
+
+Compares list-of-cells battleapi.logic.board.Board with bitmask based
+battleapi.logic.bitboard.BitBoard on the same classic fleet.
+
+Run:
+    python -m benchmarks.bench_board [--number N]
+"""
+import argparse
+import logging
+import timeit
+from typing import Callable
+
+import battleapi.logic.bitboard as bitboard
+import battleapi.logic.board as board
+import battleapi.logic.models as models
+import battleapi.logic.player as pl
+
+EngineFactory = Callable[[], pl.GameBoard]
+
+ENGINES: dict[str, EngineFactory] = {
+    "board.Board": board.Board,
+    "bitboard.BitBoard": bitboard.BitBoard,
+}
+
+CLASSIC_FLEET: list[tuple[models.Coordinate, int, models.Direction]] = [
+    ((0, 0), 4, models.Direction.HORIZONTAL),
+    ((0, 5), 3, models.Direction.HORIZONTAL),
+    ((2, 0), 3, models.Direction.VERTICAL),
+    ((2, 2), 2, models.Direction.HORIZONTAL),
+    ((2, 5), 2, models.Direction.VERTICAL),
+    ((2, 7), 2, models.Direction.HORIZONTAL),
+    ((6, 0), 1, models.Direction.HORIZONTAL),
+    ((6, 9), 1, models.Direction.HORIZONTAL),
+    ((9, 3), 1, models.Direction.HORIZONTAL),
+    ((9, 9), 1, models.Direction.HORIZONTAL),
+]
+
+ALL_COORDINATES: list[models.Coordinate] = [
+    (row, col) for row in range(10) for col in range(10)
+]
+
+
+def create_fleet_board(factory: EngineFactory) -> pl.GameBoard:
+    """Create board with the classic fleet on it.
+
+    Args:
+        factory (EngineFactory): board engine.
+
+    Returns:
+        pl.GameBoard: board with ships.
+    """
+    game_board: pl.GameBoard = factory()
+    for index, (coordinate, size, direction) in enumerate(CLASSIC_FLEET):
+        game_board.add_ship(coordinate, models.Ship(f"ship_{index}", size, direction))
+    return game_board
+
+
+def play_full_board(factory: EngineFactory) -> None:
+    """Place fleet and shoot every cell of the board checking game state.
+
+    Args:
+        factory (EngineFactory): board engine.
+    """
+    game_board: pl.GameBoard = create_fleet_board(factory)
+    for coordinate in ALL_COORDINATES:
+        game_board.make_shot(coordinate)
+        game_board.get_amount_of_alive_ships()
+
+
+def render_boards(factory: EngineFactory) -> Callable[[], None]:
+    """Create callable that requests both board representations.
+
+    Args:
+        factory (EngineFactory): board engine.
+
+    Returns:
+        Callable[[], None]: benchmark callable.
+    """
+    game_board: pl.GameBoard = create_fleet_board(factory)
+    for coordinate in ALL_COORDINATES[::3]:
+        game_board.make_shot(coordinate)
+
+    def render() -> None:
+        game_board.get_board()
+        game_board.get_board(is_hidden=True)
+        game_board.get_amount_of_not_shot_cells()
+
+    return render
+
+
+def run(number: int) -> dict[str, dict[str, float]]:
+    """Run all the scenarios for every engine.
+
+    Args:
+        number (int): amount of repetitions of every scenario.
+
+    Returns:
+        dict[str, dict[str, float]]: microseconds per operation by engine and
+            scenario.
+    """
+    results: dict[str, dict[str, float]] = {}
+    for name, factory in ENGINES.items():
+        scenarios: dict[str, Callable[[], object]] = {
+            "add_fleet": lambda factory=factory: create_fleet_board(factory),
+            "play_full_board": lambda factory=factory: play_full_board(factory),
+            "get_board": render_boards(factory),
+        }
+        results[name] = {
+            scenario: timeit.timeit(func, number=number) / number * 1_000_000
+            for scenario, func in scenarios.items()
+        }
+    return results
+
+
+def main() -> None:
+    """Entry point of the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    results: dict[str, dict[str, float]] = run(args.number)
+    baseline: dict[str, float] = results["board.Board"]
+    for name, scenarios in results.items():
+        for scenario, micros in scenarios.items():
+            speedup: float = baseline[scenario] / micros
+            print(f"{name:20} {scenario:16} {micros:10.2f} us/op  x{speedup:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Benchmark of the session codec.
+
+Compares battleapi.api.codec with pickle of the SessionStateDto object graph by
+size and round-trip time on the classic game session in the gameplay stage.
+
+Run:
+    python -m benchmarks.bench_codec [--number N]
+"""
+import argparse
+import logging
+import pickle
+import timeit
+from typing import Callable
+
+import battleapi.api.codec as codec
+import battleapi.api.dto as dto
+import battleapi.logic.bitboard as bitboard
+import battleapi.logic.board as board
+import battleapi.logic.configs as configs
+import battleapi.logic.models as models
+import battleapi.logic.player as pl
+from benchmarks.bench_board import ALL_COORDINATES, CLASSIC_FLEET, EngineFactory
+
+Encoder = Callable[[dto.SessionStateDto], bytes]
+Decoder = Callable[[bytes], dto.SessionStateDto]
+
+CODECS: dict[str, tuple[Encoder, Decoder]] = {
+    "pickle": (pickle.dumps, pickle.loads),
+    "codec": (codec.encode, codec.decode),
+}
+
+
+def create_session(factory: EngineFactory) -> dto.SessionStateDto:
+    """Create session with two players with classic fleet and some shots.
+
+    Args:
+        factory (EngineFactory): board engine.
+
+    Returns:
+        dto.SessionStateDto: session state.
+    """
+    players: dict[str, pl.Player] = {}
+    for player_index in range(2):
+        game_board: pl.GameBoard = factory()
+        ships: dict[models.ShipId, models.Ship] = {}
+        for index, (coordinate, size, direction) in enumerate(CLASSIC_FLEET):
+            ship_id: str = f"00000000-0000-4000-8000-{player_index:06d}{index:06d}"
+            ship: models.Ship = models.Ship(ship_id, size, direction)
+            game_board.add_ship(coordinate, ship)
+            ships[ship_id] = ship
+        for coordinate in ALL_COORDINATES[::7]:
+            game_board.make_shot(coordinate)
+        player_id: str = f"00000000-0000-4000-8000-{player_index:012d}"
+        players[player_id] = pl.Player(
+            player_id, f"player_{player_index}", game_board, {}, ships, True
+        )
+    return dto.SessionStateDto(
+        session_id="00000000-0000-4000-8000-999999999999",
+        game_config=configs.ClassicGameConfiguration(),
+        players=players,
+        active_player_id=next(iter(players)),
+    )
+
+
+def run(number: int) -> dict[str, dict[str, float]]:
+    """Measure size and round-trip time for every codec and board engine.
+
+    Args:
+        number (int): amount of repetitions.
+
+    Returns:
+        dict[str, dict[str, float]]: size in bytes, encode and decode time in
+            microseconds by codec name.
+    """
+    results: dict[str, dict[str, float]] = {}
+    engines: dict[str, EngineFactory] = {
+        "Board": board.Board,
+        "BitBoard": bitboard.BitBoard,
+    }
+    for engine_name, factory in engines.items():
+        session: dto.SessionStateDto = create_session(factory)
+        for codec_name, (encoder, decoder) in CODECS.items():
+            data: bytes = encoder(session)
+            encode_time: float = timeit.timeit(lambda: encoder(session), number=number)
+            decode_time: float = timeit.timeit(lambda: decoder(data), number=number)
+            results[f"{codec_name}/{engine_name}"] = {
+                "bytes": len(data),
+                "encode_us": encode_time / number * 1_000_000,
+                "decode_us": decode_time / number * 1_000_000,
+            }
+    return results
+
+
+def main() -> None:
+    """Entry point of the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=1000)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    for name, values in run(args.number).items():
+        print(
+            f"{name:18} {values['bytes']:8.0f} bytes "
+            f"encode {values['encode_us']:9.2f} us  decode {values['decode_us']:9.2f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
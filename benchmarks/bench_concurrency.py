@@ -0,0 +1,165 @@
+"""Stress benchmark of the concurrent shots in one game session.
+
+Many threads make shots to the both fields of the same session through the
+controller and the result is checked: every successful shot should be visible on the
+field and counters of the boards should match the cells. For comparison the same
+shots are done by separate load and save calls ("load/save"), that loses updates
+when sessions are not shared objects (SQLite client).
+
+Run:
+    python -m benchmarks.bench_concurrency [--threads N] [--rounds N]
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable
+
+import battleapi.abstract as abstract
+import battleapi.api.controller as controller
+import battleapi.api.dto as dto
+import battleapi.api.persistence as persistence
+import battleapi.db.in_memory_db_client as in_memory_db_client
+import battleapi.db.sqlite_db_client as sqlite_db_client
+import battleapi.logic.game as game
+import battleapi.logic.models as models
+import battleapi.utils.id_generator as id_generator
+from benchmarks.bench_board import ALL_COORDINATES, CLASSIC_FLEET
+
+Shot = tuple[str, models.Coordinate]
+ShotFunction = Callable[[str, str, models.Coordinate], None]
+
+
+def create_game(api: controller.GameControllerApi) -> tuple[str, list[str]]:
+    """Create session with two ready players with the classic fleet.
+
+    Args:
+        api (controller.GameControllerApi): controller.
+
+    Returns:
+        tuple[str, list[str]]: session id and player ids.
+    """
+    session_id: str = api.init_game_session()
+    player_ids: list[str] = [
+        api.create_player_in_session(session_id, name).player_id
+        for name in ("player_1", "player_2")
+    ]
+    for player_id in player_ids:
+        ships: list[dto.ShipDto] = api.get_prepare_ships_list(session_id, player_id)
+        ships.sort(key=lambda ship: ship.ship_size, reverse=True)
+        for ship, (coordinate, _, direction) in zip(ships, CLASSIC_FLEET):
+            api.add_ship_to_field(
+                session_id, player_id, ship.ship_id, coordinate, direction.name
+            )
+        api.start_game(session_id, player_id)
+    return session_id, player_ids
+
+
+def load_save_shot(api: controller.GameControllerApi) -> ShotFunction:
+    """Create shot function that uses separate load and save of the session.
+
+    Args:
+        api (controller.GameControllerApi): controller.
+
+    Returns:
+        ShotFunction: shot function.
+    """
+
+    def shoot(session_id: str, player_id: str, coordinate: models.Coordinate) -> None:
+        state: dto.SessionStateDto | None = api.persistence.load_session(session_id)
+        game_session: game.Game = api._create_game(state)
+        game_session.make_shot(player_id, coordinate)
+        api.persistence.save_session(
+            session_id, api._to_session_state(session_id, game_session)
+        )
+
+    return shoot
+
+
+def run(
+    db_client: abstract.DbClient, mode: str, threads: int, rounds: int
+) -> dict[str, float]:
+    """Fire concurrent shots and count lost updates.
+
+    Args:
+        db_client (abstract.DbClient): DB client.
+        mode (str): "update" (controller) or "load/save".
+        threads (int): number of threads.
+        rounds (int): number of the games played one by one.
+
+    Returns:
+        dict[str, float]: shots per second and number of lost shots.
+    """
+    api = controller.GameControllerApi(
+        persistence.GamePersistenceApi(db_client), id_generator.Uuid4IdGenerator()
+    )
+    shoot: ShotFunction = api.make_shot if mode == "update" else load_save_shot(api)
+    lost: int = 0
+    shots_count: int = 0
+    elapsed: float = 0.0
+    for _ in range(rounds):
+        session_id, player_ids = create_game(api)
+        shots: list[Shot] = [
+            (player_id, coordinate)
+            for coordinate in ALL_COORDINATES
+            for player_id in player_ids
+        ]
+        barrier = threading.Barrier(threads)
+
+        def worker(index: int) -> None:
+            barrier.wait()
+            for player_id, coordinate in shots[index::threads]:
+                shoot(session_id, player_id, coordinate)
+
+        workers: list[threading.Thread] = [
+            threading.Thread(target=worker, args=(index,)) for index in range(threads)
+        ]
+        start: float = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed += time.perf_counter() - start
+        shots_count += len(shots)
+        for player_id in player_ids:
+            target: str = player_ids[1] if player_id == player_ids[0] else player_ids[0]
+            field: list[list[dto.CellDto]] = api.get_field(session_id, target)
+            not_shot: int = sum(not cell.has_shot for row in field for cell in row)
+            lost += not_shot
+            if api.get_number_of_cells_left(session_id, target) != not_shot:
+                lost += 1
+    return {"shots_per_second": shots_count / elapsed, "lost": lost}
+
+
+def main() -> None:
+    """Entry point of the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    has_lost_updates: bool = False
+    with tempfile.TemporaryDirectory() as directory:
+        clients: dict[str, Callable[[], abstract.DbClient]] = {
+            "memory": in_memory_db_client.InMemoryDbClient,
+            "sqlite": lambda: sqlite_db_client.SqliteDbClient(
+                os.path.join(directory, "bench.sqlite")
+            ),
+        }
+        for client_name, factory in clients.items():
+            for mode in ("update", "load/save"):
+                result = run(factory(), mode, args.threads, args.rounds)
+                print(
+                    f"{client_name:7} {mode:10} "
+                    f"{result['shots_per_second']:10.0f} shots/s  "
+                    f"lost updates: {result['lost']:.0f}"
+                )
+                has_lost_updates |= mode == "update" and result["lost"] > 0
+    sys.exit(1 if has_lost_updates else 0)
+
+
+if __name__ == "__main__":
+    main()
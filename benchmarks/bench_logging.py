@@ -0,0 +1,152 @@
+"""Benchmark of the disabled debug logging in the board hot paths.
+
+Measures the cost of one disabled debug call (stdlib logger, battleapi.utils.logs
+facade, sampled event, is_debug guard), counts log calls made by every board
+scenario and estimates the share of the disabled logging in the scenario time.
+
+Run:
+    python -m benchmarks.bench_logging [--number N]
+"""
+import argparse
+import logging
+import timeit
+from typing import Any, Callable
+
+import battleapi.logic.bitboard as bitboard
+import battleapi.logic.board as board
+import battleapi.logic.utils as utils
+import battleapi.utils.logs as logs
+from benchmarks.bench_board import (
+    ENGINES,
+    create_fleet_board,
+    play_full_board,
+    render_boards,
+)
+
+LOGGED_MODULES: tuple[Any, ...] = (board, bitboard, utils)
+
+
+class CountingLogger(logs.StructuredLogger):
+    """Disabled logger that counts is_debug guards and logging method calls."""
+
+    guards: int = 0
+    calls: int = 0
+
+    def refresh(self) -> None:
+        """Levels are not cached, logger is always disabled."""
+
+    @property  # type: ignore[override]
+    def is_debug(self) -> bool:
+        """Count the guard."""
+        self.guards += 1
+        return False
+
+    def debug(self, msg: str, *args: Any) -> None:
+        """Count the call."""
+        self.calls += 1
+
+    def debug_sampled(self, msg: str, *args: Any, rate: int = 0) -> None:
+        """Count the call."""
+        self.calls += 1
+
+    def info(self, msg: str, *args: Any) -> None:
+        """Count the call."""
+        self.calls += 1
+
+
+def measure_call(func: Callable[[], object], number: int) -> float:
+    """Measure function.
+
+    Args:
+        func (Callable[[], object]): measured function.
+        number (int): amount of repetitions.
+
+    Returns:
+        float: nanoseconds per call.
+    """
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e9
+
+
+def measure_disabled_calls(number: int) -> dict[str, float]:
+    """Measure one disabled debug call of the different kinds.
+
+    Args:
+        number (int): amount of repetitions.
+
+    Returns:
+        dict[str, float]: nanoseconds per call by kind.
+    """
+    std_log: logging.Logger = logging.getLogger("benchmarks.logging")
+    log: logs.StructuredLogger = logs.get_logger("benchmarks.logging")
+    coordinate: tuple[int, int] = (1, 2)
+
+    def guarded() -> None:
+        if log.is_debug:
+            log.debug("coordinate: %s", coordinate)
+
+    return {
+        "logging.Logger.debug": measure_call(
+            lambda: std_log.debug("coordinate: %s", coordinate), number
+        ),
+        "StructuredLogger.debug": measure_call(
+            lambda: log.debug("coordinate: %s", coordinate), number
+        ),
+        "debug_sampled": measure_call(
+            lambda: log.debug_sampled("coordinate: %s", coordinate), number
+        ),
+        "is_debug guard": measure_call(guarded, number),
+        "no logging": measure_call(lambda: None, number),
+    }
+
+
+def count_log_calls(func: Callable[[], object]) -> tuple[int, int]:
+    """Count is_debug guards and log calls of the board modules made by the function.
+
+    Args:
+        func (Callable[[], object]): scenario.
+
+    Returns:
+        tuple[int, int]: number of the guards and number of the log calls.
+    """
+    counter = CountingLogger(logging.getLogger("benchmarks.logging.counter"))
+    originals: list[logs.StructuredLogger] = [module.log for module in LOGGED_MODULES]
+    for module in LOGGED_MODULES:
+        module.log = counter
+    try:
+        func()
+    finally:
+        for module, original in zip(LOGGED_MODULES, originals):
+            module.log = original
+    return counter.guards, counter.calls
+
+
+def main() -> None:
+    """Entry point of the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=1000)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    calls: dict[str, float] = measure_disabled_calls(args.number * 100)
+    for kind, nanos in calls.items():
+        print(f"{kind:24} {nanos:8.1f} ns/call")
+    call_cost: float = calls["StructuredLogger.debug"] - calls["no logging"]
+    guard_cost: float = calls["is_debug guard"] - calls["no logging"]
+    for name, factory in ENGINES.items():
+        scenarios: dict[str, Callable[[], object]] = {
+            "make_shot": lambda factory=factory: play_full_board(factory),
+            "add_fleet": lambda factory=factory: create_fleet_board(factory),
+            "get_board": render_boards(factory),
+        }
+        for scenario, func in scenarios.items():
+            micros: float = measure_call(func, args.number) / 1000
+            guards, log_calls = count_log_calls(func)
+            nanos: float = guards * guard_cost + log_calls * call_cost
+            print(
+                f"{name:20} {scenario:10} {micros:10.2f} us/op "
+                f"{guards:4d} guards {log_calls:4d} calls  "
+                f"disabled logging ~{nanos / 10 / micros:.1f}%"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark of the NumPy multi-board compared with the board engines.
+
+Every engine plays the same scenario as bench_board "play_full_board" (shoots every
+cell of the board with the classic fleet), multi-board makes the shot in all games
+at once. Reported time is per one board.
+
+Requires numpy:
+    python -m benchmarks.bench_multiboard [--games N] [--number N]
+"""
+import argparse
+import logging
+import timeit
+
+import numpy as np
+
+import battleapi.logic.multiboard as multiboard
+from benchmarks.bench_board import (
+    ALL_COORDINATES,
+    ENGINES,
+    create_fleet_board,
+    play_full_board,
+)
+
+
+def play_multi_board(template: multiboard.MultiBoard) -> None:
+    """Shoot every cell of all boards checking game state after every shot.
+
+    Args:
+        template (multiboard.MultiBoard): boards with fleets (not changed).
+    """
+    boards: multiboard.MultiBoard = template.copy()
+    rows: np.ndarray = np.empty(len(boards), dtype=np.intp)
+    cols: np.ndarray = np.empty(len(boards), dtype=np.intp)
+    for row, col in ALL_COORDINATES:
+        rows.fill(row)
+        cols.fill(col)
+        boards.make_shot(rows, cols)
+        boards.get_amount_of_alive_ships()
+
+
+def main() -> None:
+    """Entry point of the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--number", type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    results: dict[str, float] = {}
+    for name, factory in ENGINES.items():
+        seconds: float = timeit.timeit(
+            lambda factory=factory: play_full_board(factory), number=args.number * 100
+        )
+        results[name] = seconds / (args.number * 100) * 1_000_000
+    template = multiboard.MultiBoard.from_boards(
+        [create_fleet_board(ENGINES["board.Board"])] * args.games
+    )
+    seconds = timeit.timeit(lambda: play_multi_board(template), number=args.number)
+    results["multiboard.MultiBoard"] = seconds / args.number / args.games * 1_000_000
+    baseline: float = results["board.Board"]
+    for name, micros in results.items():
+        print(
+            f"{name:22} play_full_board {micros:10.2f} us/board  x{baseline / micros:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark of the SQLite DB client.
+
+Fills database with N sessions (default 10k, 100k and 1M) and measures latency of the
+save and load of random sessions.
+
+Run:
+    python -m benchmarks.bench_sqlite [--sizes 10000 100000] [--number N]
+"""
+import argparse
+import logging
+import os
+import random
+import tempfile
+import time
+
+import battleapi.api.codec as codec
+import battleapi.db.sqlite_db_client as sqlite_db_client
+import battleapi.logic.board as board
+from benchmarks.bench_codec import create_session
+
+FILL_BATCH: int = 10_000
+
+
+def fill(db_client: sqlite_db_client.SqliteDbClient, size: int) -> None:
+    """Store size sessions in the database.
+
+    Args:
+        db_client (sqlite_db_client.SqliteDbClient): client.
+        size (int): number of sessions.
+    """
+    data: bytes = codec.encode(create_session(board.Board))
+    connection = db_client._connection()
+    for start in range(0, size, FILL_BATCH):
+        rows: list[tuple[str, bytes, int]] = [
+            (f"session_{index}", data, 1)
+            for index in range(start, min(start + FILL_BATCH, size))
+        ]
+        with connection:
+            connection.executemany(sqlite_db_client.SQL_SAVE, rows)
+
+
+def measure(size: int, number: int) -> dict[str, float]:
+    """Measure save and load latency on the database with size sessions.
+
+    Args:
+        size (int): number of stored sessions.
+        number (int): number of measured operations.
+
+    Returns:
+        dict[str, float]: microseconds per operation.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        db_client = sqlite_db_client.SqliteDbClient(
+            os.path.join(directory, "bench.sqlite")
+        )
+        fill(db_client, size)
+        session = create_session(board.Board)
+        ids: list[str] = [f"session_{random.randrange(size)}" for _ in range(number)]
+
+        start: float = time.perf_counter()
+        for session_id in ids:
+            db_client.load(session_id)
+        load_time: float = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for session_id in ids:
+            db_client.save(session_id, session)
+        save_time: float = time.perf_counter() - start
+        db_client.close()
+    return {
+        "load_us": load_time / number * 1_000_000,
+        "save_us": save_time / number * 1_000_000,
+    }
+
+
+def main() -> None:
+    """Entry point of the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    for size in args.sizes:
+        result: dict[str, float] = measure(size, args.number)
+        print(
+            f"{size:>9} sessions  load {result['load_us']:8.2f} us/op  "
+            f"save {result['save_us']:8.2f} us/op"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,446 @@
+"""Benchmark suite of the core engine, controller and web hot paths.
+
+Every case is measured by timeit (best of the repeats, number of calls is chosen so
+one repeat takes at least --min-time seconds) and by tracemalloc (memory allocated
+by one call: peak and retained after the call). Results are printed as the table
+and can be saved as JSON. Comparison mode loads stored results (baseline) and flags
+cases that became slower or allocate more than the threshold, the exit status is 1
+if there are regressions.
+
+Cases don't use network or files, the web case renders the page by the Flask test
+client with the in memory persistence.
+
+Run:
+    python -m benchmarks.suite [--filter SUBSTRING ...] [--repeat N] [--min-time S]
+        [--output results.json] [--baseline baseline.json] [--threshold 0.1]
+"""
+import argparse
+import dataclasses
+import datetime
+import json
+import logging
+import os
+import platform
+import sys
+import timeit
+import tracemalloc
+from typing import Any, Callable
+
+import battleapi.api.controller as controller
+import battleapi.api.dto as dto
+import battleapi.api.persistence as persistence
+import battleapi.db.in_memory_db_client as in_memory_db_client
+import battleapi.logic.configs as configs
+import battleapi.logic.game as game
+import battleapi.utils.id_generator as id_generator
+from benchmarks.bench_board import (
+    ALL_COORDINATES,
+    CLASSIC_FLEET,
+    ENGINES,
+    create_fleet_board,
+    play_full_board,
+    render_boards,
+)
+from benchmarks.bench_codec import create_session
+from benchmarks.bench_concurrency import create_game
+
+Case = Callable[[], object]
+CaseFactory = Callable[[], Case]
+
+FORMAT_VERSION: int = 1
+DEFAULT_REPEAT: int = 5
+DEFAULT_MIN_TIME: float = 0.2
+DEFAULT_THRESHOLD: float = 0.1
+
+
+@dataclasses.dataclass
+class CaseResult:
+    """Measurements of one case.
+
+    Attributes:
+        ops_per_sec (float): calls per second (best repeat).
+        us_per_op (float): microseconds per call (best repeat).
+        alloc_peak_bytes (int): peak of the memory allocated by one call.
+        alloc_net_bytes (int): memory retained after one call.
+        number (int): calls in one repeat.
+        repeat (int): number of the repeats.
+    """
+
+    ops_per_sec: float
+    us_per_op: float
+    alloc_peak_bytes: int
+    alloc_net_bytes: int
+    number: int
+    repeat: int
+
+
+@dataclasses.dataclass
+class Comparison:
+    """Result of the case compared with the baseline.
+
+    Attributes:
+        name (str): case name.
+        speed_ratio (float): current ops per second / baseline ops per second.
+        alloc_ratio (float): current / baseline allocation peak (1 if unknown).
+        is_regression (bool): True if the change is above the threshold.
+    """
+
+    name: str
+    speed_ratio: float
+    alloc_ratio: float
+    is_regression: bool
+
+
+def create_controller() -> controller.GameControllerApi:
+    """Create controller with in memory persistence.
+
+    Returns:
+        controller.GameControllerApi: controller.
+    """
+    return controller.GameControllerApi(
+        persistence=persistence.GamePersistenceApi(
+            in_memory_db_client.InMemoryDbClient()
+        ),
+        id_generator=id_generator.Uuid4IdGenerator(),
+    )
+
+
+def play_full_game() -> None:
+    """Create game with two ready players and shoot every cell by turns."""
+    game_obj = game.Game(
+        id_generator.Uuid4IdGenerator(), configs.ClassicGameConfiguration()
+    )
+    player_ids: tuple[str, str] = ("player_1", "player_2")
+    for player_id in player_ids:
+        game_obj.add_player(player_id, player_id)
+        ships = sorted(
+            game_obj.get_available_ships(player_id),
+            key=lambda ship: ship.ship_size,
+            reverse=True,
+        )
+        for ship, (coordinate, _, direction) in zip(ships, CLASSIC_FLEET):
+            ship.direction = direction
+            game_obj.add_ship(player_id, coordinate, ship)
+    for player_id in player_ids:
+        game_obj.make_player_ready(player_id)
+    targets: dict[str, list] = {player_id: [] for player_id in player_ids}
+    while not game_obj.is_game_finished():
+        active: str = game_obj.active_player_id
+        coordinate = ALL_COORDINATES[len(targets[active])]
+        targets[active].append(coordinate)
+        game_obj.make_shot(active, coordinate)
+
+
+def controller_get_field() -> Case:
+    """Create case: field of the opponent in the gameplay stage.
+
+    Returns:
+        Case: benchmark callable.
+    """
+    api: controller.GameControllerApi = create_controller()
+    session_id, player_ids = create_game(api)
+    return lambda: api.get_field(session_id, player_ids[1], is_for_opponent=True)
+
+
+def controller_gameplay_fanout(is_scoped: bool) -> Case:
+    """Create case: all controller calls that gameplay page made before snapshots.
+
+    Args:
+        is_scoped (bool): True if calls are made in one scope (request).
+
+    Returns:
+        Case: benchmark callable.
+    """
+    api: controller.GameControllerApi = create_controller()
+    session_id, (player_id, opponent_id) = create_game(api)
+
+    def fanout() -> None:
+        api.get_player_by_id(session_id, player_id)
+        api.get_opponent(session_id, player_id)
+        api.get_active_player(session_id)
+        api.get_number_of_cells_left(session_id, player_id)
+        api.get_number_of_cells_left(session_id, opponent_id)
+        api.get_field(session_id, player_id)
+        api.get_field(session_id, opponent_id, is_for_opponent=True)
+        api.get_winner(session_id)
+
+    def scoped_fanout() -> None:
+        with api.session_scope():
+            fanout()
+
+    return scoped_fanout if is_scoped else fanout
+
+
+def controller_gameplay_snapshot() -> Case:
+    """Create case: gameplay page data by one snapshot call.
+
+    Returns:
+        Case: benchmark callable.
+    """
+    api: controller.GameControllerApi = create_controller()
+    session_id, (player_id, _) = create_game(api)
+    return lambda: api.get_gameplay_snapshot(session_id, player_id)
+
+
+def db_memory_save() -> Case:
+    """Create case: save of the session by the in memory DB client.
+
+    Returns:
+        Case: benchmark callable.
+    """
+    client = in_memory_db_client.InMemoryDbClient()
+    session: dto.SessionStateDto = create_session(ENGINES["board.Board"])
+    return lambda: client.save(session.session_id, session)
+
+
+def db_memory_load() -> Case:
+    """Create case: load of the session by the in memory DB client.
+
+    Returns:
+        Case: benchmark callable.
+    """
+    client = in_memory_db_client.InMemoryDbClient()
+    session: dto.SessionStateDto = create_session(ENGINES["board.Board"])
+    client.save(session.session_id, session)
+    return lambda: client.load(session.session_id)
+
+
+def flask_gameplay_page() -> Case:
+    """Create case: render of the gameplay page by the Flask test client.
+
+    Returns:
+        Case: benchmark callable.
+    """
+    os.environ.setdefault("FLASK_APP_KEY", "")
+    import battleflask.app.context as ctx
+    import battleflask.flask_app as flask_app
+
+    logging.disable(logging.CRITICAL)
+    session_id, (player_id, _) = create_game(ctx.GAME_API)
+    client = flask_app.FLASK_APP.test_client()
+    client.set_cookie("cookie_player_id", player_id)
+    client.set_cookie("cookie_session_id", session_id)
+    url: str = f"/game/{session_id}/gameplay"
+    if client.get(url).status_code != 200:
+        raise RuntimeError(f"Gameplay page is not rendered: {url}")
+    return lambda: client.get(url).data
+
+
+def get_cases() -> dict[str, CaseFactory]:
+    """Return factories of all the cases by name.
+
+    Returns:
+        dict[str, CaseFactory]: case factories.
+    """
+    cases: dict[str, CaseFactory] = {}
+    for engine, factory in ENGINES.items():
+        cases[f"{engine}.add_ship"] = lambda factory=factory: (
+            lambda: create_fleet_board(factory)
+        )
+        cases[f"{engine}.make_shot"] = lambda factory=factory: (
+            lambda: play_full_board(factory)
+        )
+        cases[f"{engine}.get_board"] = lambda factory=factory: render_boards(factory)
+    cases["game.make_shot"] = lambda: play_full_game
+    cases["controller.get_field"] = controller_get_field
+    cases["controller.gameplay_fanout"] = lambda: controller_gameplay_fanout(False)
+    cases["controller.gameplay_fanout_scope"] = lambda: controller_gameplay_fanout(True)
+    cases["controller.gameplay_snapshot"] = controller_gameplay_snapshot
+    cases["db.memory_save"] = db_memory_save
+    cases["db.memory_load"] = db_memory_load
+    cases["flask.gameplay_page"] = flask_gameplay_page
+    return cases
+
+
+def measure_allocations(func: Case) -> tuple[int, int]:
+    """Measure memory allocated by one call.
+
+    Args:
+        func (Case): benchmark callable (already called once, so caches are warm).
+
+    Returns:
+        tuple[int, int]: peak of the allocated memory and memory retained after
+            the call.
+    """
+    tracemalloc.start()
+    try:
+        before: int = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        func()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return max(0, peak - before), max(0, current - before)
+
+
+def measure(func: Case, repeat: int, min_time: float) -> CaseResult:
+    """Measure speed and allocations of the case.
+
+    Args:
+        func (Case): benchmark callable.
+        repeat (int): number of the repeats.
+        min_time (float): min seconds of one repeat.
+
+    Returns:
+        CaseResult: measurements.
+    """
+    func()
+    timer = timeit.Timer(func)
+    number, seconds = timer.autorange()
+    if seconds < min_time:
+        number = max(number, int(number * min_time / max(seconds, 1e-9)))
+    best: float = min(timer.repeat(repeat, number)) / number
+    alloc_peak, alloc_net = measure_allocations(func)
+    return CaseResult(
+        ops_per_sec=1 / best,
+        us_per_op=best * 1_000_000,
+        alloc_peak_bytes=alloc_peak,
+        alloc_net_bytes=alloc_net,
+        number=number,
+        repeat=repeat,
+    )
+
+
+def run(
+    filters: list[str] | None = None,
+    repeat: int = DEFAULT_REPEAT,
+    min_time: float = DEFAULT_MIN_TIME,
+) -> dict[str, CaseResult]:
+    """Run the cases.
+
+    Args:
+        filters (list[str] | None, optional): run only cases whose name contains
+            any of the substrings. Defaults to None (all cases).
+        repeat (int, optional): number of the repeats. Defaults to DEFAULT_REPEAT.
+        min_time (float, optional): min seconds of one repeat.
+            Defaults to DEFAULT_MIN_TIME.
+
+    Returns:
+        dict[str, CaseResult]: measurements by case name.
+    """
+    results: dict[str, CaseResult] = {}
+    for name, factory in get_cases().items():
+        if filters and not any(part in name for part in filters):
+            continue
+        results[name] = measure(factory(), repeat, min_time)
+        print(f"{name:36} {results[name].us_per_op:12.2f} us/op", file=sys.stderr)
+    return results
+
+
+def to_json(results: dict[str, CaseResult]) -> dict[str, Any]:
+    """Convert results to the JSON document with the environment information.
+
+    Args:
+        results (dict[str, CaseResult]): measurements by case name.
+
+    Returns:
+        dict[str, Any]: JSON document.
+    """
+    return {
+        "version": FORMAT_VERSION,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "results": {
+            name: dataclasses.asdict(result) for name, result in results.items()
+        },
+    }
+
+
+def compare(
+    results: dict[str, CaseResult],
+    baseline: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[Comparison]:
+    """Compare results with the baseline document (see to_json).
+
+    Case is a regression if it is slower than the baseline by more than the
+    threshold or allocates more (peak) by more than the threshold. Cases missing
+    in the baseline are skipped.
+
+    Args:
+        results (dict[str, CaseResult]): measurements by case name.
+        baseline (dict[str, Any]): stored JSON document.
+        threshold (float, optional): allowed relative change.
+            Defaults to DEFAULT_THRESHOLD.
+
+    Returns:
+        list[Comparison]: comparisons of the cases found in the baseline.
+    """
+    stored: dict[str, dict[str, Any]] = baseline.get("results", {})
+    comparisons: list[Comparison] = []
+    for name, result in results.items():
+        if name not in stored:
+            continue
+        speed_ratio: float = result.ops_per_sec / stored[name]["ops_per_sec"]
+        stored_alloc: int = stored[name].get("alloc_peak_bytes", 0)
+        alloc_ratio: float = (
+            result.alloc_peak_bytes / stored_alloc if stored_alloc > 0 else 1.0
+        )
+        comparisons.append(
+            Comparison(
+                name=name,
+                speed_ratio=speed_ratio,
+                alloc_ratio=alloc_ratio,
+                is_regression=speed_ratio < 1 - threshold
+                or alloc_ratio > 1 + threshold,
+            )
+        )
+    return comparisons
+
+
+def print_results(
+    results: dict[str, CaseResult], comparisons: list[Comparison] | None = None
+) -> None:
+    """Print results table (with the baseline comparison if it is passed).
+
+    Args:
+        results (dict[str, CaseResult]): measurements by case name.
+        comparisons (list[Comparison] | None, optional): result of compare.
+            Defaults to None.
+    """
+    by_name: dict[str, Comparison] = {c.name: c for c in comparisons or []}
+    print(f"{'case':36} {'ops/sec':>12} {'us/op':>12} {'peak KiB':>10} {'net KiB':>9}")
+    for name, result in results.items():
+        line: str = (
+            f"{name:36} {result.ops_per_sec:12.1f} {result.us_per_op:12.2f} "
+            f"{result.alloc_peak_bytes / 1024:10.1f} "
+            f"{result.alloc_net_bytes / 1024:9.1f}"
+        )
+        comparison: Comparison | None = by_name.get(name)
+        if comparison is not None:
+            flag: str = "REGRESSION" if comparison.is_regression else ""
+            line += (
+                f"  speed x{comparison.speed_ratio:.2f}"
+                f"  alloc x{comparison.alloc_ratio:.2f}  {flag}"
+            )
+        print(line.rstrip())
+
+
+def main() -> None:
+    """Entry point of the benchmark suite."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", nargs="*", default=None)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    results: dict[str, CaseResult] = run(args.filter, args.repeat, args.min_time)
+    comparisons: list[Comparison] | None = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            comparisons = compare(results, json.load(file), args.threshold)
+    print_results(results, comparisons)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(to_json(results), file, indent=2)
+    if comparisons and any(c.is_regression for c in comparisons):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import pytest
+
+import battleapi.api.bots as bots
+import battleapi.logic.heatmap as hm
+import battleapi.logic.montecarlo as mc
+
+
+class TestBotRegistry:
+    def test_is_bot_player(self) -> None:
+        assert bots.is_bot_player(bots.BOT_PLAYER_ID_PREFIX + "id")
+        assert not bots.is_bot_player("id")
+
+    def test_acquire_keeps_bot(self) -> None:
+        registry = bots.BotRegistry()
+        with registry.acquire("session_1", "bot-1") as bot:
+            assert isinstance(bot, hm.HeatmapBot)
+        with registry.acquire("session_1", "bot-1") as same:
+            assert same is bot
+        with registry.acquire("session_2", "bot-1") as other:
+            assert other is not bot
+        assert len(registry) == 2
+
+    def test_lru_eviction(self) -> None:
+        registry = bots.BotRegistry(max_size=2)
+        with registry.acquire("session_1", "bot-1") as first:
+            pass
+        with registry.acquire("session_2", "bot-1"):
+            pass
+        with registry.acquire("session_1", "bot-1"):
+            pass
+        with registry.acquire("session_3", "bot-1"):
+            pass
+        assert len(registry) == 2
+        with registry.acquire("session_1", "bot-1") as kept:
+            assert kept is first
+        assert not registry.remove("session_2", "bot-1")
+        assert registry.remove("session_1", "bot-1")
+
+    def test_invalid_max_size(self) -> None:
+        with pytest.raises(ValueError):
+            bots.BotRegistry(max_size=0)
+
+    def test_bot_factory(self) -> None:
+        registry = bots.BotRegistry(bot_factory=mc.MonteCarloBot)
+        with registry.acquire("session_1", "bot-1") as bot:
+            assert isinstance(bot, mc.MonteCarloBot)
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+
+import battleapi.api.broker as b
+
+
+class TestBroker:
+    def test_publish_to_subscribers_of_session(self) -> None:
+        broker = b.Broker()
+        first = broker.subscribe("session_1")
+        second = broker.subscribe("session_1")
+        other = broker.subscribe("session_2")
+        notification = b.Notification(b.EVENT_PLAYER_READY, {"player_id": "id"})
+
+        assert broker.publish("session_1", notification) == 2
+        assert first.get(timeout=0) == notification
+        assert second.get(timeout=0) == notification
+        assert other.get(timeout=0) is None
+        assert broker.count_subscribers("session_1") == 2
+
+    def test_unsubscribe(self) -> None:
+        broker = b.Broker()
+        subscription = broker.subscribe("session_1")
+        broker.unsubscribe(subscription)
+        broker.unsubscribe(subscription)
+
+        assert broker.count_subscribers("session_1") == 0
+        assert broker.publish("session_1", b.Notification(b.EVENT_TURN)) == 0
+        assert subscription.get(timeout=0) is None
+
+    def test_overflow_is_replaced_by_resync(self) -> None:
+        broker = b.Broker(queue_size=2)
+        subscription = broker.subscribe("session_1")
+        delivered = [
+            broker.publish("session_1", b.Notification(b.EVENT_CELL, {"row": row}))
+            for row in range(3)
+        ]
+
+        assert delivered == [1, 1, 0]
+        assert subscription.get(timeout=0) == b.Notification(b.EVENT_RESYNC)
+        assert subscription.get(timeout=0) is None
+        broker.publish("session_1", b.Notification(b.EVENT_TURN))
+        assert subscription.get(timeout=0) == b.Notification(b.EVENT_TURN)
+
+    def test_get_waits_for_notification(self) -> None:
+        broker = b.Broker()
+        subscription = broker.subscribe("session_1")
+        timer = threading.Timer(
+            0.01, broker.publish, args=("session_1", b.Notification(b.EVENT_TURN))
+        )
+        timer.start()
+
+        assert subscription.get(timeout=5) == b.Notification(b.EVENT_TURN)
+        timer.join()
+
+    def test_async_subscription_receives_from_threads(self) -> None:
+        broker = b.Broker()
+
+        async def run() -> None:
+            subscription = broker.subscribe_async("session_1")
+            assert await subscription.get(timeout=0.01) is None
+            publisher = threading.Thread(
+                target=broker.publish,
+                args=("session_1", b.Notification(b.EVENT_TURN)),
+            )
+            publisher.start()
+            assert await subscription.get(timeout=5) == b.Notification(b.EVENT_TURN)
+            publisher.join()
+            broker.unsubscribe(subscription)
+            assert broker.count_subscribers("session_1") == 0
+
+        asyncio.run(run())
+
+    def test_async_subscription_overflow_is_replaced_by_resync(self) -> None:
+        broker = b.Broker(queue_size=1)
+
+        async def run() -> None:
+            subscription = broker.subscribe_async("session_1")
+            for _ in range(3):
+                broker.publish("session_1", b.Notification(b.EVENT_TURN))
+            await asyncio.sleep(0)
+            assert await subscription.get(timeout=0) == b.Notification(b.EVENT_RESYNC)
+            assert await subscription.get(timeout=0) is None
+
+        asyncio.run(run())
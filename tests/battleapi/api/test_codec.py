@@ -0,0 +1,132 @@
+import pickle
+
+import pytest
+
+import battleapi.api.codec as codec
+import battleapi.api.controller as c
+import battleapi.api.dto as dto
+import battleapi.api.persistence as p
+import battleapi.db.in_memory_db_client as memory
+import battleapi.logic.bitboard as bb
+import battleapi.logic.configs as cfg
+import battleapi.logic.models as models
+import battleapi.utils.id_generator as gen
+
+FLEET = [
+    ((0, 0), models.Direction.HORIZONTAL),
+    ((0, 5), models.Direction.HORIZONTAL),
+    ((2, 0), models.Direction.VERTICAL),
+    ((2, 2), models.Direction.HORIZONTAL),
+    ((2, 5), models.Direction.VERTICAL),
+    ((2, 7), models.Direction.HORIZONTAL),
+    ((6, 0), models.Direction.HORIZONTAL),
+    ((6, 9), models.Direction.HORIZONTAL),
+    ((9, 3), models.Direction.HORIZONTAL),
+    ((9, 9), models.Direction.HORIZONTAL),
+]
+
+
+def create_session(board_factory=None) -> dto.SessionStateDto:
+    db_client = memory.InMemoryDbClient()
+    controller = c.GameControllerApi(
+        persistence=p.GamePersistenceApi(db_client),
+        id_generator=gen.Uuid4IdGenerator(),
+        board_factory=board_factory,
+    )
+    session_id = controller.init_game_session()
+    players = [
+        controller.create_player_in_session(session_id, "test_player_1"),
+        controller.create_player_in_session(session_id, "тест_2"),
+    ]
+    for player in players:
+        ships = controller.get_prepare_ships_list(session_id, player.player_id)
+        ships.sort(key=lambda ship: ship.ship_size, reverse=True)
+        for ship, (coordinate, direction) in zip(ships, FLEET):
+            controller.add_ship_to_field(
+                session_id, player.player_id, ship.ship_id, coordinate, direction.name
+            )
+        controller.start_game(session_id, player.player_id)
+    for coordinate in [(0, 0), (0, 1), (5, 5), (0, 2), (0, 3), (9, 9), (4, 4)]:
+        active = controller.get_active_player(session_id)
+        controller.make_shot(session_id, active.player_id, coordinate)
+    return db_client.data_source[session_id]
+
+
+def assert_same_session(actual, expected) -> None:
+    assert actual.session_id == expected.session_id
+    assert actual.active_player_id == expected.active_player_id
+    assert actual.players.keys() == expected.players.keys()
+    for player_id, player in expected.players.items():
+        restored = actual.players[player_id]
+        assert type(restored.board) is type(player.board)
+        assert restored.player_name == player.player_name
+        assert restored.is_ready == player.is_ready
+        assert restored.all_ships.keys() == player.all_ships.keys()
+        assert restored.ships_not_on_board.keys() == player.ships_not_on_board.keys()
+        assert restored.board.get_board() == player.board.get_board()
+        assert (
+            restored.board.get_amount_of_alive_ships()
+            == player.board.get_amount_of_alive_ships()
+        )
+        assert (
+            restored.board.get_amount_of_not_shot_cells()
+            == player.board.get_amount_of_not_shot_cells()
+        )
+
+
+class TestCodec:
+    def test_round_trip(self) -> None:
+        session = create_session()
+        restored = codec.decode(codec.encode(session))
+        assert_same_session(restored, session)
+        assert isinstance(restored.game_config, cfg.ClassicGameConfiguration)
+
+    def test_round_trip_bit_board(self) -> None:
+        session = create_session(bb.BitBoard)
+        assert_same_session(codec.decode(codec.encode(session)), session)
+
+    def test_size(self) -> None:
+        session = create_session()
+        encoded = codec.encode(session)
+        assert len(encoded) < 1024
+        assert len(encoded) * 10 < len(pickle.dumps(session))
+
+    def test_estimate_size(self) -> None:
+        session = create_session()
+        assert codec.estimate_size(session) < len(codec.encode(session))
+        for player in session.players.values():
+            player.player_name = "test_player"
+        assert codec.estimate_size(session) == len(codec.encode(session))
+        text_ids = dto.SessionStateDto("session", cfg.CustomGameConfiguration(), {})
+        assert codec.estimate_size(text_ids) == len(codec.encode(text_ids))
+
+    def test_round_trip_not_placed_ships_and_text_ids(self) -> None:
+        session = dto.SessionStateDto(
+            session_id="session",
+            game_config=cfg.CustomGameConfiguration(),
+            players={},
+        )
+        restored = codec.decode(codec.encode(session))
+        assert restored.session_id == "session"
+        assert restored.players == {}
+        assert restored.active_player_id == ""
+        assert isinstance(restored.game_config, cfg.CustomGameConfiguration)
+
+    def test_config_overrides(self) -> None:
+        game_config = cfg.MappingGameConfiguration(
+            {models.ShipType.PatrolBoat: 1, models.ShipType.Carrier: 5},
+            {models.ShipType.PatrolBoat: 2, models.ShipType.Carrier: 1},
+        )
+        session = dto.SessionStateDto("session", game_config, {})
+        restored = codec.decode(codec.encode(session)).game_config
+        assert restored.get_size_mapping() == game_config.get_size_mapping()
+        assert restored.get_amount_mapping() == game_config.get_amount_mapping()
+
+    def test_decode_wrong_data(self) -> None:
+        encoded = codec.encode(create_session())
+        with pytest.raises(codec.CodecException):
+            codec.decode(b"XX" + encoded[2:])
+        with pytest.raises(codec.CodecException):
+            codec.decode(encoded[:2] + bytes([99]) + encoded[3:])
+        with pytest.raises(codec.CodecException):
+            codec.decode(encoded[:-5])
@@ -1,14 +1,22 @@
+import random
+import threading
 from unittest.mock import MagicMock
 
 import pytest
 
+import battleapi.api.bots as bots
+import battleapi.api.broker as broker
 import battleapi.api.controller as c
 import battleapi.api.dto as dto
 import battleapi.api.persistence as p
+import battleapi.logic.board as b
 import battleapi.logic.configs as cfg
 import battleapi.logic.exceptions as ex
+import battleapi.logic.game as g
+import battleapi.logic.heatmap as hm
 import battleapi.logic.models as models
 import battleapi.utils.id_generator as gen
+import battleapi.utils.metrics as metrics
 import battleapi.db.in_memory_db_client as memory
 
 
@@ -365,6 +373,21 @@ class TestControllerApi:
         assert not field_opponent[9][5].has_shot
         assert not field_opponent[0][0].has_ship
         assert not field_opponent[0][0].has_shot
+        assert field_opponent[9][5].row == 9
+        assert field_opponent[9][5].col == 5
+        assert field_opponent[5][5].ship_id is None
+
+        rows_self = controller.get_field_rows(
+            session_id, created_player_2.player_id, False
+        )
+        assert rows_self[2] == "xsss......"
+        assert rows_self[9][5] == "s"
+        rows_opponent = controller.get_field_rows(
+            session_id, created_player_2.player_id, True
+        )
+        assert len(rows_opponent) == 10
+        assert rows_opponent[9] == ".........."
+        assert rows_opponent[5][5] == "x"
 
     def test_get_winner(self) -> None:
         controller = create_real_controller()
@@ -413,6 +436,7 @@ class TestControllerApi:
         for row in player_1.board._board:
             for cell in row:
                 cell.has_shot = True
+        player_1.board = b.Board(player_1.board._board)
         player_2 = controller.persistence.db_client.load(session_id).players[
             created_player_2.player_id
         ]
@@ -567,3 +591,595 @@ class TestControllerApi:
         session = controller.persistence.load_session(session_id)
         for player in session.players.values():
             assert player.is_ready
+
+    def test_session_scope_reuses_game(self) -> None:
+        controller = create_real_controller()
+        session_id = controller.init_game_session()
+        persistence = controller.persistence
+        persistence.load_session = MagicMock(wraps=persistence.load_session)
+        persistence.save_session = MagicMock(wraps=persistence.save_session)
+
+        with controller.session_scope():
+            controller.get_active_player(session_id)
+            player = controller.create_player_in_session(session_id, "test_player")
+            controller.get_player_by_id(session_id, player.player_id)
+            controller.get_field(session_id, player.player_id)
+            controller.get_opponent(session_id, player.player_id)
+
+        assert persistence.load_session.call_count == 1
+        persistence.save_session.assert_not_called()
+        assert controller.cache_stats.hits == 3
+        assert controller.cache_stats.misses == 1
+        assert controller.get_player_by_id(session_id, player.player_id) == player
+        assert persistence.load_session.call_count == 2
+
+    def test_session_scope_without_changes_does_not_save(self) -> None:
+        controller = create_real_controller()
+        session_id = controller.init_game_session()
+        controller.persistence.save_session = MagicMock(return_value=True)
+        controller.begin_scope()
+        controller.begin_scope()
+        controller.get_active_player(session_id)
+        controller.end_scope()
+        assert controller.cache_stats.misses == 0
+        controller.end_scope()
+        controller.end_scope()
+        controller.persistence.save_session.assert_not_called()
+        assert controller.cache_stats.misses == 1
+
+    def test_get_wait_snapshot(self) -> None:
+        controller = create_real_controller()
+        session_id = controller.init_game_session()
+        player_1 = controller.create_player_in_session(session_id, "test_player_1")
+
+        snapshot = controller.get_wait_snapshot(session_id, player_1.player_id)
+        assert snapshot.player == player_1
+        assert snapshot.opponent is None
+
+        player_2 = controller.create_player_in_session(session_id, "test_player_2")
+        snapshot = controller.get_wait_snapshot(session_id, player_1.player_id)
+        assert snapshot.opponent == player_2
+        with pytest.raises(ex.PlayerNotFoundException):
+            controller.get_wait_snapshot(session_id, "not_existing_player")
+
+    def test_get_prepare_snapshot(self) -> None:
+        controller = create_real_controller()
+        session_id = controller.init_game_session()
+        player_1 = controller.create_player_in_session(session_id, "test_player_1")
+        ship = controller.get_prepare_ships_list(session_id, player_1.player_id).pop()
+        controller.add_ship_to_field(
+            session_id,
+            player_1.player_id,
+            ship.ship_id,
+            (0, 0),
+            models.Direction.HORIZONTAL.name,
+        )
+
+        snapshot = controller.get_prepare_snapshot(session_id, player_1.player_id)
+        assert snapshot.player == player_1
+        assert snapshot.opponent is None
+        assert snapshot.ships == controller.get_prepare_ships_list(
+            session_id, player_1.player_id
+        )
+        assert snapshot.field[0][0].has_ship
+        assert not snapshot.field[0][0].is_not_available
+        assert snapshot.field[1][0].is_not_available
+        assert snapshot.field[0][ship.ship_size].is_not_available
+        assert not snapshot.field[5][5].is_not_available
+
+    def test_get_gameplay_snapshot(self) -> None:
+        controller = create_real_controller()
+        session_id = controller.init_game_session()
+        player_1 = controller.create_player_in_session(session_id, "test_player_1")
+        player_2 = controller.create_player_in_session(session_id, "test_player_2")
+        for player in (player_1, player_2):
+            ship = controller.get_prepare_ships_list(session_id, player.player_id).pop()
+            controller.add_ship_to_field(
+                session_id,
+                player.player_id,
+                ship.ship_id,
+                (0, 0),
+                models.Direction.HORIZONTAL.name,
+            )
+            controller.start_game(session_id, player.player_id)
+        active = controller.get_active_player(session_id)
+        controller.make_shot(session_id, active.player_id, (9, 9))
+
+        snapshot = controller.get_gameplay_snapshot(session_id, player_1.player_id)
+        assert snapshot.player.player_id == player_1.player_id
+        assert snapshot.opponent.player_id == player_2.player_id
+        assert snapshot.active_player == controller.get_active_player(session_id)
+        assert snapshot.number_of_cells_self == controller.get_number_of_cells_left(
+            session_id, player_1.player_id
+        )
+        assert snapshot.number_of_cells_opponent == controller.get_number_of_cells_left(
+            session_id, player_2.player_id
+        )
+        assert snapshot.player_field == controller.get_field(
+            session_id, player_1.player_id
+        )
+        assert snapshot.opponent_field == controller.get_field(
+            session_id, player_2.player_id, True
+        )
+        assert snapshot.winner is None
+
+    def test_mutations_make_one_write(self) -> None:
+        controller = create_real_controller()
+        persistence = controller.persistence
+
+        writes = persistence.write_count
+        session_id = controller.init_game_session()
+        assert persistence.write_count - writes == 1
+
+        writes = persistence.write_count
+        player_1 = controller.create_player_in_session(session_id, "test_player_1")
+        player_2 = controller.create_player_in_session(session_id, "test_player_2")
+        assert persistence.write_count - writes == 2
+
+        for player in (player_1, player_2):
+            ship = controller.get_prepare_ships_list(session_id, player.player_id).pop()
+
+            writes = persistence.write_count
+            controller.add_ship_to_field(
+                session_id,
+                player.player_id,
+                ship.ship_id,
+                (0, 0),
+                models.Direction.HORIZONTAL.name,
+            )
+            assert persistence.write_count - writes == 1
+
+            writes = persistence.write_count
+            controller.remove_ship_from_field(session_id, player.player_id, (0, 0))
+            assert persistence.write_count - writes == 1
+
+            controller.add_ship_to_field(
+                session_id,
+                player.player_id,
+                ship.ship_id,
+                (0, 0),
+                models.Direction.HORIZONTAL.name,
+            )
+            writes = persistence.write_count
+            controller.start_game(session_id, player.player_id)
+            assert persistence.write_count - writes == 1
+
+        active = controller.get_active_player(session_id)
+        writes = persistence.write_count
+        controller.make_shot(session_id, active.player_id, (9, 9))
+        assert persistence.write_count - writes == 1
+
+        writes = persistence.write_count
+        controller.get_gameplay_snapshot(session_id, player_1.player_id)
+        assert persistence.write_count == writes
+
+    def test_mutations_in_scope_are_written_at_once(self) -> None:
+        controller = create_real_controller()
+        persistence = controller.persistence
+        session_id = controller.init_game_session()
+
+        writes = persistence.write_count
+        with controller.session_scope():
+            player = controller.create_player_in_session(session_id, "test_player")
+            ship = controller.get_prepare_ships_list(session_id, player.player_id).pop()
+            controller.add_ship_to_field(
+                session_id,
+                player.player_id,
+                ship.ship_id,
+                (0, 0),
+                models.Direction.HORIZONTAL.name,
+            )
+            controller.remove_ship_from_field(session_id, player.player_id, (0, 0))
+            assert persistence.write_count - writes == 3
+        assert persistence.write_count - writes == 3
+
+    def test_failed_mutation_does_not_write(self) -> None:
+        controller = create_real_controller()
+        persistence = controller.persistence
+        session_id = controller.init_game_session()
+        player = controller.create_player_in_session(session_id, "test_player")
+
+        writes = persistence.write_count
+        with pytest.raises(ex.ShipNotFoundException):
+            controller.add_ship_to_field(
+                session_id,
+                player.player_id,
+                "not_existing_ship",
+                (0, 0),
+                models.Direction.HORIZONTAL.name,
+            )
+        ship_id = controller.get_prepare_ships_list(session_id, player.player_id)[
+            0
+        ].ship_id
+        with pytest.raises(ex.IncorrectStringException):
+            controller.add_ship_to_field(
+                session_id, player.player_id, ship_id, (0, 0), "DIAG"
+            )
+        assert persistence.write_count == writes
+
+        controller.add_ship_to_field(
+            session_id,
+            player.player_id,
+            ship_id,
+            (0, 0),
+            models.Direction.HORIZONTAL.name,
+        )
+        with pytest.raises(ex.ShipAlreadyOnTheBoardException):
+            controller.add_ship_to_field(
+                session_id,
+                player.player_id,
+                ship_id,
+                (5, 5),
+                models.Direction.HORIZONTAL.name,
+            )
+
+    def test_concurrent_shots_are_not_lost(self) -> None:
+        controller = create_real_controller()
+        session_id = controller.init_game_session()
+        players = [
+            controller.create_player_in_session(session_id, name).player_id
+            for name in ("test_player_1", "test_player_2")
+        ]
+        for player_id in players:
+            ships = controller.get_prepare_ships_list(session_id, player_id)
+            ships.sort(key=lambda ship: ship.ship_size, reverse=True)
+            for index, ship in enumerate(ships):
+                controller.add_ship_to_field(
+                    session_id,
+                    player_id,
+                    ship.ship_id,
+                    (index // 2 * 2, index % 2 * 5),
+                    models.Direction.HORIZONTAL.name,
+                )
+            controller.start_game(session_id, player_id)
+        shots = [
+            (player_id, (row, col))
+            for row in range(10)
+            for col in range(10)
+            for player_id in players
+        ]
+
+        def worker(index: int) -> None:
+            for player_id, coordinate in shots[index::8]:
+                controller.make_shot(session_id, player_id, coordinate)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for player_id in players:
+            field = controller.get_field(session_id, player_id)
+            assert all(cell.has_shot for row in field for cell in row)
+            assert controller.get_number_of_cells_left(session_id, player_id) == 0
+
+    def test_make_shot_checks_turn(self) -> None:
+        controller = create_real_controller()
+        session_id = controller.init_game_session()
+        players = [
+            controller.create_player_in_session(session_id, name).player_id
+            for name in ("test_player_1", "test_player_2")
+        ]
+        with pytest.raises(ex.NotPlayerTurnException):
+            controller.make_shot(session_id, players[0], (0, 0), check_turn=True)
+        for player_id in players:
+            controller.randomize_fleet(session_id, player_id)
+            controller.start_game(session_id, player_id)
+        active_id = controller.get_active_player(session_id).player_id
+        waiting_id = players[1] if active_id == players[0] else players[0]
+
+        writes = controller.persistence.write_count
+        with pytest.raises(ex.NotPlayerTurnException):
+            controller.make_shot(session_id, waiting_id, (0, 0), check_turn=True)
+        assert controller.persistence.write_count == writes
+        field = controller.get_field_rows(session_id, active_id)
+        assert all(dto.CELL_MISS not in line for line in field)
+
+        controller.make_shot(session_id, active_id, (0, 0), check_turn=True)
+        controller.make_shot(session_id, waiting_id, (0, 0))
+
+    def test_update_is_retried_on_version_conflict(self) -> None:
+        controller = create_real_controller()
+        session_id = controller.init_game_session()
+        update_session = controller.persistence.update_session
+        conflicts = [ex.SessionVersionConflictException()] * 2
+        calls = []
+
+        def flaky_update(session_id, update_fn):
+            calls.append(session_id)
+            if conflicts:
+                raise conflicts.pop()
+            return update_session(session_id, update_fn)
+
+        controller.persistence.update_session = flaky_update
+        player = controller.create_player_in_session(session_id, "player_1")
+        assert len(calls) == 3
+        assert controller.get_player_by_id(session_id, player.player_id) is not None
+        assert controller.contention_stats.updates == 1
+        assert controller.contention_stats.conflicts == 2
+        assert controller.contention_stats.failures == 0
+
+    def test_update_fails_after_max_retries(self) -> None:
+        controller = create_real_controller()
+        controller.max_retries = 1
+        session_id = controller.init_game_session()
+        controller.persistence.update_session = MagicMock(
+            side_effect=ex.SessionVersionConflictException()
+        )
+        with pytest.raises(ex.SessionVersionConflictException):
+            controller.create_player_in_session(session_id, "player_1")
+        assert controller.persistence.update_session.call_count == 2
+        assert controller.contention_stats.conflicts == 2
+        assert controller.contention_stats.failures == 1
+
+    def test_changes_are_published_to_broker(self) -> None:
+        notification_broker = broker.Broker()
+        controller = create_real_controller()
+        controller.notification_broker = notification_broker
+        session_id = controller.init_game_session()
+        subscription = notification_broker.subscribe(session_id)
+
+        def receive() -> list[broker.Notification]:
+            received = []
+            while (notification := subscription.get(timeout=0)) is not None:
+                received.append(notification)
+            return received
+
+        players = [
+            controller.create_player_in_session(session_id, name).player_id
+            for name in ("test_player_1", "test_player_2")
+        ]
+        for player_id in players:
+            ships = controller.get_prepare_ships_list(session_id, player_id)
+            ships.sort(key=lambda ship: ship.ship_size, reverse=True)
+            for index, ship in enumerate(ships):
+                controller.add_ship_to_field(
+                    session_id,
+                    player_id,
+                    ship.ship_id,
+                    (index // 2 * 2, index % 2 * 5),
+                    models.Direction.HORIZONTAL.name,
+                )
+            controller.start_game(session_id, player_id)
+        received = receive()
+        assert [n.kind for n in received] == [
+            broker.EVENT_PLAYER_JOINED,
+            broker.EVENT_PLAYER_JOINED,
+            broker.EVENT_PLAYER_READY,
+            broker.EVENT_PLAYER_READY,
+            broker.EVENT_TURN,
+        ]
+        assert received[0].data == {
+            "player_id": players[0],
+            "player_name": "test_player_1",
+        }
+        active_id = received[-1].data["active_player_id"]
+        opponent_id = players[1] if active_id == players[0] else players[0]
+
+        controller.make_shot(session_id, active_id, (9, 9))
+        assert receive() == [
+            broker.Notification(
+                broker.EVENT_CELL,
+                {"player_id": opponent_id, "row": 9, "col": 9, "cell": "o"},
+            ),
+            broker.Notification(
+                broker.EVENT_TURN,
+                {
+                    "active_player_id": opponent_id,
+                    "active_player_name": controller.get_player_by_id(
+                        session_id, opponent_id
+                    ).player_name,
+                    "cells_left": {active_id: 100, opponent_id: 99},
+                },
+            ),
+        ]
+
+        rows = controller.get_field_rows(session_id, active_id)
+        ship_cells = {
+            (row, col)
+            for row, line in enumerate(rows)
+            for col, cell in enumerate(line)
+            if cell == "s"
+        }
+        for coordinate in sorted(ship_cells):
+            controller.make_shot(session_id, opponent_id, coordinate)
+        received = receive()
+        assert received[-1] == broker.Notification(
+            broker.EVENT_GAME_OVER, {"winner_id": opponent_id}
+        )
+        changed = {
+            (n.data["row"], n.data["col"]): n.data["cell"]
+            for n in received
+            if n.kind == broker.EVENT_CELL
+        }
+        assert all(
+            n.data["player_id"] == active_id
+            for n in received[:-1]
+            if n.kind == broker.EVENT_CELL
+        )
+        assert {cell for cell, value in changed.items() if value == "x"} == ship_cells
+        assert (1, 0) in changed and changed[(1, 0)] == "o"
+        notification_broker.unsubscribe(subscription)
+        assert notification_broker.count_subscribers(session_id) == 0
+
+    def test_randomize_fleet(self) -> None:
+        controller = create_real_controller()
+        session_id = controller.init_game_session()
+        player_id = controller.create_player_in_session(session_id, "player").player_id
+        controller.randomize_fleet(session_id, player_id)
+
+        assert controller.get_prepare_ships_list(session_id, player_id) == []
+        rows = controller.get_field_rows(session_id, player_id)
+        assert sum(line.count("s") for line in rows) == 20
+
+    def test_randomize_fleet_of_ready_player(self) -> None:
+        controller = create_real_controller()
+        session_id = controller.init_game_session()
+        player_id = controller.create_player_in_session(session_id, "player").player_id
+        controller.create_bot_in_session(session_id)
+        controller.randomize_fleet(session_id, player_id)
+        controller.start_game(session_id, player_id)
+        rows = controller.get_field_rows(session_id, player_id)
+
+        with pytest.raises(ex.PlayerIsReadyException):
+            controller.randomize_fleet(session_id, player_id)
+        assert controller.get_field_rows(session_id, player_id) == rows
+
+    def test_game_against_bot(self, monkeypatch) -> None:
+        monkeypatch.setattr(g, "RANDOM", random.Random(7))
+        notification_broker = broker.Broker()
+        controller = create_real_controller()
+        controller.notification_broker = notification_broker
+        controller.bot_registry = bots.BotRegistry(
+            bot_factory=lambda config: hm.HeatmapBot(config, random.Random(7))
+        )
+        session_id = controller.init_game_session()
+        subscription = notification_broker.subscribe(session_id)
+        player_id = controller.create_player_in_session(session_id, "player").player_id
+        bot = controller.create_bot_in_session(session_id)
+
+        assert bots.is_bot_player(bot.player_id)
+        assert bot.is_ready
+        opponent = controller.get_opponent(session_id, player_id)
+        assert opponent.player_name == bots.BOT_PLAYER_NAME
+
+        received = []
+
+        def drain() -> None:
+            while (notification := subscription.get(timeout=0)) is not None:
+                received.append(notification)
+
+        controller.randomize_fleet(session_id, player_id)
+        controller.start_game(session_id, player_id)
+        assert controller.get_number_of_cells_left(session_id, player_id) < 100
+        for row in range(10):
+            for col in range(10):
+                if controller.get_winner(session_id) is not None:
+                    break
+                active = controller.get_active_player(session_id)
+                assert active.player_id == player_id
+                field = controller.get_field_rows(session_id, bot.player_id, True)
+                if field[row][col] == dto.CELL_EMPTY:
+                    result = controller.make_shot(session_id, player_id, (row, col))
+                    field = controller.get_field_rows(session_id, bot.player_id, True)
+                    assert result.is_hit == (field[row][col] == dto.CELL_HIT)
+                drain()
+        assert controller.get_winner(session_id) is not None
+        assert len(controller.bot_registry) == 0
+
+        drain()
+        assert broker.EVENT_RESYNC not in {n.kind for n in received}
+        assert received[-1] == broker.Notification(
+            broker.EVENT_GAME_OVER,
+            {"winner_id": controller.get_winner(session_id).player_id},
+        )
+        assert {
+            n.data["player_id"] for n in received if n.kind == broker.EVENT_CELL
+        } == {player_id, bot.player_id}
+
+    def test_bot_opening_shots_finish_game(self) -> None:
+        registry = metrics.Registry()
+        persistence = p.GamePersistenceApi(
+            memory.InMemoryDbClient(metrics_registry=registry),
+            metrics_registry=registry,
+        )
+        notification_broker = broker.Broker()
+        controller = c.GameControllerApi(
+            persistence=persistence,
+            id_generator=gen.Uuid4IdGenerator(),
+            notification_broker=notification_broker,
+            metrics_registry=registry,
+        )
+        session_id = controller.init_game_session()
+        player_id = controller.create_player_in_session(session_id, "player").player_id
+        bot = controller.create_bot_in_session(session_id)
+        ships = controller.get_prepare_ships_list(session_id, player_id)
+        ships.sort(key=lambda ship: ship.ship_size, reverse=True)
+        targets = []
+        for index, ship in enumerate(ships):
+            row, col = index // 2 * 2, index % 2 * 5
+            controller.add_ship_to_field(
+                session_id,
+                player_id,
+                ship.ship_id,
+                (row, col),
+                models.Direction.HORIZONTAL.name,
+            )
+            targets.extend((row, col + offset) for offset in range(ship.ship_size))
+        scripted_bot = MagicMock()
+        scripted_bot.choose_shot.side_effect = targets
+        controller.bot_registry = bots.BotRegistry(
+            bot_factory=lambda config: scripted_bot
+        )
+        subscription = notification_broker.subscribe(session_id)
+
+        controller.start_game(session_id, player_id)
+
+        assert controller.get_winner(session_id).player_id == bot.player_id
+        assert registry.get("battleship_shots_total").get() == 20
+        assert registry.get("battleship_games_finished_total").get() == 1
+        received = []
+        while (notification := subscription.get(timeout=0)) is not None:
+            received.append(notification)
+        assert received[-1] == broker.Notification(
+            broker.EVENT_GAME_OVER, {"winner_id": bot.player_id}
+        )
+
+    def test_metrics_are_reported(self) -> None:
+        registry = metrics.Registry()
+        persistence = p.GamePersistenceApi(
+            memory.InMemoryDbClient(metrics_registry=registry),
+            metrics_registry=registry,
+        )
+        controller = c.GameControllerApi(
+            persistence=persistence,
+            id_generator=gen.Uuid4IdGenerator(),
+            metrics_registry=registry,
+        )
+        session_id = controller.init_game_session()
+        players = [
+            controller.create_player_in_session(session_id, name).player_id
+            for name in ("test_player_1", "test_player_2")
+        ]
+        for player_id in players:
+            ships = controller.get_prepare_ships_list(session_id, player_id)
+            ships.sort(key=lambda ship: ship.ship_size, reverse=True)
+            for index, ship in enumerate(ships):
+                controller.add_ship_to_field(
+                    session_id,
+                    player_id,
+                    ship.ship_id,
+                    (index // 2 * 2, index % 2 * 5),
+                    models.Direction.HORIZONTAL.name,
+                )
+            controller.start_game(session_id, player_id)
+        assert registry.get("battleship_active_sessions").get() == 1
+
+        for row in range(10):
+            for col in range(10):
+                controller.make_shot(session_id, players[0], (row, col))
+        with pytest.raises(ex.PlayerNotFoundException):
+            controller.make_shot(session_id, "unknown", (0, 0))
+
+        assert registry.get("battleship_sessions_created_total").get() == 1
+        assert (
+            registry.get("battleship_players_joined_total").labels("player").get() == 2
+        )
+        assert registry.get("battleship_shots_total").get() == 100
+        assert registry.get("battleship_hits_total").get() == 20
+        assert registry.get("battleship_hit_ratio").get() == 0.2
+        assert registry.get("battleship_games_finished_total").get() == 1
+        assert registry.get("battleship_active_sessions").get() == 0
+        assert (
+            registry.get("battleship_errors_total")
+            .labels("PlayerNotFoundException")
+            .get()
+            == 1
+        )
+        assert registry.get("battleship_store_sessions").get() == 1
+        rendered = registry.render()
+        assert 'battleship_persistence_seconds_count{operation="save"} 1' in rendered
+        assert (
+            'battleship_persistence_seconds_bucket{operation="update",le="+Inf"}'
+            in rendered
+        )
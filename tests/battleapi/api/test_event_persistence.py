@@ -0,0 +1,149 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+import battleapi.api.controller as c
+import battleapi.api.event_persistence as ep
+import battleapi.db.in_memory_event_store as store
+import battleapi.logic.events as ev
+import battleapi.logic.exceptions as ex
+import battleapi.utils.id_generator as gen
+
+
+def create_controller(snapshot_interval: int = 4) -> c.GameControllerApi:
+    persistence = ep.EventSourcedGamePersistence(
+        store.InMemoryEventStore(), snapshot_interval=snapshot_interval
+    )
+    return c.GameControllerApi(
+        persistence=persistence, id_generator=gen.Uuid4IdGenerator()
+    )
+
+
+def play_preparation(controller: c.GameControllerApi) -> tuple[str, list[str]]:
+    session_id = controller.init_game_session()
+    player_ids = [
+        controller.create_player_in_session(session_id, name).player_id
+        for name in ("player_1", "player_2")
+    ]
+    for player_id in player_ids:
+        ships = controller.get_prepare_ships_list(session_id, player_id)
+        ships.sort(key=lambda ship: ship.ship_size, reverse=True)
+        for index, ship in enumerate(ships):
+            coordinate = (index // 2 * 2, index % 2 * 5)
+            controller.add_ship_to_field(
+                session_id, player_id, ship.ship_id, coordinate, "HORIZONTAL"
+            )
+            if index == 0:
+                controller.remove_ship_from_field(session_id, player_id, (0, 0))
+                controller.add_ship_to_field(
+                    session_id, player_id, ship.ship_id, (0, 0), "HORIZONTAL"
+                )
+        controller.start_game(session_id, player_id)
+    return session_id, player_ids
+
+
+class TestEventSourcedGamePersistence:
+    def test_game_is_restored_from_snapshot_and_events(self) -> None:
+        controller = create_controller()
+        session_id, player_ids = play_preparation(controller)
+        controller.make_shot(session_id, player_ids[0], (0, 0))
+        controller.make_shot(session_id, player_ids[0], (9, 9))
+
+        persistence = controller.persistence
+        session_events = persistence.load_events(session_id)
+        assert len(session_events) == 2 + 2 * 12 + 2 + 2
+        assert session_events[-1] == ev.ShotFired(player_ids[0], (9, 9))
+        loaded = persistence.load_session(session_id)
+        assert loaded.version == len(session_events)
+        rows = controller.get_field_rows(session_id, player_ids[1])
+        assert rows[0] == "xsss.sss.."
+        assert rows[9] == ".........o"
+        replayed = ep.EventSourcedGamePersistence(
+            store.InMemoryEventStore(), snapshot_interval=1000
+        )
+        replayed.save_session(session_id, persistence.load_session_at(session_id, 0))
+        replayed.event_store.append(session_id, session_events)
+        expected = persistence.load_session(session_id)
+        actual = replayed.load_session(session_id)
+        assert actual.active_player_id == expected.active_player_id
+        for player_id in player_ids:
+            assert actual.players[player_id].board.get_board() == (
+                expected.players[player_id].board.get_board()
+            )
+
+    def test_load_session_at(self) -> None:
+        controller = create_controller()
+        session_id, player_ids = play_preparation(controller)
+        persistence = controller.persistence
+        first = persistence.load_session_at(session_id, 1)
+        assert list(first.players.keys()) == player_ids[:1]
+        assert first.version == 1
+        ready = persistence.load_session_at(session_id, 2 + 2 * 12 + 2)
+        assert all(player.is_ready for player in ready.players.values())
+        assert persistence.load_session_at(session_id, 1000) is None
+        assert persistence.load_session_at("not_existing", 0) is None
+
+    def test_old_snapshots_are_pruned(self) -> None:
+        controller = create_controller()
+        session_id, player_ids = play_preparation(controller)
+        for col in range(10):
+            controller.make_shot(session_id, player_ids[0], (9, col))
+
+        persistence = controller.persistence
+        versions = persistence.event_store.data_source[session_id].snapshot_versions
+        assert versions == [0, 36]
+        middle = persistence.load_session_at(session_id, 2 + 2 * 12 + 2)
+        assert all(player.is_ready for player in middle.players.values())
+        assert persistence.load_session(session_id).version == 38
+
+    def test_writes_are_appends(self) -> None:
+        controller = create_controller(snapshot_interval=10)
+        session_id, player_ids = play_preparation(controller)
+        persistence = controller.persistence
+        before = persistence.write_count
+        for col in range(10):
+            controller.make_shot(session_id, player_ids[0], (9, col))
+        assert persistence.write_count - before == 10 + 1
+
+    def test_update_with_stale_version_is_retried(self) -> None:
+        controller = create_controller()
+        session_id = controller.init_game_session()
+        event_store = controller.persistence.event_store
+        append = event_store.append
+        calls = []
+        other = ev.PlayerJoined("other", "other", tuple(f"s{i}" for i in range(10)))
+
+        def concurrent_append(session_id, new_events, expected_version=None):
+            if not calls:
+                append(session_id, [other])
+            calls.append(expected_version)
+            return append(session_id, new_events, expected_version)
+
+        event_store.append = concurrent_append
+        controller.create_player_in_session(session_id, "player_1")
+        assert calls == [0, 1]
+        assert controller.contention_stats.conflicts == 1
+        assert len(controller.persistence.load_session(session_id).players) == 2
+
+    def test_not_existing_session(self) -> None:
+        persistence = ep.EventSourcedGamePersistence(store.InMemoryEventStore())
+        assert persistence.load_session("not_existing") is None
+        assert persistence.load_events("not_existing") is None
+        assert persistence.update_session("not_existing", lambda state: state) is None
+        assert not persistence.remove_session("not_existing")
+
+    def test_save_session_failure(self) -> None:
+        event_store = store.InMemoryEventStore()
+        event_store.save_snapshot = MagicMock(side_effect=RuntimeError())
+        persistence = ep.EventSourcedGamePersistence(event_store)
+        controller = c.GameControllerApi(
+            persistence=persistence, id_generator=gen.Uuid4IdGenerator()
+        )
+        with pytest.raises(ex.SessionIsNotCreatedException):
+            controller.init_game_session()
+
+    def test_incorrect_snapshot_interval(self) -> None:
+        with pytest.raises(ValueError):
+            ep.EventSourcedGamePersistence(
+                store.InMemoryEventStore(), snapshot_interval=0
+            )
@@ -1,8 +1,11 @@
 from unittest.mock import MagicMock
 
+import pytest
+
 import battleapi.api.dto as dto
 import battleapi.api.persistence as papi
 import battleapi.logic.configs as cfg
+import battleapi.logic.exceptions as ex
 import battleapi.db.in_memory_db_client as memory
 
 
@@ -94,3 +97,67 @@ class TestPersistenceApi:
 
         assert not persistence.remove_session(session_id)
         db_client_with_mocks.remove.assert_called_once_with(session_id)
+
+    def test_write_count(self):
+        persistence = papi.GamePersistenceApi(db_client=memory.InMemoryDbClient())
+        session = dto.SessionStateDto(
+            session_id="id_to_check",
+            game_config=cfg.CustomGameConfiguration(),
+            players={},
+        )
+        assert persistence.write_count == 0
+        persistence.save_session("id_to_check", session)
+        persistence.save_session("id_to_check", session)
+        persistence.load_session("id_to_check")
+        assert persistence.write_count == 2
+
+    def test_update_session(self):
+        persistence = papi.GamePersistenceApi(db_client=memory.InMemoryDbClient())
+        session = dto.SessionStateDto(
+            session_id="id_to_check",
+            game_config=cfg.CustomGameConfiguration(),
+            players={},
+        )
+        persistence.save_session("id_to_check", session)
+
+        def change(state: dto.SessionStateDto) -> dto.SessionStateDto:
+            state.active_player_id = "player"
+            return state
+
+        updated = persistence.update_session("id_to_check", change)
+        assert updated.active_player_id == "player"
+        assert persistence.write_count == 2
+        assert persistence.update_session("not_existing", change) is None
+        assert persistence.write_count == 2
+
+    def test_update_session_passes_errors_of_function(self):
+        persistence = papi.GamePersistenceApi(db_client=memory.InMemoryDbClient())
+        session = dto.SessionStateDto(
+            session_id="id_to_check",
+            game_config=cfg.CustomGameConfiguration(),
+            players={},
+        )
+        persistence.save_session("id_to_check", session)
+
+        def fail(state: dto.SessionStateDto) -> dto.SessionStateDto:
+            raise KeyError("ship")
+
+        with pytest.raises(KeyError):
+            persistence.update_session("id_to_check", fail)
+        assert persistence.write_count == 1
+
+    def test_version_conflict_is_passed_to_caller(self):
+        persistence = papi.GamePersistenceApi(db_client=memory.InMemoryDbClient())
+        session = dto.SessionStateDto(
+            session_id="id_to_check",
+            game_config=cfg.CustomGameConfiguration(),
+            players={},
+        )
+        assert persistence.save_session("id_to_check", session, expected_version=0)
+        with pytest.raises(ex.SessionVersionConflictException):
+            persistence.save_session("id_to_check", session, expected_version=0)
+        persistence.db_client.update = MagicMock(
+            side_effect=ex.SessionVersionConflictException()
+        )
+        with pytest.raises(ex.SessionVersionConflictException):
+            persistence.update_session("id_to_check", lambda state: state)
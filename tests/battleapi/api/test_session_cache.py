@@ -0,0 +1,58 @@
+import pytest
+
+import battleapi.api.session_cache as sc
+import battleapi.logic.configs as cfg
+import battleapi.logic.game as g
+import battleapi.utils.id_generator as gen
+
+
+def create_game() -> g.Game:
+    return g.Game(gen.Uuid4IdGenerator(), cfg.ClassicGameConfiguration())
+
+
+class TestSessionCache:
+    def test_get_counts_hits_and_misses(self) -> None:
+        cache = sc.SessionCache()
+        game = create_game()
+        assert cache.get("session") is None
+        cache.put("session", game)
+        assert cache.get("session") is game
+        assert cache.get("session") is game
+        assert cache.stats.hits == 2
+        assert cache.stats.misses == 1
+
+    def test_lru_eviction(self) -> None:
+        cache = sc.SessionCache(2)
+        cache.put("s1", create_game())
+        cache.put("s2", create_game())
+        cache.get("s1")
+        cache.put("s3", create_game())
+        assert len(cache) == 2
+        assert cache.get("s2") is None
+        assert cache.get("s1") is not None
+        assert cache.get("s3") is not None
+        assert cache.stats.evictions == 1
+
+    def test_put_replaces_cached_session(self) -> None:
+        cache = sc.SessionCache()
+        cache.put("s1", create_game())
+        changed = create_game()
+        cache.put("s1", changed)
+        assert len(cache) == 1
+        assert cache.get("s1") is changed
+
+    def test_invalidate(self) -> None:
+        cache = sc.SessionCache()
+        cache.put("s1", create_game())
+        cache.invalidate("s1")
+        cache.invalidate("s2")
+        assert cache.get("s1") is None
+
+    def test_incorrect_size(self) -> None:
+        with pytest.raises(ValueError):
+            sc.SessionCache(0)
+
+    def test_stats_merge(self) -> None:
+        stats = sc.CacheStats(1, 2, 3)
+        stats.merge(sc.CacheStats(1, 1, 1))
+        assert stats == sc.CacheStats(2, 3, 4)
@@ -0,0 +1,153 @@
+import time
+
+import pytest
+
+import battleapi.db.expiring_db_client as client
+import battleapi.db.in_memory_db_client as in_memory
+import battleapi.logic.configs as cc
+import battleapi.utils.metrics as metrics
+from battleapi.api.dto import SessionStateDto
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def create_session(session_id: str) -> SessionStateDto:
+    return SessionStateDto(
+        session_id=session_id, game_config=cc.ClassicGameConfiguration(), players={}
+    )
+
+
+def create_client(**kwargs) -> tuple[client.ExpiringDbClient, FakeClock]:
+    clock = FakeClock()
+    db_client = client.ExpiringDbClient(
+        in_memory.InMemoryDbClient(), clock=clock, size_fn=lambda _: 10, **kwargs
+    )
+    return db_client, clock
+
+
+class TestExpiringDbClient:
+    def test_pass_through(self) -> None:
+        db_client, _ = create_client()
+        assert db_client.save("s1", create_session("s1"))
+        assert db_client.load("s1").session_id == "s1"
+        updated = db_client.update("s1", lambda state: state)
+        assert updated.session_id == "s1"
+        assert db_client.remove("s1")
+        with pytest.raises(KeyError):
+            db_client.load("s1")
+        assert db_client.get_metrics() == client.ExpiryMetrics()
+
+    def test_expired_on_access(self) -> None:
+        db_client, clock = create_client(ttl=10)
+        db_client.save("s1", create_session("s1"))
+        clock.now = 10
+        assert db_client.load("s1").session_id == "s1"
+        clock.now = 20.5
+        with pytest.raises(KeyError):
+            db_client.load("s1")
+        with pytest.raises(KeyError):
+            db_client.db_client.load("s1")
+        metrics = db_client.get_metrics()
+        assert metrics.expired == 1
+        assert metrics.live == 0
+        assert metrics.bytes == 0
+
+    def test_sweep(self) -> None:
+        db_client, clock = create_client(ttl=10)
+        db_client.save("s1", create_session("s1"))
+        db_client.save("s2", create_session("s2"))
+        clock.now = 5
+        db_client.save("s3", create_session("s3"))
+        db_client.load("s1")
+        clock.now = 12
+        assert db_client.sweep() == 1
+        with pytest.raises(KeyError):
+            db_client.load("s2")
+        clock.now = 16
+        assert db_client.sweep() == 2
+        assert db_client.get_metrics() == client.ExpiryMetrics(expired=3)
+
+    def test_sweep_keeps_session_saved_after_it_is_found(self, monkeypatch) -> None:
+        db_client, clock = create_client(ttl=10)
+        db_client.save("s1", create_session("s1"))
+        clock.now = 12
+        for_key = db_client._session_locks.for_key
+        saved = []
+
+        def save_before_lock(key: str):
+            # session is saved by other thread after the sweep found it expired
+            if not saved:
+                saved.append(key)
+                db_client.save(key, create_session(key))
+            return for_key(key)
+
+        monkeypatch.setattr(db_client._session_locks, "for_key", save_before_lock)
+        assert db_client.sweep() == 0
+        assert saved == ["s1"]
+        assert db_client.load("s1").session_id == "s1"
+        assert db_client.get_metrics().expired == 0
+
+    def test_lru_eviction_by_count(self) -> None:
+        db_client, _ = create_client(max_sessions=2)
+        db_client.save("s1", create_session("s1"))
+        db_client.save("s2", create_session("s2"))
+        db_client.load("s1")
+        db_client.save("s3", create_session("s3"))
+        with pytest.raises(KeyError):
+            db_client.load("s2")
+        assert db_client.load("s1").session_id == "s1"
+        assert db_client.load("s3").session_id == "s3"
+        assert db_client.get_metrics() == client.ExpiryMetrics(
+            live=2, bytes=20, evicted=1
+        )
+
+    def test_lru_eviction_by_bytes(self) -> None:
+        db_client, _ = create_client(max_bytes=25)
+        for session_id in ("s1", "s2", "s3"):
+            db_client.save(session_id, create_session(session_id))
+        with pytest.raises(KeyError):
+            db_client.load("s1")
+        metrics = db_client.get_metrics()
+        assert metrics.live == 2
+        assert metrics.bytes == 20
+        assert metrics.evicted == 1
+
+    def test_encoded_size(self) -> None:
+        session = create_session("s1")
+        db_client = client.ExpiringDbClient(in_memory.InMemoryDbClient())
+        db_client.save("s1", session)
+        assert db_client.get_metrics().bytes == client.encoded_size(session) > 0
+
+    def test_registry_metrics(self) -> None:
+        registry = metrics.Registry()
+        db_client, clock = create_client(
+            ttl=10, max_sessions=2, metrics_registry=registry
+        )
+        for session_id in ("s1", "s2", "s3"):
+            db_client.save(session_id, create_session(session_id))
+        clock.now = 20
+        assert db_client.sweep() == 2
+
+        assert registry.get("battleship_sessions_evicted_total").get() == 1
+        assert registry.get("battleship_sessions_expired_total").get() == 2
+        db_client.save("s4", create_session("s4"))
+        assert registry.get("battleship_expiring_sessions").get() == 1
+        assert registry.get("battleship_expiring_bytes").get() == 10
+
+    def test_sweeper_thread(self) -> None:
+        db_client = client.ExpiringDbClient(in_memory.InMemoryDbClient(), ttl=0.01)
+        db_client.save("s1", create_session("s1"))
+        db_client.start_sweeper(0.01)
+        deadline = time.monotonic() + 5
+        while db_client.get_metrics().expired == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        db_client.stop_sweeper()
+        assert db_client.get_metrics().expired == 1
+        with pytest.raises(KeyError):
+            db_client.db_client.load("s1")
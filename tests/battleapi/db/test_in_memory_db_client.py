@@ -1,5 +1,17 @@
+import dataclasses
+import threading
+import time
+
+import pytest
+
+import battleapi.api.codec as codec
+import battleapi.logic.board as board
 import battleapi.logic.configs as cc
 import battleapi.db.in_memory_db_client as client
+import battleapi.logic.exceptions as ex
+import battleapi.logic.models as models
+import battleapi.logic.player as player
+import battleapi.utils.metrics as metrics
 from battleapi.api.dto import SessionStateDto
 
 
@@ -92,3 +104,154 @@ class TestUuid4IdGenerator:
         assert in_memory_client.remove(session_id_2)
         assert len(in_memory_client.data_source) == 0
         assert not in_memory_client.remove("non-existing")
+
+    def test_client_update(self) -> None:
+        session_id_1 = "session_1"
+        in_memory_client = prepare_session(session_id_1, "session_2")
+
+        def change(session: SessionStateDto) -> SessionStateDto:
+            session.active_player_id = "player_3"
+            return session
+
+        updated = in_memory_client.update(session_id_1, change)
+        assert updated.active_player_id == "player_3"
+        assert in_memory_client.load(session_id_1).active_player_id == "player_3"
+        with pytest.raises(KeyError):
+            in_memory_client.update("not_existing", change)
+
+    def test_failed_update_does_not_change_stored_session(self) -> None:
+        session_id = "session_1"
+        in_memory_client = prepare_session(session_id, "session_2")
+        stored = in_memory_client.load(session_id)
+
+        def fail(session: SessionStateDto) -> SessionStateDto:
+            assert session is not stored
+            session.active_player_id = "player_3"
+            raise ValueError("Failed")
+
+        with pytest.raises(ValueError):
+            in_memory_client.update(session_id, fail)
+        assert in_memory_client.load(session_id) is stored
+        assert stored.active_player_id == "player_1"
+        assert stored.version == 1
+
+    def test_failed_update_does_not_change_stored_players(self) -> None:
+        session_id = "session_1"
+        in_memory_client = prepare_session(session_id, "session_2")
+        ship = models.Ship("ship_1", 1)
+        stored = in_memory_client.load(session_id)
+        stored.players["player_1"] = player.Player(
+            player_id="player_1",
+            player_name="player",
+            board=board.Board(),
+            ships_not_on_board={ship.ship_id: ship},
+            all_ships={ship.ship_id: ship},
+        )
+
+        def fail(session: SessionStateDto) -> SessionStateDto:
+            changed = session.players["player_1"]
+            changed.ships_not_on_board["ship_1"].direction = models.Direction.VERTICAL
+            changed.board.add_ship((0, 0), changed.ships_not_on_board.pop("ship_1"))
+            changed.is_ready = True
+            raise ValueError("Failed")
+
+        with pytest.raises(ValueError):
+            in_memory_client.update(session_id, fail)
+        stored_player = in_memory_client.load(session_id).players["player_1"]
+        assert stored_player.ships_not_on_board == {"ship_1": ship}
+        assert ship.direction == models.Direction.HORIZONTAL
+        assert stored_player.board.get_amount_of_alive_ships() == 0
+        assert not stored_player.is_ready
+
+    def test_client_update_is_atomic(self) -> None:
+        session_id = "session_1"
+        in_memory_client = prepare_session(session_id, "session_2")
+        in_memory_client.load(session_id).active_player_id = "0"
+
+        def increment(session: SessionStateDto) -> SessionStateDto:
+            value = int(session.active_player_id)
+            time.sleep(0)
+            return dataclasses.replace(session, active_player_id=str(value + 1))
+
+        def worker() -> None:
+            for _ in range(200):
+                in_memory_client.update(session_id, increment)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert in_memory_client.load(session_id).active_player_id == "1600"
+
+    def test_client_versions(self) -> None:
+        session_id = "session_1"
+        in_memory_client = prepare_session(session_id, "session_2")
+        session = in_memory_client.load(session_id)
+        assert session.version == 1
+        in_memory_client.update(session_id, lambda state: dataclasses.replace(state))
+        assert in_memory_client.load(session_id).version == 2
+        with pytest.raises(ex.SessionVersionConflictException):
+            in_memory_client.save(session_id, session, expected_version=1)
+        assert in_memory_client.save(session_id, session, expected_version=2)
+        assert in_memory_client.load(session_id).version == 3
+        new_session = dataclasses.replace(session, session_id="session_3")
+        with pytest.raises(ex.SessionVersionConflictException):
+            in_memory_client.save("session_3", new_session, expected_version=1)
+        assert in_memory_client.save("session_3", new_session, expected_version=0)
+        assert in_memory_client.load("session_3").version == 1
+
+    def test_client_size_metrics(self) -> None:
+        registry = metrics.Registry()
+        in_memory_client = client.InMemoryDbClient(metrics_registry=registry)
+        assert registry.get("battleship_store_sessions").get() == 0
+        assert registry.get("battleship_store_bytes").get() == 0
+
+        for session_id, session in prepare_session("1", "2").data_source.items():
+            in_memory_client.save(session_id, session)
+        assert in_memory_client.get_size() == 2
+        assert registry.get("battleship_store_sessions").get() == 2
+        encoded = sum(
+            len(codec.encode(session))
+            for session in in_memory_client.data_source.values()
+        )
+        assert registry.get("battleship_store_bytes").get() == encoded
+
+        in_memory_client.update(
+            "1", lambda state: dataclasses.replace(state, active_player_id="")
+        )
+        assert in_memory_client.get_bytes() == encoded - len("player_1")
+        in_memory_client.remove("2")
+        assert in_memory_client.get_bytes() == len(
+            codec.encode(in_memory_client.load("1"))
+        )
+        in_memory_client.remove("1")
+        assert registry.get("battleship_store_bytes").get() == 0
+
+    def test_client_active_sessions_metric(self) -> None:
+        registry = metrics.Registry()
+        in_memory_client = client.InMemoryDbClient(metrics_registry=registry)
+        for session_id, session in prepare_session("1", "2").data_source.items():
+            in_memory_client.save(session_id, session)
+        assert registry.get("battleship_active_sessions").get() == 2
+
+        ship = models.Ship("ship_1", 1)
+        lost = player.Player(
+            player_id="player_1",
+            player_name="player",
+            board=board.Board(),
+            ships_not_on_board={},
+            all_ships={ship.ship_id: ship},
+            is_ready=True,
+        )
+        lost.board.add_ship((0, 0), ship)
+        lost.board.make_shot((0, 0))
+        in_memory_client.update(
+            "1", lambda state: dataclasses.replace(state, players={"player_1": lost})
+        )
+        assert registry.get("battleship_active_sessions").get() == 1
+        in_memory_client.remove("2")
+        assert registry.get("battleship_active_sessions").get() == 0
+        in_memory_client.remove("1")
+        assert registry.get("battleship_store_sessions").get() == 0
+        assert registry.get("battleship_active_sessions").get() == 0
@@ -0,0 +1,75 @@
+import pytest
+
+import battleapi.db.in_memory_event_store as store
+import battleapi.logic.configs as cc
+import battleapi.logic.events as ev
+import battleapi.logic.exceptions as ex
+from battleapi.api.dto import SessionStateDto
+
+
+def create_snapshot(version: int, active_player_id: str = "") -> SessionStateDto:
+    return SessionStateDto(
+        session_id="session_1",
+        game_config=cc.ClassicGameConfiguration(),
+        players={},
+        active_player_id=active_player_id,
+        version=version,
+    )
+
+
+class TestInMemoryEventStore:
+    def test_append_and_load_events(self) -> None:
+        event_store = store.InMemoryEventStore()
+        events = [ev.PlayerReady("player_1"), ev.ShotFired("player_2", (1, 2))]
+        assert event_store.append("session_1", events[:1], expected_version=0) == 1
+        assert event_store.append("session_1", events[1:]) == 2
+        assert event_store.load_events("session_1") == events
+        assert event_store.load_events("session_1", 1) == events[1:]
+        assert event_store.load_events("session_1", 0, 1) == events[:1]
+        with pytest.raises(KeyError):
+            event_store.load_events("session_2")
+
+    def test_append_with_stale_version(self) -> None:
+        event_store = store.InMemoryEventStore()
+        event_store.append("session_1", [ev.PlayerReady("player_1")])
+        with pytest.raises(ex.SessionVersionConflictException):
+            event_store.append("session_1", [ev.PlayerReady("player_2")], 0)
+        assert event_store.load_events("session_1") == [ev.PlayerReady("player_1")]
+
+    def test_snapshots(self) -> None:
+        event_store = store.InMemoryEventStore()
+        with pytest.raises(KeyError):
+            event_store.save_snapshot("session_1", create_snapshot(0))
+        event_store.append("session_1", [])
+        with pytest.raises(KeyError):
+            event_store.load_snapshot("session_1")
+        event_store.save_snapshot("session_1", create_snapshot(0, "p0"))
+        event_store.save_snapshot("session_1", create_snapshot(10, "p10"))
+        event_store.save_snapshot("session_1", create_snapshot(5, "p5"))
+        assert event_store.load_snapshot("session_1").active_player_id == "p10"
+        loaded = event_store.load_snapshot("session_1", max_version=7)
+        assert loaded.active_player_id == "p5"
+        assert loaded.version == 5
+        assert event_store.load_snapshot("session_1", 4).version == 0
+        loaded.active_player_id = "changed"
+        assert event_store.load_snapshot("session_1", 5).active_player_id == "p5"
+
+    def test_prune_snapshots(self) -> None:
+        event_store = store.InMemoryEventStore()
+        event_store.append("session_1", [])
+        for version in (0, 4, 8, 12):
+            event_store.save_snapshot("session_1", create_snapshot(version))
+        assert event_store.prune_snapshots("session_1", 12) == 2
+        assert event_store.prune_snapshots("session_1", 12) == 0
+        assert event_store.data_source["session_1"].snapshot_versions == [0, 12]
+        assert event_store.load_snapshot("session_1", 11).version == 0
+        with pytest.raises(KeyError):
+            event_store.prune_snapshots("session_2", 1)
+
+    def test_remove(self) -> None:
+        event_store = store.InMemoryEventStore()
+        event_store.append("session_1", [])
+        assert event_store.remove("session_1")
+        assert not event_store.remove("session_1")
+        with pytest.raises(KeyError):
+            event_store.load_snapshot("session_1")
@@ -0,0 +1,183 @@
+import threading
+import time
+
+import sqlite3
+
+import pytest
+
+import battleapi.db.sqlite_db_client as client
+import battleapi.logic.board as b
+import battleapi.logic.configs as cc
+import battleapi.logic.exceptions as ex
+import battleapi.logic.models as m
+import battleapi.logic.player as pl
+from battleapi.api.dto import SessionStateDto
+
+
+def create_session(session_id: str) -> SessionStateDto:
+    board = b.Board()
+    ship = m.Ship("ship_1", 2, m.Direction.VERTICAL)
+    board.add_ship((3, 3), ship)
+    board.make_shot((4, 3))
+    player = pl.Player("player_1", "name", board, {}, {"ship_1": ship}, True)
+    return SessionStateDto(
+        session_id=session_id,
+        game_config=cc.ClassicGameConfiguration(),
+        players={"player_1": player},
+        active_player_id="player_1",
+    )
+
+
+class TestSqliteDbClient:
+    def test_save_and_load(self, tmp_path) -> None:
+        db_client = client.SqliteDbClient(str(tmp_path / "db.sqlite"))
+        assert db_client.save("session_1", create_session("session_1"))
+        loaded = db_client.load("session_1")
+        assert loaded.session_id == "session_1"
+        assert loaded.active_player_id == "player_1"
+        assert loaded.players["player_1"].board.get_board() == (
+            create_session("session_1").players["player_1"].board.get_board()
+        )
+        with pytest.raises(KeyError):
+            db_client.load("session_2")
+        db_client.close()
+
+    def test_data_is_kept_after_reopen(self, tmp_path) -> None:
+        path = str(tmp_path / "db.sqlite")
+        db_client = client.SqliteDbClient(path, batch_size=10)
+        db_client.save("session_1", create_session("session_1"))
+        db_client.close()
+        reopened = client.SqliteDbClient(path)
+        assert reopened.load("session_1").session_id == "session_1"
+        assert reopened.count() == 1
+        reopened.close()
+
+    def test_remove(self, tmp_path) -> None:
+        db_client = client.SqliteDbClient(str(tmp_path / "db.sqlite"))
+        db_client.save("session_1", create_session("session_1"))
+        assert db_client.remove("session_1")
+        assert not db_client.remove("session_1")
+        with pytest.raises(KeyError):
+            db_client.load("session_1")
+        db_client.close()
+
+    def test_batched_changes_are_visible_before_commit(self, tmp_path) -> None:
+        db_client = client.SqliteDbClient(str(tmp_path / "db.sqlite"), batch_size=3)
+        db_client.save("session_1", create_session("session_1"))
+        db_client.save("session_2", create_session("session_2"))
+        assert db_client.load("session_2").session_id == "session_2"
+        assert db_client.remove("session_2")
+        with pytest.raises(KeyError):
+            db_client.load("session_2")
+        assert db_client.count() == 1
+        db_client.close()
+
+    def test_flusher_writes_not_full_batch(self, tmp_path) -> None:
+        path = str(tmp_path / "db.sqlite")
+        db_client = client.SqliteDbClient(path, batch_size=10)
+        reader = client.SqliteDbClient(path)
+        db_client.start_flusher(0.01)
+        db_client.save("session_1", create_session("session_1"))
+        deadline = time.monotonic() + 5
+        while reader.count() == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert reader.count() == 1
+
+        db_client.save("session_2", create_session("session_2"))
+        db_client.close()
+        assert db_client._flusher is None
+        assert reader.count() == 2
+        reader.close()
+
+    def test_connection_per_thread(self, tmp_path) -> None:
+        db_client = client.SqliteDbClient(str(tmp_path / "db.sqlite"))
+        errors = []
+
+        def worker(index: int) -> None:
+            try:
+                session_id = f"session_{index}"
+                db_client.save(session_id, create_session(session_id))
+                assert db_client.load(session_id).session_id == session_id
+            except Exception as err:  # pragma: no cover
+                errors.append(err)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        assert db_client.count() == 8
+        db_client.close()
+
+    def test_incorrect_batch_size(self, tmp_path) -> None:
+        with pytest.raises(ValueError):
+            client.SqliteDbClient(str(tmp_path / "db.sqlite"), batch_size=0)
+
+    def test_update(self, tmp_path) -> None:
+        db_client = client.SqliteDbClient(str(tmp_path / "db.sqlite"))
+        db_client.save("session_1", create_session("session_1"))
+
+        def change(session: SessionStateDto) -> SessionStateDto:
+            session.players["player_1"].board.make_shot((0, 0))
+            return session
+
+        db_client.update("session_1", change)
+        board = db_client.load("session_1").players["player_1"].board
+        assert board.get_board()[0][0].has_shot
+        with pytest.raises(KeyError):
+            db_client.update("session_2", change)
+        db_client.close()
+
+    def test_versions(self, tmp_path) -> None:
+        db_client = client.SqliteDbClient(str(tmp_path / "db.sqlite"))
+        session = create_session("session_1")
+        db_client.save("session_1", session)
+        assert session.version == 1
+        assert db_client.load("session_1").version == 1
+        assert db_client.update("session_1", lambda state: state).version == 2
+        with pytest.raises(ex.SessionVersionConflictException):
+            db_client.save("session_1", session, expected_version=1)
+        assert db_client.save("session_1", session, expected_version=2)
+        assert db_client.load("session_1").version == 3
+        with pytest.raises(ex.SessionVersionConflictException):
+            db_client.save("session_2", create_session("session_2"), 1)
+        assert db_client.save("session_2", create_session("session_2"), 0)
+        with pytest.raises(ex.SessionVersionConflictException):
+            db_client.save("session_2", create_session("session_2"), 0)
+        db_client.close()
+
+    def test_stale_write_of_other_client_is_rejected(self, tmp_path) -> None:
+        path = str(tmp_path / "db.sqlite")
+        first = client.SqliteDbClient(path)
+        second = client.SqliteDbClient(path)
+        first.save("session_1", create_session("session_1"))
+        stale = first.load("session_1")
+        second.update("session_1", lambda state: state)
+        with pytest.raises(ex.SessionVersionConflictException):
+            first.save("session_1", stale, expected_version=stale.version)
+        assert first.load("session_1").version == 2
+        first.close()
+        second.close()
+
+    def test_versions_of_pending_changes(self, tmp_path) -> None:
+        db_client = client.SqliteDbClient(str(tmp_path / "db.sqlite"), batch_size=10)
+        db_client.save("session_1", create_session("session_1"))
+        with pytest.raises(ex.SessionVersionConflictException):
+            db_client.save("session_1", create_session("session_1"), 0)
+        assert db_client.update("session_1", lambda state: state).version == 2
+        db_client.flush()
+        assert db_client.load("session_1").version == 2
+        db_client.close()
+
+    def test_version_column_is_added_to_old_table(self, tmp_path) -> None:
+        path = str(tmp_path / "db.sqlite")
+        connection = sqlite3.connect(path)
+        connection.execute(
+            "CREATE TABLE sessions (session_id TEXT PRIMARY KEY, data BLOB NOT NULL)"
+        )
+        connection.close()
+        db_client = client.SqliteDbClient(path)
+        db_client.save("session_1", create_session("session_1"))
+        assert db_client.load("session_1").version == 1
+        db_client.close()
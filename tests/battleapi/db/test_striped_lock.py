@@ -0,0 +1,20 @@
+import pytest
+
+import battleapi.db.striped_lock as sl
+
+
+class TestStripedLock:
+    def test_same_key_same_lock(self) -> None:
+        locks = sl.StripedLock(8)
+        assert len(locks) == 8
+        assert locks.for_key("session_1") is locks.for_key("session_1")
+
+    def test_lock_is_reentrant(self) -> None:
+        locks = sl.StripedLock(1)
+        with locks.for_key("session_1"):
+            with locks.for_key("session_2"):
+                pass
+
+    def test_incorrect_stripes(self) -> None:
+        with pytest.raises(ValueError):
+            sl.StripedLock(0)
@@ -0,0 +1,164 @@
+import pytest
+
+import battleapi.logic.bitboard as bb
+import battleapi.logic.board as b
+import battleapi.logic.exceptions as ex
+import battleapi.logic.models as m
+
+
+def add_ships(board) -> None:
+    board.add_ship((0, 0), m.Ship("ship_0_0", 4, m.Direction.VERTICAL))
+    board.add_ship((5, 5), m.Ship("ship_5_5", 3, m.Direction.HORIZONTAL))
+    board.add_ship((9, 9), m.Ship("ship_9_9", 1, m.Direction.HORIZONTAL))
+
+
+class TestBitBoard:
+    def test_creation_without_params(self) -> None:
+        board = bb.BitBoard()
+        assert board.get_amount_of_not_shot_cells() == 100
+        assert board.get_amount_of_alive_ships() == 0
+        assert board.get_board() == b.Board().get_board()
+
+    def test_creation_with_params(self) -> None:
+        reference = b.Board()
+        add_ships(reference)
+        reference.make_shot((1, 0))
+        board = bb.BitBoard(reference.get_board())
+
+        assert board.get_board() == reference.get_board()
+        assert board.get_amount_of_alive_ships() == 7
+        assert board.get_amount_of_not_shot_cells() == 99
+        assert board.remove_ship((2, 0)) == "ship_0_0"
+
+    def test_add_ship(self) -> None:
+        board = bb.BitBoard()
+        add_ships(board)
+        cells = board.get_board()
+        for row in range(4):
+            assert cells[row][0].has_ship
+            assert cells[row][0].ship_id == "ship_0_0"
+        for col in range(5, 8):
+            assert cells[5][col].ship_id == "ship_5_5"
+        assert cells[9][9].ship_id == "ship_9_9"
+        assert not cells[4][0].has_ship
+        assert board.get_amount_of_alive_ships() == 8
+
+    def test_add_ship_out_of_bounds(self) -> None:
+        board = bb.BitBoard()
+        with pytest.raises(ex.CoordinateException):
+            board.add_ship((0, 9), m.Ship("id", 3, m.Direction.HORIZONTAL))
+        with pytest.raises(ex.CoordinateException):
+            board.add_ship((8, 0), m.Ship("id", 3, m.Direction.VERTICAL))
+        assert board.get_amount_of_alive_ships() == 0
+
+    def test_add_ship_neighbour(self) -> None:
+        board = bb.BitBoard()
+        add_ships(board)
+        with pytest.raises(ex.CellIsNotEmptyException):
+            board.add_ship((4, 1), m.Ship("id", 2, m.Direction.HORIZONTAL))
+        with pytest.raises(ex.CellIsNotEmptyException):
+            board.add_ship((2, 0), m.Ship("id", 1, m.Direction.HORIZONTAL))
+        with pytest.raises(ex.CellIsNotEmptyException):
+            board.add_ship((6, 8), m.Ship("id", 1, m.Direction.HORIZONTAL))
+        board.add_ship((5, 0), m.Ship("id", 1, m.Direction.HORIZONTAL))
+
+    def test_remove_ship(self) -> None:
+        board = bb.BitBoard()
+        add_ships(board)
+        assert board.remove_ship((4, 4)) is None
+        assert board.remove_ship((5, 6)) == "ship_5_5"
+        assert board.get_amount_of_alive_ships() == 5
+        assert not board.get_board()[5][6].has_ship
+        board.add_ship((6, 6), m.Ship("id", 2, m.Direction.HORIZONTAL))
+
+    def test_make_shot(self) -> None:
+        board = bb.BitBoard()
+        add_ships(board)
+        assert not board.make_shot((3, 3))
+        assert board.make_shot((5, 5))
+        assert board.make_shot((5, 6))
+        assert board.get_amount_of_not_shot_cells() == 97
+        assert board.make_shot((5, 7))
+        cells = board.get_board()
+        for col in range(4, 9):
+            assert cells[4][col].has_shot
+            assert cells[6][col].has_shot
+        assert cells[5][4].has_shot
+        assert cells[5][8].has_shot
+        assert board.get_amount_of_alive_ships() == 5
+
+    def test_get_amount_of_alive_ships_by_size(self) -> None:
+        board = bb.BitBoard()
+        add_ships(board)
+        assert board.get_amount_of_alive_ships_by_size() == {4: 1, 3: 1, 1: 1}
+        board.make_shot((9, 9))
+        assert board.get_amount_of_alive_ships_by_size() == {4: 1, 3: 1}
+
+    def test_get_board_hidden(self) -> None:
+        board = bb.BitBoard()
+        add_ships(board)
+        board.make_shot((1, 0))
+        cells = board.get_board(is_hidden=True)
+        assert not cells[0][0].has_ship
+        assert cells[1][0].has_ship
+        assert cells[1][0].has_shot
+        assert cells[1][0].ship_id is None
+
+    def test_same_results_as_board(self) -> None:
+        reference = b.Board()
+        board = bb.BitBoard()
+        add_ships(reference)
+        add_ships(board)
+        for row in range(10):
+            for col in range(10):
+                coordinate = (row, (col * 3 + row) % 10)
+                assert board.make_shot(coordinate) == reference.make_shot(coordinate)
+                assert board.get_board(True) == reference.get_board(True)
+                assert (
+                    board.get_amount_of_alive_ships()
+                    == reference.get_amount_of_alive_ships()
+                )
+                assert (
+                    board.get_amount_of_not_shot_cells()
+                    == reference.get_amount_of_not_shot_cells()
+                )
+        assert board.get_board() == reference.get_board()
+
+    def test_get_view(self) -> None:
+        reference = b.Board()
+        board = bb.BitBoard()
+        add_ships(reference)
+        add_ships(board)
+        reference.make_shot((1, 0))
+        board.make_shot((1, 0))
+        for is_hidden in (False, True):
+            view = board.get_view(is_hidden)
+            expected = reference.get_view(is_hidden)
+            for row in range(10):
+                for col in range(10):
+                    assert view.has_ship(row, col) == expected.has_ship(row, col)
+                    assert view.has_shot(row, col) == expected.has_shot(row, col)
+                    assert view.ship_id(row, col) == expected.ship_id(row, col)
+
+    def test_get_view_keeps_state_of_creation(self) -> None:
+        board = bb.BitBoard()
+        add_ships(board)
+        view = board.get_view()
+        board.make_shot((0, 0))
+        board.remove_ship((9, 9))
+        assert not view.has_shot(0, 0)
+        assert view.has_ship(9, 9)
+        assert view.ship_id(9, 9) == "ship_9_9"
+
+    def test_copy_is_independent(self) -> None:
+        board = bb.BitBoard()
+        add_ships(board)
+        board.make_shot((0, 0))
+        copied = board.copy()
+        assert copied.get_board() == board.get_board()
+
+        copied.make_shot((9, 9))
+        copied.remove_ship((5, 5))
+        assert board.get_amount_of_alive_ships_by_size() == {4: 1, 3: 1, 1: 1}
+        assert board.get_view().ship_id(5, 5) == "ship_5_5"
+        assert not board.get_board()[9][9].has_shot
@@ -41,7 +41,9 @@ class TestGameBoard:
         assert len(board._board[0]) == 10
         assert len(board._board[9]) == 10
         assert board._ships_on_board is not None
-        assert len(board._ships_on_board) == 0
+        assert len(board._ships_on_board) == 100
+        assert board.get_amount_of_alive_ships() == 100
+        assert board.get_amount_of_not_shot_cells() == 100
         for row in board._board:
             for cell in row:
                 assert cell.has_ship
@@ -391,3 +393,108 @@ class TestGameBoard:
 
         assert not returned_board[0][2].has_ship
         assert not returned_board[0][2].has_shot
+
+    def test_get_view_matches_get_board(self):
+        board = b.Board()
+        board.add_ship((0, 0), m.Ship("ship_0_0", 3, m.Direction.VERTICAL))
+        board.make_shot((1, 0))
+        board.make_shot((5, 5))
+        for is_hidden in (False, True):
+            view = board.get_view(is_hidden)
+            cells = board.get_board(is_hidden)
+            for row in range(10):
+                for col in range(10):
+                    assert view.has_ship(row, col) == cells[row][col].has_ship
+                    assert view.has_shot(row, col) == cells[row][col].has_shot
+                    assert view.ship_id(row, col) == cells[row][col].ship_id
+
+    def test_counters_after_add_remove_and_shots(self):
+        board = b.Board()
+        board.add_ship((0, 0), m.Ship("ship_0_0", 3, m.Direction.HORIZONTAL))
+        board.add_ship((5, 5), m.Ship("ship_5_5", 1, m.Direction.HORIZONTAL))
+        board.add_ship((8, 0), m.Ship("ship_8_0", 1, m.Direction.HORIZONTAL))
+        assert board.get_amount_of_alive_ships() == 5
+        assert board.get_amount_of_alive_ships_by_size() == {3: 1, 1: 2}
+
+        board.remove_ship((8, 0))
+        assert board.get_amount_of_alive_ships() == 4
+        assert board.get_amount_of_alive_ships_by_size() == {3: 1, 1: 1}
+
+        board.make_shot((0, 0))
+        board.make_shot((0, 0))
+        assert board.get_amount_of_not_shot_cells() == 99
+        assert board.get_amount_of_alive_ships() == 3
+
+        board.make_shot((5, 5))
+        assert board.get_amount_of_not_shot_cells() == 90
+        assert board.get_amount_of_alive_ships() == 2
+        assert board.get_amount_of_alive_ships_by_size() == {3: 1}
+
+    def test_counters_restored_from_loaded_board(self):
+        board = b.Board()
+        board.add_ship((0, 0), m.Ship("ship_0_0", 3, m.Direction.HORIZONTAL))
+        board.add_ship((5, 5), m.Ship("ship_5_5", 2, m.Direction.VERTICAL))
+        board.make_shot((0, 1))
+        board.make_shot((5, 5))
+        board.make_shot((6, 5))
+        board.make_shot((9, 9))
+
+        loaded = b.Board(board.get_board())
+        assert loaded._ships_on_board == board._ships_on_board
+        assert loaded.get_amount_of_not_shot_cells() == 86
+        assert loaded.get_amount_of_alive_ships() == 2
+        assert loaded.get_amount_of_alive_ships_by_size() == {3: 1}
+
+        loaded.make_shot((0, 0))
+        loaded.make_shot((0, 2))
+        assert loaded.get_amount_of_alive_ships() == 0
+        assert loaded.get_amount_of_alive_ships_by_size() == {}
+        assert loaded._board[1][3].has_shot
+
+    def test_ship_state_created_on_add_ship(self):
+        board = b.Board()
+        board.add_ship((0, 0), m.Ship("ship_0_0", 2, m.Direction.HORIZONTAL))
+        state = board._ship_states["ship_0_0"]
+        assert state.ship_size == 2
+        assert state.hits == 0
+        assert state.halo == {(1, 0), (1, 1), (1, 2), (0, 2)}
+        assert not state.is_destroyed
+
+        board.remove_ship((0, 1))
+        assert "ship_0_0" not in board._ship_states
+
+    def test_ship_state_hits_without_neighbour_recalculation(self, monkeypatch):
+        board = b.Board()
+        board.add_ship((4, 4), m.Ship("ship_4_4", 3, m.Direction.VERTICAL))
+
+        def fail(*args, **kwargs):
+            raise AssertionError("Neighbours should not be recalculated")
+
+        monkeypatch.setattr(b.utils, "get_neighbour_coordinates", fail)
+        board.make_shot((4, 4))
+        board.make_shot((4, 4))
+        assert board._ship_states["ship_4_4"].hits == 1
+        board.make_shot((5, 4))
+        board.make_shot((6, 4))
+        state = board._ship_states["ship_4_4"]
+        assert state.hits == 3
+        assert state.is_destroyed
+        for row, col in state.halo:
+            assert board._board[row][col].has_shot
+        assert board.get_amount_of_not_shot_cells() == 85
+
+    def test_copy_is_independent(self):
+        board = b.Board()
+        board.add_ship((0, 0), m.Ship("ship_0_0", 2, m.Direction.HORIZONTAL))
+        board.make_shot((0, 0))
+        copied = board.copy()
+        assert copied.get_board() == board.get_board()
+
+        copied.make_shot((0, 1))
+        copied.add_ship((5, 5), m.Ship("ship_5_5", 1, m.Direction.HORIZONTAL))
+        assert board._ship_states["ship_0_0"].hits == 1
+        assert board.get_amount_of_alive_ships() == 1
+        assert board.get_amount_of_alive_ships_by_size() == {2: 1}
+        assert not board.get_board()[0][1].has_shot
+        assert not board.get_board()[5][5].has_ship
+        assert copied.get_amount_of_alive_ships_by_size() == {1: 1}
@@ -0,0 +1,77 @@
+import random
+
+import battleapi.logic.bitboard as bb
+import battleapi.logic.configs as cfg
+import battleapi.logic.heatmap as hm
+import battleapi.logic.models as m
+import battleapi.logic.placement as pm
+
+
+def create_board(seed: int) -> bb.BitBoard:
+    board = bb.BitBoard()
+    sizes = pm.get_fleet_sizes(cfg.ClassicGameConfiguration())
+    for number, placement in enumerate(pm.sample_fleet(sizes, random.Random(seed))):
+        ship = m.Ship(f"ship_{number}", placement.ship_size)
+        ship.direction = placement.direction
+        board.add_ship(placement.coordinate, ship)
+    return board
+
+
+class TestHeatmap:
+    def test_iterate_cells(self) -> None:
+        assert hm.iterate_cells(0) == []
+        assert hm.iterate_cells(0b1010) == [1, 3]
+
+    def test_board_to_masks(self) -> None:
+        board = bb.BitBoard()
+        board.add_ship((0, 1), m.Ship("ship", 2, m.Direction.HORIZONTAL))
+        board.make_shot((0, 1))
+        board.make_shot((5, 5))
+        shots, ships = hm.board_to_masks(board.get_board(is_hidden=True))
+        assert shots == 1 << 1 | 1 << 55
+        assert ships == 1 << 1
+
+    def test_empty_board_heatmap(self) -> None:
+        heatmap = hm.HeatmapBot().get_heatmap()
+        assert heatmap[0] == min(heatmap)
+        assert heatmap[44] == max(heatmap)
+
+    def test_bot_finishes_damaged_ship(self) -> None:
+        board = bb.BitBoard()
+        board.add_ship((4, 3), m.Ship("ship", 4, m.Direction.HORIZONTAL))
+        board.make_shot((4, 4))
+        board.make_shot((4, 5))
+        bot = hm.HeatmapBot(rng=random.Random(0))
+        bot.observe_board(board.get_board(is_hidden=True))
+        assert bot.choose_shot() in [(4, 3), (4, 6)]
+
+    def test_bot_excludes_destroyed_ship(self) -> None:
+        board = bb.BitBoard()
+        board.add_ship((0, 0), m.Ship("ship", 1, m.Direction.HORIZONTAL))
+        board.make_shot((0, 0))
+        bot = hm.HeatmapBot()
+        bot.observe_board(board.get_board(is_hidden=True))
+        heatmap = bot.get_heatmap()
+        assert heatmap[0] == heatmap[1] == heatmap[10] == heatmap[11] == 0
+
+    def test_bot_plays_full_game(self) -> None:
+        for seed in range(5):
+            board = create_board(seed)
+            bot = hm.HeatmapBot(rng=random.Random(seed))
+            shots = 0
+            while board.get_amount_of_alive_ships() > 0:
+                bot.observe_board(board.get_board(is_hidden=True))
+                coordinate = bot.choose_shot()
+                assert not board.get_view().has_shot(*coordinate)
+                board.make_shot(coordinate)
+                shots += 1
+            assert shots < 100
+
+    def test_observe_resets_on_other_board(self) -> None:
+        board = create_board(1)
+        bot = hm.HeatmapBot(rng=random.Random(1))
+        for _ in range(10):
+            bot.observe_board(board.get_board(is_hidden=True))
+            board.make_shot(bot.choose_shot())
+        bot.observe_board(bb.BitBoard().get_board(is_hidden=True))
+        assert bot.get_heatmap() == hm.HeatmapBot().get_heatmap()
@@ -0,0 +1,89 @@
+import concurrent.futures
+import random
+
+import pytest
+
+import battleapi.logic.bitboard as bb
+import battleapi.logic.heatmap as hm
+import battleapi.logic.models as m
+import battleapi.logic.montecarlo as mc
+
+FLEET = (4, 3, 3, 2, 2, 2, 1, 1, 1, 1)
+
+
+def create_damaged_board() -> bb.BitBoard:
+    board = bb.BitBoard()
+    board.add_ship((0, 0), m.Ship("ship_0_0", 1, m.Direction.HORIZONTAL))
+    board.add_ship((4, 3), m.Ship("ship_4_3", 4, m.Direction.HORIZONTAL))
+    board.make_shot((0, 0))
+    board.make_shot((4, 4))
+    board.make_shot((4, 5))
+    board.make_shot((9, 9))
+    return board
+
+
+class TestMonteCarlo:
+    def test_create_sampler_state(self) -> None:
+        board = create_damaged_board()
+        shots, hits = hm.board_to_masks(board.get_board(is_hidden=True))
+        state = mc.create_sampler_state(FLEET, shots, hits)
+
+        assert state.ship_sizes == (4, 3, 3, 2, 2, 2, 1, 1, 1)
+        assert state.unresolved == 1 << 44 | 1 << 45
+        assert state.forbidden == shots & ~state.unresolved
+
+    def test_sampled_fleets_are_consistent(self) -> None:
+        board = create_damaged_board()
+        shots, hits = hm.board_to_masks(board.get_board(is_hidden=True))
+        state = mc.create_sampler_state(FLEET, shots, hits)
+        fleets = mc.sample_fleet_masks(state, 200, 10.0, 1)
+
+        assert len(fleets) == 200
+        for ships in fleets:
+            assert ships & shots == hits
+            assert bin(ships).count("1") == sum(FLEET)
+
+    def test_sampling_stops_by_time_budget(self) -> None:
+        state = mc.create_sampler_state(FLEET, 0, 0)
+        assert len(mc.sample_fleet_masks(state, 10**6, 0.0, 1)) < 10**6
+
+    def test_bot_finishes_damaged_ship(self) -> None:
+        bot = mc.MonteCarloBot(rng=random.Random(0), samples=300, time_budget=10.0)
+        bot.observe_board(create_damaged_board().get_board(is_hidden=True))
+        assert bot.choose_shot() in [(4, 3), (4, 6)]
+
+    def test_cached_fleets_are_reused(self) -> None:
+        board = create_damaged_board()
+        bot = mc.MonteCarloBot(rng=random.Random(0), samples=300, time_budget=10.0)
+        bot.observe_board(board.get_board(is_hidden=True))
+        bot.choose_shot()
+        assert (bot.reused, bot.sampled) == (0, 300)
+
+        board.make_shot((9, 0))
+        bot.observe_board(board.get_board(is_hidden=True))
+        bot.choose_shot()
+        assert bot.reused > 0
+        assert bot.reused + bot.sampled == 300
+
+        bot.observe_board(bb.BitBoard().get_board(is_hidden=True))
+        bot.choose_shot()
+        assert bot.reused == 0
+
+    def test_sampling_by_executor(self) -> None:
+        with concurrent.futures.ProcessPoolExecutor(2) as executor:
+            bot = mc.MonteCarloBot(
+                rng=random.Random(0),
+                samples=100,
+                time_budget=10.0,
+                executor=executor,
+                tasks=2,
+            )
+            bot.observe_board(create_damaged_board().get_board(is_hidden=True))
+            assert bot.choose_shot() in [(4, 3), (4, 6)]
+            assert bot.sampled == 100
+
+    def test_invalid_parameters(self) -> None:
+        with pytest.raises(ValueError):
+            mc.MonteCarloBot(samples=0)
+        with pytest.raises(ValueError):
+            mc.MonteCarloBot(tasks=0)
@@ -0,0 +1,84 @@
+import pytest
+
+import battleapi.logic.board as b
+import battleapi.logic.exceptions as ex
+import battleapi.logic.models as m
+
+np = pytest.importorskip("numpy")
+mb = pytest.importorskip("battleapi.logic.multiboard")
+
+
+def create_boards() -> list[b.Board]:
+    first = b.Board()
+    first.add_ship((0, 0), m.Ship("ship_0_0", 4, m.Direction.VERTICAL))
+    first.add_ship((5, 5), m.Ship("ship_5_5", 3, m.Direction.HORIZONTAL))
+    second = b.Board()
+    second.add_ship((9, 9), m.Ship("ship_9_9", 1, m.Direction.HORIZONTAL))
+    second.add_ship((0, 8), m.Ship("ship_0_8", 2, m.Direction.HORIZONTAL))
+    second.make_shot((3, 3))
+    return [first, second]
+
+
+class TestMultiBoard:
+    def test_conversion(self) -> None:
+        boards = create_boards()
+        multi_board = mb.MultiBoard.from_boards(boards)
+
+        assert len(multi_board) == 2
+        assert multi_board.cells.shape == (2, 10, 10)
+        assert multi_board.cells.dtype == np.uint8
+        assert multi_board.ship_ids == [
+            ["ship_0_0", "ship_5_5"],
+            ["ship_0_8", "ship_9_9"],
+        ]
+        assert [board.get_board() for board in multi_board.to_boards()] == [
+            board.get_board() for board in boards
+        ]
+        assert multi_board.get_amount_of_alive_ships().tolist() == [7, 3]
+        assert multi_board.get_amount_of_not_shot_cells().tolist() == [100, 99]
+
+    def test_conversion_of_ship_without_id(self) -> None:
+        board = b.Board()
+        board.add_ship((0, 0), m.Ship(None, 1))  # type: ignore
+        with pytest.raises(ex.ShipWithoutIdException):
+            mb.MultiBoard.from_boards([board])
+
+    def test_make_shot(self) -> None:
+        multi_board = mb.MultiBoard.from_boards(create_boards())
+        hits, sunk = multi_board.make_shot(np.array([0, 9]), np.array([0, 9]))
+
+        assert hits.tolist() == [True, True]
+        assert sunk.tolist() == [False, True]
+        assert multi_board.get_shot_mask()[1, 8:, 8:].all()
+        assert multi_board.get_shot_mask()[0].sum() == 1
+        assert multi_board.get_hidden_ship_mask().sum() == 2
+
+        hits, sunk = multi_board.make_shot(np.array([9]), np.array([9]), np.array([1]))
+        assert hits.tolist() == [True]
+        assert sunk.tolist() == [False]
+
+    def test_make_shot_is_same_as_board(self) -> None:
+        boards = create_boards()
+        multi_board = mb.MultiBoard.from_boards(boards)
+        rng = np.random.default_rng(1)
+        for _ in range(200):
+            rows = rng.integers(0, 10, size=2)
+            cols = rng.integers(0, 10, size=2)
+            hits, _ = multi_board.make_shot(rows, cols)
+            for index, board in enumerate(boards):
+                coordinate = (int(rows[index]), int(cols[index]))
+                assert board.make_shot(coordinate) == hits[index]
+            assert [board.get_board() for board in multi_board.to_boards()] == [
+                board.get_board() for board in boards
+            ]
+        assert multi_board.is_finished().tolist() == [
+            board.get_amount_of_alive_ships() == 0 for board in boards
+        ]
+
+    def test_copy(self) -> None:
+        multi_board = mb.MultiBoard.from_boards(create_boards())
+        copy = multi_board.copy()
+        copy.make_shot(np.array([9]), np.array([9]), np.array([1]))
+
+        assert copy.get_amount_of_alive_ships().tolist() == [7, 2]
+        assert multi_board.get_amount_of_alive_ships().tolist() == [7, 3]
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+import battleapi.logic.board as b
+import battleapi.logic.configs as cfg
+import battleapi.logic.models as m
+import battleapi.logic.placement as pm
+
+
+class TestPlacement:
+    def test_get_placements(self) -> None:
+        assert len(pm.get_placements(1)) == 100
+        assert len(pm.get_placements(2)) == 180
+        assert len(pm.get_placements(4)) == 140
+        for placement in pm.get_placements(3):
+            assert bin(placement.mask).count("1") == 3
+            assert placement.blocked & placement.mask == placement.mask
+        assert pm.get_placements(4) is pm.get_placements(4)
+
+    def test_get_fleet_sizes(self) -> None:
+        sizes = pm.get_fleet_sizes(cfg.ClassicGameConfiguration())
+        assert sizes == (4, 3, 3, 2, 2, 2, 1, 1, 1, 1)
+
+    def test_sample_fleet_is_valid_board(self) -> None:
+        sizes = pm.get_fleet_sizes(cfg.ClassicGameConfiguration())
+        rng = random.Random(0)
+        for index in range(50):
+            fleet = pm.sample_fleet(sizes, rng)
+            board = b.Board()
+            for number, placement in enumerate(fleet):
+                ship = m.Ship(f"ship_{number}", placement.ship_size)
+                ship.direction = placement.direction
+                board.add_ship(placement.coordinate, ship)
+            assert [placement.ship_size for placement in fleet] == list(sizes)
+            assert board.get_amount_of_alive_ships() == sum(sizes)
+
+    def test_sample_fleet_respects_blocked_cells(self) -> None:
+        blocked = (1 << 50) - 1
+        fleet = pm.sample_fleet((4, 3, 2), random.Random(3), blocked)
+        for placement in fleet:
+            assert not placement.mask & blocked
+
+    def test_sample_fleet_fails_if_fleet_does_not_fit(self) -> None:
+        with pytest.raises(ValueError):
+            pm.sample_fleet((5,), random.Random(0), (1 << 100) - 1)
+
+    def test_iterate_fleets_fails_if_fleet_does_not_fit(self) -> None:
+        with pytest.raises(ValueError):
+            next(pm.iterate_fleets((4,) * 20, random.Random(0)))
+
+    def test_sample_fleets(self) -> None:
+        sizes = (4, 3, 2, 1)
+        fleets = pm.sample_fleets(sizes, 100, random.Random(5))
+        assert len(fleets) == 100
+        for fleet in fleets:
+            occupied = 0
+            for mask in fleet:
+                assert not mask & occupied
+                occupied |= mask
+            assert bin(occupied).count("1") == sum(sizes)
+        assert fleets == pm.sample_fleets(sizes, 100, random.Random(5))
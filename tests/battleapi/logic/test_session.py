@@ -1,9 +1,14 @@
+import random
+
 import pytest
 
+import battleapi.logic.bitboard as bb
 import battleapi.logic.board as b
 import battleapi.logic.configs as classic_cfg
+import battleapi.logic.events as ev
 import battleapi.logic.exceptions as ex
 import battleapi.logic.game as s
+import battleapi.logic.models as m
 import battleapi.logic.player as pl
 import battleapi.utils.id_generator as id_gen
 
@@ -54,6 +59,15 @@ class TestGameSession:
         with pytest.raises(ex.ToManyPlayersException):
             session.add_player("test_player_id_error", "test_name_error")
 
+    def test_add_player_with_board_factory(self) -> None:
+        session = s.Game(
+            id_generator=id_gen.Uuid4IdGenerator(),
+            game_config=classic_cfg.ClassicGameConfiguration(),
+            board_factory=bb.BitBoard,
+        )
+        session.add_player("test_player_id", "test_name")
+        assert isinstance(session.players["test_player_id"].board, bb.BitBoard)
+
     def test_is_game_initialized(self) -> None:
         session = create_session()
         assert not session.is_game_initialized()
@@ -228,12 +242,29 @@ class TestGameSession:
             session.add_ship("test_player_id_2", coordinate, pl_2_ships.pop())
         board = session.players["test_player_id_1"].board
         assert not session.is_game_finished()
-        for row in board._board:
-            for cell in row:
+        for row_index, row in enumerate(board._board):
+            for col_index, cell in enumerate(row):
                 if cell.has_ship:
-                    cell.has_shot = True
+                    board.make_shot((row_index, col_index))
         assert session.is_game_finished()
 
+    def test_get_alive_ships_by_type(self) -> None:
+        session = create_session()
+        session.add_player("test_player_id_1", "test_name_1")
+        session.add_player("test_player_id_2", "test_name_2")
+        ships = session.get_available_ships("test_player_id_1")
+        ships.sort(key=lambda ship: ship.ship_size)
+        session.add_ship("test_player_id_1", (0, 0), ships[0])
+        session.add_ship("test_player_id_1", (2, 0), ships[-1])
+        alive = session.get_alive_ships_by_type("test_player_id_1")
+        assert alive[m.ShipType.PatrolBoat] == 1
+        assert alive[m.ShipType.Battleship] == 1
+        assert alive[m.ShipType.Submarine] == 0
+
+        session.make_shot("test_player_id_2", (0, 0))
+        alive = session.get_alive_ships_by_type("test_player_id_1")
+        assert alive[m.ShipType.PatrolBoat] == 0
+
     def test_get_winner(self) -> None:
         session = create_session()
         session.add_player("test_player_id_1", "test_name_1")
@@ -295,3 +326,81 @@ class TestGameSession:
         assert session.active_player_id == "test_player_id_1"
         with pytest.raises(AttributeError):
             session.active_player_id = "new_value"
+
+    def test_events_are_recorded(self) -> None:
+        session = create_session()
+        session.add_player("player_1", "name_1")
+        session.add_player("player_2", "name_2")
+        ship = session.get_available_ships("player_1")[0]
+        ship.direction = m.Direction.VERTICAL
+        session.add_ship("player_1", (0, 0), ship)
+        assert not session.remove_ship("player_1", (9, 9))
+        session.remove_ship("player_1", (0, 0))
+        session.make_player_ready("player_1")
+        session.make_shot("player_2", (5, 5))
+        recorded = session.pop_events()
+        assert recorded == [
+            ev.PlayerJoined(
+                "player_1",
+                "name_1",
+                tuple(session.players["player_1"].all_ships.keys()),
+            ),
+            ev.PlayerJoined(
+                "player_2",
+                "name_2",
+                tuple(session.players["player_2"].all_ships.keys()),
+            ),
+            ev.ShipPlaced("player_1", ship.ship_id, (0, 0), "VERTICAL"),
+            ev.ShipRemoved("player_1", (0, 0)),
+            ev.PlayerReady("player_1"),
+            ev.ShotFired("player_2", (5, 5)),
+        ]
+        assert session.pop_events() == []
+
+    def test_apply_event_repeats_changes(self) -> None:
+        session = create_session()
+        session.add_player("player_1", "name_1")
+        session.add_player("player_2", "name_2")
+        for player_id in ("player_1", "player_2"):
+            ship = session.get_available_ships(player_id)[0]
+            ship.direction = m.Direction.VERTICAL
+            session.add_ship(player_id, (2, 3), ship)
+            session.make_player_ready(player_id)
+        session.make_shot("player_1", (2, 3))
+        session.make_shot("player_1", (0, 0))
+
+        replayed = create_session()
+        for event in session.pop_events():
+            replayed.apply_event(event)
+        assert replayed.active_player_id == session.active_player_id
+        for player_id, player in session.players.items():
+            replayed_player = replayed.players[player_id]
+            assert replayed_player.all_ships == player.all_ships
+            assert replayed_player.ships_not_on_board.keys() == (
+                player.ships_not_on_board.keys()
+            )
+            assert replayed_player.board.get_board() == player.board.get_board()
+            assert replayed_player.is_ready == player.is_ready
+
+    def test_randomize_fleet(self) -> None:
+        session = create_session()
+        session.add_player("player_1", "name_1")
+        ship = session.get_available_ships("player_1")[0]
+        session.add_ship("player_1", (0, 0), ship)
+        session.randomize_fleet("player_1", random.Random(1))
+
+        player = session.players["player_1"]
+        assert len(player.ships_not_on_board) == 0
+        assert player.board.get_amount_of_alive_ships() == sum(
+            ship.ship_size for ship in player.all_ships.values()
+        )
+        recorded = session.pop_events()
+        assert ev.ShipRemoved("player_1", (0, 0)) in recorded
+        assert sum(isinstance(event, ev.ShipPlaced) for event in recorded) == 11
+
+        replayed = create_session()
+        for event in recorded:
+            replayed.apply_event(event)
+        assert (
+            replayed.players["player_1"].board.get_board() == player.board.get_board()
+        )
@@ -1,6 +1,7 @@
 import pytest
 
 import battleapi.logic.exceptions as ex
+import battleapi.logic.models as m
 import battleapi.logic.utils as utils
 
 
@@ -78,3 +79,38 @@ class TestUtilFunctions:
     def test_get_neighbour_coordinates_1_1_4_4_eq_8(self) -> None:
         neighbours_5_5 = utils.get_neighbour_coordinates((5, 5))
         assert len(neighbours_5_5) == 8
+
+    def test_get_neighbour_coordinates_is_cached_and_immutable(self) -> None:
+        neighbours = utils.get_neighbour_coordinates((5, 5))
+        assert neighbours is utils.get_neighbour_coordinates((5, 5))
+        assert isinstance(neighbours, frozenset)
+        assert neighbours is utils.get_neighbour_index()[5][5]
+
+    def test_get_neighbour_coordinates_out_of_bounds(self) -> None:
+        assert utils.get_neighbour_coordinates((-1, 0)) == {(0, 0), (0, 1)}
+
+    def test_get_neighbour_index_custom_size(self) -> None:
+        index = utils.get_neighbour_index(4, 4)
+        assert len(index) == 4
+        assert len(index[3]) == 4
+        assert index[3][3] == {(2, 2), (2, 3), (3, 2)}
+
+    def test_get_neighbour_mask_index(self) -> None:
+        masks = utils.get_neighbour_mask_index()
+        assert len(masks) == 100
+        assert masks[0] == (1 << 1) | (1 << 10) | (1 << 11)
+
+    def test_get_ship_footprint(self) -> None:
+        footprint, halo = utils.get_ship_footprint((0, 0), 2, m.Direction.VERTICAL)
+        assert footprint == {(0, 0), (1, 0)}
+        assert halo == {(0, 1), (1, 1), (2, 0), (2, 1)}
+        assert utils.get_ship_footprint((0, 0), 2, m.Direction.VERTICAL)[1] is halo
+
+    def test_get_ship_footprint_masks(self) -> None:
+        ship_mask, halo_mask = utils.get_ship_footprint_masks(
+            (0, 0), 2, m.Direction.HORIZONTAL
+        )
+        assert ship_mask == 0b11
+        assert halo_mask == (1 << 2) | (1 << 10) | (1 << 11) | (1 << 12)
+        with pytest.raises(ex.CoordinateException):
+            utils.get_ship_footprint_masks((0, 9), 2, m.Direction.HORIZONTAL)
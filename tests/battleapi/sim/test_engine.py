@@ -0,0 +1,171 @@
+import random
+
+import pytest
+
+import battleapi.logic.bitboard as bitboard
+import battleapi.logic.configs as configs
+import battleapi.logic.game as game
+import battleapi.logic.models as models
+import battleapi.logic.player as pl
+import battleapi.sim.engine as engine
+import battleapi.sim.report as report
+import battleapi.sim.strategies as st
+
+
+class RepeatingStrategy(st.Strategy):
+    name = "repeating"
+
+    def choose_shot(
+        self, view: pl.GameBoardView, rng: random.Random
+    ) -> models.Coordinate:
+        return 0, 0
+
+
+class TestEngine:
+    def test_place_fleet(self) -> None:
+        game_obj = game.Game(
+            engine.SequenceIdGenerator(), configs.ClassicGameConfiguration()
+        )
+        game_obj.add_player("player", "name")
+        game_obj.add_player("opponent", "name")
+        engine.place_fleet(game_obj, "player", random.Random(1))
+
+        assert game_obj.get_available_ships("player") == []
+        assert game_obj.make_player_ready("player")
+
+    @pytest.mark.parametrize("board_factory", [None, bitboard.BitBoard])
+    def test_play_game(self, board_factory) -> None:
+        result = engine.play_game(
+            (st.HuntTargetStrategy(), st.RandomStrategy()),
+            random.Random(2),
+            board_factory,
+        )
+
+        assert result.winner in (0, 1)
+        assert 20 <= result.shots[result.winner] <= 100
+        assert result.shots[1 - result.winner] <= 100
+
+    def test_strategy_shooting_same_cell(self) -> None:
+        with pytest.raises(engine.StrategyException):
+            engine.play_game(
+                (RepeatingStrategy(), RepeatingStrategy()), random.Random(3)
+            )
+
+    def test_create_tasks(self) -> None:
+        strategies = [st.RandomStrategy(), st.HuntTargetStrategy()]
+        tasks = engine.create_tasks(strategies, 10, 2, 0)
+        single = engine.create_tasks(strategies[:1], 3, 1, 0)
+
+        assert [task.games for task in tasks] == [2, 2, 1, 1, 1, 1, 1, 1]
+        assert [task.start for task in tasks] == [0, 2, 4, 5, 6, 7, 8, 9]
+        assert {(task.first, task.second) for task in tasks} == {(0, 1)}
+        assert len({task.seed for task in tasks}) == len(tasks)
+        assert [(task.first, task.second, task.games) for task in single] == [
+            (0, 0, 1),
+            (0, 0, 1),
+            (0, 0, 1),
+        ]
+
+    def test_run_simulation(self) -> None:
+        strategies = [st.RandomStrategy(), st.HuntTargetStrategy()]
+        result = engine.run_simulation(strategies, 10, workers=1, seed=5)
+        again = engine.run_simulation(strategies, 10, workers=1, seed=5)
+
+        assert result.games == 10
+        assert result.wins == again.wins
+        assert result.wins[0][0] == result.wins[1][1] == 0
+        assert result.count_wins(0) + result.count_wins(1) == 10
+        assert result.elapsed_seconds > 0
+        assert result.games_per_second > 0
+
+    def test_run_simulation_in_processes(self) -> None:
+        strategies = [st.RandomStrategy(), st.HuntTargetStrategy()]
+        result = engine.run_simulation(strategies, 4, workers=2, seed=5)
+        in_process = engine.run_simulation(strategies, 4, workers=1, seed=5)
+
+        assert result.games == 4
+        assert result.strategy_names == ["random", "hunt_target"]
+        assert result.count_wins(0) + result.count_wins(1) == 4
+        assert in_process.games == 4
+
+    def test_run_simulation_without_strategies(self) -> None:
+        with pytest.raises(ValueError):
+            engine.run_simulation([], 1)
+
+
+class TestReport:
+    def test_counters(self) -> None:
+        result = report.SimulationReport(["a", "b"])
+        result.add_game(0, 1, 40, True)
+        result.add_game(0, 1, 50, False)
+        other = report.SimulationReport(["a", "b"])
+        other.add_game(1, 0, 60, True)
+        result.add(other)
+
+        assert result.wins == [[0, 2], [1, 0]]
+        assert result.games == 3
+        assert result.first_player_wins == 2
+        assert result.get_average_shots_to_win(0) == 45
+        assert result.get_average_shots_to_win(1) == 60
+        assert result.games_per_second == 0
+        assert "win matrix" in result.format()
+
+
+class TestStrategies:
+    def test_random_strategy_shoots_free_cells(self) -> None:
+        board_obj = bitboard.BitBoard()
+        for coordinate in st.ALL_COORDINATES[:-1]:
+            board_obj.make_shot(coordinate)
+
+        assert st.RandomStrategy().choose_shot(
+            board_obj.get_view(is_hidden=True), random.Random(0)
+        ) == (9, 9)
+
+    def test_hunt_target_finishes_ship_along_line(self) -> None:
+        board_obj = bitboard.BitBoard()
+        board_obj.add_ship((4, 3), models.Ship("ship", 4, models.Direction.HORIZONTAL))
+        board_obj.make_shot((4, 4))
+        board_obj.make_shot((4, 5))
+        strategy = st.HuntTargetStrategy()
+        view = board_obj.get_view(is_hidden=True)
+
+        for seed in range(10):
+            assert strategy.choose_shot(view, random.Random(seed)) in [(4, 3), (4, 6)]
+
+    def test_hunt_target_hunts_on_checkerboard(self) -> None:
+        view = bitboard.BitBoard().get_view(is_hidden=True)
+        strategy = st.HuntTargetStrategy()
+        no_parity = st.HuntTargetStrategy(parity=False)
+
+        for seed in range(10):
+            row, col = strategy.choose_shot(view, random.Random(seed))
+            assert (row + col) % 2 == 0
+        assert no_parity.name != strategy.name
+
+    def test_heatmap_strategy_plays_new_bot_every_game(self) -> None:
+        strategy = st.HeatmapStrategy()
+        first = strategy.start_game()
+        second = strategy.start_game()
+        view = bitboard.BitBoard().get_view(is_hidden=True)
+
+        assert first is not strategy and first is not second
+        row, col = first.choose_shot(view, random.Random(0))
+        assert not view.has_shot(row, col)
+        assert st.STRATEGIES["heatmap"] is st.HeatmapStrategy
+
+    def test_montecarlo_strategy_shoots_free_cells(self) -> None:
+        board_obj = bitboard.BitBoard()
+        for coordinate in st.ALL_COORDINATES[:-2]:
+            board_obj.make_shot(coordinate)
+        strategy = st.MonteCarloStrategy(samples=10).start_game()
+
+        assert strategy.choose_shot(
+            board_obj.get_view(is_hidden=True), random.Random(0)
+        ) in [(9, 8), (9, 9)]
+
+    def test_strategy_without_choose_shot_is_not_created(self) -> None:
+        class Incomplete(st.Strategy):
+            name = "incomplete"
+
+        with pytest.raises(TypeError):
+            Incomplete()
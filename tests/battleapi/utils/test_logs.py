@@ -0,0 +1,114 @@
+import logging
+
+import pytest
+
+import battleapi.utils.logs as logs
+
+
+class RecordsHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+@pytest.fixture
+def handler():
+    logger = logging.getLogger("tests.logs")
+    records_handler = RecordsHandler()
+    records_handler.addFilter(logs.ContextFilter())
+    logger.addHandler(records_handler)
+    logger.setLevel(logging.DEBUG)
+    yield records_handler
+    logger.removeHandler(records_handler)
+    logger.setLevel(logging.NOTSET)
+
+
+def test_get_logger_returns_same_object() -> None:
+    assert logs.get_logger("tests.logs") is logs.get_logger("tests.logs")
+    assert logs.get_logger("tests.logs").logger is logging.getLogger("tests.logs")
+
+
+def test_levels_are_refreshed_on_level_change(handler) -> None:
+    log = logs.get_logger("tests.logs")
+    assert log.is_debug
+    assert log.is_info
+
+    logging.getLogger("tests.logs").setLevel(logging.INFO)
+    assert not log.is_debug
+    assert log.is_info
+
+    log.debug("Hidden")
+    log.info("Visible")
+    assert [record.getMessage() for record in handler.records] == ["Visible"]
+
+    logging.disable(logging.CRITICAL)
+    try:
+        assert not log.is_info
+    finally:
+        logging.disable(logging.NOTSET)
+    assert log.is_info
+
+
+def test_record_points_to_caller(handler) -> None:
+    logs.get_logger("tests.logs").debug("Value: %d", 1)
+
+    assert len(handler.records) == 1
+    assert handler.records[0].getMessage() == "Value: 1"
+    assert handler.records[0].funcName == "test_record_points_to_caller"
+
+
+def test_debug_sampled(handler) -> None:
+    log = logs.get_logger("tests.logs")
+    for index in range(10):
+        log.debug_sampled("Sampled: %d", index, rate=4)
+
+    assert [record.getMessage() for record in handler.records] == [
+        "Sampled: 0",
+        "Sampled: 4",
+        "Sampled: 8",
+    ]
+
+
+def test_log_context(handler) -> None:
+    log = logs.get_logger("tests.logs")
+    with logs.log_context(session_id="session", player_id="0123456789abcdef"):
+        with logs.log_context(player_id=None, shot="A1") as context:
+            assert context == {
+                "session_id": "session",
+                "player_id": "0123456789abcdef",
+                "shot": "A1",
+            }
+            log.info("Inside")
+        assert "shot" not in logs.get_context()
+    log.info("Outside")
+
+    assert logs.get_context() == {}
+    assert handler.records[0].context == (
+        " session_id=session player_id=01234567... shot=A1"
+    )
+    assert handler.records[1].context == ""
+
+
+def test_bind_and_reset_context() -> None:
+    token = logs.bind_context(session_id="session", player_id="")
+
+    assert logs.get_context() == {"session_id": "session"}
+    logs.reset_context(token)
+    assert logs.get_context() == {}
+
+
+def test_install_context_filter() -> None:
+    logger = logging.getLogger("tests.logs.filter")
+    records_handler = RecordsHandler()
+    logger.addHandler(records_handler)
+    try:
+        logs.install_context_filter(logger)
+        logs.install_context_filter(logger)
+
+        assert len(records_handler.filters) == 1
+        assert isinstance(records_handler.filters[0], logs.ContextFilter)
+    finally:
+        logger.removeHandler(records_handler)
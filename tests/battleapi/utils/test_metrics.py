@@ -0,0 +1,119 @@
+import gc
+import math
+import threading
+
+import pytest
+
+import battleapi.utils.metrics as metrics
+
+
+def test_counter_with_labels() -> None:
+    registry = metrics.Registry()
+    counter = registry.counter("test_total", "Test counter.", ("kind",))
+    counter.labels("a").inc()
+    counter.labels("a").inc(2)
+    counter.labels('b"\n').inc()
+
+    assert counter.labels("a").get() == 3
+    assert registry.render() == (
+        "# HELP test_total Test counter.\n"
+        "# TYPE test_total counter\n"
+        'test_total{kind="a"} 3\n'
+        'test_total{kind="b\\"\\n"} 1\n'
+    )
+
+
+def test_labels_count_is_checked() -> None:
+    counter = metrics.Registry().counter("test_total", "Test counter.", ("kind",))
+
+    with pytest.raises(ValueError):
+        counter.labels()
+    with pytest.raises(ValueError):
+        counter.labels("a", "b")
+
+
+def test_metric_family_is_abstract() -> None:
+    with pytest.raises(TypeError):
+        metrics.Metric("test", "Test metric.")
+
+
+def test_counter_is_exact_with_many_threads() -> None:
+    counter = metrics.Registry().counter("test_total", "Test counter.")
+    child = counter.labels()
+
+    def worker() -> None:
+        for _ in range(10000):
+            child.inc()
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    assert counter.get() <= 80000
+    for thread in threads:
+        thread.join()
+
+    assert counter.get() == 80000
+    child.inc()
+    assert counter.get() == 80001
+
+
+def test_gauge() -> None:
+    registry = metrics.Registry()
+    gauge = registry.gauge("test_gauge", "Test gauge.")
+    gauge.inc(3)
+    gauge.dec()
+    assert gauge.get() == 2
+
+    gauge.set_function(lambda: 1.5)
+    assert gauge.get() == 1.5
+    assert "test_gauge 1.5\n" in registry.render()
+
+    gauge.set_function(lambda: 1 / 0)
+    assert math.isnan(gauge.get())
+    assert "test_gauge NaN\n" in registry.render()
+
+
+def test_histogram() -> None:
+    registry = metrics.Registry()
+    histogram = registry.histogram(
+        "test_seconds", "Test histogram.", ("operation",), bounds=(1.0, 0.1)
+    )
+    child = histogram.labels("load")
+    for value in (0.05, 0.1, 0.5, 3.0):
+        child.observe(value)
+
+    assert child.get() == ([2, 3, 4], 3.65, 4)
+    assert registry.render().splitlines()[2:] == [
+        'test_seconds_bucket{operation="load",le="0.1"} 2',
+        'test_seconds_bucket{operation="load",le="1"} 3',
+        'test_seconds_bucket{operation="load",le="+Inf"} 4',
+        'test_seconds_sum{operation="load"} 3.65',
+        'test_seconds_count{operation="load"} 4',
+    ]
+
+
+def test_registry_returns_registered_metric() -> None:
+    registry = metrics.Registry()
+    counter = registry.counter("test_total", "Test counter.", ("kind",))
+
+    assert registry.counter("test_total", "Other help.", ("kind",)) is counter
+    assert registry.get("test_total") is counter
+    assert registry.get("unknown") is None
+    with pytest.raises(ValueError):
+        registry.gauge("test_total", "Test gauge.", ("kind",))
+    with pytest.raises(ValueError):
+        registry.counter("test_total", "Test counter.")
+
+
+def test_weak_method() -> None:
+    class Store:
+        def get_size(self) -> float:
+            return 5
+
+    store = Store()
+    function = metrics.weak_method(store.get_size, default=-1)
+    assert function() == 5
+
+    del store
+    gc.collect()
+    assert function() == -1
@@ -0,0 +1,262 @@
+import random
+
+import battleapi.api.bots as bots
+import battleapi.api.dto as dto
+import battleapi.logic.game as game
+import battleapi.logic.heatmap as heatmap
+import battleflask.app.context as ctx
+import battleflask.app.controllers.constants as const
+
+
+def create_session(client, with_bot: bool = False) -> tuple[str, str]:
+    response = client.post(
+        "/api/v1/sessions", json={"player_name": "player", "with_bot": with_bot}
+    )
+    assert response.status_code == 201
+    return response.json["session_id"], response.json["player_id"]
+
+
+def join_session(client, session_id: str) -> str:
+    response = client.post(
+        f"/api/v1/sessions/{session_id}/players", json={"player_name": "opponent"}
+    )
+    assert response.status_code == 201
+    assert response.json["session_id"] == session_id
+    return response.json["player_id"]
+
+
+def auth(player_id: str) -> dict[str, str]:
+    return {const.HEADER_PLAYER_ID: player_id}
+
+
+def get_snapshot(client, session_id: str, player_id: str) -> dict:
+    response = client.get(f"/api/v1/sessions/{session_id}", headers=auth(player_id))
+    assert response.status_code == 200
+    return response.json
+
+
+def start_game(client, session_id: str, player_ids: list[str]) -> None:
+    for player_id in player_ids:
+        response = client.post(
+            f"/api/v1/sessions/{session_id}/ships/random", headers=auth(player_id)
+        )
+        assert response.status_code == 200
+        response = client.post(
+            f"/api/v1/sessions/{session_id}/ready", headers=auth(player_id)
+        )
+        assert response.status_code == 200
+        assert response.json == {"is_ready": True}
+
+
+def test_player_header_is_required(client) -> None:
+    session_id, _ = create_session(client)
+
+    response = client.get(f"/api/v1/sessions/{session_id}")
+    assert response.status_code == 400
+    assert response.json["error"] == "IsEmptyStringException"
+    response = client.get(f"/api/v1/sessions/{session_id}/ships")
+    assert response.status_code == 400
+
+
+def test_unknown_player_and_session(client) -> None:
+    session_id, player_id = create_session(client)
+
+    response = client.get(f"/api/v1/sessions/{session_id}", headers=auth("unknown"))
+    assert response.status_code == 404
+    response = client.get(
+        f"/api/v1/sessions/{session_id}/ships", headers=auth("unknown")
+    )
+    assert response.status_code == 404
+    assert response.json["error"] == "PlayerIsNotInSessionException"
+    response = client.get("/api/v1/sessions/unknown", headers=auth(player_id))
+    assert response.status_code == 404
+
+
+def test_request_errors_are_mapped(client) -> None:
+    response = client.post("/api/v1/sessions", json={"player_name": ""})
+    assert response.status_code == 400
+
+    session_id, player_id = create_session(client)
+    join_session(client, session_id)
+    response = client.post(
+        f"/api/v1/sessions/{session_id}/players", json={"player_name": "third"}
+    )
+    assert response.status_code == 409
+    assert response.json["error"] == "ToManyPlayersException"
+
+    response = client.post(
+        f"/api/v1/sessions/{session_id}/shots",
+        headers=auth(player_id),
+        json={"row": 10, "col": 0},
+    )
+    assert response.status_code == 400
+    assert response.json["error"] == "IsNotValidCoordinateException"
+
+
+def test_preparation(client) -> None:
+    session_id, player_id = create_session(client)
+    snapshot = get_snapshot(client, session_id, player_id)
+    assert snapshot["stage"] == "wait"
+    assert snapshot["opponent"] is None
+    assert snapshot["opponent_field"] == []
+    assert snapshot["field"] == [dto.CELL_EMPTY * 10] * 10
+
+    response = client.get(
+        f"/api/v1/sessions/{session_id}/ships", headers=auth(player_id)
+    )
+    ships = response.json["ships"]
+    assert len(ships) == 10
+    response = client.post(
+        f"/api/v1/sessions/{session_id}/ships",
+        headers=auth(player_id),
+        json={
+            "ship_id": ships[-1]["ship_id"],
+            "row": 0,
+            "col": 0,
+            "direction": "horizontal",
+        },
+    )
+    assert response.status_code == 200
+    assert response.json["field"][0] == "ssss......"
+    response = client.post(
+        f"/api/v1/sessions/{session_id}/ships",
+        headers=auth(player_id),
+        json={
+            "ship_id": ships[0]["ship_id"],
+            "row": 0,
+            "col": 0,
+            "direction": "vertical",
+        },
+    )
+    assert response.status_code == 409
+    response = client.post(
+        f"/api/v1/sessions/{session_id}/ships",
+        headers=auth(player_id),
+        json={"ship_id": "nope", "row": 5, "col": 5, "direction": "vertical"},
+    )
+    assert response.status_code == 404
+    assert response.json["error"] == "ShipNotFoundException"
+    response = client.post(
+        f"/api/v1/sessions/{session_id}/ships",
+        headers=auth(player_id),
+        json={
+            "ship_id": ships[0]["ship_id"],
+            "row": 5,
+            "col": 5,
+            "direction": "diag",
+        },
+    )
+    assert response.status_code == 400
+    assert response.json["error"] == "IncorrectStringException"
+
+    opponent_id = join_session(client, session_id)
+    response = client.post(
+        f"/api/v1/sessions/{session_id}/ready", headers=auth(player_id)
+    )
+    assert response.json == {"is_ready": False}
+    response = client.delete(
+        f"/api/v1/sessions/{session_id}/ships/0/2", headers=auth(player_id)
+    )
+    assert response.status_code == 200
+    assert response.json["field"][0] == dto.CELL_EMPTY * 10
+
+    start_game(client, session_id, [player_id])
+    snapshot = get_snapshot(client, session_id, player_id)
+    assert snapshot["stage"] == "prepare"
+    assert snapshot["player"] == {"player_name": "player", "is_ready": True}
+    assert snapshot["opponent"] == {"player_name": "opponent", "is_ready": False}
+    assert sum(line.count(dto.CELL_SHIP) for line in snapshot["field"]) == 20
+    response = client.post(
+        f"/api/v1/sessions/{session_id}/shots",
+        headers=auth(opponent_id),
+        json={"row": 0, "col": 0},
+    )
+    assert response.status_code == 409
+    assert response.json["error"] == "NotPlayerTurnException"
+
+
+def test_random_ships_of_ready_player(client) -> None:
+    session_id, player_id = create_session(client, with_bot=True)
+    start_game(client, session_id, [player_id])
+
+    response = client.post(
+        f"/api/v1/sessions/{session_id}/ships/random", headers=auth(player_id)
+    )
+    assert response.status_code == 409
+    assert response.json["error"] == "PlayerIsReadyException"
+
+
+def test_shots_against_bot(client, monkeypatch) -> None:
+    monkeypatch.setattr(game, "RANDOM", random.Random(3))
+    monkeypatch.setattr(
+        ctx.GAME_API,
+        "bot_registry",
+        bots.BotRegistry(
+            bot_factory=lambda config: heatmap.HeatmapBot(config, random.Random(3))
+        ),
+    )
+    session_id, player_id = create_session(client, with_bot=True)
+    start_game(client, session_id, [player_id])
+    results = []
+    for row in range(10):
+        response = client.post(
+            f"/api/v1/sessions/{session_id}/shots",
+            headers=auth(player_id),
+            json={"row": row, "col": row},
+        )
+        assert response.status_code == 200
+        result = response.json
+        results.append(result)
+        snapshot = get_snapshot(client, session_id, player_id)
+        expected = dto.CELL_HIT if result["is_hit"] else dto.CELL_MISS
+        assert snapshot["opponent_field"][row][row] == expected
+        # bot shoots after the miss, then the turn comes back
+        assert result["is_active"] and snapshot["is_active"]
+    assert {result["is_hit"] for result in results} == {True, False}
+
+
+def test_shots(client) -> None:
+    session_id, player_id = create_session(client)
+    opponent_id = join_session(client, session_id)
+    start_game(client, session_id, [player_id, opponent_id])
+    snapshots = {
+        player: get_snapshot(client, session_id, player)
+        for player in (player_id, opponent_id)
+    }
+    assert {snapshot["stage"] for snapshot in snapshots.values()} == {"gameplay"}
+    active_id, waiting_id = (
+        (player_id, opponent_id)
+        if snapshots[player_id]["is_active"]
+        else (opponent_id, player_id)
+    )
+    assert not snapshots[waiting_id]["is_active"]
+    assert snapshots[active_id]["cells_self"] == 100
+    assert snapshots[active_id]["cells_opponent"] == 100
+    assert all(
+        dto.CELL_SHIP not in line for line in snapshots[active_id]["opponent_field"]
+    )
+
+    response = client.post(
+        f"/api/v1/sessions/{session_id}/shots",
+        headers=auth(waiting_id),
+        json={"row": 0, "col": 0},
+    )
+    assert response.status_code == 409
+    assert response.json["error"] == "NotPlayerTurnException"
+
+    response = client.post(
+        f"/api/v1/sessions/{session_id}/shots",
+        headers=auth(active_id),
+        json={"row": 0, "col": 0},
+    )
+    assert response.status_code == 200
+    result = response.json
+    assert not result["is_finished"]
+    assert result["is_active"] == result["is_hit"]
+    snapshot = get_snapshot(client, session_id, active_id)
+    expected = dto.CELL_HIT if result["is_hit"] else dto.CELL_MISS
+    assert snapshot["opponent_field"][0][0] == expected
+    assert snapshot["is_active"] == result["is_hit"]
+    assert snapshot["cells_opponent"] < 100
+    waiting_field = get_snapshot(client, session_id, waiting_id)["field"]
+    assert waiting_field[0][0] == expected
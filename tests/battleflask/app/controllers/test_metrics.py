@@ -0,0 +1,11 @@
+import battleflask.app.controllers.metrics as metrics_controller
+
+
+def test_metrics(client) -> None:
+    response = client.post("/api/v1/sessions", json={"player_name": "player"})
+    assert response.status_code == 201
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.content_type == metrics_controller.METRICS_CONTENT_TYPE
+    assert "# TYPE battleship_sessions_created_total counter" in response.text
@@ -0,0 +1,82 @@
+import json
+
+import battleapi.api.broker as broker
+import battleflask.app.context as ctx
+import battleflask.app.controllers.constants as const
+import battleflask.app.controllers.notifications as notifications
+
+
+def create_player_session() -> tuple[str, str]:
+    session_id = ctx.GAME_API.init_game_session()
+    player = ctx.GAME_API.create_player_in_session(session_id, "player")
+    return session_id, player.player_id
+
+
+def test_subscription_is_created_before_stream_starts(app) -> None:
+    session_id, player_id = create_player_session()
+    with app.test_request_context(f"/game/{session_id}/events"):
+        response = notifications.create_events_response(session_id, player_id)
+        assert ctx.BROKER.count_subscribers(session_id) == 1
+
+        ctx.BROKER.publish(
+            session_id, broker.Notification(broker.EVENT_PLAYER_READY, {})
+        )
+        stream = iter(response.response)
+        assert next(stream) == "retry: 3000\n\n"
+        assert next(stream).startswith("event: state\n")
+        assert next(stream) == "event: player_ready\ndata: {}\n\n"
+        response.close()
+    assert ctx.BROKER.count_subscribers(session_id) == 0
+
+
+def test_stream_starts_with_state(app) -> None:
+    session_id, player_id = create_player_session()
+    # changes made before the stream is opened are not published to it
+    ctx.GAME_API.create_player_in_session(session_id, "opponent")
+    with app.test_request_context(f"/game/{session_id}/events"):
+        response = notifications.create_events_response(session_id, player_id)
+        stream = iter(response.response)
+        assert next(stream) == "retry: 3000\n\n"
+        event = next(stream)
+        response.close()
+
+    kind, data = event.strip().split("\n")
+    assert kind == f"event: {notifications.EVENT_STATE}"
+    state = json.loads(data.removeprefix("data: "))
+    assert state["opponent_name"] == "opponent"
+    assert not state["is_opponent_ready"]
+    assert not state["is_finished"]
+    assert not state["is_active"]
+    assert state["field"] == ["." * 10] * 10
+    assert state["opponent_field"] == ["." * 10] * 10
+
+
+def test_subscription_is_closed_if_stream_is_not_started(app) -> None:
+    session_id, player_id = create_player_session()
+    with app.test_request_context(f"/game/{session_id}/events"):
+        response = notifications.create_events_response(session_id, player_id)
+        assert ctx.BROKER.count_subscribers(session_id) == 1
+        response.close()
+    assert ctx.BROKER.count_subscribers(session_id) == 0
+
+
+def test_events_stream(client) -> None:
+    session_id, player_id = create_player_session()
+    client.set_cookie(const.COOKIE_SESSION_ID, session_id)
+    client.set_cookie(const.COOKIE_PLAYER_ID, player_id)
+
+    response = client.get(f"/game/{session_id}/events", buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    assert ctx.BROKER.count_subscribers(session_id) == 1
+    response.close()
+    assert ctx.BROKER.count_subscribers(session_id) == 0
+
+
+def test_unknown_player_is_rejected(client) -> None:
+    session_id = ctx.GAME_API.init_game_session()
+    client.set_cookie(const.COOKIE_SESSION_ID, session_id)
+    client.set_cookie(const.COOKIE_PLAYER_ID, "unknown")
+
+    assert client.get(f"/game/{session_id}/events").status_code == 404
+    assert ctx.BROKER.count_subscribers(session_id) == 0
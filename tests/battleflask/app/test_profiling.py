@@ -0,0 +1,52 @@
+import battleapi.utils.metrics as metrics
+import battleflask.app.context as ctx
+import battleflask.app.controllers.constants as const
+import battleflask.app.profiling as profiling
+
+
+def create_session() -> tuple[str, str]:
+    session_id = ctx.GAME_API.init_game_session()
+    player = ctx.GAME_API.create_player_in_session(session_id, "player")
+    return session_id, player.player_id
+
+
+def test_format_server_timing() -> None:
+    spans = {"controller.make_shot": [0.0015, 2], "render": [0.0002, 1]}
+
+    assert profiling.format_server_timing(spans, 0.003) == (
+        "controller.make_shot;dur=1.500, render;dur=0.200, total;dur=3.000"
+    )
+
+
+def test_profiling_is_disabled_by_default(client) -> None:
+    session_id, player_id = create_session()
+
+    response = client.get(
+        f"/api/v1/sessions/{session_id}", headers={const.HEADER_PLAYER_ID: player_id}
+    )
+    assert response.status_code == 200
+    assert profiling.HEADER_SERVER_TIMING not in response.headers
+    assert not isinstance(ctx.GAME_API, profiling.ProfiledProxy)
+
+
+def test_profiling_adds_server_timing(profiling_client) -> None:
+    assert isinstance(ctx.GAME_API, profiling.ProfiledProxy)
+    session_id, player_id = create_session()
+    route = "/api/v1/sessions/<session_id>"
+    histogram = metrics.REGISTRY.get("battleship_request_duration_seconds")
+    count = histogram.labels(route, "GET").get()[2] if histogram is not None else 0
+
+    response = profiling_client.get(
+        f"/api/v1/sessions/{session_id}", headers={const.HEADER_PLAYER_ID: player_id}
+    )
+    assert response.status_code == 200
+    timing = response.headers[profiling.HEADER_SERVER_TIMING]
+    names = [item.split(";")[0] for item in timing.split(", ")]
+    assert "controller.get_gameplay_snapshot" in names
+    assert "persistence.load_session" in names
+    assert names[-1] == profiling.SPAN_TOTAL
+    histogram = metrics.REGISTRY.get("battleship_request_duration_seconds")
+    assert histogram.labels(route, "GET").get()[2] == count + 1
+
+    response = profiling_client.get("/metrics")
+    assert "battleship_request_duration_seconds_count{" in response.text
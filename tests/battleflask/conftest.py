@@ -0,0 +1,39 @@
+import os
+
+import flask
+import flask.testing
+import pytest
+
+import battleflask
+import battleflask.app.context as ctx
+from battleflask.flask_app_config import configure_flask_app
+
+# application of battleflask.flask_app is configured on import
+os.environ.setdefault("FLASK_APP_KEY", "test_key")
+
+
+def create_app(monkeypatch, **config) -> flask.Flask:
+    monkeypatch.setenv("FLASK_APP_KEY", "test_key")
+    # profiling replaces the controller of the context by the proxies
+    monkeypatch.setattr(ctx, "GAME_API", ctx.GAME_API)
+    monkeypatch.setattr(ctx.GAME_API, "persistence", ctx.GAME_API.persistence)
+    application = flask.Flask(
+        battleflask.__name__, root_path=os.path.dirname(battleflask.__file__)
+    )
+    configure_flask_app(application, {"TESTING": True, **config})
+    return application
+
+
+@pytest.fixture
+def app(monkeypatch) -> flask.Flask:
+    return create_app(monkeypatch)
+
+
+@pytest.fixture
+def client(app) -> flask.testing.FlaskClient:
+    return app.test_client()
+
+
+@pytest.fixture
+def profiling_client(monkeypatch) -> flask.testing.FlaskClient:
+    return create_app(monkeypatch, PROFILING=True).test_client()
@@ -0,0 +1,181 @@
+import asyncio
+import json
+
+import pytest
+
+import battleapi.api.broker as broker
+import battleflask.app.context as ctx
+import battleflask.app.controllers.constants as const
+import battleflask.app.profiling as profiling
+import battleflask.asgi_app as asgi_app
+
+
+def create_asgi_app(wsgi_app) -> asgi_app.GameAsgiApp:
+    return asgi_app.GameAsgiApp(
+        wsgi_app, ctx.GAME_API, ctx.BROKER, max_workers=2, max_stream_seconds=0.5
+    )
+
+
+def create_scope(method: str, path: str, headers=()) -> dict:
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": b"",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers],
+    }
+
+
+def call(application, scope: dict, body: bytes = b"", on_send=None) -> list[dict]:
+    sent = []
+
+    async def run() -> None:
+        requests = [{"type": "http.request", "body": body, "more_body": False}]
+        disconnected = asyncio.Event()
+
+        async def receive() -> dict:
+            if requests:
+                return requests.pop()
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: dict) -> None:
+            sent.append(message)
+            if on_send is not None and on_send(message):
+                disconnected.set()
+
+        await application(scope, receive, send)
+
+    asyncio.run(run())
+    return sent
+
+
+def get_headers(sent: list[dict]) -> dict[str, str]:
+    return {name.decode(): value.decode() for name, value in sent[0]["headers"]}
+
+
+def create_session() -> tuple[str, str]:
+    session_id = ctx.GAME_API.init_game_session()
+    player = ctx.GAME_API.create_player_in_session(session_id, "player")
+    return session_id, player.player_id
+
+
+def test_build_environ() -> None:
+    scope = create_scope(
+        "POST",
+        "/api/v1/sessions",
+        [
+            ("Content-Type", "application/json"),
+            ("Content-Length", "100"),
+            ("Cookie", "a=1"),
+            ("Cookie", "b=2"),
+            ("X-Player-Id", "player"),
+        ],
+    )
+    environ = asgi_app.build_environ(scope, b"{}")
+
+    assert environ["REQUEST_METHOD"] == "POST"
+    assert environ["PATH_INFO"] == "/api/v1/sessions"
+    assert environ["CONTENT_TYPE"] == "application/json"
+    assert environ["CONTENT_LENGTH"] == "2"
+    assert environ["HTTP_COOKIE"] == "a=1; b=2"
+    assert environ["HTTP_X_PLAYER_ID"] == "player"
+    assert environ["wsgi.input"].read() == b"{}"
+
+
+@pytest.mark.parametrize(
+    "headers, player_id",
+    [
+        ([(const.HEADER_PLAYER_ID, " player ")], "player"),
+        ([("Cookie", f"{const.COOKIE_PLAYER_ID}=cookie")], ""),
+        (
+            [
+                (
+                    "Cookie",
+                    f"{const.COOKIE_SESSION_ID}=session; "
+                    f"{const.COOKIE_PLAYER_ID}=cookie",
+                )
+            ],
+            "cookie",
+        ),
+        (
+            [
+                (
+                    "Cookie",
+                    f"{const.COOKIE_SESSION_ID}=other; "
+                    f"{const.COOKIE_PLAYER_ID}=cookie",
+                )
+            ],
+            "",
+        ),
+    ],
+)
+def test_get_player_id(headers, player_id) -> None:
+    scope = create_scope("GET", "/game/session/events", headers)
+
+    assert asgi_app.get_player_id(scope, "session") == player_id
+
+
+def test_requests_are_passed_to_wsgi_app(app) -> None:
+    scope = create_scope(
+        "POST", "/api/v1/sessions", [("Content-Type", "application/json")]
+    )
+    sent = call(create_asgi_app(app), scope, json.dumps({"player_name": "p"}).encode())
+
+    assert sent[0]["status"] == 201
+    assert get_headers(sent)["content-type"] == "application/json"
+    assert profiling.HEADER_SERVER_TIMING.lower() not in get_headers(sent)
+    assert set(json.loads(sent[1]["body"])) == {"session_id", "player_id"}
+
+    sent = call(create_asgi_app(app), create_scope("GET", "/metrics"))
+    assert sent[0]["status"] == 200
+    assert b"battleship_sessions_created_total" in sent[1]["body"]
+
+
+def test_profiling_headers_are_passed(profiling_client) -> None:
+    session_id, player_id = create_session()
+    scope = create_scope(
+        "GET", f"/api/v1/sessions/{session_id}", [(const.HEADER_PLAYER_ID, player_id)]
+    )
+    sent = call(create_asgi_app(profiling_client.application), scope)
+
+    assert sent[0]["status"] == 200
+    assert "total;dur=" in get_headers(sent)["server-timing"]
+
+
+def test_events_stream(app) -> None:
+    session_id, player_id = create_session()
+    scope = create_scope(
+        "GET",
+        f"/api/v1/sessions/{session_id}/events",
+        [(const.HEADER_PLAYER_ID, player_id)],
+    )
+
+    def on_send(message: dict) -> bool:
+        if message.get("body") == b"retry: 3000\n\n":
+            assert ctx.BROKER.count_subscribers(session_id) == 1
+            ctx.BROKER.publish(
+                session_id, broker.Notification(broker.EVENT_PLAYER_READY, {})
+            )
+        return message.get("body", b"").startswith(b"event: player_ready")
+
+    sent = call(create_asgi_app(app), scope, on_send=on_send)
+
+    assert sent[0]["status"] == 200
+    assert get_headers(sent)["content-type"].startswith("text/event-stream")
+    assert sent[2]["body"].startswith(b"event: state\n")
+    assert sent[-1]["body"] == b"event: player_ready\ndata: {}\n\n"
+    assert ctx.BROKER.count_subscribers(session_id) == 0
+
+
+def test_events_stream_of_unknown_player(app) -> None:
+    session_id, _ = create_session()
+    scope = create_scope(
+        "GET",
+        f"/api/v1/sessions/{session_id}/events",
+        [(const.HEADER_PLAYER_ID, "unknown")],
+    )
+    sent = call(create_asgi_app(app), scope)
+
+    assert sent[0]["status"] == 404
+    assert ctx.BROKER.count_subscribers(session_id) == 0